@@ -1,6 +1,7 @@
 from copy import deepcopy
 from nbs_core.autoload import simpleResolver, instantiateOphyd
 from .settings import SETTINGS
+from .models.updateLimits import UpdateLimits
 
 
 def instantiateGUIDevice(device_key, info, cls=None, namespace=None):
@@ -52,4 +53,31 @@ def instantiateGUIDevice(device_key, info, cls=None, namespace=None):
         print(f"Error instantiating GUI {cls.__name__} for {device_key}: {e}")
         return None
 
+    try:
+        limits = UpdateLimits.from_config(info)
+    except (ValueError, TypeError) as e:
+        print(f"Invalid update limits for {device_key}: {e}")
+        limits = None
+    if limits is not None:
+        apply_update_limits(device, limits)
+
     return device
+
+
+def apply_update_limits(device, limits):
+    """
+    Set the update limits of a device model and of all models it contains.
+
+    Parameters
+    ----------
+    device : object
+        Device model.
+    limits : UpdateLimits
+        Deadband and rate limit of the value updates. Each model gets a copy.
+    """
+    if hasattr(device, "set_update_limits"):
+        device.set_update_limits(limits.copy())
+    if hasattr(device, "iter_models"):
+        for model in device.iter_models() or ():
+            if model is not device:
+                apply_update_limits(model, limits)
@@ -53,23 +53,42 @@ class TabViewer(QTabWidget):
                 self._tab_order.append(tab_name)
         print("All Tabs Added")
 
-    def reload_tabs(self, model):
+    def reload_tabs(self, model, changes=None):
         """
         Reload reloadable tabs in place using the provided model.
 
+        With device changes, tabs that implement ``update_devices(changes)``
+        are updated in place, and are only rebuilt if it returns False. Tabs
+        are not touched if no device changed.
+
         Parameters
         ----------
         model : ViewerModel
             Application model containing the refreshed beamline.
+        changes : DeviceChanges, optional
+            Devices added and removed by the reload. If None, all reloadable
+            tabs are rebuilt.
         """
         self.model = model
-        latest_entries = {ep.name: ep for ep in entry_points(group="nbs_gui.tabs")}
+        if changes is not None and not changes:
+            return
+        latest_entries = None
         for tab_name in list(self._tab_order):
             widget = self.tab_dict.get(tab_name)
             if widget is None:
                 continue
             if not getattr(widget, "reloadable", False):
                 continue
+            if changes is not None and hasattr(widget, "update_devices"):
+                try:
+                    if widget.update_devices(changes):
+                        continue
+                except Exception as exc:
+                    print(f"Device update failed for {tab_name}: {exc}")
+            if latest_entries is None:
+                latest_entries = {
+                    ep.name: ep for ep in entry_points(group="nbs_gui.tabs")
+                }
             if hasattr(widget, "teardown"):
                 try:
                     widget.teardown()
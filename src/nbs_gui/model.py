@@ -63,12 +63,7 @@ class ViewerModel:
         """Initialize beamline model and connections."""
         print("Initializing Beamline")
         if not hasattr(self, "run_engine") or self.run_engine is None:
-            self.run_engine = RunEngineClient(
-                zmq_control_addr=SETTINGS.zmq_re_manager_control_addr,
-                zmq_info_addr=SETTINGS.zmq_re_manager_info_addr,
-                http_server_uri=SETTINGS.http_server_uri,
-                http_server_api_key=SETTINGS.http_server_api_key,
-            )
+            self.run_engine = self.create_run_engine_client()
 
             # Get Redis settings from beamline config
             redis_settings = (
@@ -115,6 +110,15 @@ class ViewerModel:
 
         self.settings = SETTINGS
 
+    def create_run_engine_client(self):
+        """Create the client of the Queue Server named in the settings."""
+        return RunEngineClient(
+            zmq_control_addr=SETTINGS.zmq_re_manager_control_addr,
+            zmq_info_addr=SETTINGS.zmq_re_manager_info_addr,
+            http_server_uri=SETTINGS.http_server_uri,
+            http_server_api_key=SETTINGS.http_server_api_key,
+        )
+
     def init_queue_staging(self):
         """Initialize queue staging model."""
         print("Initializing Queue Staging")
@@ -1,8 +1,10 @@
 from bluesky_live.event import EmitterGroup, Event
 from bluesky_queueserver import bind_plan_arguments
 from qtpy.QtCore import Signal, QObject
+import bisect
 import collections
 import copy
+import orjson
 import uuid
 
 
@@ -19,6 +21,13 @@ class QueueStagingModel(QObject):
         self.run_engine_client = model
         self._allowed_plans = self.run_engine_client._allowed_plans
 
+        # Cache of bound arguments and formatted cell strings:
+        #   {item_uid: (content_key, allowed_plans_uid, {label: value})}
+        self._item_label_cache = {}
+        # The table requests all columns of a row in sequence, so the content key
+        #   of the most recent item is reused for the following labels.
+        self._last_item_content_key = (None, None)
+
         # Initialize the default mapping
         self.set_map_param_labels_to_keys()
 
@@ -30,13 +39,54 @@ class QueueStagingModel(QObject):
             queue_item_selection_changed=Event,
         )
 
-    def load_plan_queue(self):
-        """Update the position mapping and emit queue changed event."""
-        self._plan_queue_items_pos = {
-            item["item_uid"]: n
-            for n, item in enumerate(self._plan_queue_items)
-            if "item_uid" in item
-        }
+        self.run_engine_client.events.allowed_plans_changed.connect(
+            self.on_allowed_plans_changed
+        )
+
+    def _update_item_positions(self, start=0, stop=None):
+        """
+        Update the UID-to-position map for the items in the range of positions
+        ``[start, stop)``. Positions of the items outside the range must be unchanged.
+        """
+        items = self._plan_queue_items
+        stop = len(items) if stop is None else min(stop, len(items))
+        items_pos = self._plan_queue_items_pos
+        for n in range(max(start, 0), stop):
+            item_uid = items[n].get("item_uid", None)
+            if item_uid:
+                items_pos[item_uid] = n
+
+    def _forget_items(self, item_uids):
+        """Drop position and cache entries of the items removed from the queue."""
+        for item_uid in item_uids:
+            self._plan_queue_items_pos.pop(item_uid, None)
+            self._item_label_cache.pop(item_uid, None)
+
+    def load_plan_queue(self, *, start=None, stop=None):
+        """
+        Update the position mapping and emit queue changed event.
+
+        Parameters
+        ----------
+        start, stop : int or None
+            Range of positions changed by the operation. The positions of the items
+            outside of the range are not updated. If ``start`` is None, the mapping
+            is rebuilt for the whole queue.
+        """
+        if start is None:
+            self._plan_queue_items_pos = {
+                item["item_uid"]: n
+                for n, item in enumerate(self._plan_queue_items)
+                if "item_uid" in item
+            }
+
+            # Evict cached cell values of the items that left the queue
+            for item_uid in list(self._item_label_cache):
+                if item_uid not in self._plan_queue_items_pos:
+                    del self._item_label_cache[item_uid]
+        else:
+            self._update_item_positions(start, stop)
+        self._last_item_content_key = (None, None)
 
         # Deselect queue items that are not in the queue or are not part of the
         # contiguous selection. The selection will be cleared when the table is
@@ -58,6 +108,10 @@ class QueueStagingModel(QObject):
             selected_item_uids=self._selected_queue_item_uids,
         )
 
+    def on_allowed_plans_changed(self, event):
+        """Bound arguments depend on plan parameters, so drop all cached cell values."""
+        self._item_label_cache.clear()
+
     def get_allowed_plan_names(self):
         """Get list of allowed plan names."""
         return list(self._allowed_plans.keys()) if self._allowed_plans else []
@@ -115,10 +169,56 @@ class QueueStagingModel(QObject):
 
         return item_args, item_kwargs
 
+    def _item_content_key(self, item):
+        """
+        Returns a hash of the item contents, or None if the item can not be serialized.
+        """
+        last_item, last_key = self._last_item_content_key
+        if item is last_item:
+            return last_key
+        try:
+            key = hash(
+                orjson.dumps(
+                    item,
+                    option=orjson.OPT_SORT_KEYS | orjson.OPT_SERIALIZE_NUMPY,
+                )
+            )
+        except TypeError:
+            key = None
+        self._last_item_content_key = (item, key)
+        return key
+
+    def _get_item_cache(self, item):
+        """
+        Returns the dictionary of cached values for the item, or None if the item
+        can not be cached. The cache is invalidated when the item contents or the
+        list of allowed plans change.
+        """
+        item_uid = item.get("item_uid", None)
+        if not item_uid:
+            return None
+        content_key = self._item_content_key(item)
+        if content_key is None:
+            return None
+
+        allowed_plans_uid = self.run_engine_client._allowed_plans_uid
+        cached = self._item_label_cache.get(item_uid, None)
+        if (
+            cached is None
+            or cached[0] != content_key
+            or cached[1] != allowed_plans_uid
+        ):
+            cached = (content_key, allowed_plans_uid, {})
+            self._item_label_cache[item_uid] = cached
+        return cached[2]
+
     def get_item_value_for_label(self, *, item, label, as_str=True):
         """
         Returns parameter value of the item for given label.
 
+        String values are cached per item UID. The cache entry is reused as long
+        as the item contents and the list of allowed plans are unchanged.
+
         Parameters
         ----------
         item : dict
@@ -144,6 +244,10 @@ class QueueStagingModel(QObject):
         except KeyError:
             raise KeyError(f"Label '{label}' is not found in the map dictionary")
 
+        item_cache = self._get_item_cache(item) if as_str else None
+        if item_cache is not None and label in item_cache:
+            return item_cache[label]
+
         # Follow the path in the dictionary. 'KeyError' exception is raised if a
         # key does not exist
         try:
@@ -167,7 +271,13 @@ class QueueStagingModel(QObject):
 
             s = ""
             if key in ("args", "kwargs"):
-                value["args"], value["kwargs"] = self.get_bound_item_arguments(item)
+                if item_cache is not None and "__bound__" in item_cache:
+                    bound = item_cache["__bound__"]
+                else:
+                    bound = self.get_bound_item_arguments(item)
+                    if item_cache is not None:
+                        item_cache["__bound__"] = bound
+                value["args"], value["kwargs"] = bound
 
                 s_args, s_kwargs = "", ""
                 if value["args"] and isinstance(
@@ -195,6 +305,9 @@ class QueueStagingModel(QObject):
             else:
                 s = str(value)
 
+            if item_cache is not None:
+                item_cache[label] = s
+
         else:
             s = value
 
@@ -227,14 +340,21 @@ class QueueStagingModel(QObject):
             item_uid = ""
         return item_uid
 
-    def queue_item_by_uid(self, item_uid):
+    def queue_item_by_uid(self, item_uid, *, copy_item=True):
         """
         Returns deep copy of the item based on item UID or None if the item was not found.
 
+        Items are never modified in place once they are added to the queue: updates
+        replace the item. Read-only callers may therefore pass ``copy_item=False``
+        to get the stored item without copying it.
+
         Parameters
         ----------
         item_uid : str
             UID of an item. If ``item_uid=""`` then None will be returned
+        copy_item : bool
+            ``True`` - return a deep copy of the item, ``False`` - return the stored
+            item, which must not be modified
 
         Returns
         -------
@@ -244,9 +364,38 @@ class QueueStagingModel(QObject):
         if item_uid:
             sel_item_pos = self.queue_item_uid_to_pos(item_uid)
             if sel_item_pos >= 0:
-                return copy.deepcopy(self._plan_queue_items[sel_item_pos])
+                item = self._plan_queue_items[sel_item_pos]
+                return copy.deepcopy(item) if copy_item else item
         return None
 
+    def _sorted_positions(self, item_uids):
+        """Returns sorted positions of the items in the queue, skipping missing items."""
+        positions = (self.queue_item_uid_to_pos(uid) for uid in item_uids)
+        return sorted(p for p in positions if p >= 0)
+
+    def _remove_positions(self, positions):
+        """
+        Remove items at the sorted positions in a single pass over the queue.
+
+        Returns
+        -------
+        list
+            Removed items in the order of their positions
+        """
+        items = self._plan_queue_items
+        removed = [items[p] for p in positions]
+        if positions[-1] - positions[0] + 1 == len(positions):
+            # Contiguous block (the typical selection)
+            del items[positions[0] : positions[-1] + 1]
+        else:
+            pos_set = set(positions)
+            items[positions[0] :] = [
+                item
+                for n, item in enumerate(items[positions[0] :], positions[0])
+                if n not in pos_set
+            ]
+        return removed
+
     def _queue_items_move(self, *, sel_items, ref_item, position):
         """
         Move the batch of selected items above or below the reference item.
@@ -270,18 +419,14 @@ class QueueStagingModel(QObject):
             return  # Nothing to do
 
         # Get positions of selected items and reference item
-        sel_positions = [self.queue_item_uid_to_pos(uid) for uid in sel_items]
+        sel_positions = self._sorted_positions(sel_items)
         ref_position = self.queue_item_uid_to_pos(ref_item)
 
-        if ref_position < 0:
-            return  # Reference item not found
+        if ref_position < 0 or not sel_positions:
+            return  # Reference item or selected items not found
 
         # Remove selected items from their current positions
-        sel_positions.sort(reverse=True)  # Remove from highest to lowest
-        items_to_move = []
-        for pos in sel_positions:
-            if pos >= 0:
-                items_to_move.append(self._plan_queue_items.pop(pos))
+        items_to_move = self._remove_positions(sel_positions)
 
         # Insert items at the target position
         if position == "before":
@@ -290,16 +435,16 @@ class QueueStagingModel(QObject):
             insert_pos = ref_position + 1
 
         # Adjust insert position based on how many items we removed before the insert position
-        items_removed_before_insert = sum(
-            1 for pos in sel_positions if pos < insert_pos
-        )
-        insert_pos -= items_removed_before_insert
+        insert_pos -= bisect.bisect_left(sel_positions, insert_pos)
 
-        for item in reversed(items_to_move):
-            self._plan_queue_items.insert(insert_pos, item)
+        self._plan_queue_items[insert_pos:insert_pos] = items_to_move
 
-        # Update the queue
-        self.load_plan_queue()
+        # Update the queue. Only the items between the old and the new location
+        #   of the batch change positions.
+        self.load_plan_queue(
+            start=min(sel_positions[0], insert_pos),
+            stop=max(sel_positions[-1], insert_pos + len(items_to_move) - 1) + 1,
+        )
 
         # Update selection to new positions
         new_sel_uids = [item["item_uid"] for item in items_to_move]
@@ -415,21 +560,22 @@ class QueueStagingModel(QObject):
             else:
                 self.selected_queue_item_uids = []
 
-            # Remove items from highest to lowest position
-            sel_positions = [self.queue_item_uid_to_pos(uid) for uid in sel_item_uids]
-            sel_positions.sort(reverse=True)
-            for pos in sel_positions:
-                if pos >= 0:
-                    self._plan_queue_items.pop(pos)
+            sel_positions = self._sorted_positions(sel_item_uids)
+            if not sel_positions:
+                return
+            removed_items = self._remove_positions(sel_positions)
+            self._forget_items(item.get("item_uid", None) for item in removed_items)
 
             # Update the queue
-            self.load_plan_queue()
+            self.load_plan_queue(start=sel_positions[0])
 
     def queue_clear(self):
         """Clear the plan queue."""
         self._plan_queue_items.clear()
+        self._plan_queue_items_pos.clear()
+        self._item_label_cache.clear()
         self.selected_queue_item_uids = []
-        self.load_plan_queue()
+        self.load_plan_queue(start=0)
 
     def queue_item_copy_to_queue(self):
         """Copy currently selected item to queue."""
@@ -438,7 +584,8 @@ class QueueStagingModel(QObject):
         for uid in sel_item_uids:
             pos = self.queue_item_uid_to_pos(uid)
             if uid and (pos >= 0):
-                sel_items.append(copy.deepcopy(self._plan_queue_items[pos]))
+                # The item is copied when it is added to the queue
+                sel_items.append(self._plan_queue_items[pos])
 
         if sel_items:
             self.queue_item_add_batch(items=sel_items)
@@ -486,18 +633,16 @@ class QueueStagingModel(QObject):
         # Create a copy of the item and assign a new UID
         new_item = self._create_queue_item(item)
         # Insert the item
+        insert_pos = len(self._plan_queue_items)
         if "after_uid" in params:
             after_uid = params["after_uid"]
             after_pos = self.queue_item_uid_to_pos(after_uid)
             if after_pos >= 0:
-                self._plan_queue_items.insert(after_pos + 1, new_item)
-            else:
-                self._plan_queue_items.append(new_item)
-        else:
-            self._plan_queue_items.append(new_item)
+                insert_pos = after_pos + 1
+        self._plan_queue_items.insert(insert_pos, new_item)
 
         # Update the queue
-        self.load_plan_queue()
+        self.load_plan_queue(start=insert_pos)
 
         # Set the new item as selected
         self.selected_queue_item_uids = [new_item["item_uid"]]
@@ -519,7 +664,7 @@ class QueueStagingModel(QObject):
         if pos >= 0:
             # Update the item
             self._plan_queue_items[pos] = copy.deepcopy(item)
-            self.load_plan_queue()
+            self.load_plan_queue(start=pos, stop=pos + 1)
             self.selected_queue_item_uids = [item_uid]
 
     def queue_item_add_batch(self, *, items, params=None):
@@ -560,19 +705,16 @@ class QueueStagingModel(QObject):
             new_items.append(new_item)
 
         # Insert the items
+        insert_pos = len(self._plan_queue_items)
         if "after_uid" in params:
             after_uid = params["after_uid"]
             after_pos = self.queue_item_uid_to_pos(after_uid)
             if after_pos >= 0:
-                for i, item in enumerate(new_items):
-                    self._plan_queue_items.insert(after_pos + 1 + i, item)
-            else:
-                self._plan_queue_items.extend(new_items)
-        else:
-            self._plan_queue_items.extend(new_items)
+                insert_pos = after_pos + 1
+        self._plan_queue_items[insert_pos:insert_pos] = new_items
 
         # Update the queue
-        self.load_plan_queue()
+        self.load_plan_queue(start=insert_pos)
 
         # Set the new items as selected
         new_sel_uids = [item["item_uid"] for item in new_items]
@@ -624,10 +766,8 @@ class QueueStagingModel(QObject):
             Index of plan to duplicate
         """
         if 0 <= index < len(self._plan_queue_items):
-            plan = copy.deepcopy(self._plan_queue_items[index])
-            # Remove the UID so a new one will be assigned
-            plan.pop("item_uid", None)
-            self.queue_item_add(item=plan)
+            # The copy of the plan is assigned a new UID when it is added
+            self.queue_item_add(item=self._plan_queue_items[index])
 
     def clear_all(self):
         """Clear all staged plans."""
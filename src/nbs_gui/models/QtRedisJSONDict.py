@@ -1,4 +1,4 @@
-from qtpy.QtCore import QObject, Signal, QThread
+from qtpy.QtCore import QCoreApplication, QObject, Signal, QThread
 from qtpy.QtCore import QAbstractTableModel, Qt
 import orjson
 import redis
@@ -45,11 +45,23 @@ class RedisWatcherThread(QThread):
             prefix,
         )
         if cache_key not in cls._watchers:
+            if not cls._watchers:
+                app = QCoreApplication.instance()
+                if app is not None:
+                    app.aboutToQuit.connect(cls.stop_all)
             watcher = cls(redis_client, prefix)
             watcher.start()
             cls._watchers[cache_key] = watcher
         return cls._watchers[cache_key]
 
+    @classmethod
+    def stop_all(cls):
+        """Stop all shared watchers, so that no thread outlives the application."""
+        watchers = list(cls._watchers.values())
+        cls._watchers.clear()
+        for watcher in watchers:
+            watcher.stop()
+
     def __init__(self, redis_client, prefix):
         super().__init__()
         self._redis = redis_client
@@ -7,8 +7,12 @@ from epics.ca import ChannelAccessGetFailure
 from ..views.monitors import PVMonitor, PVControl
 from ..views.enums import EnumControl, EnumMonitor
 from .mixins import ModeManagedModel
+from .valueFormat import FormattedValueMixin
 from functools import wraps
 from random import uniform
+import time
+import weakref
+from ..utils.hot_path import HOT_PATH, timed_slot
 
 CONNECTION_ERRORS = (
     ReadTimeoutError,
@@ -39,6 +43,17 @@ def initialize_with_retry(func, retry_intervals=None, jitter_factor=0.2):
         jitter = uniform(-jitter_factor, jitter_factor) * base_interval
         return int(base_interval + jitter)
 
+    def retry_slot(self, args, kwargs):
+        """Retry callback that does not keep the model alive."""
+        ref = weakref.ref(self)
+
+        def retry():
+            model = ref()
+            if model is not None:
+                wrapper(model, *args, **kwargs)
+
+        return retry
+
     @wraps(func)
     def wrapper(self, *args, **kwargs):
         if not hasattr(self, "_initialized_methods"):
@@ -98,7 +113,7 @@ def initialize_with_retry(func, retry_intervals=None, jitter_factor=0.2):
                 # Create and store new timer
                 timer = QTimer()
                 timer.setSingleShot(True)
-                timer.timeout.connect(lambda: wrapper(self, *args, **kwargs))
+                timer.timeout.connect(retry_slot(self, args, kwargs))
                 self._init_retry_timers[qual_name] = timer
 
                 print(
@@ -123,7 +138,7 @@ def initialize_with_retry(func, retry_intervals=None, jitter_factor=0.2):
             # Create and store new timer
             timer = QTimer()
             timer.setSingleShot(True)
-            timer.timeout.connect(lambda: wrapper(self, *args, **kwargs))
+            timer.timeout.connect(retry_slot(self, args, kwargs))
             self._init_retry_timers[qual_name] = timer
 
             print(
@@ -220,6 +235,7 @@ def requires_connection(func, default_value=None):
             )
             return default_value
 
+        start = time.perf_counter()
         try:
             return func(self, *args, **kwargs)
         except CONNECTION_ERRORS as e:
@@ -229,6 +245,12 @@ def requires_connection(func, default_value=None):
             # Schedule reconnection instead of immediate check to prevent blocking
             self._schedule_reconnection()
             return default_value
+        finally:
+            HOT_PATH.record(
+                "blocking",
+                f"{type(self).__name__}.{func.__name__}",
+                time.perf_counter() - start,
+            )
 
     return wrapper
 
@@ -250,9 +272,19 @@ class BaseModel(QWidget, ModeManagedModel):
         self._value = None
         self._latest_value = None
         self._has_update = False
+        # Deadband and rate limit of stashed values, see set_update_limits
+        self._update_limits = None
+        self._held_value = None
+        self._has_held = False
+        # Update counters, reported by the Debug tab
+        self.n_received = 0
+        self.n_stashed = 0
+        self.n_drained = 0
+        self.n_emitted = 0
+        self._created_time = time.monotonic()
         # Create reconnection timer
         self._reconnection_timer = QTimer()
-        self._reconnection_timer.timeout.connect(self._check_connection)
+        self._reconnection_timer.timeout.connect(timed_slot(self._check_connection))
         self._reconnection_timer.setSingleShot(True)
         self._reconnection_scheduled = False  # Track if reconnection is scheduled
         self._reconnection_attempts = 0  # Count attempts since last connection
@@ -269,7 +301,6 @@ class BaseModel(QWidget, ModeManagedModel):
         # Connect connection status changes to timer management
         self.connectionStatusChanged.connect(self._handle_connection_change)
 
-        self.destroyed.connect(lambda: self._cleanup())
         self.units = None
 
     def _stop_timers(self):
@@ -313,8 +344,32 @@ class BaseModel(QWidget, ModeManagedModel):
         return result
 
     def _cleanup(self):
+        """Release the subscriptions to the Ophyd object, see :meth:`teardown`."""
         pass
 
+    def teardown(self):
+        """
+        Release the device and delete the model and its sub-models.
+
+        Ophyd holds subscribed callbacks strongly, so a model that is not torn
+        down stays subscribed, and alive, as long as its Ophyd object. The
+        beamline calls this for devices it removes. It is not called on
+        ``destroyed``, because Qt drops connections to bound methods of the
+        object being destroyed.
+        """
+        for model in self.iter_models():
+            if model is not self and hasattr(model, "teardown"):
+                model.teardown()
+        self._reconnection_timer.stop()
+        for timer in getattr(self, "_init_retry_timers", {}).values():
+            timer.stop()
+        self._stop_timers()
+        try:
+            self._cleanup()
+        except Exception as e:
+            print(f"[{self.name}] Error in cleanup: {e}")
+        self.deleteLater()
+
     def _handle_connection_error(self, error, context=""):
         """
         Common handler for connection errors.
@@ -401,17 +456,77 @@ class BaseModel(QWidget, ModeManagedModel):
     def _value_changed(self, value, **kwargs):
         raise NotImplementedError("Subclasses must implement _value_changed")
 
+    def _emit_value(self, value):
+        """Emit ``valueChanged`` and count the emission."""
+        self.n_emitted += 1
+        self.valueChanged.emit(value)
+
+    def set_update_limits(self, limits):
+        """
+        Set the deadband and rate limit of value updates.
+
+        Parameters
+        ----------
+        limits : UpdateLimits or None
+            The limits, None to stash every update.
+        """
+        self._update_limits = limits
+        self._held_value = None
+        self._has_held = False
+
+    @property
+    def update_limits(self):
+        """The UpdateLimits of the model, None if updates are not limited."""
+        return self._update_limits
+
     def _stash_value(self, value, **kwargs):
         """
         Store the latest value from a subscription callback.
 
+        Values within the deadband of the last stashed value are dropped, and
+        values arriving faster than the maximum rate are held until
+        :meth:`drain_pending` after the rate interval.
+
         Parameters
         ----------
         value : any
             Latest value from the device.
         """
+        self.n_received += 1
+        limits = self._update_limits
+        if limits is not None:
+            if limits.in_deadband(value):
+                # The stashed value is still current, drop an older held value
+                self._held_value = None
+                self._has_held = False
+                return
+            now = time.monotonic()
+            if limits.rate_limited(now):
+                self._held_value = value
+                self._has_held = True
+                return
+            limits.stashed(value, now)
+            self._has_held = False
+        self._latest_value = value
+        self._has_update = True
+        self.n_stashed += 1
+
+    def _stash_held_value(self):
+        """Stash a held value if the rate interval has passed."""
+        now = time.monotonic()
+        limits = self._update_limits
+        if limits is None or limits.rate_limited(now):
+            return False
+        value = self._held_value
+        self._held_value = None
+        self._has_held = False
+        if limits.in_deadband(value):
+            return False
+        limits.stashed(value, now)
         self._latest_value = value
         self._has_update = True
+        self.n_stashed += 1
+        return True
 
     def drain_pending(self):
         """
@@ -423,10 +538,12 @@ class BaseModel(QWidget, ModeManagedModel):
             True if an update was emitted, otherwise False.
         """
         if not self._has_update:
-            return False
+            if not self._has_held or not self._stash_held_value():
+                return False
         value = self._latest_value
         self._latest_value = None
         self._has_update = False
+        self.n_drained += 1
         self._value_changed(value)
         return True
 
@@ -442,7 +559,7 @@ class BaseModel(QWidget, ModeManagedModel):
         return ()
 
 
-class PVModelRO(BaseModel):
+class PVModelRO(FormattedValueMixin, BaseModel):
     valueChanged = Signal(str)
 
     def __init__(self, name, obj, group, long_name, **kwargs):
@@ -502,59 +619,6 @@ class PVModelRO(BaseModel):
         self._stash_value(value)
         QTimer.singleShot(10000, self._check_value)
 
-    def _value_changed(self, value, print_value=False, **kwargs):
-        """Handle value changes, with better type handling."""
-        # print(f"[{self.name}] _value_changed: {value}")
-        if value is None:
-            if self._value is None:
-                return
-            else:
-                self._value = None
-                self.valueChanged.emit(self._value)
-                return
-
-        try:
-            # Extract value from named tuple if needed
-            if hasattr(value, "_fields"):
-                if hasattr(value, "user_readback"):
-                    value = value.user_readback
-                elif hasattr(value, "readback"):
-                    value = value.readback
-                elif hasattr(value, "value"):
-                    value = value.value
-
-            # Determine the type if not yet set
-            if self.value_type is None:
-                if isinstance(value, (float, np.floating)):
-                    self.value_type = float
-                elif isinstance(value, (int, np.integer)):
-                    self.value_type = int
-                else:
-                    self.value_type = str
-                # print(f"[{self.name}] new value_type: {self.value_type}")
-
-            # Format based on type
-            if self.value_type is float:
-                formatted_value = formatFloat(value)
-            elif self.value_type is int:
-                formatted_value = formatInt(value)
-            else:
-                formatted_value = str(value)
-            if print_value:
-                print(f"[{self.name}] value changed to {formatted_value}")
-
-            if self._value != formatted_value:
-                self._value = formatted_value
-                self.valueChanged.emit(formatted_value)
-        except Exception as e:
-            print(f"[{self.name}] Error in _value_changed for value {value}: {e}")
-            self._value = str(value)
-            self.valueChanged.emit(str(value))
-
-    @property
-    def value(self):
-        return self._value
-
 
 class PVModel(PVModelRO):
     default_controller = PVControl
@@ -643,4 +707,4 @@ class EnumModel(PVModel):
             index = self._enum_strs.index(value)
             self._index_value = index
         self._value = str(value)
-        self.valueChanged.emit(self._value)
+        self._emit_value(self._value)
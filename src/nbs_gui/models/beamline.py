@@ -3,16 +3,151 @@
 import time
 
 from nbs_core.beamline import BeamlineModel as CoreBeamlineModel
-from nbs_core.autoload import loadFromConfig, _find_deferred_devices
+from nbs_core.autoload import loadFromConfig, _find_deferred_devices, getMaxLoadPass
+from nbs_core.utils import iterfy
 from qtpy.QtCore import Signal, QTimer
 
 from ..load import instantiateGUIDevice
+from ..settings import SETTINGS
+from ..utils.hot_path import HOT_PATH
+from .devicePrefetch import DevicePrefetcher
 from .redis import RedisStatusProvider
 from .signal_tuple import SignalTupleModel
 from .base import PVModel
 from ..views.signal_tuple import SignalTupleMonitor, SignalTupleControl
 
 
+class ModeDeviceIndex:
+    """
+    Devices, groups and roles that are loaded in each mode, computed from the
+    device config without instantiating any device.
+
+    The layout of every mode listed in a ``_modes`` entry is computed when the
+    index is created, layouts of other modes on first use. Devices are selected
+    as ``loadFromConfig`` selects them for a mode.
+
+    Parameters
+    ----------
+    config : dict
+        Raw configuration dictionary from devices.toml
+    """
+
+    def __init__(self, config):
+        self.config = config
+        # {mode: ({device key: [groups]}, {role: device key})}
+        self._layouts = {}
+        modes = set()
+        for device_config in config.values():
+            if isinstance(device_config, dict):
+                modes.update(iterfy(device_config.get("_modes", [])))
+        for mode in modes:
+            self.layout(mode)
+
+    @property
+    def modes(self):
+        """Modes with a computed layout."""
+        return list(self._layouts)
+
+    def layout(self, mode):
+        """
+        Devices, groups and roles loaded in a mode.
+
+        Parameters
+        ----------
+        mode : str
+            Mode name.
+
+        Returns
+        -------
+        groups : dict
+            ``{device key: [group names]}``, in load order.
+        roles : dict
+            ``{role: device key}``
+        """
+        layout = self._layouts.get(mode, None)
+        if layout is None:
+            _, filtered_config, _ = _find_deferred_devices(self.config, mode=mode)
+            groups = {}
+            roles = {}
+            for load_pass in range(1, getMaxLoadPass(filtered_config) + 1):
+                for key, device_config in filtered_config.items():
+                    if device_config.get("_load_order", 1) != load_pass:
+                        continue
+                    if device_config.get("_defer_loading", False):
+                        continue
+                    if device_config.get("_target", "IGNORE") == "IGNORE":
+                        continue
+                    groups[key] = list(iterfy(device_config.get("_group", ["misc"])))
+                    if device_config.get("_role", ""):
+                        roles[device_config["_role"]] = key
+            layout = (groups, roles)
+            self._layouts[mode] = layout
+        return layout
+
+    def device_keys(self, mode):
+        """Keys of the devices loaded in a mode."""
+        return set(self.layout(mode)[0])
+
+
+class DeviceChanges:
+    """
+    Devices added and removed from a GUIBeamlineModel by a mode change.
+
+    Parameters
+    ----------
+    mode : str
+        The new mode.
+
+    Attributes
+    ----------
+    added : dict
+        ``{device key: device}`` of the new devices.
+    removed : dict
+        ``{device key: device}`` of the devices that were removed.
+    roles : set
+        Roles assigned to another device, or removed.
+    """
+
+    def __init__(self, mode):
+        self.mode = mode
+        self.added = {}
+        self.removed = {}
+        self.roles = set()
+        self._added_groups = {}
+        self._removed_groups = {}
+
+    def __bool__(self):
+        return bool(self.added or self.removed or self.roles)
+
+    def __repr__(self):
+        return (
+            f"DeviceChanges(mode={self.mode!r}, added={list(self.added)}, "
+            f"removed={list(self.removed)}, roles={sorted(self.roles)})"
+        )
+
+    def _add(self, key, device, groups):
+        self.added[key] = device
+        for group in groups:
+            self._added_groups.setdefault(group, []).append(key)
+
+    def _remove(self, key, device, groups):
+        self.removed[key] = device
+        for group in groups:
+            self._removed_groups.setdefault(group, []).append(key)
+
+    def groups(self):
+        """Names of the groups with added or removed devices."""
+        return set(self._added_groups) | set(self._removed_groups)
+
+    def added_to(self, group):
+        """``{device key: device}`` of the devices added to a group."""
+        return {key: self.added[key] for key in self._added_groups.get(group, [])}
+
+    def removed_from(self, group):
+        """Keys of the devices removed from a group."""
+        return list(self._removed_groups.get(group, []))
+
+
 class GUIBeamlineModel(CoreBeamlineModel):
     """GUI-specific beamline model with mode management.
 
@@ -97,6 +232,12 @@ class GUIBeamlineModel(CoreBeamlineModel):
         roles = dict(base_roles)
         roles.update(extra_roles)
 
+        self.mode_index = ModeDeviceIndex(config)
+        # {role: device key} of the assigned roles
+        self._role_keys = {}
+        #: Changes made by the last call of reload_for_mode
+        self.device_changes = None
+        self.prefetcher = None
         super().__init__(devices, groups, roles, *args, **kwargs)
         self.update_interval_ms = 500
         self.drain_budget_ms = 20
@@ -106,10 +247,17 @@ class GUIBeamlineModel(CoreBeamlineModel):
         self._update_timer.timeout.connect(self._drain_all_devices)
         self._update_timer.start()
 
+        self.prefetcher = DevicePrefetcher.from_config(
+            self, SETTINGS.gui_config.get("gui", {}).get("prefetch", {})
+        )
+        if self.prefetcher is not None:
+            self.prefetcher.start()
+
 
     def loadDevices(self, devices, groups, roles):
         """Load devices and handle mode configuration."""
         super().loadDevices(devices, groups, roles)
+        self._role_keys.update({role: key for role, key in roles.items() if role})
 
         # Check if mode model was loaded
         if "mode" in roles:
@@ -153,18 +301,15 @@ class GUIBeamlineModel(CoreBeamlineModel):
             New mode name
         """
         print(f"Updating device availability for mode: {mode}")
-        for group in self.groups:
-            group_dict = getattr(self, group)
-            for name, device in group_dict.items():
-                if hasattr(device, "set_available"):
-                    try:
-                        # Get mode info from config
-                        device_config = self.config.get(name, {})
-                        available = self._check_mode_availability(device_config, mode)
-                        print(f"Device {name}: available={available}")
-                        device.set_available(available)
-                    except Exception as e:
-                        print(f"Error updating {name} availability: {e}")
+        for name, device in self.devices.items():
+            if hasattr(device, "set_available"):
+                try:
+                    # Get mode info from config
+                    device_config = self.config.get(name, {})
+                    available = self._check_mode_availability(device_config, mode)
+                    device.set_available(available)
+                except Exception as e:
+                    print(f"Error updating {name} availability: {e}")
 
     def _check_mode_availability(self, device_config, mode):
         """Check if device is available in specified mode.
@@ -193,10 +338,39 @@ class GUIBeamlineModel(CoreBeamlineModel):
             # Mode not allowed
             return False
 
+    def instantiate_or_reuse(self, name, device_config, **kwargs):
+        """
+        Return the loaded or prefetched device of a key, or instantiate it.
+
+        Parameters
+        ----------
+        name : str
+            Device key.
+        device_config : dict
+            Raw device configuration.
+
+        Returns
+        -------
+        object
+            The device model.
+        """
+        if name in self.devices:
+            return self.devices[name]
+        if self.prefetcher is not None:
+            device = self.prefetcher.take(name)
+            if device is not None:
+                return device
+        return instantiateGUIDevice(name, device_config, **kwargs)
+
     def reload_for_mode(self, mode):
         """
-        Reload devices in place for a new mode without reinstantiating
-        already-loaded devices when possible.
+        Update the loaded devices in place for a new mode.
+
+        The devices of the mode are looked up in ``mode_index``. Only devices
+        that are not loaded yet are instantiated, or taken from ``prefetcher``,
+        devices that are not used in the new mode are made unavailable and
+        removed from their groups, and handed to ``prefetcher`` or torn down,
+        and roles are only reassigned if they change.
 
         Parameters
         ----------
@@ -205,66 +379,107 @@ class GUIBeamlineModel(CoreBeamlineModel):
 
         Returns
         -------
-        None
+        DeviceChanges or None
+            The added and removed devices, also stored as ``device_changes``.
+            None if the reload failed.
         """
-        existing_devices = dict(self.devices)
-        existing_keys = set(existing_devices.keys())
-        if self.mode_model is not None:
-            try:
-                self.mode_model.mode_changed.disconnect(self._on_mode_change)
-            except Exception:
-                pass
-        self.mode_model = None
-
+        self.device_changes = None
         try:
-            _, filtered_config, _ = _find_deferred_devices(self.config, mode=mode)
+            new_groups, new_roles = self.mode_index.layout(mode)
         except Exception as exc:
             print(f"Failed to filter config for mode {mode}: {exc}")
             return None
 
-        def instantiate_or_reuse(name, device_config, **kwargs):
-            if name in existing_devices:
-                return existing_devices[name]
-            return instantiateGUIDevice(name, device_config, **kwargs)
-
+        added_config = {
+            key: self.config[key] for key in new_groups if key not in self.devices
+        }
         try:
-            devices_new, groups_new, roles_new = loadFromConfig(
-                filtered_config,
-                instantiate_or_reuse,
+            added_devices, _, _ = loadFromConfig(
+                added_config,
+                self.instantiate_or_reuse,
                 load_pass="auto",
                 filter_deferred=False,
-                mode=mode,
             )
         except Exception as exc:
             print(f"Reload failed during loadFromConfig for mode {mode}: {exc}")
             return None
 
-        removed = existing_keys.difference(devices_new.keys())
-        for name in removed:
-            device = existing_devices.get(name)
+        changes = DeviceChanges(mode)
+
+        for name in [key for key in self.devices if key not in new_groups]:
+            device = self.devices.pop(name)
             if hasattr(device, "set_available"):
                 try:
                     device.set_available(False)
                 except Exception as exc:
                     print(f"Failed to disable removed device {name}: {exc}")
+            groups = [g for g in self.groups if name in getattr(self, g)]
+            for group in groups:
+                del getattr(self, group)[name]
+            changes._remove(name, device, groups)
+            if self.prefetcher is not None and self.prefetcher.keep(name, device):
+                continue
+            # Ophyd holds the subscriptions of the model, unsubscribe them so
+            # that the model is not kept alive by its Ophyd object
+            if hasattr(device, "teardown"):
+                device.teardown()
+
+        for name, device in added_devices.items():
+            self.devices[name] = device
+            for group in new_groups[name]:
+                if group not in self.groups:
+                    self.groups.append(group)
+                    setattr(self, group, {})
+                getattr(self, group)[name] = device
+            changes._add(name, device, new_groups[name])
+
+        for role, key in list(self._role_keys.items()):
+            if new_roles.get(role, None) != key:
+                del self._role_keys[role]
+                if role in self.roles:
+                    self.roles.remove(role)
+                if hasattr(self, role):
+                    delattr(self, role)
+                changes.roles.add(role)
+        for role, key in new_roles.items():
+            if role not in self._role_keys:
+                self._role_keys[role] = key
+                self.roles.append(role)
+                setattr(self, role, self.devices[key])
+                changes.roles.add(role)
+
+        if "mode" in changes.roles:
+            self._set_mode_model(self.devices.get(new_roles.get("mode", None), None))
 
-        self.devices = {}
-        self.groups = list(self.default_groups)
-        for group in self.default_groups:
-            setattr(self, group, {})
-
-        for role in self.roles:
-            if hasattr(self, role):
-                delattr(self, role)
-
-        self.roles = []
-
-        self.loadDevices(devices_new, groups_new, roles_new)
         try:
             self._update_device_availability(mode)
         except Exception as exc:
             print(f"Availability update failed for mode {mode}: {exc}")
 
+        print(
+            f"Reloaded beamline for mode {mode}: {len(changes.added)} added, "
+            f"{len(changes.removed)} removed, roles changed: {sorted(changes.roles)}"
+        )
+        self.device_changes = changes
+        if self.prefetcher is not None:
+            self.prefetcher.restart()
+        return changes
+
+    def _set_mode_model(self, mode_model):
+        """Replace the mode model and its mode change connection."""
+        if self.mode_model is not None:
+            try:
+                self.mode_model.mode_changed.disconnect(self._on_mode_change)
+            except Exception:
+                pass
+        self.mode_model = mode_model
+        if mode_model is not None:
+            try:
+                mode_model.mode_changed.connect(self._on_mode_change)
+            except Exception as e:
+                print(f"Error setting up mode model: {e}")
+                self.mode_model = None
+
     def _drain_all_devices(self):
         """
         Deliver pending updates from all devices within a time budget.
@@ -273,6 +488,7 @@ class GUIBeamlineModel(CoreBeamlineModel):
         -------
         None
         """
+        tick_start = time.perf_counter()
         devices = list(self._iter_all_models())
         total = len(devices)
         if total == 0:
@@ -299,6 +515,9 @@ class GUIBeamlineModel(CoreBeamlineModel):
                 break
 
         self._drain_cursor = idx
+        HOT_PATH.record(
+            "drain", "_drain_all_devices", time.perf_counter() - tick_start
+        )
 
     def _iter_all_models(self):
         """
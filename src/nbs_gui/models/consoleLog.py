@@ -0,0 +1,197 @@
+"""Append-only on-disk store of the console output of a GUI session."""
+
+from collections import deque
+import os
+import re
+import tempfile
+import threading
+import time
+
+
+class ConsoleLogStore:
+    """
+    Append-only file of timestamped console lines with a sparse offset index.
+
+    Each line is stored as ``"<time>\\t<text>\\n"``. The byte offset of every
+    ``index_interval``-th line is kept in memory, so a window of lines is read
+    by seeking to the nearest indexed line and skipping at most
+    ``index_interval - 1`` lines. Memory use grows by one integer per
+    ``index_interval`` lines, independent of the length of the lines.
+
+    Reading and searching open their own file handles and only see the lines
+    appended before the call, so they may run in a worker thread while new
+    lines are appended.
+
+    Parameters
+    ----------
+    path : str, optional
+        File to write. By default a temporary file is created in *directory*
+        and removed by :meth:`close`.
+    directory : str, optional
+        Directory of the temporary file. Default: the system temporary directory.
+    """
+
+    #: Number of lines between indexed offsets
+    index_interval = 256
+
+    def __init__(self, path=None, directory=None):
+        self._remove_on_close = path is None
+        if path is None:
+            fd, path = tempfile.mkstemp(
+                prefix="nbs-gui-console-", suffix=".log", dir=directory
+            )
+            os.close(fd)
+        self.path = path
+        self._file = open(path, "wb")
+        self._lock = threading.Lock()
+        self._offsets = []
+        self._n_lines = 0
+        self._size = 0
+
+    def __len__(self):
+        return self._n_lines
+
+    def append(self, text, timestamp=None):
+        """
+        Append console output.
+
+        Parameters
+        ----------
+        text : str
+            Console output, possibly containing several lines. Trailing whitespace
+            is removed and empty lines are skipped, as in the console display.
+        timestamp : float, optional
+            Time of the output. Default: current time.
+        """
+        self.append_many([(timestamp, text)])
+
+    def append_many(self, messages):
+        """
+        Append several console messages with a single write.
+
+        Parameters
+        ----------
+        messages : iterable of tuple
+            ``(timestamp, text)`` pairs, see :meth:`append`.
+        """
+        records = []
+        now = time.time()
+        for timestamp, text in messages:
+            if text is None:
+                continue
+            prefix = f"{now if timestamp is None else timestamp:.3f}\t"
+            for line in text.rstrip().splitlines():
+                line = line.rstrip()
+                if line:
+                    records.append((prefix + line + "\n").encode("utf-8", "replace"))
+        if not records:
+            return
+
+        with self._lock:
+            if self._file is None:
+                return
+            size, n_lines = self._size, self._n_lines
+            for record in records:
+                if n_lines % self.index_interval == 0:
+                    self._offsets.append(size)
+                size += len(record)
+                n_lines += 1
+            self._file.write(b"".join(records))
+            self._file.flush()
+            self._size, self._n_lines = size, n_lines
+
+    def _snapshot(self):
+        with self._lock:
+            return self._n_lines, list(self._offsets)
+
+    @staticmethod
+    def _parse_record(record):
+        timestamp, _, text = record.decode("utf-8", "replace").partition("\t")
+        try:
+            timestamp = float(timestamp)
+        except ValueError:
+            timestamp = None
+        return timestamp, text.rstrip("\n")
+
+    def read_lines(self, start, stop):
+        """
+        Read a window of lines.
+
+        Parameters
+        ----------
+        start, stop : int
+            Range of line numbers ``[start, stop)``, clipped to the stored lines.
+
+        Returns
+        -------
+        list of tuple
+            ``(timestamp, text)`` of each line.
+        """
+        n_lines, offsets = self._snapshot()
+        start, stop = max(start, 0), min(stop, n_lines)
+        if start >= stop:
+            return []
+
+        block = start // self.index_interval
+        lines = []
+        with open(self.path, "rb") as f:
+            f.seek(offsets[block])
+            for _ in range(start - block * self.index_interval):
+                f.readline()
+            for _ in range(stop - start):
+                lines.append(self._parse_record(f.readline()))
+        return lines
+
+    def search(self, pattern, *, regex=False, case_sensitive=False, max_results=10000):
+        """
+        Find the lines that match a pattern.
+
+        Parameters
+        ----------
+        pattern : str
+            Substring, or regular expression if *regex* is True.
+        regex : bool
+            Interpret *pattern* as a regular expression.
+        case_sensitive : bool
+            Match case.
+        max_results : int or None
+            Return only this many of the most recent matches. None for no limit.
+
+        Returns
+        -------
+        list of int
+            Line numbers of the matching lines, in ascending order.
+
+        Raises
+        ------
+        re.error
+            If *regex* is True and *pattern* is not a valid regular expression.
+        """
+        flags = 0 if case_sensitive else re.IGNORECASE
+        if not regex:
+            pattern = re.escape(pattern)
+        matcher = re.compile(pattern, flags).search
+
+        n_lines, _ = self._snapshot()
+        # The most recent matches are kept, older ones drop out of the deque
+        matches = deque(maxlen=max_results)
+        with open(self.path, "rb") as f:
+            for n in range(n_lines):
+                record = f.readline()
+                text = record.decode("utf-8", "replace").partition("\t")[2]
+                if matcher(text, 0, len(text) - 1):
+                    matches.append(n)
+        return list(matches)
+
+    def close(self):
+        """Close the file, and remove it if it is a temporary file."""
+        with self._lock:
+            if self._file is None:
+                return
+            self._file.close()
+            self._file = None
+        if self._remove_on_close:
+            try:
+                os.remove(self.path)
+            except OSError:
+                pass
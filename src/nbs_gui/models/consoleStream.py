@@ -0,0 +1,281 @@
+"""Shared console output stream of the RE Manager."""
+
+from collections import deque
+import threading
+import time
+import weakref
+
+from qtpy.QtCore import QObject, QThread, Signal
+from qtpy.QtWidgets import QApplication
+
+from ..settings import SETTINGS
+from .consoleLog import ConsoleLogStore
+
+
+def dropped_lines_message(n_dropped):
+    """Text of the line that marks console output dropped by the monitor."""
+    return f"... {n_dropped} lines dropped ..."
+
+
+class ConsoleMonitorThread(QThread):
+    """Thread that polls the RE Manager console output stream.
+
+    Runs a loop calling ``next_msg`` with a short timeout. Messages are
+    accumulated and forwarded to the main thread in batches via
+    *batch_received*: a batch is emitted once it holds ``max_batch_lines``
+    lines, once ``batch_interval`` seconds passed since its first line,
+    or when the stream goes quiet.
+
+    Each batch must be acknowledged with :meth:`batch_processed`. While
+    ``max_pending_batches`` batches are unacknowledged, new lines are kept
+    in a buffer of at most ``max_buffered_lines`` lines; the oldest lines
+    are dropped when it overflows and the number of dropped lines is
+    reported with the next batch. The loop checks ``_running`` each
+    iteration so it can be stopped deterministically with :meth:`stop`.
+
+    Parameters
+    ----------
+    re_client : RunEngineClient
+        The run engine client model whose console monitor to poll.
+    parent : QObject, optional
+        Parent Qt object.
+    """
+
+    #: Emitted with ``(messages, n_dropped)``: list of ``(time, text)`` message
+    #: tuples and the number of messages dropped before them
+    batch_received = Signal(object, int)
+
+    #: Maximum time (s) between the first line of a batch and its emission
+    batch_interval = 0.1
+    #: Maximum number of lines in a batch
+    max_batch_lines = 1000
+    #: Maximum number of emitted batches waiting to be processed by the GUI
+    max_pending_batches = 2
+    #: Maximum number of lines held while the GUI is busy
+    max_buffered_lines = 10000
+
+    def __init__(self, re_client, parent=None):
+        super().__init__(parent)
+        self._re_client = re_client
+        self._running = False
+        self._lock = threading.Lock()
+        self._n_pending_batches = 0
+        self._buffer = deque()
+        self._n_dropped = 0
+        self._batch_start = None
+
+    def run(self):
+        self._running = True
+        client = self._re_client._client
+        client.console_monitor.enable()
+        while self._running:
+            try:
+                payload = client.console_monitor.next_msg(timeout=self._next_timeout())
+                msg = payload.get("msg", None)
+                if msg is not None:
+                    self._buffer_message(payload.get("time", None), msg)
+            except client.RequestTimeoutError:
+                pass
+            except Exception as ex:
+                if self._running:
+                    print(f"Console monitor error: {ex}")
+            self._emit_batch()
+        try:
+            client.console_monitor.disable_wait()
+        except Exception:
+            pass
+
+    def _next_timeout(self):
+        """Time to wait for the next message, so a started batch is not held back."""
+        if self._batch_start is None:
+            return 0.2
+        remaining = self._batch_start + self.batch_interval - time.monotonic()
+        return min(max(remaining, 0.01), 0.2)
+
+    def _buffer_message(self, time_val, msg):
+        if self._batch_start is None:
+            self._batch_start = time.monotonic()
+        if len(self._buffer) >= self.max_buffered_lines:
+            self._buffer.popleft()
+            self._n_dropped += 1
+        self._buffer.append((time_val, msg))
+
+    def _emit_batch(self):
+        """Emit the buffered lines if the batch is complete and the GUI keeps up."""
+        if not self._buffer:
+            return
+        batch_due = (len(self._buffer) >= self.max_batch_lines) or (
+            time.monotonic() - self._batch_start >= self.batch_interval
+        )
+        if not batch_due:
+            return
+        with self._lock:
+            if self._n_pending_batches >= self.max_pending_batches:
+                return
+            self._n_pending_batches += 1
+
+        n_lines = min(len(self._buffer), self.max_batch_lines)
+        messages = [self._buffer.popleft() for _ in range(n_lines)]
+        n_dropped, self._n_dropped = self._n_dropped, 0
+        self._batch_start = time.monotonic() if self._buffer else None
+        self.batch_received.emit(messages, n_dropped)
+
+    def batch_processed(self):
+        """Acknowledge a batch received from *batch_received*."""
+        with self._lock:
+            self._n_pending_batches = max(self._n_pending_batches - 1, 0)
+
+    def stop(self):
+        """Stop the monitoring loop and wait for the thread to finish."""
+        self._running = False
+        self.wait(2000)
+
+
+class ConsoleStreamService(QObject):
+    """Single reader of the console output of one RunEngineClient.
+
+    The RE Manager console output stream is consumed by one
+    :class:`ConsoleMonitorThread`, and each batch is fanned out to any number
+    of subscribers through *batch_received*. The most recent lines are kept in
+    a ring buffer, so subscribers that connect later can replay them.
+
+    Unless disabled in the ``[gui.console]`` configuration, the whole session
+    output is also written to a :class:`~nbs_gui.models.consoleLog.ConsoleLogStore`
+    (``log_store``), which can be read and searched by line number.
+
+    Use :func:`get_console_stream` to get the service of a client instead of
+    creating it directly.
+
+    Parameters
+    ----------
+    re_client : RunEngineClient
+        The run engine client model whose console monitor to read.
+    parent : QObject, optional
+        Parent Qt object.
+    """
+
+    #: Emitted with ``(lines, n_dropped)``: list of message strings and the
+    #: number of messages dropped before them
+    batch_received = Signal(object, int)
+
+    #: Number of recent lines kept for replay
+    max_history_lines = 10000
+
+    def __init__(self, re_client, parent=None):
+        super().__init__(parent)
+        # Weak, so that the entry of the client in _console_streams can expire
+        self._re_client = weakref.ref(re_client)
+        self._history = deque(maxlen=self.max_history_lines)
+        self._monitor_thread = None
+        self.log_store = None
+
+    @property
+    def is_running(self):
+        return self._monitor_thread is not None
+
+    def start(self):
+        """Start reading the console output, if not already started."""
+        if self._monitor_thread is not None:
+            return
+        re_client = self._re_client()
+        if re_client is None:
+            return
+        config = SETTINGS.gui_config.get("gui", {}).get("console", {})
+        if self.log_store is None and config.get("log_history", True):
+            try:
+                self.log_store = ConsoleLogStore(directory=config.get("log_dir", None))
+            except OSError as ex:
+                print(f"Could not create console history file: {ex}")
+        self._monitor_thread = ConsoleMonitorThread(re_client, parent=self)
+        self._monitor_thread.batch_received.connect(self._on_batch_received)
+        self._monitor_thread.start()
+        app = QApplication.instance()
+        if app:
+            app.aboutToQuit.connect(self.stop)
+
+    def stop(self):
+        """Stop reading the console output and wait for the thread to finish."""
+        if self._monitor_thread is not None:
+            self._monitor_thread.stop()
+            self._monitor_thread = None
+        if self.log_store is not None:
+            self.log_store.close()
+            self.log_store = None
+
+    def history(self):
+        """
+        Recent console output, oldest first.
+
+        Returns
+        -------
+        list of str
+            Up to ``max_history_lines`` lines, including markers of dropped lines.
+        """
+        return list(self._history)
+
+    def subscribe(self, callback):
+        """
+        Connect a subscriber and start the stream if needed.
+
+        Parameters
+        ----------
+        callback : callable
+            Called as ``callback(lines, n_dropped)`` for each new batch.
+
+        Returns
+        -------
+        list of str
+            Recent console output to be replayed by the subscriber.
+        """
+        self.batch_received.connect(callback)
+        self.start()
+        return self.history()
+
+    def unsubscribe(self, callback):
+        """Disconnect a subscriber connected with :meth:`subscribe`."""
+        try:
+            self.batch_received.disconnect(callback)
+        except (RuntimeError, TypeError):
+            pass
+
+    def _on_batch_received(self, messages, n_dropped):
+        try:
+            lines = [msg for _, msg in messages]
+            if n_dropped:
+                self._history.append(dropped_lines_message(n_dropped))
+            self._history.extend(lines)
+            if self.log_store is not None:
+                if n_dropped:
+                    self.log_store.append(dropped_lines_message(n_dropped))
+                self.log_store.append_many(messages)
+            self.batch_received.emit(lines, n_dropped)
+        finally:
+            # Subscribers run synchronously, so the batch is done
+            thread = self._monitor_thread
+            if thread is not None:
+                thread.batch_processed()
+
+
+_console_streams = weakref.WeakKeyDictionary()
+
+
+def get_console_stream(re_client):
+    """
+    Get the shared console stream service of a RunEngineClient.
+
+    Parameters
+    ----------
+    re_client : RunEngineClient
+        The run engine client model.
+
+    Returns
+    -------
+    ConsoleStreamService
+        The service, created on first use. It is not started until it has a
+        subscriber or :meth:`ConsoleStreamService.start` is called.
+    """
+    service = _console_streams.get(re_client, None)
+    if service is None:
+        service = ConsoleStreamService(re_client)
+        _console_streams[re_client] = service
+    return service
@@ -0,0 +1,220 @@
+"""Background construction of the devices of other beamline modes."""
+
+import time
+
+from qtpy.QtCore import QObject, QTimer
+
+from ..load import instantiateGUIDevice
+from ..utils.debug_utils import current_rss_mb
+from ..utils.hot_path import timed_slot
+
+
+class DevicePrefetcher(QObject):
+    """
+    Construct the devices of other modes while the GUI is idle.
+
+    Devices of the modes in ``mode_index`` that are not loaded by the beamline
+    are instantiated one per timer tick, so their Ophyd objects connect before
+    the mode is selected. Prefetched devices are not added to any group or
+    role and are not shown. :meth:`GUIBeamlineModel.reload_for_mode` takes
+    them from the prefetcher instead of instantiating them again, and hands
+    over the devices that a mode switch removes, so switching back is instant.
+
+    Prefetching stops, and removed devices are torn down instead of held, when
+    ``max_devices`` devices are held, or when the resident memory of the
+    process grew by more than ``max_memory_mb`` since :meth:`start`.
+
+    Parameters
+    ----------
+    beamline : GUIBeamlineModel
+        Beamline whose devices are prefetched.
+    modes : list of str, optional
+        Modes to prefetch, in order of priority. Default: all modes of the
+        beamline's ``mode_index``.
+    max_devices : int, optional
+        Maximum number of devices held by the prefetcher.
+    max_memory_mb : float, optional
+        Maximum growth of the resident memory while prefetching, None for no limit.
+    interval_ms : int, optional
+        Time between two prefetched devices.
+    start_delay_ms : int, optional
+        Time between :meth:`start` and the first prefetched device.
+    """
+
+    def __init__(
+        self,
+        beamline,
+        modes=None,
+        max_devices=50,
+        max_memory_mb=None,
+        interval_ms=200,
+        start_delay_ms=5000,
+        parent=None,
+    ):
+        super().__init__(parent)
+        self.beamline = beamline
+        self.modes = modes
+        self.max_devices = max_devices
+        self.max_memory_mb = max_memory_mb
+        self.start_delay_ms = start_delay_ms
+        #: {device key: device} of the prefetched devices
+        self.devices = {}
+        self._queue = []
+        self._failed = set()
+        self._start_rss = None
+        self.prefetch_time = 0.0
+
+        self._timer = QTimer(self)
+        self._timer.setInterval(interval_ms)
+        self._timer.timeout.connect(timed_slot(self._prefetch_next))
+
+    @classmethod
+    def from_config(cls, beamline, config):
+        """
+        Create a prefetcher from the ``[gui.prefetch]`` settings.
+
+        Parameters
+        ----------
+        beamline : GUIBeamlineModel
+            Beamline whose devices are prefetched.
+        config : dict
+            The ``[gui.prefetch]`` table.
+
+        Returns
+        -------
+        DevicePrefetcher or None
+            None if prefetching is not enabled.
+        """
+        if not config.get("enabled", False):
+            return None
+        return cls(
+            beamline,
+            modes=config.get("modes", None),
+            max_devices=int(config.get("max_devices", 50)),
+            max_memory_mb=config.get("max_memory_mb", None),
+            interval_ms=int(config.get("interval_ms", 200)),
+            start_delay_ms=int(config.get("start_delay_ms", 5000)),
+        )
+
+    def _build_queue(self):
+        modes = self.modes
+        if modes is None:
+            modes = sorted(self.beamline.mode_index.modes)
+        queue = []
+        seen = set()
+        for mode in modes:
+            groups, _ = self.beamline.mode_index.layout(mode)
+            for key in groups:
+                if key in seen:
+                    continue
+                seen.add(key)
+                if (
+                    key not in self.beamline.devices
+                    and key not in self.devices
+                    and key not in self._failed
+                ):
+                    queue.append(key)
+        # Keep the load order of the config within the queue
+        config = self.beamline.config
+        queue.sort(key=lambda key: config[key].get("_load_order", 1))
+        self._queue = queue
+
+    def start(self):
+        """Start prefetching after ``start_delay_ms``."""
+        # The memory budget also covers devices kept by a mode switch, so the
+        # baseline is taken even if there is nothing to prefetch yet
+        self._take_baseline()
+        self._build_queue()
+        if not self._queue:
+            return
+        QTimer.singleShot(self.start_delay_ms, self._resume)
+
+    def _take_baseline(self):
+        if self._start_rss is None:
+            self._start_rss = current_rss_mb()
+
+    def _resume(self):
+        if self._queue and not self._timer.isActive():
+            self._timer.start()
+
+    def restart(self):
+        """Rebuild the queue after a mode switch and continue prefetching."""
+        self._take_baseline()
+        self._build_queue()
+        self._resume()
+
+    def stop(self):
+        """Stop prefetching. Prefetched devices are kept."""
+        self._timer.stop()
+
+    def _budget_left(self):
+        if len(self.devices) >= self.max_devices:
+            return False
+        if self.max_memory_mb is not None and self._start_rss is not None:
+            rss = current_rss_mb()
+            if rss is not None and rss - self._start_rss > self.max_memory_mb:
+                return False
+        return True
+
+    def _prefetch_next(self):
+        if not self._queue or not self._budget_left():
+            self._timer.stop()
+            print(
+                f"Device prefetch stopped: {len(self.devices)} devices prefetched "
+                f"in {self.prefetch_time:.1f} s, {len(self._queue)} not prefetched"
+            )
+            return
+        key = self._queue.pop(0)
+        if key in self.beamline.devices or key in self.devices:
+            return
+        start = time.perf_counter()
+        try:
+            device = instantiateGUIDevice(key, self.beamline.config[key])
+        except Exception as e:
+            print(f"Error prefetching {key}: {e}")
+            device = None
+        self.prefetch_time += time.perf_counter() - start
+        if device is None:
+            self._failed.add(key)
+            return
+        if hasattr(device, "set_available"):
+            device.set_available(False)
+        self.devices[key] = device
+
+    def take(self, key):
+        """
+        Remove a prefetched device from the prefetcher.
+
+        Parameters
+        ----------
+        key : str
+            Device key.
+
+        Returns
+        -------
+        object or None
+            The device, None if it was not prefetched.
+        """
+        return self.devices.pop(key, None)
+
+    def keep(self, key, device):
+        """
+        Hold a device that was removed from the beamline, within the device
+        and memory budget.
+
+        Parameters
+        ----------
+        key : str
+            Device key.
+        device : object
+            The device model.
+
+        Returns
+        -------
+        bool
+            True if the device is held, False if the caller should tear it down.
+        """
+        if device is None or not self._budget_left():
+            return False
+        self.devices[key] = device
+        return True
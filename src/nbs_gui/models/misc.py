@@ -7,12 +7,11 @@ from ..views.manipulator_monitor import RealManipulatorControl, RealManipulatorM
 
 from .base import (
     BaseModel,
-    formatFloat,
-    formatInt,
     requires_connection,
     initialize_with_retry,
 )
 from .motors import PVPositionerModel, MotorModel
+from .valueFormat import FormattedValueMixin
 
 
 class EnergyModel:
@@ -71,7 +70,9 @@ class GVModel(BaseModel):
         return True
 
     def _cleanup(self):
-        self.obj.state.unsubscribe(self.sub_key)
+        if self.sub_key is not None:
+            self.obj.state.unsubscribe(self.sub_key)
+            self.sub_key = None
 
     @requires_connection
     def open(self):
@@ -100,7 +101,7 @@ class GVModelConfirmation(GVModel):
     default_controller = GVControlConfirmation
     default_monitor = GVMonitor
 
-class ScalarModel(BaseModel):
+class ScalarModel(FormattedValueMixin, BaseModel):
     valueChanged = Signal(str)
 
     def __init__(self, name, obj, group, long_name, **kwargs):
@@ -128,8 +129,9 @@ class ScalarModel(BaseModel):
         self._cleanup()
 
     def _cleanup(self):
-        print(f"[{self.name}] Cleaning up")
-        self.obj.target.unsubscribe(self.sub_key)
+        if self.sub_key is not None:
+            self.obj.target.unsubscribe(self.sub_key)
+            self.sub_key = None
 
     @requires_connection
     def _get_value(self):
@@ -140,51 +142,6 @@ class ScalarModel(BaseModel):
         self._stash_value(value)
         QTimer.singleShot(100000, self._check_value)
 
-    def _value_changed(self, value, **kwargs):
-        """Handle value changes, with better type handling."""
-        if value is None:
-            if self._value is None:
-                return
-            else:
-                self._value = None
-                self.valueChanged.emit(self._value)
-                return
-        try:
-            # Extract value from named tuple if needed
-            if hasattr(value, "_fields"):
-                if hasattr(value, "user_readback"):
-                    value = value.user_readback
-                elif hasattr(value, "value"):
-                    value = value.value
-
-            # Determine the type if not yet set
-            if self.value_type is None:
-                if isinstance(value, (float, np.floating)):
-                    self.value_type = float
-                elif isinstance(value, (int, np.integer)):
-                    self.value_type = int
-                else:
-                    self.value_type = str
-
-            # Format based on type
-            if self.value_type is float:
-                formatted_value = formatFloat(value)
-            elif self.value_type is int:
-                formatted_value = formatInt(value)
-            else:
-                formatted_value = str(value)
-            if self._value != formatted_value:
-                self._value = formatted_value
-                self.valueChanged.emit(formatted_value)
-        except Exception as e:
-            print(f"Error in _value_changed for {self.name}: {e}")
-            self._value = str(value)
-            self.valueChanged.emit(str(value))
-
-    @property
-    def value(self):
-        return self._value
-
 
 class ControlModel(BaseModel):
     controlChange = Signal(str)
@@ -192,7 +149,12 @@ class ControlModel(BaseModel):
     def __init__(self, name, obj, group, long_name, requester=None, **kwargs):
         super().__init__(name, obj, group, long_name, **kwargs)
         self.requester = requester
-        self.obj.subscribe(self._control_change)
+        self.sub_key = self.obj.subscribe(self._control_change)
+
+    def _cleanup(self):
+        if self.sub_key is not None:
+            self.obj.unsubscribe(self.sub_key)
+            self.sub_key = None
 
     def request_control(self, requester=None):
         if requester is None:
@@ -34,6 +34,7 @@ class ModeModel(EnumModel):
         super().__init__(name, obj, group, long_name, **kwargs)
         self.mode_info = mode_info or {}
         self._current_mode = "Unknown"
+        self._mode_sub_key = None
         self._initialize()
 
     @initialize_with_retry
@@ -41,12 +42,18 @@ class ModeModel(EnumModel):
         if not super()._initialize():
             return False
         try:
-            self.sub_key = self.obj.subscribe(self._mode_changed)
+            self._mode_sub_key = self.obj.subscribe(self._mode_changed)
             return True
         except Exception as e:
             print(f"Error subscribing to mode changes for {self.name}: {e}")
             return False
 
+    def _cleanup(self):
+        super()._cleanup()
+        if self._mode_sub_key is not None:
+            self.obj.unsubscribe(self._mode_sub_key)
+            self._mode_sub_key = None
+
     def _mode_changed(self, value, **kwargs):
         """Handle mode changes from PV."""
         try:
@@ -10,6 +10,7 @@ from ..views.switchable_motors import (
     SwitchableMotorControl,
 )
 from .base import PVModel, BaseModel, requires_connection, initialize_with_retry
+from ..utils.hot_path import timed_slot
 
 CONNECTION_ERRORS = (
     ReadTimeoutError,
@@ -104,6 +105,7 @@ class EPICSMotorModel(BaseMotorModel):
         self._setpoint = None
         self._position = None
         self._moving = False
+        self._moving_sub_key = None
         self.checkValueTimer = QTimer(self)
         EPICSMotorModel._initialize(self)
 
@@ -125,7 +127,9 @@ class EPICSMotorModel(BaseMotorModel):
             return False
 
         # print(f"Initializing EPICSMotorModel for {self.name}")
-        self.sub_key = self.obj.motor_is_moving.subscribe(self._update_moving_status)
+        self._moving_sub_key = self.obj.motor_is_moving.subscribe(
+            self._update_moving_status
+        )
 
         # print(f"Setting up setpoint for {self.name}")
         if "user_setpoint" in self.obj.__dir__():
@@ -162,11 +166,17 @@ class EPICSMotorModel(BaseMotorModel):
         self.setpointChanged.emit(self._setpoint)
 
         self.checkValueTimer.setInterval(1000)
-        self.checkValueTimer.timeout.connect(self._check_value)
+        self.checkValueTimer.timeout.connect(timed_slot(self._check_value))
         self.checkValueTimer.start()
 
         return True
 
+    def _cleanup(self):
+        super()._cleanup()
+        if self._moving_sub_key is not None:
+            self.obj.motor_is_moving.unsubscribe(self._moving_sub_key)
+            self._moving_sub_key = None
+
     def _update_moving_status(self, value, **kwargs):
         self._moving = value
         self.movingStatusChanged.emit(value)
@@ -294,15 +304,15 @@ class PVPositionerModel(BaseMotorModel):
 
         # Set up timers
         self.checkSPTimer.setInterval(1000)
-        self.checkSPTimer.timeout.connect(self._check_setpoint)
+        self.checkSPTimer.timeout.connect(timed_slot(self._check_setpoint))
 
         self.checkMovingTimer.setInterval(500)
-        self.checkMovingTimer.timeout.connect(self.check_moving)
+        self.checkMovingTimer.timeout.connect(timed_slot(self.check_moving))
 
         # Start the timers
 
         self.checkValueTimer.setInterval(500)
-        self.checkValueTimer.timeout.connect(self._check_value)
+        self.checkValueTimer.timeout.connect(timed_slot(self._check_value))
 
         self.checkSPTimer.start()
         self.checkMovingTimer.start()
@@ -0,0 +1,76 @@
+"""Client-side search index over the plan history."""
+
+
+def _history_item_uid(item):
+    return item.get("item_uid", None)
+
+
+def _history_item_key(item):
+    """Build the lowercase search key (name, user, exit status) for an item."""
+    result = item.get("result", None) or {}
+    fields = (
+        item.get("name", ""),
+        item.get("user", ""),
+        result.get("exit_status", ""),
+    )
+    # The separator keeps a search term from matching across field boundaries
+    return "\x00".join(str(_) for _ in fields).lower()
+
+
+class PlanHistoryIndex:
+    """
+    Incrementally maintained search index over plan history items.
+
+    The plan history is append-only between clears, so only items that were
+    appended since the last update are indexed. The index stores one compact
+    string per item (plan name, user and exit status), not the items themselves.
+    """
+
+    def __init__(self):
+        self._keys = []
+        self._tail_uid = None
+
+    def __len__(self):
+        return len(self._keys)
+
+    def update(self, items):
+        """
+        Bring the index up to date with the history list.
+
+        Parameters
+        ----------
+        items : list of dict
+            Full list of plan history items, oldest first.
+        """
+        n_indexed = len(self._keys)
+        if (len(items) < n_indexed) or (
+            n_indexed and _history_item_uid(items[n_indexed - 1]) != self._tail_uid
+        ):
+            # History was cleared or replaced, rebuild from scratch
+            self._keys = []
+            n_indexed = 0
+
+        for item in items[n_indexed:]:
+            self._keys.append(_history_item_key(item))
+
+        self._tail_uid = _history_item_uid(items[-1]) if items else None
+
+    def search(self, text):
+        """
+        Find history positions matching a search string.
+
+        Parameters
+        ----------
+        text : str
+            Substring matched (case-insensitive) against plan name, user and
+            exit status. An empty string matches every item.
+
+        Returns
+        -------
+        sequence of int
+            Matching positions in the history list, oldest first.
+        """
+        text = text.strip().lower()
+        if not text:
+            return range(len(self._keys))
+        return [n for n, key in enumerate(self._keys) if text in key]
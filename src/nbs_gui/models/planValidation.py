@@ -0,0 +1,355 @@
+"""Validation of queue items against the allowed plans of the Queue Server."""
+
+import inspect
+import threading
+import weakref
+
+from bluesky_queueserver import (
+    construct_parameters,
+    format_text_descriptions,
+    validate_plan,
+)
+
+try:
+    from bluesky_queueserver.manager.profile_ops import (
+        _check_ranges,
+        _compare_in_out,
+        filter_plan_description,
+        pydantic_construct_model_class,
+        pydantic_validate_model,
+    )
+
+    _compiled_validation_available = True
+except ImportError:
+    # Fall back to 'validate_plan', which rebuilds the validation model for every item
+    _compiled_validation_available = False
+
+
+def _item_to_dict(item):
+    return item.to_dict() if hasattr(item, "to_dict") else item
+
+
+def _validate_meta(item):
+    meta_msg = "Plan parameter 'meta' must be a dictionary or a list of dictionaries"
+    if "meta" in item:
+        meta = item["meta"]
+        if isinstance(meta, (tuple, list)):
+            if not all(isinstance(_, dict) for _ in meta):
+                raise ValueError(meta_msg)
+        elif not isinstance(meta, dict):
+            raise ValueError(meta_msg)
+
+
+class _CompiledPlanValidator:
+    """
+    Signature and validation model of one plan, built from its description once
+    and reused for every item of the plan.
+    """
+
+    def __init__(self, plan_description):
+        self.param_list = plan_description["parameters"]
+        parameters = construct_parameters(self.param_list)
+        self.signature = inspect.Signature(parameters)
+        self.model_class = pydantic_construct_model_class(parameters)
+        # Single-parameter models and descriptions: {name: (model_class, [description])}
+        self._parameter_checks = {}
+
+    def validate(self, args, kwargs):
+        """Raise an exception if the arguments are not valid."""
+        bound_args = self.signature.bind(*args, **kwargs)
+        m = pydantic_validate_model(bound_args.arguments, self.model_class)
+        success, msg = _compare_in_out(bound_args.arguments, m.__dict__)
+        if not success:
+            raise ValueError(f"Error in argument types: {msg}")
+        success, msg = _check_ranges(bound_args.arguments, self.param_list)
+        if not success:
+            raise ValueError(f"Argument values are out of range: {msg}")
+
+    def validate_parameter(self, name, value):
+        """
+        Raise an exception if the value of a single parameter is not valid.
+        Parameters that are not in the plan signature are not checked.
+        """
+        check = self._parameter_checks.get(name, None)
+        if check is None:
+            parameter = self.signature.parameters.get(name, None)
+            if parameter is None:
+                return
+            descriptions = [_ for _ in self.param_list if _.get("name", None) == name]
+            check = (pydantic_construct_model_class([parameter]), descriptions)
+            self._parameter_checks[name] = check
+
+        model_class, descriptions = check
+        kwargs = {name: value}
+        m = pydantic_validate_model(kwargs, model_class)
+        success, msg = _compare_in_out(kwargs, m.__dict__)
+        if not success:
+            raise ValueError(f"Error in argument types: {msg}")
+        success, msg = _check_ranges(kwargs, descriptions)
+        if not success:
+            raise ValueError(f"Argument values are out of range: {msg}")
+
+
+class ItemParameterInfo:
+    """
+    Parameter metadata of a plan or instruction used by the plan editor: parsed
+    ``inspect.Parameter`` objects, formatted descriptions and the compiled
+    validator of the plan. Built once per item name and allowed plans version,
+    see :func:`get_item_parameter_info`.
+
+    Parameters
+    ----------
+    item_type : str
+        ``"plan"`` or ``"instruction"``.
+    item_params : dict or None
+        Item description from the allowed plans or instructions, None if the item
+        is not allowed.
+    validator : object, optional
+        Compiled validator of the plan, None if not available.
+    """
+
+    def __init__(self, item_type, item_params, validator=None):
+        self.item_type = item_type
+        self.item_params = item_params
+        self.descriptions = format_text_descriptions(
+            item_parameters=item_params, use_html=True
+        )
+        if item_params is not None:
+            self.parameters = construct_parameters(item_params.get("parameters", {}))
+            self.signature = inspect.Signature(self.parameters)
+        else:
+            self.parameters = []
+            self.signature = None
+        self._validator = validator
+
+    def bind_arguments(self, args, kwargs):
+        """
+        Bind item arguments to plan parameters, as
+        ``RunEngineClient.get_bound_item_arguments`` does.
+
+        Returns
+        -------
+        args : list
+            Empty list if the arguments were bound, otherwise the original ``args``.
+        kwargs : dict
+            Bound arguments, or the original ``kwargs``.
+        """
+        if self.item_type != "plan" or self.signature is None:
+            return args, kwargs
+        try:
+            return [], self.signature.bind(*args, **kwargs).arguments
+        except Exception:
+            return args, kwargs
+
+    def check_value(self, name, value):
+        """
+        Check the value of a single parameter.
+
+        Returns
+        -------
+        str
+            Error message, empty if the value is valid or can not be checked.
+        """
+        if self._validator is None:
+            return ""
+        try:
+            self._validator.validate_parameter(name, value)
+        except Exception as ex:
+            return str(ex)
+        return ""
+
+
+class PlanValidators:
+    """
+    Per-plan validators for one version of the allowed plans and devices.
+
+    Validators are compiled from the plan descriptions the first time a plan is
+    validated and reused afterwards. The object holds its own references to the
+    allowed plans and devices, so it keeps working in a worker thread when the
+    RunEngineClient loads a new version. Validation follows
+    ``bluesky_queueserver.validate_plan``.
+
+    Parameters
+    ----------
+    allowed_plans : dict or None
+        Allowed plans, key - plan name. If None, all plans are considered valid.
+    allowed_devices : dict or None
+        Allowed devices, key - device name.
+    version : object, optional
+        Identifier of the version of the allowed plans and devices.
+    """
+
+    def __init__(self, allowed_plans, allowed_devices, version=None):
+        self.allowed_plans = allowed_plans
+        self.allowed_devices = allowed_devices
+        self.version = version
+        self._validators = {}
+        self._lock = threading.Lock()
+        # Parameter metadata for the plan editor: {(item_type, name): ItemParameterInfo}
+        self._item_info = {}
+
+    def get_validator(self, plan_name):
+        """
+        Compiled validator of a plan.
+
+        Raises
+        ------
+        KeyError
+            If the plan is not in the list of allowed plans.
+        """
+        with self._lock:
+            validator = self._validators.get(plan_name, None)
+        if validator is not None:
+            return validator
+
+        if plan_name not in self.allowed_plans:
+            raise KeyError(f"Plan '{plan_name}' is not in the list of allowed plans.")
+        plan_description = filter_plan_description(
+            self.allowed_plans[plan_name],
+            allowed_plans=self.allowed_plans,
+            allowed_devices=self.allowed_devices,
+        )
+        validator = _CompiledPlanValidator(plan_description)
+        with self._lock:
+            self._validators.setdefault(plan_name, validator)
+        return validator
+
+    def validate_item(self, item):
+        """
+        Validate a queue item.
+
+        Parameters
+        ----------
+        item : dict or BItem
+            Queue item. Items other than plans are not validated.
+
+        Returns
+        -------
+        str
+            Error message, empty if the item is valid.
+        """
+        item = _item_to_dict(item)
+        if item.get("item_type", "plan") != "plan":
+            return ""
+
+        if not _compiled_validation_available:
+            success, msg = validate_plan(
+                item,
+                allowed_plans=self.allowed_plans,
+                allowed_devices=self.allowed_devices,
+            )
+            return "" if success else msg
+
+        try:
+            if self.allowed_plans is not None:
+                validator = self.get_validator(item.get("name", None))
+                validator.validate(item.get("args", []), item.get("kwargs", {}))
+            _validate_meta(item)
+        except KeyError as ex:
+            return str(ex.args[0]) if ex.args else str(ex)
+        except Exception as ex:
+            return str(ex)
+        return ""
+
+    def iter_validate(self, items, *, chunk_size=100):
+        """
+        Validate items and report progress after every chunk.
+
+        Parameters
+        ----------
+        items : list
+            Queue items (dict or BItem).
+        chunk_size : int
+            Number of items validated between reports.
+
+        Yields
+        ------
+        n_validated : int
+            Number of items validated so far.
+        errors : list of tuple
+            ``(index, plan_name, message)`` for the invalid items of the chunk.
+        """
+        n_items = len(items)
+        for start in range(0, n_items, chunk_size):
+            errors = []
+            for n in range(start, min(start + chunk_size, n_items)):
+                item = _item_to_dict(items[n])
+                msg = self.validate_item(item)
+                if msg:
+                    errors.append((n, item.get("name", ""), msg))
+            yield min(start + chunk_size, n_items), errors
+
+
+_plan_validators = weakref.WeakKeyDictionary()
+
+
+def get_plan_validators(run_engine_client):
+    """
+    Get validators for the current allowed plans and devices of a RunEngineClient.
+
+    Compiled validators are shared until the client loads a new version of the
+    allowed plans or devices. Must be called from the GUI thread.
+
+    Parameters
+    ----------
+    run_engine_client : RunEngineClient
+        The run engine client model.
+
+    Returns
+    -------
+    PlanValidators
+    """
+    version = (
+        getattr(run_engine_client, "_allowed_plans_uid", None),
+        getattr(run_engine_client, "_allowed_devices_uid", None),
+    )
+    validators = _plan_validators.get(run_engine_client, None)
+    if validators is None or validators.version != version:
+        # The client updates its dictionaries in place, so keep copies
+        validators = PlanValidators(
+            dict(run_engine_client._allowed_plans),
+            dict(run_engine_client._allowed_devices),
+            version=version,
+        )
+        _plan_validators[run_engine_client] = validators
+    return validators
+
+
+def get_item_parameter_info(run_engine_client, item_type, name):
+    """
+    Get parameter metadata of a plan or instruction, cached until the client
+    loads a new version of the allowed plans or devices. Must be called from
+    the GUI thread.
+
+    Parameters
+    ----------
+    run_engine_client : RunEngineClient
+        The run engine client model.
+    item_type : str
+        ``"plan"`` or ``"instruction"``.
+    name : str
+        Name of the plan or instruction.
+
+    Returns
+    -------
+    ItemParameterInfo
+    """
+    validators = get_plan_validators(run_engine_client)
+    key = (item_type, name)
+    info = validators._item_info.get(key, None)
+    if info is None:
+        validator = None
+        if item_type == "plan":
+            item_params = run_engine_client.get_allowed_plan_parameters(name=name)
+            if _compiled_validation_available and item_params is not None:
+                try:
+                    validator = validators.get_validator(name)
+                except Exception as ex:
+                    print(f"Failed to compile validator for plan '{name}': {ex}")
+        else:
+            item_params = run_engine_client.get_allowed_instruction_parameters(
+                name=name
+            )
+        info = ItemParameterInfo(item_type, item_params, validator)
+        validators._item_info[key] = info
+    return info
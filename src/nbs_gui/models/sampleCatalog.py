@@ -0,0 +1,318 @@
+"""Indexed list model of the samples for sample pickers."""
+
+import bisect
+import re
+import weakref
+
+from qtpy.QtCore import QAbstractListModel, QModelIndex, Qt, QTimer
+
+
+def sample_display_text(key, sample):
+    """Text shown for a sample in the sample pickers."""
+    return f"Sample {key}: {sample.get('name', '')}"
+
+
+_token_split = re.compile(r"[^0-9a-z]+")
+
+
+def _tokens(*fields):
+    tokens = set()
+    for field in fields:
+        text = str(field).lower()
+        if text:
+            tokens.add(text)
+            tokens.update(_ for _ in _token_split.split(text) if _)
+    return tokens
+
+
+def _is_subsequence(term, text):
+    it = iter(text)
+    return all(c in it for c in term)
+
+
+class SampleSearchIndex:
+    """
+    Search index over the id, name and description of samples.
+
+    Every field is split into lowercase words, which are kept in a sorted list,
+    so the samples with a word that starts with a search term are found by
+    bisection. A term that is not the prefix of any word is matched as a
+    subsequence of the text of each sample ("fuzzy" match), e.g. ``"fe2o"``
+    matches ``"Fe2O3 powder"`` and ``"cuf"`` matches ``"Cu foil"``.
+    """
+
+    def __init__(self):
+        # Sorted (token, key) pairs
+        self._entries = []
+        # {key: (tokens, text)}
+        self._samples = {}
+
+    def __len__(self):
+        return len(self._samples)
+
+    @staticmethod
+    def _index_fields(key, sample):
+        name = sample.get("name", "")
+        description = sample.get("description", "")
+        tokens = _tokens(key, name, description)
+        return tokens, f"{key} {name} {description}".lower()
+
+    def build(self, samples):
+        """
+        Replace the index with the samples of a dictionary.
+
+        Parameters
+        ----------
+        samples : dict
+            ``{sample id: sample}``
+        """
+        self._samples = {
+            key: self._index_fields(key, sample) for key, sample in samples.items()
+        }
+        self._entries = sorted(
+            (token, key)
+            for key, (tokens, _) in self._samples.items()
+            for token in tokens
+        )
+
+    def update(self, key, sample):
+        """Add a sample, or replace the indexed fields of a sample."""
+        self.remove(key)
+        tokens, text = self._index_fields(key, sample)
+        self._samples[key] = (tokens, text)
+        for token in tokens:
+            bisect.insort(self._entries, (token, key))
+
+    def remove(self, key):
+        """Remove a sample from the index, if it is indexed."""
+        indexed = self._samples.pop(key, None)
+        if indexed is None:
+            return
+        for token in indexed[0]:
+            n = bisect.bisect_left(self._entries, (token, key))
+            if n < len(self._entries) and self._entries[n] == (token, key):
+                del self._entries[n]
+
+    def clear(self):
+        self._entries = []
+        self._samples = {}
+
+    def _prefix_matches(self, term):
+        matches = set()
+        n = bisect.bisect_left(self._entries, (term,))
+        entries = self._entries
+        while n < len(entries) and entries[n][0].startswith(term):
+            matches.add(entries[n][1])
+            n += 1
+        return matches
+
+    def search(self, query):
+        """
+        Find the samples that match every term of a query.
+
+        Parameters
+        ----------
+        query : str
+            Whitespace-separated search terms, case-insensitive.
+
+        Returns
+        -------
+        set or None
+            Keys of the matching samples, None if the query is empty.
+        """
+        terms = query.lower().split()
+        if not terms:
+            return None
+        result = None
+        for term in terms:
+            matches = self._prefix_matches(term)
+            if not matches:
+                candidates = self._samples if result is None else result
+                matches = {
+                    key
+                    for key in candidates
+                    if _is_subsequence(term, self._samples[key][1])
+                }
+            result = matches if result is None else result & matches
+            if not result:
+                break
+        return result
+
+
+class SampleCatalog(QAbstractListModel):
+    """
+    List model of samples, sorted by sample id, with a search index.
+
+    :meth:`set_samples` compares the new sample dictionary with the current
+    rows and only inserts, removes or updates the rows of the samples that
+    changed, so views keep their selection and scroll position. Views of the
+    model only create rows that are visible.
+
+    The display role is the sample text shown in the sample pickers, the user
+    role is the sample id and the tooltip role is the sample description.
+    """
+
+    #: Changes above this fraction of the rows reset the model instead
+    reset_fraction = 0.5
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._keys = []
+        # {key: (display text, description)}
+        self._rows = {}
+        self.search_index = SampleSearchIndex()
+        self.samples = {}
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self._keys)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or not 0 <= index.row() < len(self._keys):
+            return None
+        key = self._keys[index.row()]
+        if role in (Qt.DisplayRole, Qt.EditRole):
+            return self._rows[key][0]
+        elif role == Qt.UserRole:
+            return key
+        elif role == Qt.ToolTipRole:
+            return self._rows[key][1] or None
+        return None
+
+    def sample_key(self, row):
+        """Sample id of a row."""
+        return self._keys[row]
+
+    def row_of(self, key):
+        """Row of a sample id, -1 if there is no such sample."""
+        n = bisect.bisect_left(self._keys, key)
+        if n < len(self._keys) and self._keys[n] == key:
+            return n
+        return -1
+
+    def keys(self):
+        """Sample ids in row order."""
+        return list(self._keys)
+
+    def search(self, query):
+        """Keys of the samples that match a query, see :class:`SampleSearchIndex`."""
+        return self.search_index.search(query)
+
+    def set_samples(self, samples):
+        """
+        Update the rows to a new sample dictionary.
+
+        Parameters
+        ----------
+        samples : dict-like
+            ``{sample id: sample}``, where each sample is a dictionary with
+            optional ``"name"`` and ``"description"`` entries.
+        """
+        self.samples = samples if samples is not None else {}
+        samples, rows = {}, {}
+        for key, sample in self.samples.items():
+            key = str(key)
+            if not isinstance(sample, dict):
+                sample = {}
+            samples[key] = sample
+            rows[key] = (
+                sample_display_text(key, sample),
+                str(sample.get("description", "") or ""),
+            )
+
+        removed = [key for key in self._keys if key not in rows]
+        added = sorted(key for key in rows if key not in self._rows)
+        changed = [
+            key for key in self._keys if key in rows and rows[key] != self._rows[key]
+        ]
+        n_changes = len(removed) + len(added) + len(changed)
+        if not n_changes:
+            return
+
+        if n_changes > self.reset_fraction * max(len(self._keys), 1):
+            self.beginResetModel()
+            self._keys = sorted(rows)
+            self._rows = rows
+            self.search_index.build(samples)
+            self.endResetModel()
+            return
+
+        for key in removed:
+            row = self.row_of(key)
+            self.beginRemoveRows(QModelIndex(), row, row)
+            del self._keys[row]
+            del self._rows[key]
+            self.search_index.remove(key)
+            self.endRemoveRows()
+
+        for key in added:
+            row = bisect.bisect_left(self._keys, key)
+            self.beginInsertRows(QModelIndex(), row, row)
+            self._keys.insert(row, key)
+            self._rows[key] = rows[key]
+            self.search_index.update(key, samples[key])
+            self.endInsertRows()
+
+        for key in changed:
+            self._rows[key] = rows[key]
+            self.search_index.update(key, samples[key])
+            index = self.createIndex(self.row_of(key), 0)
+            self.dataChanged.emit(index, index)
+
+
+class GlobalSampleCatalog(SampleCatalog):
+    """
+    Sample catalog that follows the GLOBAL_SAMPLES dictionary of a UserStatus.
+
+    Change notifications of the dictionary are coalesced, and the rows are
+    updated once after a burst of changes.
+
+    Parameters
+    ----------
+    user_status : UserStatus
+        User status model providing the Redis dictionaries.
+    """
+
+    #: Delay (ms) between a change notification and the update of the rows
+    update_delay_ms = 100
+
+    def __init__(self, user_status, parent=None):
+        super().__init__(parent)
+        self._sample_dict = user_status.get_redis_dict("GLOBAL_SAMPLES")
+        self._update_timer = QTimer(self)
+        self._update_timer.setSingleShot(True)
+        self._update_timer.setInterval(self.update_delay_ms)
+        self._update_timer.timeout.connect(self.sync)
+        if self._sample_dict is not None:
+            self._sample_dict.changed.connect(self._update_timer.start)
+        self.sync()
+
+    def sync(self):
+        """Update the rows to the current content of the sample dictionary."""
+        self._update_timer.stop()
+        self.set_samples(self._sample_dict)
+
+
+_sample_catalogs = weakref.WeakKeyDictionary()
+
+
+def get_sample_catalog(user_status):
+    """
+    Get the shared catalog of the global samples of a UserStatus.
+
+    Parameters
+    ----------
+    user_status : UserStatus
+        The user status model.
+
+    Returns
+    -------
+    GlobalSampleCatalog
+        The catalog, created on first use.
+    """
+    catalog = _sample_catalogs.get(user_status, None)
+    if catalog is None:
+        catalog = GlobalSampleCatalog(user_status)
+        _sample_catalogs[user_status] = catalog
+    return catalog
@@ -0,0 +1,140 @@
+"""Per-device deadband and rate limit of model value updates."""
+
+import numpy as np
+
+from .valueFormat import unwrap_value
+
+
+def parse_deadband(deadband):
+    """
+    Parse the ``_deadband`` option of a device.
+
+    Parameters
+    ----------
+    deadband : float, dict or None
+        A number is an absolute deadband. A table may give an ``absolute``
+        deadband, a ``relative`` deadband (fraction of the last value), or both.
+
+    Returns
+    -------
+    absolute : float
+    relative : float
+
+    Raises
+    ------
+    ValueError
+        If the option can not be parsed.
+    """
+    if deadband is None:
+        return 0.0, 0.0
+    if isinstance(deadband, dict):
+        unknown = set(deadband) - {"absolute", "relative"}
+        if unknown:
+            raise ValueError(f"Unknown deadband keys: {sorted(unknown)}")
+        return (
+            abs(float(deadband.get("absolute", 0.0))),
+            abs(float(deadband.get("relative", 0.0))),
+        )
+    return abs(float(deadband)), 0.0
+
+
+class UpdateLimits:
+    """
+    Deadband and rate limit applied to the value updates of a model before
+    they are stashed.
+
+    A numeric value is dropped if it differs from the last stashed value by
+    no more than ``max(absolute, relative * abs(last value))``. Values that
+    are not numbers always pass the deadband. Values that arrive less than
+    ``1 / max_rate_hz`` seconds after the last stashed value are held, and
+    the latest held value is stashed once the interval has passed.
+
+    Parameters
+    ----------
+    deadband : float, dict or None, optional
+        See :func:`parse_deadband`.
+    max_rate_hz : float or None, optional
+        Maximum rate of stashed values. None or 0 for no limit.
+    """
+
+    __slots__ = (
+        "absolute",
+        "relative",
+        "max_rate_hz",
+        "min_interval",
+        "next_time",
+        "_last",
+    )
+
+    def __init__(self, deadband=None, max_rate_hz=None):
+        self.absolute, self.relative = parse_deadband(deadband)
+        self.max_rate_hz = float(max_rate_hz) if max_rate_hz else None
+        self.min_interval = 1.0 / self.max_rate_hz if self.max_rate_hz else 0.0
+        self.next_time = 0.0
+        self._last = None
+
+    @classmethod
+    def from_config(cls, device_config):
+        """
+        Limits from the ``_deadband`` and ``_max_rate_hz`` options of a device.
+
+        Returns
+        -------
+        UpdateLimits or None
+            None if the device sets neither option.
+        """
+        deadband = device_config.get("_deadband", None)
+        max_rate_hz = device_config.get("_max_rate_hz", None)
+        if deadband is None and not max_rate_hz:
+            return None
+        return cls(deadband=deadband, max_rate_hz=max_rate_hz)
+
+    def copy(self):
+        """New limits with the same options, without the last stashed value."""
+        return UpdateLimits(
+            deadband={"absolute": self.absolute, "relative": self.relative},
+            max_rate_hz=self.max_rate_hz,
+        )
+
+    def __repr__(self):
+        return (
+            f"UpdateLimits(absolute={self.absolute}, relative={self.relative}, "
+            f"max_rate_hz={self.max_rate_hz})"
+        )
+
+    def describe(self):
+        """Short text description of the limits."""
+        parts = []
+        if self.absolute:
+            parts.append(f"deadband {self.absolute:g}")
+        if self.relative:
+            parts.append(f"deadband {self.relative:.3g} rel")
+        if self.max_rate_hz:
+            parts.append(f"max {self.max_rate_hz:g} Hz")
+        return ", ".join(parts) or "none"
+
+    def in_deadband(self, value):
+        """Whether a value is within the deadband of the last stashed value."""
+        last = self._last
+        if last is None or not (self.absolute or self.relative):
+            return False
+        value = unwrap_value(value)
+        if not isinstance(value, (int, float, np.number)) or isinstance(value, bool):
+            return False
+        try:
+            return abs(value - last) <= max(self.absolute, self.relative * abs(last))
+        except TypeError:
+            return False
+
+    def rate_limited(self, now):
+        """Whether a value arriving at time ``now`` must be held."""
+        return now < self.next_time
+
+    def stashed(self, value, now):
+        """Record a value as stashed at time ``now``."""
+        self.next_time = now + self.min_interval
+        value = unwrap_value(value)
+        if isinstance(value, (int, float, np.number)) and not isinstance(value, bool):
+            self._last = value
+        else:
+            self._last = None
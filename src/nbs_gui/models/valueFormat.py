@@ -0,0 +1,251 @@
+"""Value formatting for scalar-like models."""
+
+from math import copysign
+
+import numpy as np
+
+
+def unwrap_value(value):
+    """
+    Extract the scalar value of a named tuple reading, e.g. of a positioner.
+
+    Parameters
+    ----------
+    value : any
+        Value from a subscription callback.
+
+    Returns
+    -------
+    any
+        ``user_readback``, ``readback`` or ``value`` of a named tuple, otherwise
+        the value itself.
+    """
+    cls = type(value)
+    if cls is float or cls is int:
+        return value
+    if hasattr(value, "_fields"):
+        if hasattr(value, "user_readback"):
+            return value.user_readback
+        elif hasattr(value, "readback"):
+            return value.readback
+        elif hasattr(value, "value"):
+            return value.value
+    return value
+
+
+def infer_value_type(value):
+    """Python type used to format a value: float, int or str."""
+    if isinstance(value, (float, np.floating)):
+        return float
+    elif isinstance(value, (int, np.integer)):
+        return int
+    return str
+
+
+class ValueFormatter:
+    """
+    Formatter for the values of one model, compiled once from the value type
+    and precision.
+
+    Float values are formatted as :func:`nbs_gui.models.base.formatFloat`
+    formats them, integers as :func:`nbs_gui.models.base.formatInt`. The
+    format methods are bound when the formatter is created, so formatting a
+    value does not build format strings.
+
+    :meth:`update` compares a numeric value with the last displayed value
+    before formatting it: values that round to the displayed text, repeated
+    values and changes within the deadband are dropped without creating
+    strings.
+
+    Parameters
+    ----------
+    value_type : type or None
+        ``float``, ``int`` or ``str``. None formats values with ``str``.
+    precision : int, optional
+        Number of decimal places of float values.
+    width : int, optional
+        Width of formatted float values. By default, the width of
+        :func:`~nbs_gui.models.base.formatFloat`.
+    deadband : float, optional
+        Numeric changes up to this absolute value are not displayed.
+    """
+
+    __slots__ = (
+        "value_type",
+        "precision",
+        "deadband",
+        "_threshold",
+        "_format_fixed",
+        "_format_exp",
+        "_format",
+        "_last_number",
+        "_last_text",
+        "_same_text_low",
+        "_same_text_high",
+    )
+
+    def __init__(self, value_type, precision=2, width=None, deadband=0.0):
+        self.value_type = value_type
+        self.precision = precision
+        self.deadband = deadband
+        self._threshold = 10 ** (1 - precision)
+        fixed_width = width if width is not None else precision + 3
+        exp_width = width if width is not None else precision + 7
+        self._format_fixed = f"{{:>{fixed_width}.{precision}f}}".format
+        self._format_exp = f"{{:>{exp_width}.{precision}e}}".format
+        if value_type is float:
+            self._format = self._format_float
+        elif value_type is int:
+            self._format = self._format_int
+        else:
+            self._format = str
+        self._last_number = None
+        self._last_text = None
+        self._same_text_low = float("inf")
+        self._same_text_high = float("-inf")
+
+    def _format_float(self, value):
+        try:
+            value = float(value)
+        except (ValueError, TypeError) as e:
+            print(f"Could not convert value {value} to float: {e}")
+            return str(value)
+        if value == 0 or abs(value) >= self._threshold:
+            return self._format_fixed(value)
+        return self._format_exp(value)
+
+    def _format_int(self, value):
+        try:
+            return str(int(value))
+        except (ValueError, TypeError) as e:
+            print(f"Could not convert value {value} to int: {e}")
+            return str(value)
+
+    def format(self, value):
+        """Format a value, without comparing it to the last value."""
+        return self._format(value)
+
+    def _set_same_text_range(self, value, text):
+        # Values strictly within 0.49 digits of the last displayed fixed-point
+        # value round to the same text, so they are dropped by two comparisons
+        self._same_text_low = float("inf")
+        self._same_text_high = float("-inf")
+        if self._format != self._format_float:
+            return
+        try:
+            value = float(value)
+            shown = float(text)
+        except (ValueError, TypeError):
+            return
+        # Stay away from the switch to exponent notation and from values whose
+        # float spacing is not small against the last digit
+        if 2 * self._threshold <= abs(value) < 1e12:
+            half_digit = 0.49 * 10 ** (-self.precision)
+            self._same_text_low = shown - half_digit
+            self._same_text_high = shown + half_digit
+
+    def update(self, value):
+        """
+        Format a new value if its displayed text may change.
+
+        Parameters
+        ----------
+        value : any
+            The new value.
+
+        Returns
+        -------
+        str or None
+            The new text, None if it would be the text of the last value.
+        """
+        cls = type(value)
+        if cls is float or cls is int or isinstance(value, (np.floating, np.integer)):
+            if self._same_text_low < value < self._same_text_high:
+                return None
+            last = self._last_number
+            if last is not None:
+                # -0.0 == 0.0, but they are displayed with different signs
+                if value == last and (
+                    value or copysign(1.0, value) == copysign(1.0, last)
+                ):
+                    return None
+                if self.deadband and abs(value - last) <= self.deadband:
+                    return None
+            text = self._format(value)
+            if text == self._last_text:
+                if not self.deadband:
+                    # Same text, skip formatting if this value repeats
+                    self._last_number = value
+                return None
+            self._last_number = value
+            self._set_same_text_range(value, text)
+        else:
+            text = self._format(value)
+            if text == self._last_text:
+                return None
+            self._last_number = None
+            self._same_text_low = float("inf")
+            self._same_text_high = float("-inf")
+        self._last_text = text
+        return text
+
+    def reset(self):
+        """Forget the last value, so that the next value is always formatted."""
+        self._last_number = None
+        self._last_text = None
+        self._same_text_low = float("inf")
+        self._same_text_high = float("-inf")
+
+
+class FormattedValueMixin:
+    """
+    Value handling of models that display a single formatted value.
+
+    Classes using the mixin list it before ``BaseModel``, and define a
+    ``valueChanged = Signal(str)`` and a ``value_type`` attribute. The value
+    type is inferred from the first value if it is None, and the
+    :class:`ValueFormatter` of the model is created once per value type.
+    """
+
+    #: Number of decimal places of float values
+    precision = 2
+    _formatter = None
+
+    def _value_changed(self, value, print_value=False, **kwargs):
+        """Handle value changes, with better type handling."""
+        if value is None:
+            if self._formatter is not None:
+                self._formatter.reset()
+            if self._value is None:
+                return
+            else:
+                self._value = None
+                self._emit_value(self._value)
+                return
+
+        try:
+            value = unwrap_value(value)
+            if self.value_type is None:
+                self.value_type = infer_value_type(value)
+            formatter = self._formatter
+            if formatter is None or formatter.value_type is not self.value_type:
+                formatter = ValueFormatter(self.value_type, precision=self.precision)
+                self._formatter = formatter
+
+            formatted_value = formatter.update(value)
+            if formatted_value is None:
+                return
+            if print_value:
+                print(f"[{self.name}] value changed to {formatted_value}")
+            self._value = formatted_value
+            self._emit_value(formatted_value)
+        except Exception as e:
+            print(f"[{self.name}] Error in _value_changed for value {value}: {e}")
+            if self._formatter is not None:
+                self._formatter.reset()
+            self._value = str(value)
+            self._emit_value(self._value)
+
+    @property
+    def value(self):
+        return self._value
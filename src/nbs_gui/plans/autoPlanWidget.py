@@ -78,7 +78,7 @@ class AutoPlanWidget(PlanWidgetBase):
 
         self.param_group = AutoParamGroup(self.model, self, title=self.title)
         self.layout.addWidget(self.param_group)
-        self.param_group.editingFinished.connect(self.check_plan_ready)
+        self.param_group.editingFinished.connect(self.schedule_plan_ready_check)
 
         # Create AutoParamGroup parameters from parameter objects
         for p in self.parameters:
@@ -14,9 +14,11 @@ from qtpy.QtWidgets import (
     QPushButton,
 )
 from qtpy.QtGui import QDoubleValidator, QIntValidator, QColor, QPalette
-from qtpy.QtCore import Signal, Qt
+from qtpy.QtCore import Signal, Qt, QTimer
 from typing import Any
 from .planParam import AutoParamGroup
+from ..widgets.utils import submit_plans
+from ..utils.hot_path import timed_slot
 
 
 class PlanWidgetBase(QWidget):
@@ -35,12 +37,19 @@ class PlanWidgetBase(QWidget):
     plan_ready = Signal(bool)
     editingFinished = Signal()
 
+    #: Delay (ms) between the last parameter change and the readiness check
+    ready_check_delay_ms = 100
+
     def __init__(self, model, parent=None):
         super().__init__(parent)
         self.model = model
         self.run_engine_client = model.run_engine
         self.user_status = model.user_status
         self.layout = QVBoxLayout(self)
+        self._ready_check_timer = QTimer(self)
+        self._ready_check_timer.setSingleShot(True)
+        self._ready_check_timer.setInterval(self.ready_check_delay_ms)
+        self._ready_check_timer.timeout.connect(timed_slot(self.check_plan_ready))
 
     def _check_ready(self):
         """
@@ -59,6 +68,15 @@ class PlanWidgetBase(QWidget):
         """
         self.plan_ready.emit(self._check_ready())
 
+    def schedule_plan_ready_check(self):
+        """
+        Check if the plan is ready once parameter changes have settled.
+
+        Calls :meth:`check_plan_ready` ``ready_check_delay_ms`` after the last
+        call, so a burst of edits results in a single check.
+        """
+        self._ready_check_timer.start()
+
     def reset(self):
         raise NotImplementedError
 
@@ -99,14 +117,28 @@ class PlanWidgetBase(QWidget):
         """
         raise NotImplementedError("This method should be implemented by child classes.")
 
+    def estimate_plan_items(self):
+        """
+        Return plan items that represent the plans of ``create_plan_items``
+        for time estimation.
+
+        Subclasses may override this to avoid creating every plan item, if
+        several items have the same duration.
+
+        Returns
+        -------
+        list of tuple
+            ``(item, count)`` pairs, where *count* is the number of plans
+            with the duration of *item*.
+        """
+        return [(item, 1) for item in self.create_plan_items()]
+
     def submit_all_plans(self):
         """
-        Create and submit all plan items.
+        Create and submit all plan items in batches.
         """
         plan_items = self.create_plan_items()
-        for item in plan_items:
-            if not self.submit_plan(item):
-                break
+        submit_plans(self, self.run_engine_client, plan_items)
 
     def stage_plan(self, item):
         """
@@ -129,9 +161,15 @@ class PlanWidgetBase(QWidget):
         Create and stage all plan items.
         """
         plan_items = self.create_plan_items()
-        for item in plan_items:
-            if not self.stage_plan(item):
-                break  # Stop staging if an error occurs
+        try:
+            self.model.queue_staging.queue_item_add_batch(items=plan_items)
+        except Exception as e:
+            QMessageBox.critical(
+                self,
+                "Plan Staging Error",
+                f"Failed to stage plans: {str(e)}",
+                QMessageBox.Ok,
+            )
 
 
 class BasicPlanWidget(PlanWidgetBase):
@@ -160,7 +198,7 @@ class BasicPlanWidget(PlanWidgetBase):
 
         self.basePlanLayout = QVBoxLayout()
         self.layout.addLayout(self.basePlanLayout)
-        self.editingFinished.connect(self.check_plan_ready)
+        self.editingFinished.connect(self.schedule_plan_ready_check)
         self.setup_widget()
 
     def current_plan_changed(self, idx=None):
@@ -295,7 +333,7 @@ class MultiPlanWidget(PlanWidgetBase):
             # Create checkbox with label
             checkbox = QCheckBox(getattr(plan_widget, "display_name", "Unnamed Plan"))
             checkbox.setChecked(True)
-            checkbox.stateChanged.connect(self.check_plan_ready)
+            checkbox.stateChanged.connect(self.schedule_plan_ready_check)
             container_layout.addWidget(checkbox)
 
             # Add plan widget with stretch
@@ -305,7 +343,7 @@ class MultiPlanWidget(PlanWidgetBase):
             self.widget_checkboxes[plan_widget] = checkbox
 
             # Connect plan widget signals
-            plan_widget.plan_ready.connect(self.check_plan_ready)
+            plan_widget.plan_ready.connect(self.schedule_plan_ready_check)
 
             # Add to main layout
             self.layout.addWidget(container)
@@ -443,6 +481,21 @@ class MultiPlanWidget(PlanWidgetBase):
                     )
         return all_items
 
+    def estimate_plan_items(self):
+        """
+        Return plan items for time estimation from the selected widgets.
+
+        Returns
+        -------
+        list of tuple
+            ``(item, count)`` pairs from all selected plan widgets
+        """
+        all_items = []
+        for widget, checkbox in self.widget_checkboxes.items():
+            if checkbox.isChecked():
+                all_items.extend(widget.estimate_plan_items())
+        return all_items
+
     def reset(self):
         """Reset all plan widgets"""
         for widget in self.plan_widgets:
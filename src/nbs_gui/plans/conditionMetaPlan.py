@@ -61,7 +61,7 @@ class ConditionMetaPlan(MetaPlanBase):
         self.condition_param = ConditionParam(
             "condition", "Select Condition", "Select a condition", parent=self
         )
-        self.condition_param.editingFinished.connect(self.check_plan_ready)
+        self.condition_param.editingFinished.connect(self.schedule_plan_ready_check)
         params_layout.addWidget(self.condition_param)
 
         # Register signal for condition updates
@@ -115,7 +115,7 @@ class ConditionMetaPlan(MetaPlanBase):
             self.model, condition, self, title=f"Condition: {condition}"
         )
         # Connect parameter changes to our check_plan_ready method
-        condition_widget.plan_ready.connect(self.check_plan_ready)
+        condition_widget.plan_ready.connect(self.schedule_plan_ready_check)
 
         self.condition_params_stack.addWidget(condition_widget)
         self.condition_params_stack.setCurrentWidget(condition_widget)
@@ -35,7 +35,7 @@ class DurationMetaPlan(MetaPlanBase):
             default=60.0,
         )
         print("[DurationMetaPlan] Adding duration parameter to layout")
-        self.duration_param.editingFinished.connect(self.check_plan_ready)
+        self.duration_param.editingFinished.connect(self.schedule_plan_ready_check)
         params_layout.addWidget(self.duration_param)
 
         params_group.setLayout(params_layout)
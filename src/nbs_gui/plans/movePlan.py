@@ -3,6 +3,7 @@ from .base import AutoPlanWidget
 
 
 class MovePlanWidget(AutoPlanWidget):
+    display_name = "Movement"
     modifiersAllowed = []
 
     def __init__(self, model, parent=None):
@@ -17,7 +18,6 @@ class MovePlanWidget(AutoPlanWidget):
             },
             position=float,
         )
-        self.display_name = "Movement"
         print("Move Initialized")
 
     def create_plan_items(self):
@@ -22,6 +22,8 @@ class NBSPlanWidget(BasicPlanWidget):
         self.beamline_setup = beamline_setup
         self.plan_setup = plan_setup
         self.layout_style = layout_style
+        # Samples returned by get_params while estimating, None otherwise
+        self._estimate_samples = None
         print("Initializing NBSPlanWidget Super")
         super().__init__(model, parent, plans)
         print("Done initializing NBSPlanWidget Super")
@@ -33,7 +35,7 @@ class NBSPlanWidget(BasicPlanWidget):
             self, title="Scan Parameters", **self.initial_kwargs
         )
         self.params.append(self.scan_widget)
-        self.scan_widget.editingFinished.connect(self.check_plan_ready)
+        self.scan_widget.editingFinished.connect(self.schedule_plan_ready_check)
 
         if self.plan_setup:
             self.scan_modifier = ScanModifierParam(self.model, self)
@@ -44,7 +46,7 @@ class NBSPlanWidget(BasicPlanWidget):
 
         if self.sample_setup:
             self.sample_select = SampleSelectWidget(self.model, self)
-            self.sample_select.editingFinished.connect(self.check_plan_ready)
+            self.sample_select.editingFinished.connect(self.schedule_plan_ready_check)
             self.params.append(self.sample_select)
 
         # Create placeholder widgets for the 2x2 grid
@@ -78,3 +80,34 @@ class NBSPlanWidget(BasicPlanWidget):
             del self.widget_layout
 
         print("NBSPlanWidget setup Widget finished")
+
+    def get_params(self):
+        params = super().get_params()
+        if self._estimate_samples is not None and "samples" in params:
+            params["samples"] = self._estimate_samples
+        return params
+
+    def estimate_plan_items(self):
+        """
+        Return plan items for time estimation.
+
+        The selected samples only set the sample arguments of the plans, which
+        do not change their duration. Plans are created for the first sample
+        and counted once for every selected sample.
+
+        Returns
+        -------
+        list of tuple
+            ``(item, count)`` pairs
+        """
+        if not self.sample_setup:
+            return super().estimate_plan_items()
+        samples = self.sample_select.get_params()["samples"]
+        if not samples:
+            return []
+        self._estimate_samples = samples[:1]
+        try:
+            items = self.create_plan_items()
+        finally:
+            self._estimate_samples = None
+        return [(item, len(samples)) for item in items]
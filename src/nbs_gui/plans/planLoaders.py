@@ -3,21 +3,114 @@ from qtpy.QtWidgets import QWidget, QVBoxLayout, QTableView, QMessageBox
 from qtpy.QtCore import Qt, QAbstractTableModel, Signal
 from bluesky_queueserver_api import BPlan
 from typing import List, Dict, Any
+from ..widgets.utils import submit_plans
+
+
+class PlanTable:
+    """
+    Column store of the rows of a plan file.
+
+    Cells are kept as read from the file (strings, or None for missing cells), one
+    list per column, so loaders can resolve and convert whole columns at once.
+
+    Parameters
+    ----------
+    headers : list of str
+        Column names. If a name is repeated, the last column with the name is kept.
+    rows : iterable of sequence
+        Row values in the order of *headers*. Short rows are padded with None,
+        extra values are ignored.
+    """
+
+    def __init__(self, headers=(), rows=()):
+        headers = list(dict.fromkeys(headers))
+        self.columns = {h: [] for h in headers}
+        self.headers = headers
+        self._n_rows = 0
+        self._rows = None
+
+        n_headers = len(headers)
+        column_lists = [self.columns[h] for h in headers]
+        for row in rows:
+            row = list(row[:n_headers]) + [None] * (n_headers - len(row))
+            for column, value in zip(column_lists, row):
+                column.append(value)
+            self._n_rows += 1
+
+    @classmethod
+    def from_csv(cls, csvfile):
+        """
+        Read a CSV file with a header line, as ``csv.DictReader`` would.
+
+        Parameters
+        ----------
+        csvfile : file
+            Open text file.
+        """
+        reader = csv.reader(csvfile, skipinitialspace=True)
+        raw_headers = next(reader, [])
+        # Keep the last of repeated column names, like csv.DictReader does
+        positions = {h: n for n, h in enumerate(raw_headers)}
+        headers = list(positions)
+        order = [positions[h] for h in headers]
+        n_raw = len(raw_headers)
+        rows = []
+        for row in reader:
+            if not row:
+                continue
+            row = row + [None] * (n_raw - len(row))
+            rows.append([row[n] for n in order])
+        return cls(headers, rows)
+
+    @classmethod
+    def from_dicts(cls, data):
+        """Build a table from a list of row dictionaries."""
+        headers = list(dict.fromkeys(k for row in data for k in row))
+        return cls(headers, ([row.get(h, None) for h in headers] for row in data))
+
+    def __len__(self):
+        return self._n_rows
+
+    def column(self, name, default=None):
+        """
+        Values of a column.
+
+        Returns
+        -------
+        list
+            Column values, or *default* for each row if there is no such column.
+        """
+        if name in self.columns:
+            return self.columns[name]
+        return [default] * self._n_rows
+
+    def rows(self):
+        """Rows as a list of dictionaries ``{header: value}``."""
+        if self._rows is None:
+            if self.headers:
+                columns = [self.columns[h] for h in self.headers]
+                self._rows = [dict(zip(self.headers, _)) for _ in zip(*columns)]
+            else:
+                self._rows = [{} for _ in range(self._n_rows)]
+        return self._rows
 
 
 class PlanQueueTableModel(QAbstractTableModel):
     def __init__(self, data):
         super().__init__()
-        self._data = data
-        self._headers = list(data[0].keys()) if data else []
+        if not isinstance(data, PlanTable):
+            data = PlanTable.from_dicts(data)
+        self._table = data
+        self._headers = data.headers
+        self._columns = [data.columns[h] for h in self._headers]
 
     def data(self, index, role):
         if role == Qt.DisplayRole:
-            return str(list(self._data[index.row()].values())[index.column()])
+            return str(self._columns[index.column()][index.row()])
         return None
 
     def rowCount(self, index):
-        return len(self._data)
+        return len(self._table)
 
     def columnCount(self, index):
         return len(self._headers)
@@ -42,7 +135,16 @@ class PlanLoaderWidgetBase(QWidget):
         self.layout = QVBoxLayout(self)
         self.table_view = QTableView(self)
         self.layout.addWidget(self.table_view)
-        self.plan_queue_data = []
+        self.plan_table = PlanTable()
+
+    @property
+    def plan_queue_data(self):
+        """Rows of the loaded plan file as a list of dictionaries."""
+        return self.plan_table.rows()
+
+    @plan_queue_data.setter
+    def plan_queue_data(self, data):
+        self.plan_table = PlanTable.from_dicts(data)
 
     def load_plan_file(self, filename: str):
         """
@@ -56,8 +158,7 @@ class PlanLoaderWidgetBase(QWidget):
         """
         try:
             with open(filename, "r", newline="") as csvfile:
-                reader = csv.DictReader(csvfile, skipinitialspace=True)
-                self.plan_queue_data = list(reader)
+                self.plan_table = PlanTable.from_csv(csvfile)
             self._update_table_view()
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Error loading CSV file: {str(e)}")
@@ -67,14 +168,14 @@ class PlanLoaderWidgetBase(QWidget):
         """
         Update the QTableView with the current plan queue data.
         """
-        model = PlanQueueTableModel(self.plan_queue_data)
+        model = PlanQueueTableModel(self.plan_table)
         self.table_view.setModel(model)
 
     def clear_plan_queue(self):
         """
         Clear the current plan queue.
         """
-        self.plan_queue_data = []
+        self.plan_table = PlanTable()
         self._update_table_view()
         self.check_plan_ready()
 
@@ -106,12 +207,10 @@ class PlanLoaderWidgetBase(QWidget):
 
     def submit_all_plans(self):
         """
-        Create and submit all plan items.
+        Create and submit all plan items in batches.
         """
         plan_items = self.create_plan_items()
-        for item in plan_items:
-            if not self.submit_plan(item):
-                break  # Stop submitting if an error occurs
+        submit_plans(self, self.run_engine, plan_items)
 
     def stage_plan(self, item):
         """
@@ -134,12 +233,84 @@ class PlanLoaderWidgetBase(QWidget):
         Create and stage all plan items.
         """
         plan_items = self.create_plan_items()
-        for item in plan_items:
-            if not self.stage_plan(item):
-                break  # Stop staging if an error occurs
+        try:
+            self.model.queue_staging.queue_item_add_batch(items=plan_items)
+        except Exception as e:
+            QMessageBox.critical(
+                self,
+                "Plan Staging Error",
+                f"Failed to stage plans: {str(e)}",
+                QMessageBox.Ok,
+            )
+
+    def report_plan_errors(self, errors, title="Plan Generation Error"):
+        """
+        Show all problems found in the plan file in a single dialog.
+
+        Parameters
+        ----------
+        errors : list of str
+            Error messages, one per problem.
+        title : str
+            Dialog title.
+        """
+        n_shown = 10
+        summary = "\n".join(errors[:n_shown])
+        if len(errors) > n_shown:
+            summary += f"\n... and {len(errors) - n_shown} more"
+        msg_box = QMessageBox(self)
+        msg_box.setIcon(QMessageBox.Critical)
+        msg_box.setWindowTitle(title)
+        msg_box.setText(
+            f"Found {len(errors)} problem(s) in the plan file. No plans were created."
+        )
+        msg_box.setInformativeText(summary)
+        msg_box.setDetailedText("\n".join(errors))
+        msg_box.setStandardButtons(QMessageBox.Ok)
+        msg_box.exec_()
+
+    @staticmethod
+    def convert_column(values, convert, default, column_name, errors):
+        """
+        Convert the cells of a column, converting each distinct value once.
+
+        Parameters
+        ----------
+        values : list
+            Column cells. Missing (None) and empty cells are replaced by *default*.
+        convert : callable
+            Conversion function, e.g. ``float``.
+        default : object
+            Value for missing cells.
+        column_name : str
+            Column name used in error messages.
+        errors : list
+            ``(row, message)`` tuples are appended for cells that can not be converted.
+
+        Returns
+        -------
+        list
+            Converted values; None for cells that failed.
+        """
+        converted = {}
+        result = []
+        for n, value in enumerate(values):
+            if value is None or value == "":
+                result.append(default)
+                continue
+            if value not in converted:
+                try:
+                    converted[value] = (True, convert(value))
+                except (TypeError, ValueError):
+                    converted[value] = (False, None)
+            ok, v = converted[value]
+            if not ok:
+                errors.append((n, f"Invalid {column_name}: {value!r}"))
+            result.append(v)
+        return result
 
     def check_plan_ready(self):
-        if len(self.plan_queue_data) > 0:
+        if len(self.plan_table) > 0:
             self.plan_ready.emit(True)
         else:
             self.plan_ready.emit(False)
@@ -153,6 +324,9 @@ class XASPlanLoader(PlanLoaderWidgetBase):
     def __init__(self, model, parent=None):
         super().__init__(model, parent)
         self.xas_plans = {}
+        self.samples = {}
+        # Lowercase plan key, name and edge: plan key
+        self._plan_index = {}
         self.signal_update_xas.connect(self.update_xas)
         self.user_status.register_signal("XAS_PLANS", self.signal_update_xas)
 
@@ -161,66 +335,94 @@ class XASPlanLoader(PlanLoaderWidgetBase):
 
     def update_xas(self, xas_plans):
         self.xas_plans = xas_plans
+        index = {}
+        # Keys take precedence over names and edges, and earlier plans over later ones
+        for plan_key, plan_info in (xas_plans or {}).items():
+            for alias in (plan_info.get("name", ""), plan_info.get("edge", "")):
+                alias = (alias or "").lower()
+                if alias and alias not in index:
+                    index[alias] = plan_key
+        for plan_key in xas_plans or {}:
+            index[plan_key] = plan_key
+        self._plan_index = index
 
     def update_samples(self, sample_dict):
         self.samples = sample_dict
 
     def get_plan(self, plan_name):
-        plan_name = plan_name.lower()
-        if plan_name in self.xas_plans:
-            return plan_name
-        else:
-            for plan_key, plan_info in self.xas_plans.items():
-                if plan_name in [
-                    plan_info.get("name", "").lower(),
-                    plan_info.get("edge", "").lower(),
-                ]:
-                    return plan_key
-        raise KeyError(f"{plan_name} not found in list of XAS Plans")
+        plan_key = self._plan_index.get((plan_name or "").lower(), None)
+        if plan_key is None:
+            raise KeyError(f"{plan_name} not found in list of XAS Plans")
+        return plan_key
 
     def create_plan_items(self):
-        items = []
-        for plan_data in self.plan_queue_data:
-            sample_id = plan_data.get("Sample ID")
-            plan_name = plan_data.get("Edge")
+        items, errors = self.generate_plan_items()
+        if errors:
+            self.report_plan_errors(errors)
+            return []
+        return items
+
+    def generate_plan_items(self):
+        """
+        Validate all rows of the plan file and create the plan items.
+
+        Each distinct edge, sample and numeric value is resolved only once.
 
+        Returns
+        -------
+        items : list of BPlan
+            Plan items, empty if there are errors.
+        errors : list of str
+            One message per problem, ordered by row.
+        """
+        table = self.plan_table
+        errors = []
+
+        edges = table.column("Edge")
+        plan_keys = {}
+        for edge in set(edges):
             try:
-                plan = self.get_plan(plan_name)
-            except Exception as e:
-                QMessageBox.critical(
-                    self,
-                    "Plan Generation Error",
-                    f"Failed to create plan: {str(e)}",
-                    QMessageBox.Ok,
-                )
-                return []
-
-            if sample_id not in self.samples:
-                QMessageBox.critical(
-                    self,
-                    "Plan Generation Error",
-                    f"Sample: {sample_id} not in sample list",
-                    QMessageBox.Ok,
-                )
-                return []
-
-            plan_kwargs = {}
-            plan_kwargs["eslit"] = (
-                float(plan_data.get("Slit Size", None))
-                if plan_data.get("Slit Size") is not None
-                else None
+                plan_keys[edge] = self.get_plan(edge)
+            except KeyError:
+                plan_keys[edge] = None
+
+        sample_ids = table.column("Sample ID")
+        samples = self.samples or {}
+        for n, (edge, sample_id) in enumerate(zip(edges, sample_ids)):
+            if plan_keys[edge] is None:
+                errors.append((n, f"{edge} not found in list of XAS Plans"))
+            if sample_id not in samples:
+                errors.append((n, f"Sample: {sample_id} not in sample list"))
+
+        slits = self.convert_column(
+            table.column("Slit Size"), float, None, "Slit Size", errors
+        )
+        angles = self.convert_column(table.column("Angle"), float, None, "Angle", errors)
+        repeats = self.convert_column(table.column("Repeat"), int, 1, "Repeat", errors)
+
+        if errors:
+            errors.sort(key=lambda _: _[0])
+            # Rows are numbered as in the table view
+            return [], [f"Row {n + 1}: {msg}" for n, msg in errors]
+
+        items = [
+            BPlan(
+                plan_keys[edge],
+                sample=sample_id,
+                eslit=slit,
+                sample_position={"r": angle},
+                group_name=group_name,
+                comment=comment,
+                repeat=repeat,
             )
-            plan_kwargs["sample_position"] = {
-                "r": (
-                    float(plan_data.get("Angle", None))
-                    if plan_data.get("Angle") is not None
-                    else None
-                )
-            }
-            plan_kwargs["group_name"] = plan_data.get("Group Name", None)
-            plan_kwargs["comment"] = plan_data.get("Comment", None)
-            plan_kwargs["repeat"] = int(plan_data.get("Repeat", 1))
-
-            item = BPlan(plan, sample=sample_id, **plan_kwargs)
-            items.append(item)
-        return items
+            for edge, sample_id, slit, angle, group_name, comment, repeat in zip(
+                edges,
+                sample_ids,
+                slits,
+                angles,
+                table.column("Group Name"),
+                table.column("Comment"),
+                repeats,
+            )
+        ]
+        return items, []
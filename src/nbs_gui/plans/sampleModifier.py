@@ -7,31 +7,151 @@ from qtpy.QtWidgets import (
     QHBoxLayout,
     QLabel,
     QStackedWidget,
-    QListWidget,
-    QListWidgetItem,
+    QListView,
+    QLineEdit,
     QGroupBox,
     QFormLayout,
 )
-
-from qtpy.QtCore import Signal, Qt
+from qtpy.QtGui import QStandardItem, QStandardItemModel
+from qtpy.QtCore import Signal, Qt, QSortFilterProxyModel, QConcatenateTablesProxyModel
 from .planParam import LineEditParam, SpinBoxParam
+from ..models.sampleCatalog import SampleCatalog, get_sample_catalog
 from ..widgets.qt_custom import ScrollingComboBox
 
 
+def _is_checked(value):
+    try:
+        return Qt.CheckState(value) == Qt.Checked
+    except (TypeError, ValueError):
+        return value == Qt.Checked
+
+
+class SampleFilterModel(QSortFilterProxyModel):
+    """
+    Searchable view of a SampleCatalog with a check box for each sample.
+
+    Parameters
+    ----------
+    catalog : SampleCatalog
+        Samples to show
+    checked_samples : iterable, optional
+        Ids of the samples that are initially checked
+    parent : QObject, optional
+        Parent object
+    """
+
+    checked_changed = Signal()
+
+    def __init__(self, catalog, checked_samples=(), parent=None):
+        super().__init__(parent)
+        self.catalog = catalog
+        self._checked = set(checked_samples)
+        self._query = ""
+        self._matches = None
+        self.setSourceModel(catalog)
+        catalog.modelReset.connect(self._refresh_matches)
+        catalog.rowsInserted.connect(self._refresh_matches)
+        catalog.dataChanged.connect(self._refresh_matches)
+
+    def set_query(self, query):
+        """Show only the samples that match a search query."""
+        self._query = query
+        self._refresh_matches()
+
+    def _refresh_matches(self, *args):
+        matches = self.catalog.search(self._query)
+        if matches != self._matches:
+            self._matches = matches
+            self.invalidateFilter()
+
+    def filterAcceptsRow(self, source_row, source_parent):
+        if self._matches is None:
+            return True
+        return self.catalog.sample_key(source_row) in self._matches
+
+    def flags(self, index):
+        return super().flags(index) | Qt.ItemIsUserCheckable
+
+    def sample_key(self, index):
+        """Sample id of an index of this model."""
+        return self.catalog.sample_key(self.mapToSource(index).row())
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        if role == Qt.CheckStateRole:
+            key = self.sample_key(index)
+            return Qt.Checked if key in self._checked else Qt.Unchecked
+        return self.catalog.data(self.mapToSource(index), role)
+
+    def setData(self, index, value, role=Qt.EditRole):
+        if role != Qt.CheckStateRole or not index.isValid():
+            return False
+        key = self.sample_key(index)
+        if _is_checked(value):
+            self._checked.add(key)
+        else:
+            self._checked.discard(key)
+        self.dataChanged.emit(index, index, [Qt.CheckStateRole])
+        self.checked_changed.emit()
+        return True
+
+    def set_shown_checked(self, checked):
+        """Check or uncheck all samples that match the search query."""
+        n_rows = self.rowCount()
+        keys = [self.sample_key(self.index(row, 0)) for row in range(n_rows)]
+        if checked:
+            self._checked.update(keys)
+        else:
+            self._checked.difference_update(keys)
+        if n_rows:
+            self.dataChanged.emit(
+                self.index(0, 0), self.index(n_rows - 1, 0), [Qt.CheckStateRole]
+            )
+        self.checked_changed.emit()
+
+    def checked_samples(self):
+        """Ids of the checked samples that are in the catalog, in catalog order."""
+        return [key for key in self.catalog.keys() if key in self._checked]
+
+
 class SampleDialog(QDialog):
-    def __init__(self, samples={}, parent=None):
+    """
+    Dialog to check samples from a searchable list.
+
+    Parameters
+    ----------
+    samples : SampleCatalog or dict
+        Samples to choose from
+    parent : QWidget, optional
+        Parent widget
+    checked_samples : iterable, optional
+        Ids of the samples that are initially checked
+    """
+
+    def __init__(self, samples={}, parent=None, checked_samples=()):
         super().__init__(parent)
+        self.setWindowTitle("Select Samples")
+
+        if isinstance(samples, SampleCatalog):
+            catalog = samples
+        else:
+            catalog = SampleCatalog(self)
+            catalog.set_samples(samples)
+        self.filter_model = SampleFilterModel(catalog, checked_samples, self)
+        self.filter_model.checked_changed.connect(self.update_selected_label)
 
-        self.list_widget = QListWidget()
-        self.sample_keys = sorted(list(samples.keys()))
+        self.search_edit = QLineEdit()
+        self.search_edit.setPlaceholderText("Search sample id, name or description")
+        self.search_edit.setClearButtonEnabled(True)
+        self.search_edit.textChanged.connect(self.filter_model.set_query)
 
-        for k in self.sample_keys:
-            s = samples[k]
-            item = QListWidgetItem(f"Sample {k}: {s.get('name', '')}")
-            item.setFlags(item.flags() | Qt.ItemIsUserCheckable)
-            item.setCheckState(Qt.Unchecked)
-            item.setData(Qt.UserRole, k)
-            self.list_widget.addItem(item)
+        self.list_view = QListView()
+        self.list_view.setUniformItemSizes(True)
+        self.list_view.setModel(self.filter_model)
+
+        self.selected_label = QLabel()
+        self.update_selected_label()
 
         self.ok_button = QPushButton("OK")
         self.ok_button.clicked.connect(self.accept)
@@ -39,6 +159,10 @@ class SampleDialog(QDialog):
         # Add Check All and Uncheck All buttons
         self.check_all_button = QPushButton("Check All Samples")
         self.uncheck_all_button = QPushButton("Uncheck All Samples")
+        self.check_all_button.setToolTip("Check all samples that match the search")
+        self.uncheck_all_button.setToolTip(
+            "Uncheck all samples that match the search"
+        )
         self.check_all_button.clicked.connect(self.check_all_samples)
         self.uncheck_all_button.clicked.connect(self.uncheck_all_samples)
 
@@ -48,26 +172,26 @@ class SampleDialog(QDialog):
         button_layout.addWidget(self.uncheck_all_button)
 
         layout = QVBoxLayout(self)
-        layout.addWidget(self.list_widget)
+        layout.addWidget(self.search_edit)
+        layout.addWidget(self.list_view)
+        layout.addWidget(self.selected_label)
         layout.addLayout(button_layout)
         layout.addWidget(self.ok_button)
         self.setLayout(layout)
 
+    def update_selected_label(self):
+        n_checked = len(self.filter_model.checked_samples())
+        n_samples = self.filter_model.catalog.rowCount()
+        self.selected_label.setText(f"{n_checked} of {n_samples} samples selected")
+
     def check_all_samples(self):
-        for index in range(self.list_widget.count()):
-            self.list_widget.item(index).setCheckState(Qt.Checked)
+        self.filter_model.set_shown_checked(True)
 
     def uncheck_all_samples(self):
-        for index in range(self.list_widget.count()):
-            self.list_widget.item(index).setCheckState(Qt.Unchecked)
+        self.filter_model.set_shown_checked(False)
 
     def get_checked_samples(self):
-        checked_samples = []
-        for index in range(self.list_widget.count()):
-            item = self.list_widget.item(index)
-            if item.checkState() == Qt.Checked:
-                checked_samples.append(item.data(Qt.UserRole))
-        return checked_samples
+        return self.filter_model.checked_samples()
 
 
 def create_position_widget(pos):
@@ -115,18 +239,64 @@ class NoSampleDummy(QWidget):
         self.layout.addWidget(self.input_widget)
 
 
+def sample_combo_model(catalog, placeholder_text, placeholder_enabled=False, parent=None):
+    """
+    Model of a sample combo box: a placeholder row followed by the samples of a
+    catalog. Rows follow the changes of the catalog, so the combo box keeps its
+    current sample when other samples are added or removed.
+
+    Parameters
+    ----------
+    catalog : SampleCatalog
+        Samples shown after the placeholder
+    placeholder_text : str
+        Text of the first row
+    placeholder_enabled : bool, optional
+        Whether the placeholder row can be selected
+    parent : QObject, optional
+        Parent of the models
+
+    Returns
+    -------
+    QConcatenateTablesProxyModel
+    """
+    placeholder_model = QStandardItemModel(parent)
+    placeholder = QStandardItem(placeholder_text)
+    placeholder.setEnabled(placeholder_enabled)
+    placeholder_model.appendRow(placeholder)
+    model = QConcatenateTablesProxyModel(parent)
+    model.addSourceModel(placeholder_model)
+    model.addSourceModel(catalog)
+    # The proxy does not own its source models
+    model.placeholder_model = placeholder_model
+    return model
+
+
 class SampleComboParam(QWidget):
+    """
+    Combo box to select one sample, with sample position offsets.
+
+    Parameters
+    ----------
+    parent : QWidget, optional
+        Parent widget
+    catalog : SampleCatalog, optional
+        Samples to select from. By default the widget has its own catalog,
+        filled by :meth:`update_samples`.
+    """
+
     editingFinished = Signal()
 
-    def __init__(self, parent=None):
+    def __init__(self, parent=None, catalog=None):
         super().__init__(parent=parent)
-        self.samples = {}
+        self.catalog = catalog if catalog is not None else SampleCatalog(self)
+        self.samples = self.catalog.samples
         # Use ScrollingComboBox instead of QComboBox
         self.input_widget = ScrollingComboBox(max_visible_items=10)
-        self.input_widget.addItem("Select Sample")
-        self.input_widget.setItemData(0, "", Qt.UserRole - 1)
-        # print(f"SampleComboParam: Adding {len(self.samples)} samples to QComboBox")
-        self.input_widget.addItems(self.samples.keys())
+        self.input_widget.setModel(
+            sample_combo_model(self.catalog, "Select Sample", parent=self)
+        )
+        self.input_widget.setCurrentIndex(0)
         # print("SampleComboParam: Connecting currentIndexChanged signal")
         self.input_widget.currentIndexChanged.connect(
             lambda x: self.editingFinished.emit()
@@ -154,23 +324,14 @@ class SampleComboParam(QWidget):
         # print("SampleComboParam: Initialization complete")
 
     def update_samples(self, sample_dict):
-        self.samples = sample_dict
-        self.input_widget.clear()
-        self.input_widget.addItem("Select Sample")
-        self.input_widget.setItemData(0, "", Qt.UserRole - 1)
-        self.input_widget.addItems(
-            [
-                "Sample {}: {}".format(k, v["name"])
-                for k, v in sorted(self.samples.items())
-            ]
-        )
+        self.catalog.set_samples(sample_dict)
+        self.samples = self.catalog.samples
 
     def check_ready(self):
-        return self.input_widget.currentIndex() != 0
+        return self.input_widget.currentIndex() > 0
 
     def get_params(self):
-        sampletext = self.input_widget.currentText()
-        sample_id = sampletext.split(":")[0][7:]
+        sample_id = self.input_widget.currentData(Qt.UserRole)
         positions = {}
         for widget in self.position_widgets:
             positions.update(widget.get_params())
@@ -181,12 +342,26 @@ class SampleComboParam(QWidget):
 
 
 class MultiSampleParam(QWidget):
+    """
+    Button that opens a :class:`SampleDialog` to select several samples, with
+    sample position offsets.
+
+    Parameters
+    ----------
+    parent : QWidget, optional
+        Parent widget
+    catalog : SampleCatalog, optional
+        Samples to select from. By default the widget has its own catalog,
+        filled by :meth:`update_samples`.
+    """
+
     editingFinished = Signal()
 
-    def __init__(self, parent=None):
+    def __init__(self, parent=None, catalog=None):
         super().__init__(parent=parent)
         # print("MultiSampleParam")
-        self.samples = {}
+        self.catalog = catalog if catalog is not None else SampleCatalog(self)
+        self.samples = self.catalog.samples
         self.checked_samples = []
         self.dialog_accepted = False
         self.input_widget = QPushButton("Sample Select (0 selected)")
@@ -211,15 +386,23 @@ class MultiSampleParam(QWidget):
         # print("MultiSampleParam Done")
 
     def update_samples(self, sample_dict):
-        self.samples = sample_dict
+        self.catalog.set_samples(sample_dict)
+        self.samples = self.catalog.samples
 
     def create_sample_dialog(self):
         """
         Create a sample dialog and store the checked samples when the dialog is accepted.
         """
-        dialog = SampleDialog(self.samples)
-        if dialog.exec():
-            self.checked_samples = dialog.get_checked_samples()
+        dialog = SampleDialog(self.catalog, self, checked_samples=self.checked_samples)
+        try:
+            accepted = dialog.exec()
+            checked_samples = dialog.get_checked_samples()
+        finally:
+            # The dialog is a child of this widget, and its filter model is
+            # connected to the shared catalog, so it must not outlive exec()
+            dialog.deleteLater()
+        if accepted:
+            self.checked_samples = checked_samples
             if self.checked_samples:
                 self.dialog_accepted = True
                 self.update_button_text()
@@ -266,8 +449,9 @@ class SampleSelectWidget(QGroupBox):
         self.setLayout(self.layout)
 
         self.user_status = model.user_status
-        self.samples = self.user_status.get_redis_dict("GLOBAL_SAMPLES")
-        self.samples.changed.connect(self.update_samples)
+        # Shared by all sample selections, follows GLOBAL_SAMPLES incrementally
+        self.catalog = get_sample_catalog(self.user_status)
+        self.samples = self.catalog.samples
 
         self.sample_label = QLabel("Sample Select Option")
 
@@ -278,10 +462,10 @@ class SampleSelectWidget(QGroupBox):
         self.no_sample = NoSampleDummy(self)
 
         # print("Creating Single Sample Combo")
-        self.one_sample = SampleComboParam(self)
+        self.one_sample = SampleComboParam(self, catalog=self.catalog)
         self.one_sample.editingFinished.connect(self.editingFinished.emit)
         # print("Creating Multi Sample Combo")
-        self.multi_sample = MultiSampleParam(self)
+        self.multi_sample = MultiSampleParam(self, catalog=self.catalog)
         self.multi_sample.editingFinished.connect(self.editingFinished.emit)
 
         self.sample_option.addItems(["No Sample", "One Sample", "Multiple Samples"])
@@ -302,7 +486,6 @@ class SampleSelectWidget(QGroupBox):
         h.addWidget(self.sample_option)
         self.layout.addLayout(h)
         self.layout.addWidget(self.sample_selection)
-        self.update_samples()
         # print("Sample Select Initialized")
 
     def clear_sample_selection(self, *args):
@@ -311,8 +494,8 @@ class SampleSelectWidget(QGroupBox):
 
     def update_samples(self):
         # print("Got Sample Update")
-        self.one_sample.update_samples(self.samples)
-        self.multi_sample.update_samples(self.samples)
+        self.catalog.sync()
+        self.samples = self.catalog.samples
 
     def get_params(self):
         if self.sample_option.currentText() == "No Sample":
@@ -2,6 +2,7 @@ from qtpy.QtCore import Signal
 from bluesky_queueserver_api import BPlan
 from .base import BasicPlanWidget
 from .sampleModifier import SampleComboParam
+from ..models.sampleCatalog import get_sample_catalog
 
 
 class SampleMovePlan(BasicPlanWidget):
@@ -16,27 +17,26 @@ class SampleMovePlan(BasicPlanWidget):
         Parent widget
     """
 
+    display_name = "Move Sample"
+
     def __init__(self, model, parent=None, **kwargs):
         super().__init__(model, parent, "move_sample")
-        self.display_name = "Move Sample"
 
     def setup_widget(self):
         print("Setting up SampleMovePlan widget")
         super().setup_widget()
         print("Super().setup_widget() completed")
-        self.sample_param = SampleComboParam(self)
+        # The shared catalog follows GLOBAL_SAMPLES incrementally
+        self.catalog = get_sample_catalog(self.user_status)
+        self.samples = self.catalog.samples
+        self.sample_param = SampleComboParam(self, catalog=self.catalog)
         self.params = [self.sample_param]
-        self.sample_param.editingFinished.connect(self.check_plan_ready)
+        self.sample_param.editingFinished.connect(self.schedule_plan_ready_check)
         self.basePlanLayout.addWidget(self.sample_param)
 
-        self.samples = self.user_status.get_redis_dict("GLOBAL_SAMPLES")
-        if self.samples is not None:
-            self.samples.changed.connect(self.update_samples)
-        self.update_samples()
-
     def update_samples(self):
         # print("Got Sample Update")
-        self.sample_param.update_samples(self.samples)
+        self.catalog.sync()
 
     def create_plan_items(self):
         """
@@ -6,6 +6,8 @@ from qtpy.QtWidgets import (
 
 from qtpy.QtCore import Signal, Qt
 from .planParam import ParamGroup, SpinBoxParam, LineEditParam, TextEditParam
+from .sampleModifier import sample_combo_model
+from ..models.sampleCatalog import SampleCatalog
 from nbs_gui.settings import SETTINGS
 from importlib.metadata import entry_points
 
@@ -77,13 +79,16 @@ class ReferenceComboParam(QWidget):
         self.user_status = model.user_status
 
         # print("RefComboParam: Initializing")
-        self.samples = {}
+        self.catalog = SampleCatalog(self)
+        self.samples = self.catalog.samples
         # print("RefComboParam: Creating QComboBox")
         self.input_widget = QComboBox()
-        self.input_widget.addItem("Select Reference Sample")
-        self.input_widget.setItemData(0, "", Qt.UserRole - 1)
-        # print(f"RefComboParam: Adding {len(self.samples)} samples to QComboBox")
-        self.input_widget.addItems(self.samples.keys())
+        self.input_widget.setModel(
+            sample_combo_model(
+                self.catalog, "Auto (default)", placeholder_enabled=True, parent=self
+            )
+        )
+        self.input_widget.setCurrentIndex(0)
         # print("RefComboParam: Connecting currentIndexChanged signal")
         self.input_widget.currentIndexChanged.connect(
             lambda x: self.editingFinished.emit()
@@ -102,26 +107,16 @@ class ReferenceComboParam(QWidget):
         )
 
     def update_samples(self, sample_dict):
-        self.samples = sample_dict
-        self.input_widget.clear()
-        self.input_widget.addItem("Auto (default)")
-        # self.input_widget.setItemData(0, "", Qt.UserRole - 1)
-        self.input_widget.addItems(
-            [
-                "Sample {}: {}".format(k, v["name"])
-                for k, v in sorted(self.samples.items())
-            ]
-        )
+        self.catalog.set_samples(sample_dict)
+        self.samples = self.catalog.samples
 
     def check_ready(self):
-        return self.input_widget.currentIndex() != 0
+        return self.input_widget.currentIndex() > 0
 
     def get_params(self):
-        if self.input_widget.currentIndex() == 0:
+        if self.input_widget.currentIndex() <= 0:
             return {}
-        sampletext = self.input_widget.currentText()
-        sample_id = sampletext.split(":")[0][7:]
-        return {"eref_sample": sample_id}
+        return {"eref_sample": self.input_widget.currentData(Qt.UserRole)}
 
     def reset(self):
         self.input_widget.setCurrentIndex(0)
@@ -0,0 +1,263 @@
+"""
+Startup, update throughput and memory of the GUI with simulated beamlines.
+
+Each beamline size runs in its own process, which starts a fake Redis server,
+writes a simulated profile, builds the main window against a fake queue
+server, and then puts values to the devices from a background thread while
+the event loop runs.
+
+Run with ``python -m nbs_gui.sim.benchmarks [--devices 100 1000 5000]``. The
+benchmark uses the offscreen Qt platform unless ``QT_QPA_PLATFORM`` is set.
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+
+def _process_events(app, seconds):
+    end = time.monotonic() + seconds
+    while True:
+        app.processEvents()
+        if time.monotonic() >= end:
+            return
+        time.sleep(0.002)
+
+
+def run_benchmark(n_devices, duration=5.0, rate=2000.0, tabs=None):
+    """
+    Benchmark the GUI with one simulated beamline, in this process.
+
+    Parameters
+    ----------
+    n_devices : int
+        Number of simulated devices.
+    duration : float, optional
+        Time (s) for which values are put to the devices.
+    rate : float, optional
+        Total number of values put per second.
+    tabs : sequence of str, optional
+        Entry point names of the tabs to load, see
+        :data:`~nbs_gui.sim.profile.DEFAULT_TABS`.
+
+    Returns
+    -------
+    dict
+        The measured startup times (s), update counts and rates, drain and
+        event loop lag times (ms) and resident memory (MB).
+    """
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from qtpy.QtWidgets import QApplication
+
+    from ..settings import set_top_level_model
+    from ..utils.debug_utils import current_rss_mb
+    from ..utils.hot_path import HOT_PATH
+    from ..window import MainWindow
+    from .fakeRedis import FakeRedisServer
+    from .model import SimViewerModel, UpdateDriver, update_targets
+    from .profile import DEFAULT_TABS, generate_profile
+
+    app = QApplication.instance() or QApplication([])
+    result = {"devices": n_devices, "rss_base_mb": current_rss_mb() or 0.0}
+    redis = FakeRedisServer().start()
+    log = io.StringIO()
+    with tempfile.TemporaryDirectory() as profile_dir:
+        generate_profile(
+            profile_dir,
+            n_devices,
+            redis_settings=redis.settings("sim:"),
+            tabs=tabs or DEFAULT_TABS,
+        )
+        with contextlib.redirect_stdout(log):
+            start = time.perf_counter()
+            model = SimViewerModel(profile_dir)
+            set_top_level_model(model)
+            result["startup_model_s"] = time.perf_counter() - start
+            window = MainWindow(model, show=False)
+            result["startup_window_s"] = (
+                time.perf_counter() - start - result["startup_model_s"]
+            )
+            app.processEvents()
+            result["startup_s"] = time.perf_counter() - start
+            # Let the retry timers and the first drain ticks run
+            _process_events(app, 1.0)
+    result["rss_startup_mb"] = current_rss_mb() or 0.0
+    result["rss_per_device_kb"] = (
+        1024.0 * (result["rss_startup_mb"] - result["rss_base_mb"]) / n_devices
+    )
+
+    beamline = model.beamline
+    models = list(beamline._iter_all_models())
+    received = sum(m.n_received for m in models)
+    emitted = sum(getattr(m, "n_emitted", 0) for m in models)
+    driver = UpdateDriver(update_targets(beamline), rate=rate)
+    monitor = window.stall_monitor
+    if monitor is not None:
+        monitor.reset()
+    HOT_PATH.reset()
+    with contextlib.redirect_stdout(log):
+        start = time.monotonic()
+        driver.start()
+        _process_events(app, duration)
+        driver.stop()
+        elapsed = time.monotonic() - start
+        # Drain what was stashed before the driver stopped
+        _process_events(app, 2 * beamline.update_interval_ms / 1000.0)
+
+    result["updates_sent"] = driver.n_sent
+    result["updates_per_s"] = driver.n_sent / elapsed
+    result["updates_received"] = sum(m.n_received for m in models) - received
+    result["updates_emitted"] = (
+        sum(getattr(m, "n_emitted", 0) for m in models) - emitted
+    )
+    drain = HOT_PATH.timings.get(("drain", "_drain_all_devices"), None)
+    result["drain_ticks"] = drain.count if drain is not None else 0
+    result["drain_mean_ms"] = (
+        1e3 * drain.total / drain.count if drain is not None and drain.count else 0.0
+    )
+    result["drain_max_ms"] = 1e3 * drain.max if drain is not None else 0.0
+    if monitor is not None:
+        result["lag_max_ms"] = 1e3 * monitor.max_lag
+        result["stalls"] = sum(site[0] for site in monitor.sites.values())
+    result["rss_end_mb"] = current_rss_mb() or 0.0
+    with contextlib.redirect_stdout(log):
+        # Stop the threads of the GUI as quitting the application does
+        app.aboutToQuit.emit()
+        _process_events(app, 0.1)
+    redis.stop()
+    return result
+
+
+#: Columns of the report: (result key, heading, format)
+COLUMNS = (
+    ("devices", "Devices", "{:>8d}"),
+    ("startup_model_s", "Model s", "{:>8.2f}"),
+    ("startup_window_s", "Window s", "{:>9.2f}"),
+    ("rss_startup_mb", "RSS MB", "{:>8.1f}"),
+    ("rss_per_device_kb", "KB/dev", "{:>7.1f}"),
+    ("updates_per_s", "Sent/s", "{:>8.0f}"),
+    ("updates_received", "Received", "{:>9d}"),
+    ("updates_emitted", "Emitted", "{:>8d}"),
+    ("drain_mean_ms", "Drain ms", "{:>9.2f}"),
+    ("drain_max_ms", "Max ms", "{:>7.1f}"),
+    ("lag_max_ms", "Lag ms", "{:>7.0f}"),
+    ("stalls", "Stalls", "{:>6d}"),
+    ("rss_end_mb", "End MB", "{:>7.1f}"),
+)
+
+
+def format_report(results):
+    """
+    Text table of benchmark results.
+
+    Parameters
+    ----------
+    results : list of dict
+        Results of :func:`run_benchmark`, one per beamline size.
+
+    Returns
+    -------
+    str
+        One line per beamline size.
+    """
+    widths = [len(fmt.format(0 if "d" in fmt else 0.0)) for _, _, fmt in COLUMNS]
+    lines = [
+        " ".join(
+            heading.rjust(width) for (_, heading, _), width in zip(COLUMNS, widths)
+        )
+    ]
+    for result in results:
+        cells = []
+        for (key, _, fmt), width in zip(COLUMNS, widths):
+            value = result.get(key, None)
+            cells.append("-".rjust(width) if value is None else fmt.format(value))
+        lines.append(" ".join(cells))
+    return "\n".join(lines)
+
+
+def _run_in_subprocess(n_devices, args):
+    with tempfile.NamedTemporaryFile(suffix=".json", delete=False) as f:
+        result_file = f.name
+    command = [
+        sys.executable,
+        "-m",
+        "nbs_gui.sim.benchmarks",
+        "--devices",
+        str(n_devices),
+        "--duration",
+        str(args.duration),
+        "--rate",
+        str(args.rate),
+        "--in-process",
+        "--result-file",
+        result_file,
+    ]
+    if args.tabs:
+        command += ["--tabs", *args.tabs]
+    try:
+        process = subprocess.run(command, capture_output=True, text=True)
+        if process.returncode != 0:
+            print(f"Benchmark of {n_devices} devices failed:\n{process.stderr}")
+            return None
+        with open(result_file) as f:
+            return json.load(f)
+    finally:
+        os.remove(result_file)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--devices",
+        type=int,
+        nargs="+",
+        default=[100, 1000, 5000],
+        help="Numbers of simulated devices",
+    )
+    parser.add_argument(
+        "--duration", type=float, default=5.0, help="Time (s) of the update phase"
+    )
+    parser.add_argument(
+        "--rate", type=float, default=2000.0, help="Values put per second"
+    )
+    parser.add_argument(
+        "--tabs", nargs="+", default=None, help="Entry point names of the tabs"
+    )
+    parser.add_argument(
+        "--in-process",
+        action="store_true",
+        help="Run all sizes in this process instead of one process each",
+    )
+    parser.add_argument("--result-file", default=None, help=argparse.SUPPRESS)
+    parser.add_argument("--json", default=None, help="Write the results to a file")
+    args = parser.parse_args(argv)
+
+    results = []
+    for n_devices in args.devices:
+        if args.in_process:
+            result = run_benchmark(n_devices, args.duration, args.rate, args.tabs)
+        else:
+            result = _run_in_subprocess(n_devices, args)
+        if result is not None:
+            results.append(result)
+    if args.result_file:
+        with open(args.result_file, "w") as f:
+            json.dump(results[0] if len(results) == 1 else results, f)
+        return 0
+    print(format_report(results))
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+    return 0 if len(results) == len(args.devices) else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,115 @@
+"""
+Simulated Ophyd devices that need no IOC.
+
+The devices are built from Ophyd soft signals, so that thousands of them can
+be created in one process. They provide what the GUI models read from the real
+devices: ``PVPositionerModel`` uses :class:`SimPositioner`, ``EnumModel``
+:class:`SimEnumSignal` and ``GVModel`` :class:`SimGateValve`.
+"""
+
+from ophyd import Component as Cpt, Device, Signal
+from ophyd.status import Status
+
+
+def _finished_status(obj):
+    status = Status(obj=obj)
+    status.set_finished()
+    return status
+
+
+class SimPositioner(Device):
+    """
+    Soft positioner that moves instantly, for ``PVPositionerModel``.
+
+    Parameters
+    ----------
+    units : str, optional
+        Engineering units of the setpoint and readback.
+    limits : tuple of float, optional
+        Lower and upper limit, ``(0, 0)`` for none.
+    """
+
+    SUB_READBACK = "readback"
+    _default_sub = SUB_READBACK
+
+    setpoint = Cpt(Signal, value=0.0, kind="normal")
+    readback = Cpt(Signal, value=0.0, kind="hinted")
+
+    def __init__(self, *args, units=None, limits=(0, 0), **kwargs):
+        super().__init__(*args, **kwargs)
+        self._limits = tuple(limits)
+        if units is not None:
+            self.setpoint._metadata["units"] = units
+            self.readback._metadata["units"] = units
+        self.readback.subscribe(self._readback_changed, run=False)
+
+    def _readback_changed(self, value=None, old_value=None, timestamp=None, **kwargs):
+        self._run_subs(
+            sub_type=self.SUB_READBACK,
+            value=value,
+            old_value=old_value,
+            timestamp=timestamp,
+        )
+
+    @property
+    def moving(self):
+        return False
+
+    @property
+    def limits(self):
+        return self._limits
+
+    def get(self, **kwargs):
+        return self.readback.get(**kwargs)
+
+    def set(self, value, **kwargs):
+        self.setpoint.put(value)
+        self.readback.put(value)
+        return _finished_status(self)
+
+    def stop(self, *, success=False):
+        pass
+
+
+class SimEnumSignal(Signal):
+    """
+    Soft signal whose value is an index into ``enum_strs``, for ``EnumModel``.
+
+    Parameters
+    ----------
+    enum_strs : sequence of str, optional
+        Names of the states.
+    value : int, optional
+        Initial index.
+    """
+
+    def __init__(self, *, enum_strs=("Out", "In"), value=0, **kwargs):
+        super().__init__(value=value, **kwargs)
+        self._metadata["enum_strs"] = tuple(enum_strs)
+
+    @property
+    def enum_strs(self):
+        return self._metadata["enum_strs"]
+
+
+class SimGateValve(Device):
+    """Gate valve that opens and closes instantly, for ``GVModel``."""
+
+    state = Cpt(Signal, value=0, kind="hinted")
+
+    openval = 1
+    closeval = 0
+
+    def open(self):
+        self.state.put(self.openval)
+        return _finished_status(self)
+
+    def close(self):
+        self.state.put(self.closeval)
+        return _finished_status(self)
+
+    def open_nonplan(self):
+        self.state.put(self.openval)
+
+    def close_nonplan(self):
+        self.state.put(self.closeval)
@@ -0,0 +1,719 @@
+"""
+In-process stand-in for the Queue Server API.
+
+:class:`FakeQueueServer` implements the ``REManagerAPI`` methods that
+``RunEngineClient`` and the GUI call, with replies shaped like those of RE
+Manager. Plans are not executed: a started queue moves one item every
+``plan_duration`` seconds from the queue to the history, so that the queue,
+running plan and history widgets see the usual changes. Functions run through
+``function_execute`` are looked up in :attr:`FakeQueueServer.functions`.
+
+:class:`SimRunEngineClient` is a ``RunEngineClient`` that talks to a
+:class:`FakeQueueServer` instead of RE Manager.
+"""
+
+from __future__ import annotations
+
+import copy
+import queue
+import threading
+import time
+import uuid
+
+from bluesky_queueserver_api import comm_base
+from bluesky_widgets.models.run_engine_client import RunEngineClient
+
+
+def _uid():
+    return str(uuid.uuid4())
+
+
+def _parameter(name, default=None, kind="POSITIONAL_OR_KEYWORD"):
+    values = {
+        "POSITIONAL_OR_KEYWORD": 1,
+        "VAR_POSITIONAL": 2,
+        "KEYWORD_ONLY": 3,
+        "VAR_KEYWORD": 4,
+    }
+    param = {"name": name, "kind": {"name": kind, "value": values[kind]}}
+    if default is not None:
+        param["default"] = default
+    return param
+
+
+def default_plans_allowed():
+    """
+    Descriptions of a few standard plans, as returned by ``plans_allowed``.
+
+    Returns
+    -------
+    dict
+        ``{plan name: plan description}``.
+    """
+    plans = {
+        "count": [
+            _parameter("detectors"),
+            _parameter("num", "1"),
+            _parameter("delay", "None"),
+            _parameter("md", "None", "KEYWORD_ONLY"),
+        ],
+        "scan": [
+            _parameter("detectors"),
+            _parameter("args", kind="VAR_POSITIONAL"),
+            _parameter("num", "None", "KEYWORD_ONLY"),
+            _parameter("md", "None", "KEYWORD_ONLY"),
+        ],
+        "rel_scan": [
+            _parameter("detectors"),
+            _parameter("args", kind="VAR_POSITIONAL"),
+            _parameter("num", "None", "KEYWORD_ONLY"),
+            _parameter("md", "None", "KEYWORD_ONLY"),
+        ],
+        "mv": [_parameter("args", kind="VAR_POSITIONAL")],
+        "sleep": [_parameter("time")],
+    }
+    return {
+        name: {"name": name, "module": "bluesky.plans", "parameters": parameters}
+        for name, parameters in plans.items()
+    }
+
+
+class _ConsoleMonitor:
+    """Console output of a :class:`FakeQueueServer`, like ``console_monitor``."""
+
+    def __init__(self):
+        self._queue = queue.Queue()
+        self._enabled = False
+
+    @property
+    def enabled(self):
+        return self._enabled
+
+    def enable(self):
+        self._enabled = True
+
+    def disable(self):
+        self._enabled = False
+
+    def disable_wait(self, timeout=2):
+        self._enabled = False
+
+    def clear(self):
+        while True:
+            try:
+                self._queue.get_nowait()
+            except queue.Empty:
+                return
+
+    def write(self, msg):
+        if self._enabled:
+            self._queue.put({"time": time.time(), "msg": msg})
+
+    def next_msg(self, timeout=None):
+        try:
+            return self._queue.get(timeout=timeout)
+        except queue.Empty:
+            raise comm_base.RequestTimeoutError("No message", {}) from None
+
+
+class FakeQueueServer:
+    """
+    Queue Server API backed by in-process state.
+
+    Parameters
+    ----------
+    devices : sequence of str, optional
+        Names of the allowed devices.
+    plans : dict, optional
+        Allowed plans, ``{name: description}``, see
+        :func:`default_plans_allowed`.
+    plan_duration : float, optional
+        Time (s) for which each started plan runs.
+    environment_open : bool, optional
+        Whether the worker environment exists from the start.
+    """
+
+    RequestTimeoutError = comm_base.RequestTimeoutError
+    RequestFailedError = comm_base.RequestFailedError
+    RequestError = comm_base.HTTPRequestError
+    ClientError = comm_base.HTTPClientError
+
+    def __init__(
+        self, devices=(), plans=None, plan_duration=2.0, environment_open=True
+    ):
+        self.plan_duration = plan_duration
+        self.console_monitor = _ConsoleMonitor()
+        #: ``{name: callable}`` run by ``function_execute``
+        self.functions = {
+            "get_status": self._get_user_status,
+            "request_update": self._request_update,
+        }
+        #: ``{key: value}`` served by ``get_status`` and ``request_update``
+        self.user_status = {}
+        self._user_status_uids = {}
+        self._lock = threading.RLock()
+        self._queue = []
+        self._history = []
+        self._running_item = {}
+        self._running_start = None
+        self._running_elapsed = 0.0
+        self._manager_state = "idle"
+        self._worker_exists = environment_open
+        self._stop_pending = False
+        self._autostart = False
+        self._loop = False
+        self._tasks = {}
+        self._plans = plans if plans is not None else default_plans_allowed()
+        self._devices = {
+            name: {"classname": "Device", "is_readable": True, "is_movable": True}
+            for name in devices
+        }
+        self._uids = {
+            key: _uid()
+            for key in (
+                "plan_queue_uid",
+                "plan_history_uid",
+                "run_list_uid",
+                "plans_allowed_uid",
+                "devices_allowed_uid",
+                "task_results_uid",
+            )
+        }
+
+    def _changed(self, *keys):
+        for key in keys:
+            self._uids[key] = _uid()
+
+    def _ok(self, **kwargs):
+        return dict(success=True, msg="", **kwargs)
+
+    def _failed(self, msg):
+        raise self.RequestFailedError({"success": False, "msg": msg}, msg)
+
+    # Progression of the running plan
+
+    def _advance(self):
+        """Move finished plans to the history and start the next ones."""
+        with self._lock:
+            while self._manager_state == "executing_queue":
+                elapsed = self._running_elapsed + time.monotonic() - self._running_start
+                if elapsed < self.plan_duration:
+                    return
+                self._finish_running("completed")
+                if self._stop_pending or not self._queue:
+                    self._stop_pending = False
+                    self._manager_state = "idle"
+                else:
+                    self._start_next()
+
+    def _start_next(self):
+        item = self._queue.pop(0)
+        if self._loop:
+            looped = copy.deepcopy(item)
+            looped["item_uid"] = _uid()
+            self._queue.append(looped)
+        self._running_item = item
+        self._running_start = time.monotonic()
+        self._running_elapsed = 0.0
+        self._manager_state = "executing_queue"
+        self._changed("plan_queue_uid", "run_list_uid")
+        self.console_monitor.write(f"Starting plan {item.get('name', '')}\n")
+
+    def _finish_running(self, exit_status, msg=""):
+        item = copy.deepcopy(self._running_item)
+        now = time.time()
+        item["result"] = {
+            "exit_status": exit_status,
+            "run_uids": [_uid()],
+            "scan_ids": [len(self._history) + 1],
+            "time_start": now - self.plan_duration,
+            "time_stop": now,
+            "msg": msg,
+            "traceback": "",
+        }
+        self._history.append(item)
+        self._running_item = {}
+        self._running_start = None
+        self._changed("plan_queue_uid", "plan_history_uid", "run_list_uid")
+        self.console_monitor.write(
+            f"Plan {item.get('name', '')} finished: {exit_status}\n"
+        )
+
+    # Status
+
+    def status(self, *, reload=False):
+        self._advance()
+        with self._lock:
+            status = {
+                "msg": "RE Manager v0.0.25 (simulated)",
+                "items_in_queue": len(self._queue),
+                "items_in_history": len(self._history),
+                "running_item_uid": self._running_item.get("item_uid", None),
+                "manager_state": self._manager_state,
+                "queue_stop_pending": self._stop_pending,
+                "queue_autostart_enabled": self._autostart,
+                "worker_environment_exists": self._worker_exists,
+                "worker_environment_state": (
+                    "idle" if self._worker_exists else "closed"
+                ),
+                "worker_background_tasks": 0,
+                "re_state": self._re_state(),
+                "ip_kernel_state": "disabled",
+                "ip_kernel_captured": True,
+                "pause_pending": False,
+                "run_list_uid": self._uids["run_list_uid"],
+                "plan_queue_mode": {"loop": self._loop, "ignore_failures": False},
+                "task_results_uid": self._uids["task_results_uid"],
+                "lock_info_uid": "",
+                "lock": {"environment": False, "queue": False},
+            }
+            for key in (
+                "plan_queue_uid",
+                "plan_history_uid",
+                "plans_allowed_uid",
+                "devices_allowed_uid",
+            ):
+                status[key] = self._uids[key]
+            return status
+
+    def _re_state(self):
+        if not self._worker_exists:
+            return None
+        return {"executing_queue": "running", "paused": "paused"}.get(
+            self._manager_state, "idle"
+        )
+
+    def config_get(self):
+        return self._ok(config={})
+
+    def plans_allowed(self, *, reload=False, user_group=None):
+        return self._ok(
+            plans_allowed=copy.deepcopy(self._plans),
+            plans_allowed_uid=self._uids["plans_allowed_uid"],
+        )
+
+    def devices_allowed(self, *, reload=False, user_group=None):
+        return self._ok(
+            devices_allowed=copy.deepcopy(self._devices),
+            devices_allowed_uid=self._uids["devices_allowed_uid"],
+        )
+
+    def queue_get(self, *, reload=False):
+        self._advance()
+        with self._lock:
+            return self._ok(
+                items=copy.deepcopy(self._queue),
+                running_item=copy.deepcopy(self._running_item),
+                plan_queue_uid=self._uids["plan_queue_uid"],
+            )
+
+    def history_get(self, *, reload=False):
+        self._advance()
+        with self._lock:
+            return self._ok(
+                items=copy.deepcopy(self._history),
+                plan_history_uid=self._uids["plan_history_uid"],
+            )
+
+    def re_runs(self, option="active", *, reload=False):
+        with self._lock:
+            run_list = []
+            if self._running_item:
+                run_list.append({"uid": _uid(), "is_open": True, "exit_status": None})
+            return self._ok(run_list=run_list, run_list_uid=self._uids["run_list_uid"])
+
+    # Queue editing
+
+    def _new_item(self, item, user=None, user_group=None):
+        if hasattr(item, "to_dict"):
+            item = item.to_dict()
+        item = copy.deepcopy(dict(item))
+        item.setdefault("args", [])
+        item.setdefault("kwargs", {})
+        item["item_uid"] = _uid()
+        item["user"] = user or "GUI Client"
+        item["user_group"] = user_group or "primary"
+        return item
+
+    def _index(self, uid):
+        for n, item in enumerate(self._queue):
+            if item["item_uid"] == uid:
+                return n
+        self._failed(f"Item with UID {uid} is not in the queue")
+
+    def _insert_pos(self, pos=None, before_uid=None, after_uid=None):
+        if before_uid is not None:
+            return self._index(before_uid)
+        if after_uid is not None:
+            return self._index(after_uid) + 1
+        if pos in (None, "back"):
+            return len(self._queue)
+        if pos == "front":
+            return 0
+        return pos if pos >= 0 else len(self._queue) + pos + 1
+
+    def item_add(
+        self,
+        item,
+        *,
+        pos=None,
+        before_uid=None,
+        after_uid=None,
+        user=None,
+        user_group=None,
+        lock_key=None,
+    ):
+        response = self.item_add_batch(
+            [item],
+            pos=pos,
+            before_uid=before_uid,
+            after_uid=after_uid,
+            user=user,
+            user_group=user_group,
+        )
+        return self._ok(item=response["items"][0], qsize=response["qsize"])
+
+    def item_add_batch(
+        self,
+        items,
+        *,
+        pos=None,
+        before_uid=None,
+        after_uid=None,
+        user=None,
+        user_group=None,
+        lock_key=None,
+    ):
+        new_items = [self._new_item(item, user, user_group) for item in items]
+        with self._lock:
+            n = self._insert_pos(pos, before_uid, after_uid)
+            self._queue[n:n] = new_items
+            self._changed("plan_queue_uid")
+            qsize = len(self._queue)
+        self._autostart_queue()
+        return self._ok(
+            items=copy.deepcopy(new_items),
+            results=[self._ok() for _ in new_items],
+            qsize=qsize,
+        )
+
+    def item_update(
+        self, item, *, replace=None, user=None, user_group=None, lock_key=None
+    ):
+        if hasattr(item, "to_dict"):
+            item = item.to_dict()
+        with self._lock:
+            n = self._index(item["item_uid"])
+            updated = copy.deepcopy(dict(item))
+            if replace:
+                updated["item_uid"] = _uid()
+            self._queue[n] = updated
+            self._changed("plan_queue_uid")
+            return self._ok(item=copy.deepcopy(updated), qsize=len(self._queue))
+
+    def item_get(self, *, pos=None, uid=None):
+        with self._lock:
+            n = self._index(uid) if uid is not None else (pos or 0)
+            return self._ok(item=copy.deepcopy(self._queue[n]))
+
+    def item_remove(self, *, pos=None, uid=None, lock_key=None):
+        with self._lock:
+            if uid is not None:
+                n = self._index(uid)
+            elif pos in (None, "back"):
+                n = -1
+            elif pos == "front":
+                n = 0
+            else:
+                n = pos
+            item = self._queue.pop(n)
+            self._changed("plan_queue_uid")
+            return self._ok(item=item, qsize=len(self._queue))
+
+    def item_remove_batch(self, *, uids, ignore_missing=None, lock_key=None):
+        with self._lock:
+            removed = [item for item in self._queue if item["item_uid"] in uids]
+            self._queue = [item for item in self._queue if item["item_uid"] not in uids]
+            self._changed("plan_queue_uid")
+            return self._ok(items=removed, qsize=len(self._queue))
+
+    def item_move(
+        self,
+        *,
+        pos=None,
+        uid=None,
+        pos_dest=None,
+        before_uid=None,
+        after_uid=None,
+        lock_key=None,
+    ):
+        with self._lock:
+            if uid is None:
+                uid = self._queue[pos]["item_uid"]
+        response = self.item_move_batch(
+            uids=[uid], pos_dest=pos_dest, before_uid=before_uid, after_uid=after_uid
+        )
+        return self._ok(item=response["items"][0], qsize=response["qsize"])
+
+    def item_move_batch(
+        self,
+        *,
+        uids=None,
+        pos_dest=None,
+        before_uid=None,
+        after_uid=None,
+        reorder=None,
+        lock_key=None,
+    ):
+        with self._lock:
+            uids = list(uids or [])
+            moved = [self._queue[self._index(uid)] for uid in uids]
+            if reorder:
+                moved.sort(key=lambda item: self._index(item["item_uid"]))
+            remaining = [item for item in self._queue if item["item_uid"] not in uids]
+            self._queue = remaining
+            if before_uid in uids or after_uid in uids:
+                self._failed("Reference item is one of the moved items")
+            n = self._insert_pos(pos_dest, before_uid, after_uid)
+            self._queue[n:n] = moved
+            self._changed("plan_queue_uid")
+            return self._ok(items=copy.deepcopy(moved), qsize=len(self._queue))
+
+    def item_execute(self, item, *, user=None, user_group=None, lock_key=None):
+        new_item = self._new_item(item, user, user_group)
+        with self._lock:
+            if self._manager_state != "idle":
+                self._failed("RE Manager is busy")
+            self._queue.insert(0, new_item)
+            self._stop_pending = True
+            self._start_next()
+            return self._ok(item=copy.deepcopy(new_item), qsize=len(self._queue))
+
+    def queue_clear(self, *, lock_key=None):
+        with self._lock:
+            self._queue = []
+            self._changed("plan_queue_uid")
+            return self._ok()
+
+    def queue_mode_set(self, **kwargs):
+        with self._lock:
+            mode = kwargs.get("mode", kwargs)
+            if "loop" in mode:
+                self._loop = bool(mode["loop"])
+            self._changed("plan_queue_uid")
+            return self._ok()
+
+    def history_clear(self, *, size=None, lock_key=None):
+        with self._lock:
+            self._history = [] if not size else self._history[-size:]
+            self._changed("plan_history_uid")
+            return self._ok()
+
+    # Queue execution
+
+    def queue_start(self, *, lock_key=None):
+        with self._lock:
+            if not self._worker_exists:
+                self._failed("Worker environment does not exist")
+            if self._manager_state != "idle":
+                self._failed("RE Manager is busy")
+            if self._queue:
+                self._start_next()
+            return self._ok()
+
+    def _autostart_queue(self):
+        with self._lock:
+            if self._autostart and self._manager_state == "idle" and self._queue:
+                self._start_next()
+
+    def queue_autostart(self, enable, *, lock_key=None):
+        with self._lock:
+            self._autostart = bool(enable)
+        self._autostart_queue()
+        return self._ok()
+
+    def queue_stop(self, *, lock_key=None):
+        with self._lock:
+            if self._manager_state != "executing_queue":
+                self._failed("Queue is not running")
+            self._stop_pending = True
+            return self._ok()
+
+    def queue_stop_cancel(self, *, lock_key=None):
+        with self._lock:
+            self._stop_pending = False
+            return self._ok()
+
+    def re_pause(self, option=None, *, lock_key=None):
+        with self._lock:
+            if self._manager_state != "executing_queue":
+                self._failed("No plan is running")
+            self._running_elapsed += time.monotonic() - self._running_start
+            self._manager_state = "paused"
+            return self._ok()
+
+    def re_resume(self, *, lock_key=None):
+        with self._lock:
+            if self._manager_state != "paused":
+                self._failed("No plan is paused")
+            self._running_start = time.monotonic()
+            self._manager_state = "executing_queue"
+            return self._ok()
+
+    def _re_end(self, exit_status):
+        with self._lock:
+            if self._manager_state != "paused":
+                self._failed("No plan is paused")
+            self._finish_running(exit_status)
+            if exit_status != "completed":
+                # Stopped, aborted and halted plans return to the queue
+                item = copy.deepcopy(self._history[-1])
+                item.pop("result", None)
+                self._queue.insert(0, item)
+            self._manager_state = "idle"
+            self._stop_pending = False
+            return self._ok()
+
+    def re_stop(self, *, lock_key=None):
+        return self._re_end("stopped")
+
+    def re_abort(self, *, lock_key=None):
+        return self._re_end("aborted")
+
+    def re_halt(self, *, lock_key=None):
+        return self._re_end("halted")
+
+    def kernel_interrupt(
+        self, *, interrupt_task=None, interrupt_plan=None, lock_key=None
+    ):
+        return self._ok()
+
+    # Worker environment
+
+    def _set_environment(self, exists):
+        with self._lock:
+            if self._manager_state != "idle":
+                self._failed("RE Manager is busy")
+            self._worker_exists = exists
+            self.console_monitor.write(
+                "Environment opened\n" if exists else "Environment closed\n"
+            )
+            return self._ok()
+
+    def environment_open(self, *, lock_key=None):
+        return self._set_environment(True)
+
+    def environment_close(self, *, lock_key=None):
+        return self._set_environment(False)
+
+    def environment_destroy(self, *, lock_key=None):
+        with self._lock:
+            self._manager_state = "idle"
+            self._running_item = {}
+        return self._set_environment(False)
+
+    def environment_update(self, *, run_in_background=None, lock_key=None):
+        return self._ok(task_uid=self._add_task({"success": True, "msg": ""}))
+
+    # Functions and tasks
+
+    def set_user_status(self, key, value):
+        """
+        Set an entry of the user status, as ``request_update`` returns it.
+
+        Parameters
+        ----------
+        key : str
+            Status key.
+        value : object
+            New value. Registered ``UserStatus`` signals are emitted on the
+            next status poll.
+        """
+        with self._lock:
+            self.user_status[key] = value
+            self._user_status_uids[key] = _uid()
+
+    def _get_user_status(self):
+        with self._lock:
+            return dict(self._user_status_uids)
+
+    def _request_update(self, key):
+        with self._lock:
+            return copy.deepcopy(self.user_status.get(key, None))
+
+    def _add_task(self, result):
+        task_uid = _uid()
+        with self._lock:
+            self._tasks[task_uid] = result
+            self._changed("task_results_uid")
+        return task_uid
+
+    def function_execute(
+        self, item, *, run_in_background=None, user=None, user_group=None, lock_key=None
+    ):
+        if hasattr(item, "to_dict"):
+            item = item.to_dict()
+        name = item.get("name", "")
+        function = self.functions.get(name, None)
+        if function is None:
+            self._failed(f"Function {name!r} is not allowed")
+        try:
+            value = function(*item.get("args", []), **item.get("kwargs", {}))
+            result = {"success": True, "msg": "", "return_value": value}
+        except Exception as e:
+            result = {
+                "success": False,
+                "msg": f"{type(e).__name__}: {e}",
+                "return_value": None,
+                "traceback": "",
+            }
+        task_uid = self._add_task(result)
+        return self._ok(item=item, task_uid=task_uid)
+
+    def task_result(self, task_uid):
+        with self._lock:
+            result = self._tasks.pop(task_uid, None)
+        if result is None:
+            return self._ok(task_uid=task_uid, status="not_found", result={})
+        return self._ok(task_uid=task_uid, status="completed", result=result)
+
+    def task_status(self, task_uid):
+        with self._lock:
+            status = "completed" if task_uid in self._tasks else "not_found"
+        return self._ok(task_uid=task_uid, status=status)
+
+    def wait_for_completed_task(
+        self, task_uid, *, timeout=600, monitor=None, treat_not_found_as_completed=True
+    ):
+        # Tasks complete as they are submitted
+        with self._lock:
+            if task_uid in self._tasks or treat_not_found_as_completed:
+                return {task_uid: "completed"}
+        raise self.RequestTimeoutError("Task not found", {})
+
+    # Connection
+
+    def set_authorization_key(self, *, api_key=None, token=None, refresh_token=None):
+        pass
+
+    def close(self):
+        self.console_monitor.disable()
+
+
+class SimRunEngineClient(RunEngineClient):
+    """
+    ``RunEngineClient`` that talks to a :class:`FakeQueueServer`.
+
+    Parameters
+    ----------
+    queue_server : FakeQueueServer, optional
+        The queue server. A new one is created if omitted.
+    **kwargs
+        Passed on to ``RunEngineClient``, without the server addresses.
+    """
+
+    def __init__(self, queue_server=None, **kwargs):
+        super().__init__(**kwargs)
+        # Replace the 0MQ client created by RunEngineClient
+        self._client.close()
+        self._client = queue_server if queue_server is not None else FakeQueueServer()
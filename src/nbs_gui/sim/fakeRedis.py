@@ -0,0 +1,443 @@
+"""
+In-process Redis server for the simulated beamline.
+
+:class:`FakeRedisServer` speaks the Redis protocol on a local TCP
+port, so the unmodified ``redis`` clients of nbs-gui and nbs-bl connect to it
+like to a real server. It keeps string keys in memory and implements the
+commands that the GUI uses: GET, SET, MGET, MSET, DEL, EXISTS, KEYS, SCAN,
+transactions (MULTI/EXEC, used by pipelines), publish/subscribe and keyspace
+notifications (``CONFIG SET notify-keyspace-events``), in RESP2 and, after
+``HELLO 3``, RESP3. Expiry times are accepted and ignored.
+"""
+
+from __future__ import annotations
+
+from fnmatch import fnmatchcase
+import socketserver
+import threading
+
+
+class _ReplyError(Exception):
+    """Error reply sent to the client."""
+
+
+def _encode(reply, resp3=False) -> bytes:
+    if reply is None:
+        return b"_\r\n" if resp3 else b"$-1\r\n"
+    if isinstance(reply, _ReplyError):
+        return b"-" + str(reply).encode() + b"\r\n"
+    if isinstance(reply, bool):
+        reply = int(reply)
+    if isinstance(reply, int):
+        return b":%d\r\n" % reply
+    if isinstance(reply, _Status):
+        return b"+" + reply.text.encode() + b"\r\n"
+    if isinstance(reply, str):
+        reply = reply.encode()
+    if isinstance(reply, bytes):
+        return b"$%d\r\n%s\r\n" % (len(reply), reply)
+    if isinstance(reply, dict):
+        items = [_encode(k, resp3) + _encode(v, resp3) for k, v in reply.items()]
+        head = b"%%%d\r\n" if resp3 else b"*%d\r\n"
+        size = len(reply) if resp3 else 2 * len(reply)
+        return head % size + b"".join(items)
+    if isinstance(reply, _Push):
+        head = b">%d\r\n" if resp3 else b"*%d\r\n"
+        return head % len(reply.items) + b"".join(
+            _encode(item, resp3) for item in reply.items
+        )
+    if isinstance(reply, (list, tuple)):
+        return b"*%d\r\n" % len(reply) + b"".join(
+            _encode(item, resp3) for item in reply
+        )
+    raise TypeError(f"Cannot encode reply {reply!r}")
+
+
+class _Push:
+    """Out-of-band message (publish/subscribe), a push type in RESP3."""
+
+    def __init__(self, items):
+        self.items = items
+
+
+class _Status:
+    def __init__(self, text):
+        self.text = text
+
+
+OK = _Status("OK")
+QUEUED = _Status("QUEUED")
+
+
+class _Connection(socketserver.StreamRequestHandler):
+    """One client connection, with its database, transaction and subscriptions."""
+
+    def setup(self):
+        super().setup()
+        self.db = 0
+        self.resp3 = False
+        self.transaction = None
+        self.channels = set()
+        self.patterns = set()
+        self._write_lock = threading.Lock()
+
+    def send(self, reply):
+        data = _encode(reply, self.resp3)
+        with self._write_lock:
+            self.wfile.write(data)
+            self.wfile.flush()
+
+    def _read_command(self):
+        line = self.rfile.readline()
+        if not line:
+            return None
+        if not line.startswith(b"*"):
+            # Inline command, e.g. from telnet
+            return line.split()
+        args = []
+        for _ in range(int(line[1:])):
+            size = int(self.rfile.readline()[1:])
+            args.append(self.rfile.read(size + 2)[:-2])
+        return args
+
+    def handle(self):
+        server = self.server.fake
+        server._add_connection(self)
+        try:
+            while True:
+                try:
+                    args = self._read_command()
+                except (ConnectionError, ValueError):
+                    break
+                if args is None:
+                    break
+                if not args:
+                    continue
+                reply = server.execute(self, args)
+                if reply is not _NO_REPLY:
+                    self.send(reply)
+        except (ConnectionError, OSError):
+            pass
+        finally:
+            server._remove_connection(self)
+
+
+_NO_REPLY = object()
+
+
+class _ThreadingServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+class FakeRedisServer:
+    """
+    Redis server with in-memory string keys, for tests and benchmarks.
+
+    Parameters
+    ----------
+    host : str, optional
+        Address to listen on.
+    port : int, optional
+        Port to listen on, 0 for a free port.
+
+    Examples
+    --------
+    >>> server = FakeRedisServer().start()
+    >>> client = redis.Redis(port=server.port)
+    >>> server.stop()
+    """
+
+    def __init__(self, host="127.0.0.1", port=0):
+        self._server = _ThreadingServer((host, port), _Connection)
+        self._server.fake = self
+        self.host, self.port = self._server.server_address[:2]
+        self._thread = None
+        self._lock = threading.RLock()
+        #: {db: {key (bytes): value (bytes)}}
+        self.data = {}
+        self.config = {"notify-keyspace-events": ""}
+        self._connections = set()
+        self.n_commands = 0
+
+    def start(self):
+        """Serve in a daemon thread. Returns the server."""
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=self._server.serve_forever,
+                name="nbs-gui-fake-redis",
+                daemon=True,
+            )
+            self._thread.start()
+        return self
+
+    def stop(self):
+        """Stop serving and close the listening socket."""
+        if self._thread is not None:
+            self._server.shutdown()
+            self._thread.join(timeout=1.0)
+            self._thread = None
+        self._server.server_close()
+
+    def settings(self, prefix=""):
+        """Redis settings for ``beamline.toml`` (``[settings.redis.info]``)."""
+        return {"host": self.host, "port": self.port, "prefix": prefix}
+
+    def _add_connection(self, connection):
+        with self._lock:
+            self._connections.add(connection)
+
+    def _remove_connection(self, connection):
+        with self._lock:
+            self._connections.discard(connection)
+
+    # Commands
+
+    def execute(self, connection, args):
+        """Run one command of a connection and return its reply."""
+        self.n_commands += 1
+        name = args[0].decode().upper()
+        args = args[1:]
+        if connection.transaction is not None and name not in (
+            "EXEC",
+            "DISCARD",
+            "MULTI",
+        ):
+            connection.transaction.append((name, args))
+            return QUEUED
+        if name in ("SUBSCRIBE", "PSUBSCRIBE", "UNSUBSCRIBE", "PUNSUBSCRIBE"):
+            self._subscribe(connection, name, args)
+            return _NO_REPLY
+        return self._run(connection, name, args)
+
+    def _run(self, connection, name, args):
+        handler = getattr(self, f"_cmd_{name.lower()}", None)
+        if handler is None:
+            return _ReplyError(f"ERR unknown command '{name.lower()}'")
+        try:
+            with self._lock:
+                return handler(connection, *args)
+        except TypeError:
+            return _ReplyError(f"ERR wrong number of arguments for '{name.lower()}'")
+        except _ReplyError as e:
+            return e
+
+    def _db(self, connection):
+        return self.data.setdefault(connection.db, {})
+
+    def _cmd_ping(self, connection, message=None):
+        return _Status("PONG") if message is None else message
+
+    def _cmd_echo(self, connection, message):
+        return message
+
+    def _cmd_client(self, connection, *args):
+        return OK
+
+    def _cmd_hello(self, connection, protocol=b"2", *args):
+        if protocol not in (b"2", b"3"):
+            raise _ReplyError("NOPROTO unsupported protocol version")
+        connection.resp3 = protocol == b"3"
+        return {
+            "server": "redis",
+            "version": "7.0.0",
+            "proto": int(protocol),
+            "id": id(connection),
+            "mode": "standalone",
+            "role": "master",
+            "modules": [],
+        }
+
+    def _cmd_select(self, connection, db):
+        connection.db = int(db)
+        return OK
+
+    def _cmd_config(self, connection, action, *args):
+        action = action.decode().upper()
+        if action == "SET":
+            for key, value in zip(args[::2], args[1::2]):
+                self.config[key.decode().lower()] = value.decode()
+            return OK
+        if action == "GET":
+            reply = {}
+            for pattern in args:
+                for key, value in self.config.items():
+                    if fnmatchcase(key, pattern.decode().lower()):
+                        reply[key] = value
+            return reply
+        return OK
+
+    def _cmd_info(self, connection, *args):
+        return "# Server\r\nredis_version:7.0.0\r\nredis_mode:standalone\r\n"
+
+    def _cmd_dbsize(self, connection):
+        return len(self._db(connection))
+
+    def _cmd_flushdb(self, connection, *args):
+        self._db(connection).clear()
+        return OK
+
+    def _cmd_flushall(self, connection, *args):
+        self.data.clear()
+        return OK
+
+    def _cmd_get(self, connection, key):
+        return self._db(connection).get(key, None)
+
+    def _cmd_set(self, connection, key, value, *options):
+        db = self._db(connection)
+        options = [option.upper() for option in options]
+        if b"NX" in options and key in db:
+            return None
+        if b"XX" in options and key not in db:
+            return None
+        old = db.get(key, None)
+        db[key] = value
+        self._notify(connection.db, key, "set")
+        return old if b"GET" in options else OK
+
+    def _cmd_mget(self, connection, *keys):
+        db = self._db(connection)
+        return [db.get(key, None) for key in keys]
+
+    def _cmd_mset(self, connection, *args):
+        for key, value in zip(args[::2], args[1::2]):
+            self._cmd_set(connection, key, value)
+        return OK
+
+    def _cmd_del(self, connection, *keys):
+        db = self._db(connection)
+        removed = 0
+        for key in keys:
+            if db.pop(key, None) is not None:
+                removed += 1
+                self._notify(connection.db, key, "del")
+        return removed
+
+    _cmd_unlink = _cmd_del
+
+    def _cmd_exists(self, connection, *keys):
+        db = self._db(connection)
+        return sum(1 for key in keys if key in db)
+
+    def _cmd_type(self, connection, key):
+        return _Status("string" if key in self._db(connection) else "none")
+
+    def _cmd_expire(self, connection, key, *args):
+        return int(key in self._db(connection))
+
+    _cmd_pexpire = _cmd_expire
+
+    def _cmd_ttl(self, connection, key):
+        return -1 if key in self._db(connection) else -2
+
+    _cmd_pttl = _cmd_ttl
+
+    def _match(self, connection, pattern):
+        pattern = pattern.decode()
+        keys = self._db(connection)
+        return [key for key in keys if fnmatchcase(key.decode(), pattern)]
+
+    def _cmd_keys(self, connection, pattern):
+        return self._match(connection, pattern)
+
+    def _cmd_scan(self, connection, cursor, *args):
+        pattern = b"*"
+        for option, value in zip(args[::2], args[1::2]):
+            if option.upper() == b"MATCH":
+                pattern = value
+        # All keys are returned at once, with the final cursor
+        return [b"0", self._match(connection, pattern)]
+
+    def _cmd_multi(self, connection):
+        if connection.transaction is not None:
+            raise _ReplyError("ERR MULTI calls can not be nested")
+        connection.transaction = []
+        return OK
+
+    def _cmd_discard(self, connection):
+        connection.transaction = None
+        return OK
+
+    def _cmd_exec(self, connection):
+        if connection.transaction is None:
+            raise _ReplyError("ERR EXEC without MULTI")
+        queued, connection.transaction = connection.transaction, None
+        return [self._run(connection, name, args) for name, args in queued]
+
+    def _cmd_publish(self, connection, channel, message):
+        return self.publish(channel, message)
+
+    # Publish/subscribe
+
+    def publish(self, channel, message):
+        """Send a message to the subscribers of a channel. Returns their number."""
+        channel = channel if isinstance(channel, bytes) else channel.encode()
+        message = message if isinstance(message, bytes) else message.encode()
+        receivers = 0
+        with self._lock:
+            connections = list(self._connections)
+        text = channel.decode()
+        for connection in connections:
+            replies = []
+            if channel in connection.channels:
+                replies.append(_Push([b"message", channel, message]))
+            for pattern in list(connection.patterns):
+                if fnmatchcase(text, pattern.decode()):
+                    replies.append(_Push([b"pmessage", pattern, channel, message]))
+            for reply in replies:
+                try:
+                    connection.send(reply)
+                    receivers += 1
+                except OSError:
+                    pass
+        return receivers
+
+    def _notify(self, db, key, event):
+        flags = self.config.get("notify-keyspace-events", "")
+        if not flags:
+            return
+        if "K" in flags:
+            self.publish(b"__keyspace@%d__:" % db + key, event)
+        if "E" in flags:
+            self.publish(f"__keyevent@{db}__:{event}", key)
+
+    def _subscribe(self, connection, name, args):
+        patterns = name.startswith("P")
+        targets = connection.patterns if patterns else connection.channels
+        kind = name.lower().encode()
+        if name.startswith("UN") or name.startswith("PUN"):
+            names = list(args) or list(targets)
+            if not names:
+                count = len(connection.channels) + len(connection.patterns)
+                connection.send(_Push([kind, None, count]))
+            for item in names:
+                targets.discard(item)
+                count = len(connection.channels) + len(connection.patterns)
+                connection.send(_Push([kind, item, count]))
+            return
+        for item in args:
+            targets.add(item)
+            count = len(connection.channels) + len(connection.patterns)
+            connection.send(_Push([kind, item, count]))
+
+
+def main(argv=None):
+    import argparse
+    import time
+
+    parser = argparse.ArgumentParser(description="Run an in-memory Redis server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=6379)
+    args = parser.parse_args(argv)
+    server = FakeRedisServer(args.host, args.port).start()
+    print(f"Fake Redis server listening on {server.host}:{server.port}")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
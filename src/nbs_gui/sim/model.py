@@ -0,0 +1,143 @@
+"""
+Top-level model of the GUI connected to a simulated beamline.
+"""
+
+from __future__ import annotations
+
+import random
+import threading
+import time
+
+from ophyd import Signal
+
+from ..model import ViewerModel
+from ..settings import SETTINGS
+from .devices import SimEnumSignal, SimPositioner
+from .fakeQueueServer import FakeQueueServer, SimRunEngineClient
+
+
+class SimViewerModel(ViewerModel):
+    """
+    ``ViewerModel`` whose run engine client talks to a :class:`FakeQueueServer`.
+
+    The ``activate_mode`` function of the queue server sets the mode device of
+    the beamline, as the function of a real profile does.
+
+    Parameters
+    ----------
+    profile_dir : str
+        Profile directory, e.g. from :func:`~nbs_gui.sim.profile.generate_profile`.
+    queue_server : FakeQueueServer, optional
+        The queue server. By default one is created whose allowed devices are
+        the devices of the profile.
+    **kwargs
+        Passed on to ``ViewerModel``.
+    """
+
+    def __init__(self, profile_dir, queue_server=None, **kwargs):
+        self.queue_server = queue_server
+        super().__init__(profile_dir, **kwargs)
+
+    def create_run_engine_client(self):
+        if self.queue_server is None:
+            self.queue_server = FakeQueueServer(devices=list(SETTINGS.object_config))
+        self.queue_server.functions["activate_mode"] = self._activate_mode
+        return SimRunEngineClient(self.queue_server)
+
+    def _activate_mode(self, mode):
+        mode_model = getattr(self.beamline, "mode_model", None)
+        if mode_model is None:
+            raise ValueError("The beamline has no mode device")
+        mode_model.set_mode(mode)
+        return mode
+
+
+def update_targets(beamline):
+    """
+    Signals of a simulated beamline whose values change over time.
+
+    Parameters
+    ----------
+    beamline : GUIBeamlineModel
+        The beamline.
+
+    Returns
+    -------
+    list of ophyd.Signal
+        The readbacks of the motors and the soft signals and enums.
+    """
+    targets = []
+    for model in beamline._iter_all_models():
+        obj = getattr(model, "obj", None)
+        if isinstance(obj, SimPositioner):
+            targets.append(obj.readback)
+        elif type(obj) in (Signal, SimEnumSignal):
+            targets.append(obj)
+    return targets
+
+
+class UpdateDriver:
+    """
+    Background thread that puts new values to simulated signals.
+
+    Values are put at a fixed total rate, cycling through the signals in a
+    random order, from a thread other than the GUI thread, as the callbacks of
+    real devices arrive.
+
+    Parameters
+    ----------
+    signals : sequence of ophyd.Signal
+        Signals to update, see :func:`update_targets`.
+    rate : float, optional
+        Total number of values put per second.
+    seed : int, optional
+        Seed of the random values.
+    """
+
+    def __init__(self, signals, rate=1000.0, seed=0):
+        self.signals = list(signals)
+        self.rate = rate
+        self.n_sent = 0
+        self._random = random.Random(seed)
+        self._random.shuffle(self.signals)
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    def start(self):
+        """Start putting values."""
+        if self._thread is not None or not self.signals or self.rate <= 0:
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="nbs-gui-sim-updates", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self):
+        """Stop putting values and wait for the thread to end."""
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout=2.0)
+            self._thread = None
+
+    def _value(self, signal):
+        if isinstance(signal, SimEnumSignal):
+            return self._random.randrange(len(signal.enum_strs))
+        return round(self._random.uniform(0.0, 100.0), 3)
+
+    def _run(self):
+        # Put values in batches every few ms, so that high rates do not depend
+        # on the resolution of sleep
+        period = 0.005
+        start = time.monotonic()
+        n = 0
+        while not self._stop_event.wait(period):
+            due = int((time.monotonic() - start) * self.rate)
+            while self.n_sent < due:
+                signal = self.signals[n]
+                n = (n + 1) % len(self.signals)
+                try:
+                    signal.put(self._value(signal))
+                except Exception as e:
+                    print(f"Could not update {signal.name}: {e}")
+                self.n_sent += 1
@@ -0,0 +1,185 @@
+"""
+Generated profiles of simulated beamlines.
+
+:func:`generate_profile` writes the ``devices.toml``, ``gui_config.toml`` and
+``beamline.toml`` of a beamline with any number of simulated devices, which
+``ViewerModel`` loads like the files of a real IPython profile.
+"""
+
+from __future__ import annotations
+
+import os
+
+import tomli_w
+
+#: Fraction of the devices of each kind
+DEVICE_MIX = {"motor": 0.4, "signal": 0.4, "enum": 0.1, "valve": 0.1}
+
+#: Tabs loaded by the GUI of a simulated profile
+DEFAULT_TABS = ("nbs-gui-queue", "nbs-gui-motors", "nbs-gui-monitor", "nbs-gui-debug")
+
+_KINDS = {
+    # kind: (ophyd class, GUI model, group, key prefix)
+    "motor": (
+        "nbs_gui.sim.devices.SimPositioner",
+        "nbs_gui.models.PVPositionerModel",
+        "motors",
+        "motor",
+    ),
+    "signal": ("ophyd.Signal", "nbs_gui.models.PVModel", "signals", "signal"),
+    "enum": (
+        "nbs_gui.sim.devices.SimEnumSignal",
+        "nbs_gui.models.EnumModel",
+        "signals",
+        "enum",
+    ),
+    "valve": (
+        "nbs_gui.sim.devices.SimGateValve",
+        "nbs_gui.models.GVModel",
+        "shutters",
+        "gv",
+    ),
+}
+
+
+def _device_counts(n_devices):
+    """Number of devices of each kind, at least one of each."""
+    counts = {kind: max(int(n_devices * f), 1) for kind, f in DEVICE_MIX.items()}
+    counts["signal"] += max(n_devices - sum(counts.values()), 0)
+    return counts
+
+
+def simulated_devices(n_devices=100, modes=("a", "b"), mode_fraction=0.1, redis=True):
+    """
+    Device configuration of a simulated beamline, as in ``devices.toml``.
+
+    The devices are motors, signals, enums and gate valves in the proportions
+    of :data:`DEVICE_MIX`, plus an energy motor. A fraction of the motors and
+    signals is split among the modes, and the last mode has its own energy
+    motor.
+
+    Parameters
+    ----------
+    n_devices : int, optional
+        Number of devices besides the energy motors and the mode device.
+    modes : sequence of str, optional
+        Modes besides ``"default"``.
+    mode_fraction : float, optional
+        Fraction of the motors and signals that belong to one mode only.
+    redis : bool, optional
+        Add a ``RedisModeDevice``, which needs the Redis server of the
+        profile, as the mode device.
+
+    Returns
+    -------
+    dict
+        ``{device key: device configuration}``.
+    """
+    modes = list(modes)
+    devices = {}
+    energy = {
+        "_target": _KINDS["motor"][0],
+        "_group": "source",
+        "_role": "energy",
+        "units": "eV",
+    }
+    devices["energy"] = dict(energy)
+    if modes:
+        devices["energy"]["_modes"] = ["default"] + modes[:-1]
+        devices[f"{modes[-1]}_energy"] = dict(energy, _modes=modes[-1:])
+    if redis and modes:
+        devices["beamline_mode"] = {
+            "_target": "nbs_bl.redisDevice.RedisModeDevice",
+            "prefix": "MODE",
+            "_group": "modes",
+            "_role": "mode",
+        }
+
+    for kind, count in _device_counts(n_devices).items():
+        target, _, group, prefix = _KINDS[kind]
+        n_mode = int(count * mode_fraction) if kind in ("motor", "signal") else 0
+        for n in range(count):
+            config = {"_target": target, "_group": group}
+            if kind == "motor":
+                config["units"] = "mm"
+            if modes and n >= count - n_mode:
+                config["_modes"] = [modes[n % len(modes)]]
+            devices[f"{prefix}{n}"] = config
+    return devices
+
+
+def simulated_gui_config(tabs=DEFAULT_TABS):
+    """
+    GUI configuration of a simulated beamline, as in ``gui_config.toml``.
+
+    Parameters
+    ----------
+    tabs : sequence of str, optional
+        Entry point names of the tabs to load.
+
+    Returns
+    -------
+    dict
+        The configuration.
+    """
+    loaders = {target.split(".")[-1]: model for target, model, _, _ in _KINDS.values()}
+    loaders["RedisModeDevice"] = "nbs_gui.models.mode.RedisModeModel"
+    return {
+        "gui": {
+            "tabs": {"include": list(tabs)},
+            "plans": {"load_plans": False},
+        },
+        "models": {"beamline": {"loader": "nbs_gui.models.beamline.GUIBeamlineModel"}},
+        "loaders": loaders,
+    }
+
+
+def generate_profile(
+    directory,
+    n_devices=100,
+    modes=("a", "b"),
+    mode_fraction=0.1,
+    redis_settings=None,
+    tabs=DEFAULT_TABS,
+):
+    """
+    Write the configuration files of a simulated beamline.
+
+    Parameters
+    ----------
+    directory : str
+        Profile directory, created if it does not exist.
+    n_devices : int, optional
+        Number of devices, see :func:`simulated_devices`.
+    modes : sequence of str, optional
+        Modes besides ``"default"``.
+    mode_fraction : float, optional
+        Fraction of the motors and signals that belong to one mode only.
+    redis_settings : dict, optional
+        ``host``, ``port`` and ``prefix`` of the Redis server, e.g. from
+        :meth:`~nbs_gui.sim.fakeRedis.FakeRedisServer.settings`. Without
+        them the profile has no Redis server and no mode device.
+    tabs : sequence of str, optional
+        Entry point names of the tabs to load.
+
+    Returns
+    -------
+    str
+        The profile directory.
+    """
+    os.makedirs(directory, exist_ok=True)
+    devices = simulated_devices(
+        n_devices, modes, mode_fraction, redis=redis_settings is not None
+    )
+    beamline = {}
+    if redis_settings is not None:
+        beamline["settings"] = {"redis": {"info": dict(redis_settings)}}
+    files = {
+        "devices.toml": devices,
+        "gui_config.toml": simulated_gui_config(tabs),
+        "beamline.toml": beamline,
+    }
+    for filename, config in files.items():
+        with open(os.path.join(directory, filename), "wb") as f:
+            tomli_w.dump(config, f)
+    return directory
@@ -15,18 +15,29 @@ from qtpy.QtWidgets import (
     QCheckBox,
     QSpinBox,
     QLabel,
+    QTabWidget,
+    QProgressBar,
+    QComboBox,
 )
 
 from ..utils.debug_utils import (
-    dump_timer_stats,
-    dump_object_counts,
+    iter_timer_stats,
+    iter_object_counts,
     dump_memory_stats,
-    dump_widget_stats,
+    iter_widget_stats,
     dump_process_info,
-    dump_full_snapshot,
-    dump_referrers_summary,
-    dump_referrers_aggregate,
+    iter_full_snapshot,
+    dump_update_rates,
+    iter_referrers_summary,
+    iter_referrers_aggregate,
+    iter_take_snapshot,
+    diff_snapshots,
 )
+from ..settings import SETTINGS
+from ..utils.debug_jobs import IncrementalJob
+from ..utils.sampling_profiler import SamplingProfiler
+from ..utils.stall_monitor import get_stall_monitor
+from ..widgets.hotPathTable import HotPathView
 from ..widgets.simpleConsoleMonitor import QtReConsoleMonitor
 
 
@@ -120,9 +131,23 @@ class DebugTab(QWidget):
         self._auto_timer.setSingleShot(False)
         self._auto_timer.timeout.connect(self._emit_full_snapshot)
 
+        self._job = None
+        #: Object snapshots, oldest first
+        self._snapshots = []
+
+        self._profiler = None
+        self._profile_timer = QTimer(self)
+        self._profile_timer.setInterval(250)
+        self._profile_timer.timeout.connect(self._poll_profiler)
+
+        self._hot_paths = HotPathView(getattr(model, "beamline", None), parent=self)
+        self._views = QTabWidget()
+        self._views.addTab(self._console, "Output")
+        self._views.addTab(self._hot_paths, "Hot Paths")
+
         root = QVBoxLayout()
         root.addWidget(self._build_controls())
-        root.addWidget(self._console)
+        root.addWidget(self._views)
         self.setLayout(root)
 
         self._append(_format_block("Process Info", dump_process_info()))
@@ -185,11 +210,14 @@ class DebugTab(QWidget):
         btn_process.clicked.connect(self._emit_process_info)
         btn_snapshot = QPushButton("Full Snapshot")
         btn_snapshot.clicked.connect(self._emit_full_snapshot)
+        btn_rates = QPushButton("Update Rates")
+        btn_rates.clicked.connect(self._emit_update_rates)
         btn_clear = QPushButton("Clear Output")
         btn_clear.clicked.connect(self._clear_output)
         row2.addWidget(btn_widgets)
         row2.addWidget(btn_process)
         row2.addWidget(btn_snapshot)
+        row2.addWidget(btn_rates)
         row2.addWidget(btn_clear)
 
         row3 = QHBoxLayout()
@@ -206,6 +234,61 @@ class DebugTab(QWidget):
         row3.addWidget(btn_agg_gw)
         row3.addWidget(btn_agg_fw)
 
+        row4 = QHBoxLayout()
+        btn_lag = QPushButton("Event Loop Lag")
+        btn_lag.clicked.connect(self._emit_event_loop_lag)
+        btn_sites = QPushButton("Top Stall Sites")
+        btn_sites.clicked.connect(self._emit_stall_sites)
+        btn_stalls = QPushButton("Recent Stalls")
+        btn_stalls.clicked.connect(self._emit_recent_stalls)
+        btn_reset_stalls = QPushButton("Reset Stalls")
+        btn_reset_stalls.clicked.connect(self._reset_stalls)
+        row4.addWidget(btn_lag)
+        row4.addWidget(btn_sites)
+        row4.addWidget(btn_stalls)
+        row4.addWidget(btn_reset_stalls)
+
+        profile_row = QHBoxLayout()
+        self._sb_profile_seconds = QSpinBox()
+        self._sb_profile_seconds.setRange(1, 600)
+        self._sb_profile_seconds.setValue(10)
+        self._cb_profile_threads = QCheckBox("All threads")
+        self._btn_profile = QPushButton("Start Profiler")
+        self._btn_profile.clicked.connect(self._toggle_profiler)
+        self._profile_status = QLabel("")
+        profile_row.addWidget(QLabel("Profile for"))
+        profile_row.addWidget(self._sb_profile_seconds)
+        profile_row.addWidget(QLabel("seconds"))
+        profile_row.addWidget(self._cb_profile_threads)
+        profile_row.addWidget(self._btn_profile)
+        profile_row.addWidget(self._profile_status)
+        profile_row.addStretch()
+
+        snapshot_row = QHBoxLayout()
+        btn_take_snapshot = QPushButton("Take Object Snapshot")
+        btn_take_snapshot.clicked.connect(self._take_snapshot)
+        self._cb_snapshot_old = QComboBox()
+        self._cb_snapshot_new = QComboBox()
+        btn_diff = QPushButton("Diff Snapshots")
+        btn_diff.clicked.connect(self._diff_snapshots)
+        snapshot_row.addWidget(btn_take_snapshot)
+        snapshot_row.addWidget(self._cb_snapshot_old)
+        snapshot_row.addWidget(QLabel("->"))
+        snapshot_row.addWidget(self._cb_snapshot_new)
+        snapshot_row.addWidget(btn_diff)
+        snapshot_row.addStretch()
+
+        job_row = QHBoxLayout()
+        self._job_label = QLabel("")
+        self._job_progress = QProgressBar()
+        self._job_progress.setTextVisible(True)
+        self._btn_cancel_job = QPushButton("Cancel")
+        self._btn_cancel_job.setEnabled(False)
+        self._btn_cancel_job.clicked.connect(self._cancel_job)
+        job_row.addWidget(self._job_label)
+        job_row.addWidget(self._job_progress)
+        job_row.addWidget(self._btn_cancel_job)
+
         auto_row = QHBoxLayout()
         self._cb_auto = QCheckBox("Auto-refresh every")
         self._cb_auto.stateChanged.connect(self._auto_refresh_changed)
@@ -221,6 +304,10 @@ class DebugTab(QWidget):
         vbox.addLayout(row1)
         vbox.addLayout(row2)
         vbox.addLayout(row3)
+        vbox.addLayout(row4)
+        vbox.addLayout(profile_row)
+        vbox.addLayout(snapshot_row)
+        vbox.addLayout(job_row)
         vbox.addLayout(auto_row)
         group.setLayout(vbox)
         return group
@@ -267,56 +354,253 @@ class DebugTab(QWidget):
         if self._cb_auto.isChecked():
             self._auto_timer.start(int(self._sb_seconds.value() * 1000))
 
+    def _run_job(self, title: str, job, on_finished=None) -> bool:
+        """
+        Run an incremental analysis, one at a time, with progress and cancel.
+
+        Parameters
+        ----------
+        title : str
+            Name of the analysis.
+        job : generator
+            Analysis from ``debug_utils``.
+        on_finished : callable, optional
+            Called with the result. By default, the result is appended to the
+            output as a text block.
+
+        Returns
+        -------
+        bool
+            False if another analysis is running.
+        """
+
+        if self._job is not None and self._job.running:
+            job.close()
+            self._append(f"{title}: waiting for {self._job.title} to finish or cancel")
+            return False
+        if on_finished is None:
+
+            def on_finished(result):
+                self._append(_format_block(title, result))
+
+        self._job = IncrementalJob(title, job, parent=self)
+        self._job.progress.connect(self._job_progressed)
+        self._job.finished.connect(lambda result: self._job_done(result, on_finished))
+        self._job.failed.connect(
+            lambda error: self._job_done(f"{title} failed: {error}", self._append)
+        )
+        self._job_label.setText(title)
+        self._job_progress.setRange(0, 0)
+        self._btn_cancel_job.setEnabled(True)
+        self._job.start()
+        return True
+
+    def _job_progressed(self, message: str, done: int, total: int) -> None:
+        self._job_label.setText(f"{self._job.title}: {message}")
+        if total > 0:
+            self._job_progress.setRange(0, total)
+            self._job_progress.setValue(done)
+        else:
+            self._job_progress.setRange(0, 0)
+
+    def _job_done(self, result, on_finished) -> None:
+        job = self._job
+        self._btn_cancel_job.setEnabled(False)
+        self._job_progress.setRange(0, 1)
+        self._job_progress.setValue(1)
+        self._job_label.setText(f"{job.title}: done in {job.elapsed:.1f} s")
+        self._job = None
+        job.deleteLater()
+        on_finished(result)
+
+    def _cancel_job(self) -> None:
+        job = self._job
+        if job is None or not job.running:
+            return
+        job.cancel()
+        self._btn_cancel_job.setEnabled(False)
+        self._job_progress.setRange(0, 1)
+        self._job_progress.setValue(0)
+        self._job_label.setText(f"{job.title}: cancelled")
+        self._job = None
+        job.deleteLater()
+
+    def _take_snapshot(self) -> None:
+        label = f"#{len(self._snapshots) + 1}"
+        self._run_job(
+            f"Object Snapshot {label}",
+            iter_take_snapshot(label),
+            on_finished=self._add_snapshot,
+        )
+
+    def _add_snapshot(self, snapshot) -> None:
+        self._snapshots.append(snapshot)
+        text = f"{snapshot.label} {snapshot.time:%H:%M:%S}"
+        self._cb_snapshot_old.addItem(text)
+        self._cb_snapshot_new.addItem(text)
+        self._cb_snapshot_old.setCurrentIndex(max(len(self._snapshots) - 2, 0))
+        self._cb_snapshot_new.setCurrentIndex(len(self._snapshots) - 1)
+        summary = f"{text}: {snapshot.total} objects of {len(snapshot.counts)} types"
+        if snapshot.rss_mb is not None:
+            summary += f", RSS {snapshot.rss_mb:.1f} MB"
+        self._append(_format_block("Object Snapshot", summary))
+
+    def _diff_snapshots(self) -> None:
+        old = self._cb_snapshot_old.currentIndex()
+        new = self._cb_snapshot_new.currentIndex()
+        if old < 0 or new < 0:
+            self._append("Take two object snapshots to compare them")
+            return
+        self._append(
+            _format_block(
+                "Snapshot Diff",
+                diff_snapshots(self._snapshots[old], self._snapshots[new]),
+            )
+        )
+
     def _emit_timer_stats(self) -> None:
-        self._append(_format_block("QTimer Stats", dump_timer_stats()))
+        self._run_job("QTimer Stats", iter_timer_stats())
 
     def _emit_object_counts(self) -> None:
-        self._append(_format_block("Python Object Counts", dump_object_counts()))
+        self._run_job("Python Object Counts", iter_object_counts())
 
     def _emit_memory_stats(self) -> None:
         self._append(_format_block("Memory Stats", dump_memory_stats()))
 
     def _emit_widget_stats(self) -> None:
-        self._append(_format_block("Widget Stats", dump_widget_stats()))
+        self._run_job("Widget Stats", iter_widget_stats())
 
     def _emit_process_info(self) -> None:
         self._append(_format_block("Process Info", dump_process_info()))
 
     def _emit_full_snapshot(self) -> None:
-        self._append(dump_full_snapshot())
+        if self._job is not None and self._job.running:
+            # Skip an auto-refresh while another analysis runs
+            return
+        self._run_job("Full Snapshot", iter_full_snapshot(), on_finished=self._append)
 
-    def _emit_referrers_generatorworker(self) -> None:
-        self._append(
-            _format_block(
-                "Referrers: GeneratorWorker",
-                dump_referrers_summary("GeneratorWorker", sample=5, ref_limit=75),
+    def _emit_update_rates(self) -> None:
+        beamline = getattr(self.model, "beamline", None)
+        self._append(_format_block("Update Rates", dump_update_rates(beamline)))
+
+    def _emit_stall_report(self, title: str, report) -> None:
+        monitor = get_stall_monitor()
+        if monitor is None:
+            body = "Stall monitor is not running, see [gui.stall_monitor]"
+        else:
+            body = report(monitor)
+        self._append(_format_block(title, body))
+
+    def _emit_event_loop_lag(self) -> None:
+        self._emit_stall_report("Event Loop Lag", lambda m: m.lag_report())
+
+    def _emit_stall_sites(self) -> None:
+        self._emit_stall_report("Top Stall Sites", lambda m: m.top_sites_report())
+
+    def _emit_recent_stalls(self) -> None:
+        self._emit_stall_report("Recent Stalls", lambda m: m.recent_report())
+
+    def _reset_stalls(self) -> None:
+        monitor = get_stall_monitor()
+        if monitor is not None:
+            monitor.reset()
+
+    def _toggle_profiler(self) -> None:
+        """
+        Start the sampling profiler, or stop it before its duration elapsed.
+
+        Returns
+        -------
+        None
+        """
+
+        if self._profiler is not None and self._profiler.running:
+            self._finish_profile()
+            return
+        config = SETTINGS.gui_config.get("gui", {}).get("profiler", {})
+        self._profiler = SamplingProfiler(
+            interval_ms=float(config.get("interval_ms", 5)),
+            all_threads=self._cb_profile_threads.isChecked(),
+        )
+        self._profiler.start(duration_s=self._sb_profile_seconds.value())
+        self._btn_profile.setText("Stop Profiler")
+        self._profile_timer.start()
+
+    def _poll_profiler(self) -> None:
+        profiler = self._profiler
+        if profiler is None:
+            self._profile_timer.stop()
+            return
+        if profiler.running:
+            self._profile_status.setText(
+                f"Profiling: {profiler.elapsed:.0f} / {profiler.duration:.0f} s, "
+                f"{profiler.n_samples} samples"
             )
+        else:
+            self._finish_profile()
+
+    def _finish_profile(self) -> None:
+        """
+        Stop the profiler, save the profile and show the top functions.
+
+        Returns
+        -------
+        None
+        """
+
+        self._profile_timer.stop()
+        self._btn_profile.setText("Start Profiler")
+        profiler = self._profiler
+        if profiler is None:
+            return
+        profiler.stop()
+        config = SETTINGS.gui_config.get("gui", {}).get("profiler", {})
+        try:
+            paths = profiler.save(config.get("output_dir", None))
+            saved = "Saved:\n" + "\n".join(f"  {path}" for path in paths)
+        except OSError as e:
+            saved = f"Could not save profile: {e}"
+        self._profile_status.setText(f"{profiler.n_samples} samples")
+        self._append(
+            _format_block("Sampling Profile", profiler.summary() + "\n" + saved)
+        )
+
+    def _emit_referrers_generatorworker(self) -> None:
+        self._run_job(
+            "Referrers: GeneratorWorker",
+            iter_referrers_summary("GeneratorWorker", sample=5, ref_limit=75),
         )
 
     def _emit_referrers_functionworker(self) -> None:
-        self._append(
-            _format_block(
-                "Referrers: FunctionWorker",
-                dump_referrers_summary("FunctionWorker", sample=5, ref_limit=75),
-            )
+        self._run_job(
+            "Referrers: FunctionWorker",
+            iter_referrers_summary("FunctionWorker", sample=5, ref_limit=75),
         )
 
     def _emit_aggregate_generatorworker(self) -> None:
-        self._append(
-            _format_block(
-                "Aggregate: GeneratorWorker",
-                dump_referrers_aggregate("GeneratorWorker", max_objects=100),
-            )
+        self._run_job(
+            "Aggregate: GeneratorWorker",
+            iter_referrers_aggregate("GeneratorWorker", max_objects=100),
         )
 
     def _emit_aggregate_functionworker(self) -> None:
-        self._append(
-            _format_block(
-                "Aggregate: FunctionWorker",
-                dump_referrers_aggregate("FunctionWorker", max_objects=100),
-            )
+        self._run_job(
+            "Aggregate: FunctionWorker",
+            iter_referrers_aggregate("FunctionWorker", max_objects=100),
         )
 
+    def update_devices(self, changes) -> bool:
+        """
+        Keep the tab on device changes, it does not show beamline devices.
+
+        Returns
+        -------
+        bool
+            Always True.
+        """
+
+        return True
+
     def teardown(self) -> None:
         """
         Release resources before tab reload.
@@ -328,6 +612,12 @@ class DebugTab(QWidget):
 
         if self._auto_timer.isActive():
             self._auto_timer.stop()
+        if self._job is not None:
+            self._job.cancel()
+        self._profile_timer.stop()
+        if self._profiler is not None:
+            self._profiler.stop()
+        self._hot_paths.teardown()
         try:
             self._console.teardown()
         except Exception:
@@ -20,6 +20,9 @@ class MonitorTab(QWidget):
         self.user_status = model.user_status
         self.beamline = model.beamline
         self.model = model
+        # {group: box} of the device boxes, see update_devices
+        self._group_boxes = {}
+        self._motor_combo = None
 
         # Main layout
         vbox = QVBoxLayout()
@@ -51,16 +54,18 @@ class MonitorTab(QWidget):
         signals = getattr(self.beamline, "signals", {})
         if signals:
             print("Adding ring signals monitor...")
-            beamBox.addWidget(
-                AutoMonitorBox(signals, "Ring Signals", orientation="v")
+            self._group_boxes["signals"] = AutoMonitorBox(
+                signals, "Ring Signals", orientation="v"
             )
+            beamBox.addWidget(self._group_boxes["signals"])
             print("Ring signals monitor added")
 
         # Add shutters control if available
         shutters = getattr(self.beamline, "shutters", {})
         if shutters:
             print("Adding shutters control...")
-            beamBox.addWidget(AutoControlBox(shutters, "Shutters"))
+            self._group_boxes["shutters"] = AutoControlBox(shutters, "Shutters")
+            beamBox.addWidget(self._group_boxes["shutters"])
             print("Shutters control added")
 
         # Add detectors and vacuum monitoring
@@ -69,17 +74,19 @@ class MonitorTab(QWidget):
         detectors = getattr(self.beamline, "detectors", {})
         if detectors:
             print("Adding detectors monitor...")
-            vbox1.addWidget(
-                AutoMonitorBox(detectors, "Detectors", orientation="h")
+            self._group_boxes["detectors"] = AutoMonitorBox(
+                detectors, "Detectors", orientation="h"
             )
+            vbox1.addWidget(self._group_boxes["detectors"])
             print("Detectors monitor added")
 
         vacuum = getattr(self.beamline, "vacuum", {})
         if vacuum:
             print("Adding vacuum monitor...")
-            vbox1.addWidget(
-                AutoMonitorBox(vacuum, "Vacuum", orientation="h")
+            self._group_boxes["vacuum"] = AutoMonitorBox(
+                vacuum, "Vacuum", orientation="h"
             )
+            vbox1.addWidget(self._group_boxes["vacuum"])
             print("Vacuum monitor added")
 
         if vbox1.count() > 0:
@@ -112,7 +119,10 @@ class MonitorTab(QWidget):
         # Add motor control if any motors are available
         if motor_devices:
             print("Creating motor control widget...")
-            hbox.addWidget(AutoControlCombo(motor_devices, "Choose a Motor"))
+            self._motor_combo = AutoControlCombo(motor_devices, "Choose a Motor")
+            for group in ("motors", "manipulators", "mirrors"):
+                self._group_boxes[group] = self._motor_combo
+            hbox.addWidget(self._motor_combo)
             print("Motor control widget added")
 
         # Add sample selection if available
@@ -129,6 +139,43 @@ class MonitorTab(QWidget):
         if hbox.count() > 0:
             layout.addLayout(hbox)
 
+    def update_devices(self, changes):
+        """
+        Add and remove the widgets of devices changed by a mode change.
+
+        Parameters
+        ----------
+        changes : DeviceChanges
+            Devices added and removed from the beamline.
+
+        Returns
+        -------
+        bool
+            False if the tab must be rebuilt, i.e. if a section must be
+            added or the energy or sample holder changed.
+        """
+        if changes.roles & {"energy", "primary_sampleholder"}:
+            return False
+        groups = {
+            "signals",
+            "shutters",
+            "detectors",
+            "vacuum",
+            "motors",
+            "manipulators",
+            "mirrors",
+        }
+        for group in changes.groups() & groups:
+            if changes.added_to(group) and group not in self._group_boxes:
+                return False
+
+        for group, box in self._group_boxes.items():
+            for name in changes.removed_from(group):
+                box.remove_model(name)
+            for name, device in changes.added_to(group).items():
+                box.add_model(name, device)
+        return True
+
     def teardown(self):
         """
         Release resources before tab reload.
@@ -21,14 +21,14 @@ class MotorTab(QWidget):
         beamline = model.beamline
         print("Initializing Motor Control Tab")
         vbox = QVBoxLayout()
-        vbox.addWidget(AutoControlBox(beamline.shutters, "Shutters"))
+        self._shutters = AutoControlBox(beamline.shutters, "Shutters")
+        vbox.addWidget(self._shutters)
         # vbox.addWidget(BeamlineMotorBars(model))
-        vbox.addWidget(
-            AutoControlCombo(
-                beamline.motors | beamline.manipulators | beamline.mirrors,
-                "Choose a Motor",
-            )
+        self._motors = AutoControlCombo(
+            beamline.motors | beamline.manipulators | beamline.mirrors,
+            "Choose a Motor",
         )
+        vbox.addWidget(self._motors)
         vbox.addWidget(AutoControl(beamline.energy))
         # hbox = QHBoxLayout()
         # print("Real Manipulator")
@@ -52,6 +52,33 @@ class MotorTab(QWidget):
         vbox.addStretch()
         self.setLayout(vbox)
 
+    def update_devices(self, changes):
+        """
+        Add and remove the controls of devices changed by a mode change.
+
+        Parameters
+        ----------
+        changes : DeviceChanges
+            Devices added and removed from the beamline.
+
+        Returns
+        -------
+        bool
+            False if the tab must be rebuilt.
+        """
+        if "energy" in changes.roles:
+            return False
+        for name in changes.removed_from("shutters"):
+            self._shutters.remove_model(name)
+        for name, device in changes.added_to("shutters").items():
+            self._shutters.add_model(name, device)
+        for group in ("motors", "manipulators", "mirrors"):
+            for name in changes.removed_from(group):
+                self._motors.remove_model(name)
+            for name, device in changes.added_to(group).items():
+                self._motors.add_model(name, device)
+        return True
+
     def teardown(self):
         """
         Release resources before tab reload.
@@ -1,50 +1,65 @@
-from qtpy.QtWidgets import QApplication, QVBoxLayout, QWidget, QMainWindow
-from .settings import SETTINGS
-from .models import BeamlineModel
-from .tabs.motorTab import MotorTab
-from os.path import join, exists
-import toml
-
-
-def main():
-    app = QApplication([])
-    profile_dir = "/usr/local/share/ipython/profile_simulation/startup"
-    SETTINGS.object_config_file = join(profile_dir, "devices.toml")
-    SETTINGS.gui_config_file = join(profile_dir, "gui_config.toml")
-    if exists(SETTINGS.gui_config_file):
-        with open(SETTINGS.gui_config_file, "r") as config_file:
-            SETTINGS.gui_config = toml.load(config_file)
-    else:
-        SETTINGS.gui_config = {}
-    if exists(SETTINGS.object_config_file):
-        with open(SETTINGS.object_config_file, "r") as config_file:
-            SETTINGS.object_config = toml.load(config_file)
-    else:
-        SETTINGS.object_config = {}
-
-    beamline = BeamlineModel()
-
-    class simpleModel:
-        beamline = None
-        run_engine = None
-        user_status = None
-        settings = None
-
-    model = simpleModel()
-    model.settings = SETTINGS
-    model.beamline = beamline
-    layout = QVBoxLayout()
-    # layout.addWidget(QLabel("Testing"))
-    layout.addWidget(MotorTab(model))
-
-    main_window = QMainWindow()
-    central_widget = QWidget()
-    central_widget.setLayout(layout)
-    main_window.setCentralWidget(central_widget)
-
-    main_window.show()
-
-    app.exec_()
+"""
+Run the GUI against a simulated beamline.
+
+The beamline is a generated profile of simulated devices (see
+:mod:`nbs_gui.sim`), served by an in-process fake Redis server and fake
+Queue Server, so the GUI runs without IOCs, Redis or RE Manager.
+"""
+
+import argparse
+import tempfile
+
+from bluesky_widgets.qt import gui_qt
+
+from .settings import set_top_level_model
+from .sim.fakeRedis import FakeRedisServer
+from .sim.model import SimViewerModel, UpdateDriver, update_targets
+from .sim.profile import generate_profile
+from .window import MainWindow
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="NBS GUI with a simulated beamline")
+    parser.add_argument(
+        "--devices", type=int, default=100, help="Number of simulated devices"
+    )
+    parser.add_argument(
+        "--profile",
+        default=None,
+        help="Directory to write the generated profile to, kept after exit",
+    )
+    parser.add_argument(
+        "--rate",
+        type=float,
+        default=100.0,
+        help="Values put to the simulated devices per second, 0 for none",
+    )
+    parser.add_argument(
+        "--no-redis",
+        action="store_true",
+        help="Do not start a Redis server; the beamline has no mode device",
+    )
+    args = parser.parse_args(argv)
+
+    redis = None if args.no_redis else FakeRedisServer().start()
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        profile_dir = generate_profile(
+            args.profile or tmp_dir,
+            args.devices,
+            redis_settings=redis.settings("sim:") if redis else None,
+        )
+        driver = None
+        with gui_qt("NBS GUI Simulation"):
+            model = SimViewerModel(profile_dir)
+            set_top_level_model(model)
+            viewer = MainWindow(model)  # noqa: 401
+            if model.beamline is not None:
+                driver = UpdateDriver(update_targets(model.beamline), rate=args.rate)
+                driver.start()
+        if driver is not None:
+            driver.stop()
+    if redis is not None:
+        redis.stop()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,114 @@
+"""
+Micro-benchmarks of the per-update code paths of the device models.
+
+Run with ``python -m nbs_gui.utils.benchmarks [-n UPDATES]``. The benchmarks
+do not need a display, a beamline or a connection to any device.
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import time
+
+import numpy as np
+
+from ..models.base import formatFloat
+from ..models.valueFormat import ValueFormatter
+
+
+def _noisy_values(n: int, seed: int = 0) -> list:
+    """
+    Values of a noisy signal, like a ring current: small fluctuations around
+    a slow decay, with about a third of the updates repeating the last value.
+    """
+
+    rng = random.Random(seed)
+    values = []
+    value = 400.0
+    for i in range(n):
+        if rng.random() > 0.3:
+            value = 400.0 - 1e-5 * i + rng.gauss(0, 0.002)
+        values.append(value)
+    return values
+
+
+def _update_with_format_float(values) -> int:
+    """The update path before ValueFormatter: format, then compare strings."""
+
+    last = None
+    emitted = 0
+    for value in values:
+        text = formatFloat(value)
+        if text != last:
+            last = text
+            emitted += 1
+    return emitted
+
+
+def _update_with_formatter(values, deadband: float = 0.0) -> int:
+    formatter = ValueFormatter(float, deadband=deadband)
+    update = formatter.update
+    emitted = 0
+    for value in values:
+        if update(value) is not None:
+            emitted += 1
+    return emitted
+
+
+def _time(func, *args, **kwargs):
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return time.perf_counter() - start, result
+
+
+def benchmark_value_formatting(n: int = 1_000_000) -> str:
+    """
+    Compare the cost of float value updates with and without ValueFormatter.
+
+    Parameters
+    ----------
+    n : int
+        Number of updates.
+
+    Returns
+    -------
+    str
+        Multi-line text report with the time per update and the number of
+        updates that would be emitted to the views.
+    """
+
+    values = _noisy_values(n)
+    np_values = list(np.asarray(values, dtype=np.float64))
+    cases = [
+        ("formatFloat + string compare", _update_with_format_float, values, {}),
+        ("ValueFormatter", _update_with_formatter, values, {}),
+        ("ValueFormatter, numpy floats", _update_with_formatter, np_values, {}),
+        (
+            "ValueFormatter, deadband 0.01",
+            _update_with_formatter,
+            values,
+            {"deadband": 0.01},
+        ),
+    ]
+    lines = [f"Value formatting, {n} float updates:"]
+    for label, func, data, kwargs in cases:
+        elapsed, emitted = _time(func, data, **kwargs)
+        lines.append(
+            f"  {label:<32} {elapsed * 1e9 / n:7.0f} ns/update  "
+            f"{elapsed:6.2f} s  {emitted} emitted"
+        )
+    return "\n".join(lines)
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "-n", "--updates", type=int, default=1_000_000, help="Number of updates"
+    )
+    args = parser.parse_args(argv)
+    print(benchmark_value_formatting(args.updates))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+Time-budgeted execution of incremental analyses on the GUI thread.
+"""
+
+from __future__ import annotations
+
+import time
+
+from qtpy.QtCore import QObject, QTimer, Signal
+
+
+class IncrementalJob(QObject):
+    """
+    Run an incremental analysis a few steps per event loop iteration.
+
+    The analysis is a generator that yields ``(message, done, total)`` progress
+    tuples and returns its result, like the ``iter_*`` functions of
+    :mod:`nbs_gui.utils.debug_utils`. Each timer tick advances the generator
+    until ``budget_ms`` have passed, then returns to the event loop, so the
+    GUI stays responsive while the analysis runs.
+
+    Parameters
+    ----------
+    title : str
+        Name of the analysis.
+    job : generator
+        The analysis.
+    budget_ms : float, optional
+        Time spent on the analysis per event loop iteration.
+
+    Signals
+    -------
+    progress(str, int, int)
+        Message, steps done and total steps of the current phase. Total is 0
+        while the length of the phase is unknown.
+    finished(object)
+        Result of the analysis.
+    failed(str)
+        Error message if the analysis raised an exception.
+    """
+
+    progress = Signal(str, int, int)
+    finished = Signal(object)
+    failed = Signal(str)
+
+    def __init__(self, title, job, budget_ms=20, parent=None):
+        super().__init__(parent)
+        self.title = title
+        self._job = job
+        self.budget_ms = budget_ms
+        self.cancelled = False
+        self.start_time = None
+        self._timer = QTimer(self)
+        self._timer.setInterval(0)
+        self._timer.timeout.connect(self._step)
+
+    @property
+    def running(self):
+        return self._timer.isActive()
+
+    @property
+    def elapsed(self):
+        """Time (s) since the job started."""
+        if self.start_time is None:
+            return 0.0
+        return time.monotonic() - self.start_time
+
+    def start(self):
+        """Start running the analysis from the event loop."""
+        self.start_time = time.monotonic()
+        self._timer.start()
+
+    def cancel(self):
+        """Stop the analysis and release the objects it holds."""
+        if not self.running:
+            return
+        self._timer.stop()
+        self.cancelled = True
+        self._job.close()
+
+    def _step(self):
+        deadline = time.perf_counter() + self.budget_ms / 1000.0
+        last = None
+        try:
+            while True:
+                last = next(self._job)
+                if time.perf_counter() >= deadline:
+                    break
+        except StopIteration as stop:
+            self._timer.stop()
+            self.finished.emit(stop.value)
+            return
+        except Exception as e:
+            self._timer.stop()
+            self.failed.emit(f"{type(e).__name__}: {e}")
+            return
+        if last is not None:
+            self.progress.emit(*last)
@@ -3,6 +3,16 @@ Utilities for collecting debugging information from a running nbs-gui process.
 
 The functions in this module are intended to be called from GUI actions (e.g.
 button clicks) and return formatted text for display.
+
+Analyses that walk all objects tracked by the garbage collector are generators
+(``iter_*``), which do a bounded amount of work per step and yield their
+progress as ``(message, done, total)`` tuples. The result of the analysis is
+the return value of the generator. The Debug tab runs them a few steps per
+event loop iteration with :class:`~nbs_gui.utils.debug_jobs.IncrementalJob`,
+and the ``dump_*`` functions run them to completion with
+:func:`run_to_completion`. Listing the objects (``gc.get_objects()``),
+collecting garbage and ``gc.get_referrers()`` are single steps that can not be
+split.
 """
 
 from __future__ import annotations
@@ -10,6 +20,8 @@ from __future__ import annotations
 from datetime import datetime
 import gc
 import os
+import time
+import weakref
 from typing import Iterable
 from collections import Counter
 
@@ -30,10 +42,77 @@ def _timestamp() -> str:
     return datetime.now().strftime("%Y-%m-%d %H:%M:%S")
 
 
+#: Number of objects examined per step of an incremental analysis
+CHUNK_SIZE = 20000
+
+
+def run_to_completion(job):
+    """
+    Run an incremental analysis on the calling thread.
+
+    Parameters
+    ----------
+    job : generator
+        One of the ``iter_*`` analyses of this module.
+
+    Returns
+    -------
+    object
+        The result of the analysis.
+    """
+
+    while True:
+        try:
+            next(job)
+        except StopIteration as stop:
+            return stop.value
+
+
+def _iter_gc_objects(collect: bool = False):
+    """
+    List the objects tracked by the garbage collector, as one step.
+
+    Returns
+    -------
+    list[object]
+        The objects, from ``gc.get_objects()``.
+    """
+
+    if collect:
+        yield ("Collecting garbage", 0, 0)
+        gc.collect()
+    yield ("Listing objects", 0, 0)
+    return gc.get_objects()
+
+
+def _iter_scan(objs: list, message: str, func):
+    """
+    Call ``func`` on consecutive chunks of ``objs``, one chunk per step.
+    """
+
+    total = len(objs)
+    for start in range(0, total, CHUNK_SIZE):
+        func(objs[start : start + CHUNK_SIZE])
+        yield (message, min(start + CHUNK_SIZE, total), total)
+
+
 def dump_timer_stats() -> str:
     """
     Dump statistics about Qt timers in the current application.
 
+    Returns
+    -------
+    str
+        See :func:`iter_timer_stats`.
+    """
+
+    return run_to_completion(iter_timer_stats())
+
+
+def iter_timer_stats():
+    """
+    Incrementally collect statistics about Qt timers in the current application.
+
     Returns
     -------
     str
@@ -52,9 +131,14 @@ def dump_timer_stats() -> str:
     single_shot_qt = sum(1 for t in timers_qt if t.isSingleShot())
     repeating_qt = len(timers_qt) - single_shot_qt
 
-    timers_gc = [
-        obj for obj in gc.get_objects() if isinstance(obj, QTimer)
-    ]
+    objs = yield from _iter_gc_objects()
+    timers_gc = []
+    yield from _iter_scan(
+        objs,
+        "Finding timers",
+        lambda chunk: timers_gc.extend(o for o in chunk if isinstance(o, QTimer)),
+    )
+    del objs
     active_gc = 0
     single_shot_gc = 0
     for t in timers_gc:
@@ -84,6 +168,19 @@ def dump_widget_stats() -> str:
     """
     Dump statistics about live widgets in the current application.
 
+    Returns
+    -------
+    str
+        See :func:`iter_widget_stats`.
+    """
+
+    return run_to_completion(iter_widget_stats())
+
+
+def iter_widget_stats():
+    """
+    Incrementally collect statistics about live widgets in the current application.
+
     Returns
     -------
     str
@@ -104,15 +201,21 @@ def dump_widget_stats() -> str:
             widgets_all = []
 
     widgets_qt_tree = app.findChildren(QWidget)
-    widgets_gc = [
-        obj for obj in gc.get_objects() if isinstance(obj, QWidget)
-    ]
+    objs = yield from _iter_gc_objects()
+    n_widgets_gc = 0
+
+    def count_widgets(chunk):
+        nonlocal n_widgets_gc
+        n_widgets_gc += sum(1 for o in chunk if isinstance(o, QWidget))
+
+    yield from _iter_scan(objs, "Finding widgets", count_widgets)
+    del objs
 
     return (
         "Widget Statistics:\n"
         f"  QApplication.allWidgets(): {len(widgets_all)}\n"
         f"  Qt object-tree widgets: {len(widgets_qt_tree)}\n"
-        f"  Python GC widgets: {len(widgets_gc)}"
+        f"  Python GC widgets: {n_widgets_gc}"
     )
 
 
@@ -136,7 +239,21 @@ def _top_type_counts(type_counts: dict[str, int], limit: int) -> list[tuple[str,
     return sorted(type_counts.items(), key=lambda kv: (-kv[1], kv[0]))[:limit]
 
 
-def _iter_interesting_objects(objs: Iterable[object]) -> dict[str, int]:
+def _is_interesting_type_name(name: str) -> bool:
+    """Whether a type name matches common Qt/GUI patterns."""
+
+    return (
+        name.startswith("Q")
+        or "Signal" in name
+        or "Timer" in name
+        or "Worker" in name
+        or name.endswith("Model")
+    )
+
+
+def _iter_interesting_objects(
+    objs: Iterable[object], type_counts: dict[str, int] | None = None
+) -> dict[str, int]:
     """
     Count potentially interesting Python objects by type name.
 
@@ -144,6 +261,8 @@ def _iter_interesting_objects(objs: Iterable[object]) -> dict[str, int]:
     ----------
     objs : Iterable[object]
         Iterable of Python objects, typically from ``gc.get_objects()``.
+    type_counts : dict[str, int] | None, optional
+        Counts to add to, e.g. of a previous chunk of objects.
 
     Returns
     -------
@@ -151,16 +270,11 @@ def _iter_interesting_objects(objs: Iterable[object]) -> dict[str, int]:
         Mapping of type name to count for types that match common Qt/GUI patterns.
     """
 
-    type_counts: dict[str, int] = {}
+    if type_counts is None:
+        type_counts = {}
     for obj in objs:
         name = type(obj).__name__
-        if (
-            name.startswith("Q")
-            or "Signal" in name
-            or "Timer" in name
-            or "Worker" in name
-            or name.endswith("Model")
-        ):
+        if _is_interesting_type_name(name):
             type_counts[name] = type_counts.get(name, 0) + 1
     return type_counts
 
@@ -180,8 +294,32 @@ def dump_object_counts(limit: int = 25) -> str:
         Multi-line text summary of counts derived from ``gc.get_objects()``.
     """
 
-    gc.collect()
-    type_counts = _iter_interesting_objects(gc.get_objects())
+    return run_to_completion(iter_object_counts(limit=limit))
+
+
+def iter_object_counts(limit: int = 25):
+    """
+    Incrementally count Python objects, focusing on Qt/GUI-related types.
+
+    Parameters
+    ----------
+    limit : int, optional
+        Maximum number of types to display. Default is 25.
+
+    Returns
+    -------
+    str
+        Multi-line text summary of counts derived from ``gc.get_objects()``.
+    """
+
+    objs = yield from _iter_gc_objects(collect=True)
+    type_counts: dict[str, int] = {}
+    yield from _iter_scan(
+        objs,
+        "Counting objects",
+        lambda chunk: _iter_interesting_objects(chunk, type_counts),
+    )
+    del objs
     top = _top_type_counts(type_counts, limit=limit)
 
     lines = [f"Python Object Counts (filtered, top {len(top)}):"]
@@ -190,6 +328,32 @@ def dump_object_counts(limit: int = 25) -> str:
     return "\n".join(lines)
 
 
+def current_rss_mb() -> float | None:
+    """
+    Resident memory of the process in MB.
+
+    Returns
+    -------
+    float | None
+        Current resident memory from ``/proc``, the peak resident memory where
+        ``/proc`` is not available, or None if neither can be read.
+    """
+
+    try:
+        with open("/proc/self/statm") as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE") / (1024.0 * 1024.0)
+    except Exception:
+        pass
+    try:
+        import resource
+
+        # Peak instead of current memory, but never lower than the current one
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.0
+    except Exception:
+        return None
+
+
 def dump_memory_stats() -> str:
     """
     Dump basic process memory statistics.
@@ -208,8 +372,13 @@ def dump_memory_stats() -> str:
 
     usage = resource.getrusage(resource.RUSAGE_SELF)
     max_rss_mb = usage.ru_maxrss / 1024.0
+    rss_mb = current_rss_mb()
 
-    return "Memory Statistics:\n" f"  Max RSS: {max_rss_mb:.1f} MB"
+    lines = ["Memory Statistics:"]
+    if rss_mb is not None:
+        lines.append(f"  RSS: {rss_mb:.1f} MB")
+    lines.append(f"  Max RSS: {max_rss_mb:.1f} MB")
+    return "\n".join(lines)
 
 
 def dump_process_info() -> str:
@@ -231,6 +400,75 @@ def dump_process_info() -> str:
     )
 
 
+# {model: (time, received, stashed, drained)} at the last dump_update_rates
+_rate_samples = weakref.WeakKeyDictionary()
+
+
+def dump_update_rates(beamline, limit: int = 40) -> str:
+    """
+    Dump the effective value update rates of the beamline models.
+
+    Rates are averaged since the previous call, or since the model was created
+    on the first call.
+
+    Parameters
+    ----------
+    beamline : GUIBeamlineModel
+        Beamline whose models are reported.
+    limit : int, optional
+        Maximum number of models listed, by received rate.
+
+    Returns
+    -------
+    str
+        Multi-line text summary with the received, stashed and drained
+        (displayed) updates per second and the update limits of each model.
+    """
+
+    if beamline is None or not hasattr(beamline, "_iter_all_models"):
+        return "Update Rates:\n  No beamline"
+
+    now = time.monotonic()
+    rows = []
+    totals = [0.0, 0.0, 0.0]
+    for model in beamline._iter_all_models():
+        if not hasattr(model, "n_received"):
+            continue
+        counts = (model.n_received, model.n_stashed, model.n_drained)
+        last = _rate_samples.get(model, None)
+        if last is None:
+            last = (getattr(model, "_created_time", now), 0, 0, 0)
+        try:
+            _rate_samples[model] = (now, *counts)
+        except TypeError:
+            pass
+        elapsed = now - last[0]
+        if elapsed <= 0:
+            continue
+        rates = [(c - c0) / elapsed for c, c0 in zip(counts, last[1:])]
+        for i, rate in enumerate(rates):
+            totals[i] += rate
+        limits = getattr(model, "update_limits", None)
+        rows.append(
+            (rates, getattr(model, "name", type(model).__name__), limits)
+        )
+
+    rows.sort(key=lambda row: row[0][0], reverse=True)
+    lines = [
+        "Update Rates (1/s, received / stashed / displayed):",
+        f"  Total: {totals[0]:.1f} / {totals[1]:.1f} / {totals[2]:.1f} "
+        f"over {len(rows)} models",
+    ]
+    for rates, name, limits in rows[:limit]:
+        if not rates[0]:
+            break
+        text = limits.describe() if limits is not None else "no limits"
+        lines.append(
+            f"  {rates[0]:8.1f} {rates[1]:8.1f} {rates[2]:8.1f}  {name} ({text})"
+        )
+    return "\n".join(lines)
+
+
 def dump_full_snapshot() -> str:
     """
     Generate a full diagnostic snapshot.
@@ -242,15 +480,25 @@ def dump_full_snapshot() -> str:
         memory information.
     """
 
-    parts = [
-        f"=== Debug Snapshot: {_timestamp()} ===",
-        dump_process_info(),
-        dump_timer_stats(),
-        dump_widget_stats(),
-        dump_object_counts(),
-        dump_memory_stats(),
-        "=" * 40,
-    ]
+    return run_to_completion(iter_full_snapshot())
+
+
+def iter_full_snapshot():
+    """
+    Incrementally generate a full diagnostic snapshot.
+
+    Returns
+    -------
+    str
+        See :func:`dump_full_snapshot`.
+    """
+
+    parts = [f"=== Debug Snapshot: {_timestamp()} ===", dump_process_info()]
+    parts.append((yield from iter_timer_stats()))
+    parts.append((yield from iter_widget_stats()))
+    parts.append((yield from iter_object_counts()))
+    parts.append(dump_memory_stats())
+    parts.append("=" * 40)
     return "\n\n".join(parts)
 
 
@@ -322,11 +570,27 @@ def _find_all_objects_by_type_name(type_name: str) -> list[object]:
         All matching objects, sorted by id (newest/highest first).
     """
 
-    gc.collect()
+    return run_to_completion(_iter_find_all_objects_by_type_name(type_name))
+
+
+def _iter_find_all_objects_by_type_name(type_name: str):
+    """
+    Incrementally find ALL live Python objects by their type name.
+
+    Returns
+    -------
+    list[object]
+        See :func:`_find_all_objects_by_type_name`.
+    """
+
+    objs = yield from _iter_gc_objects(collect=True)
     found: list[object] = []
-    for obj in gc.get_objects():
-        if type(obj).__name__ == type_name:
-            found.append(obj)
+    yield from _iter_scan(
+        objs,
+        f"Finding {type_name} objects",
+        lambda chunk: found.extend(o for o in chunk if type(o).__name__ == type_name),
+    )
+    del objs
     found.sort(key=id, reverse=True)
     return found
 
@@ -502,9 +766,25 @@ def dump_referrers_summary(type_name: str, sample: int = 3, ref_limit: int = 50)
         Multi-line summary.
     """
 
+    return run_to_completion(
+        iter_referrers_summary(type_name, sample=sample, ref_limit=ref_limit)
+    )
+
+
+def iter_referrers_summary(type_name: str, sample: int = 3, ref_limit: int = 50):
+    """
+    Incrementally summarize what is retaining objects of a given type, one
+    sampled object per step.
+
+    Returns
+    -------
+    str
+        See :func:`dump_referrers_summary`.
+    """
+
     global _previous_object_ids
 
-    all_objs = _find_all_objects_by_type_name(type_name)
+    all_objs = yield from _iter_find_all_objects_by_type_name(type_name)
     total_count = len(all_objs)
 
     if total_count == 0:
@@ -542,6 +822,7 @@ def dump_referrers_summary(type_name: str, sample: int = 3, ref_limit: int = 50)
     }
 
     for idx, obj in enumerate(objs_to_sample, start=1):
+        yield (f"Tracing {type_name} referrers", idx - 1, len(objs_to_sample))
         obj_id = id(obj)
         is_new = obj_id in new_ids
         new_marker = " [NEW]" if is_new else ""
@@ -599,7 +880,22 @@ def dump_referrers_aggregate(type_name: str, max_objects: int = 100) -> str:
         Multi-line summary showing aggregated retention patterns.
     """
 
-    all_objs = _find_all_objects_by_type_name(type_name)
+    return run_to_completion(
+        iter_referrers_aggregate(type_name, max_objects=max_objects)
+    )
+
+
+def iter_referrers_aggregate(type_name: str, max_objects: int = 100):
+    """
+    Incrementally aggregate referrer patterns, one object per step.
+
+    Returns
+    -------
+    str
+        See :func:`dump_referrers_aggregate`.
+    """
+
+    all_objs = yield from _iter_find_all_objects_by_type_name(type_name)
     total_count = len(all_objs)
 
     if total_count == 0:
@@ -610,7 +906,8 @@ def dump_referrers_aggregate(type_name: str, max_objects: int = 100) -> str:
 
     ignore_ids = {id(all_objs), id(objs_to_analyze), id(retention_sites)}
 
-    for obj in objs_to_analyze:
+    for n, obj in enumerate(objs_to_analyze):
+        yield (f"Tracing {type_name} referrers", n, len(objs_to_analyze))
         obj_id = id(obj)
         ignore_ids.add(obj_id)
         chain = _trace_referrer_chain(obj, max_depth=10, ignore_ids=ignore_ids)
@@ -637,3 +934,139 @@ def dump_referrers_aggregate(type_name: str, max_objects: int = 100) -> str:
 
     return "\n".join(lines)
 
+
+
+class ObjectSnapshot:
+    """
+    Counts of the live Python objects by type at one point in time.
+
+    Attributes
+    ----------
+    label : str
+        Name of the snapshot, shown in diffs.
+    time : datetime
+        Time at which the snapshot was taken.
+    counts : dict[str, int]
+        Number of objects tracked by the garbage collector, by qualified type
+        name.
+    ids : dict[str, set[int]]
+        Ids of the objects of the Qt/GUI-related types, by type name.
+    rss_mb : float | None
+        Resident memory of the process.
+    """
+
+    def __init__(self, label, counts, ids, rss_mb):
+        self.label = label
+        self.time = datetime.now()
+        self.counts = counts
+        self.ids = ids
+        self.rss_mb = rss_mb
+
+    @property
+    def total(self) -> int:
+        return sum(self.counts.values())
+
+
+def _type_key(cls: type) -> str:
+    module = getattr(cls, "__module__", None)
+    name = getattr(cls, "__qualname__", cls.__name__)
+    if module in (None, "builtins"):
+        return name
+    return f"{module}.{name}"
+
+
+def iter_take_snapshot(label: str | None = None):
+    """
+    Incrementally take an :class:`ObjectSnapshot` of the live objects.
+
+    Parameters
+    ----------
+    label : str | None, optional
+        Name of the snapshot. Default: the current time.
+
+    Returns
+    -------
+    ObjectSnapshot
+        The snapshot.
+    """
+
+    objs = yield from _iter_gc_objects(collect=True)
+    type_counts: Counter = Counter()
+    ids: dict[str, set[int]] = {}
+
+    def count(chunk):
+        types = [type(o) for o in chunk]
+        type_counts.update(types)
+        for obj, cls in zip(chunk, types):
+            if _is_interesting_type_name(cls.__name__):
+                ids.setdefault(cls.__name__, set()).add(id(obj))
+
+    yield from _iter_scan(objs, "Counting objects", count)
+    del objs
+    counts: dict[str, int] = {}
+    for cls, n in type_counts.items():
+        key = _type_key(cls)
+        counts[key] = counts.get(key, 0) + n
+    return ObjectSnapshot(
+        label or datetime.now().strftime("%H:%M:%S"), counts, ids, current_rss_mb()
+    )
+
+
+def diff_snapshots(old: ObjectSnapshot, new: ObjectSnapshot, limit: int = 25) -> str:
+    """
+    Compare two object snapshots, e.g. before and after reloading a tab.
+
+    Parameters
+    ----------
+    old : ObjectSnapshot
+        Earlier snapshot.
+    new : ObjectSnapshot
+        Later snapshot.
+    limit : int, optional
+        Maximum number of types listed. Default is 25.
+
+    Returns
+    -------
+    str
+        Multi-line text with the change of the total number of objects and of
+        the memory, the types whose counts grew or shrank the most, and the
+        number of new and removed objects of the Qt/GUI-related types.
+    """
+
+    seconds = (new.time - old.time).total_seconds()
+    lines = [
+        f"Snapshot Diff: {old.label} -> {new.label} ({seconds:.0f} s)",
+        f"  Objects: {old.total} -> {new.total} ({new.total - old.total:+d})",
+    ]
+    if old.rss_mb is not None and new.rss_mb is not None:
+        lines.append(
+            f"  RSS: {old.rss_mb:.1f} -> {new.rss_mb:.1f} MB "
+            f"({new.rss_mb - old.rss_mb:+.1f} MB)"
+        )
+
+    deltas = [
+        (new.counts.get(key, 0) - old.counts.get(key, 0), key)
+        for key in set(old.counts) | set(new.counts)
+    ]
+    grown = sorted((d for d in deltas if d[0] > 0), key=lambda d: (-d[0], d[1]))
+    shrunk = sorted((d for d in deltas if d[0] < 0), key=lambda d: (d[0], d[1]))
+    lines.append(f"  Grown types ({len(grown)}):")
+    for delta, key in grown[:limit]:
+        lines.append(f"    {delta:+8d}  {key} ({new.counts.get(key, 0)})")
+    lines.append(f"  Shrunk types ({len(shrunk)}):")
+    for delta, key in shrunk[: max(limit // 3, 1)]:
+        lines.append(f"    {delta:+8d}  {key} ({new.counts.get(key, 0)})")
+
+    changed = []
+    for name in set(old.ids) | set(new.ids):
+        before = old.ids.get(name, set())
+        after = new.ids.get(name, set())
+        added, removed = len(after - before), len(before - after)
+        if added or removed:
+            changed.append((added - removed, added, removed, name))
+    if changed:
+        changed.sort(key=lambda c: (-c[0], c[3]))
+        lines.append("  Qt/GUI objects by id (new / removed):")
+        for _, added, removed, name in changed[:limit]:
+            lines.append(f"    +{added:<6d} -{removed:<6d} {name}")
+    return "\n".join(lines)
@@ -0,0 +1,247 @@
+"""
+Always-on counters and timers of the GUI-thread hot paths.
+
+Model update counters (received, stashed, drained and emitted values) are
+attributes of each model. Call durations are recorded in the shared
+:data:`HOT_PATH` registry, grouped by category:
+
+- ``"drain"``: each tick of :meth:`GUIBeamlineModel._drain_all_devices`
+- ``"timer"``: QTimer callbacks connected through :func:`timed_slot`, named
+  by the class that owns the callback
+- ``"blocking"``: methods wrapped by ``requires_connection``, which read or
+  write the device from the GUI thread
+
+Recording a duration costs two ``perf_counter`` calls and a dictionary lookup.
+The Debug tab shows the counters in a sortable table and exports them to JSON
+or CSV.
+"""
+
+from __future__ import annotations
+
+import csv
+import json
+import time
+import weakref
+
+
+class TimingStat:
+    """Number, total and maximum duration of the calls of one hot path."""
+
+    __slots__ = ("count", "total", "max")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, seconds: float) -> None:
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+
+class HotPathStats:
+    """
+    Registry of call durations, keyed by ``(category, name)``.
+
+    Attributes
+    ----------
+    enabled : bool
+        If False, :meth:`record` does nothing.
+    timings : dict
+        ``{(category, name): TimingStat}``
+    """
+
+    def __init__(self):
+        self.enabled = True
+        self.timings = {}
+        self.start_time = time.monotonic()
+
+    def record(self, category: str, name: str, seconds: float) -> None:
+        """
+        Record the duration of one call.
+
+        Parameters
+        ----------
+        category : str
+            Hot path category, e.g. ``"timer"``.
+        name : str
+            Name of the call within the category, e.g. ``"MotorModel._check_value"``.
+        seconds : float
+            Duration of the call.
+        """
+        if not self.enabled:
+            return
+        key = (category, name)
+        stat = self.timings.get(key, None)
+        if stat is None:
+            stat = self.timings[key] = TimingStat()
+        stat.add(seconds)
+
+    def reset(self) -> None:
+        """Forget all recorded durations."""
+        self.timings = {}
+        self.start_time = time.monotonic()
+
+    def timing_rows(self) -> list[dict]:
+        """
+        Recorded durations as table rows.
+
+        Returns
+        -------
+        list of dict
+            One row per hot path, with the category, name, number of calls,
+            calls per second, and total, mean and maximum duration in ms.
+        """
+        elapsed = max(time.monotonic() - self.start_time, 1e-9)
+        rows = []
+        for (category, name), stat in list(self.timings.items()):
+            rows.append(
+                {
+                    "category": category,
+                    "name": name,
+                    "calls": stat.count,
+                    "calls_per_s": stat.count / elapsed,
+                    "total_ms": stat.total * 1e3,
+                    "mean_ms": stat.total * 1e3 / stat.count if stat.count else 0.0,
+                    "max_ms": stat.max * 1e3,
+                }
+            )
+        return rows
+
+
+#: Shared registry of the hot path durations of the process
+HOT_PATH = HotPathStats()
+
+
+def _slot_name(slot) -> str:
+    owner = getattr(slot, "__self__", None)
+    name = getattr(slot, "__name__", type(slot).__name__)
+    if owner is not None:
+        return f"{type(owner).__name__}.{name}"
+    return getattr(slot, "__qualname__", name)
+
+
+def timed_slot(slot, category: str = "timer", name: str | None = None):
+    """
+    Wrap a callback so that its duration is recorded in :data:`HOT_PATH`.
+
+    Bound methods are referenced weakly, so a connection to the wrapper does
+    not keep the owner of the method alive. The wrapper does nothing once
+    the owner is deleted.
+
+    Parameters
+    ----------
+    slot : callable
+        The callback, usually a bound method.
+    category : str, optional
+        Hot path category.
+    name : str, optional
+        Name of the hot path. By default ``OwnerClass.method``.
+
+    Returns
+    -------
+    callable
+        The wrapper, to connect instead of the callback.
+    """
+    if name is None:
+        name = _slot_name(slot)
+    if hasattr(slot, "__self__") and hasattr(slot, "__func__"):
+        ref = weakref.WeakMethod(slot)
+    else:
+        ref = lambda: slot  # noqa: E731
+    record = HOT_PATH.record
+    perf_counter = time.perf_counter
+
+    def wrapper(*args):
+        func = ref()
+        if func is None:
+            return None
+        start = perf_counter()
+        try:
+            return func(*args)
+        finally:
+            record(category, name, perf_counter() - start)
+
+    wrapper.__name__ = getattr(slot, "__name__", "wrapper")
+    return wrapper
+
+
+def model_rows(beamline) -> list[dict]:
+    """
+    Update counters of all models of a beamline as table rows.
+
+    Parameters
+    ----------
+    beamline : GUIBeamlineModel
+        Beamline whose models are reported.
+
+    Returns
+    -------
+    list of dict
+        One row per model, with the model name, class, and the number of
+        received, stashed, drained and emitted updates.
+    """
+    if beamline is None or not hasattr(beamline, "_iter_all_models"):
+        return []
+    rows = []
+    for model in beamline._iter_all_models():
+        if not hasattr(model, "n_received"):
+            continue
+        limits = getattr(model, "update_limits", None)
+        rows.append(
+            {
+                "name": getattr(model, "name", ""),
+                "class": type(model).__name__,
+                "received": model.n_received,
+                "stashed": model.n_stashed,
+                "drained": model.n_drained,
+                "emitted": getattr(model, "n_emitted", 0),
+                "limits": limits.describe() if limits is not None else "",
+            }
+        )
+    return rows
+
+
+def export_json(path: str, tables: dict[str, list[dict]]) -> None:
+    """
+    Write tables of rows to a JSON file.
+
+    Parameters
+    ----------
+    path : str
+        Output file.
+    tables : dict
+        ``{table name: rows}``, e.g. ``{"models": ..., "timings": ...}``.
+    """
+    with open(path, "w") as f:
+        json.dump(tables, f, indent=2)
+
+
+def export_csv(path: str, tables: dict[str, list[dict]]) -> None:
+    """
+    Write tables of rows to one CSV file.
+
+    The first column is the table name, the other columns are the union of
+    the row keys of all tables, in order of appearance.
+
+    Parameters
+    ----------
+    path : str
+        Output file.
+    tables : dict
+        ``{table name: rows}``.
+    """
+    fields = []
+    for rows in tables.values():
+        for row in rows:
+            for key in row:
+                if key not in fields:
+                    fields.append(key)
+    with open(path, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=["table"] + fields)
+        writer.writeheader()
+        for table, rows in tables.items():
+            for row in rows:
+                writer.writerow({"table": table, **row})
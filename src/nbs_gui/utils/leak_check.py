@@ -0,0 +1,424 @@
+"""
+Headless memory leak check of mode switches and tab reloads.
+
+The check builds a beamline of simulated devices (Ophyd soft signals, which
+need no IOC), loads the configured tabs in a ``TabViewer``, and repeats a
+cycle of mode switches and tab reloads. After each cycle it records the
+number of live Python objects, QTimers and QWidgets, the resident memory, and
+the subscriptions to the Ophyd objects, which by default outlive the models as
+the objects of an IPython profile do.
+The growth per cycle is the slope of a least-squares line through the cycles
+after the warm-up cycles, and the check fails if any growth exceeds its
+threshold.
+
+Run with ``python -m nbs_gui.utils.leak_check [--cycles N]``. The check uses
+the offscreen Qt platform unless ``QT_QPA_PLATFORM`` is set, and exits with
+status 1 if it fails.
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import gc
+import io
+import json
+import os
+import time
+from types import SimpleNamespace
+
+
+def simulated_device_config(
+    n_motors: int = 10,
+    n_signals: int = 10,
+    modes=("a", "b"),
+    n_mode_devices: int = 5,
+):
+    """
+    Device configuration of a simulated beamline.
+
+    Motors are :class:`~nbs_gui.sim.devices.SimPositioner` devices with
+    ``PVPositionerModel``, signals are ``ophyd.Signal`` with ``PVModel``. Each
+    mode has its own motors and signals, and the last mode its own energy
+    device, so that mode switches add and remove devices and change a role.
+
+    Parameters
+    ----------
+    n_motors : int, optional
+        Number of motors present in all modes.
+    n_signals : int, optional
+        Number of signals present in all modes.
+    modes : sequence of str, optional
+        Modes besides ``"default"``.
+    n_mode_devices : int, optional
+        Number of motors and of signals of each mode.
+
+    Returns
+    -------
+    object_config : dict
+        Ophyd configuration, for ``SETTINGS.object_config``.
+    gui_config : dict
+        GUI device configuration, for ``GUIBeamlineModel``.
+    """
+
+    object_config, gui_config = {}, {}
+    motor_model = "nbs_gui.models.motors.PVPositionerModel"
+    signal_model = "nbs_gui.models.base.PVModel"
+    sim_motor = "nbs_gui.sim.devices.SimPositioner"
+
+    def add(key, model, group, modes=None, role=None):
+        target = sim_motor if model == motor_model else "ophyd.Signal"
+        object_config[key] = {"_target": target}
+        info = {"_target": model, "_group": group}
+        if modes is not None:
+            info["_modes"] = list(modes)
+        if role is not None:
+            info["_role"] = role
+        gui_config[key] = info
+
+    modes = list(modes)
+    energy_modes = ["default"] + modes[:-1] if modes else None
+    add("energy", motor_model, "source", energy_modes, "energy")
+    if modes:
+        add(f"{modes[-1]}_energy", motor_model, "source", modes[-1:], "energy")
+    for n in range(n_motors):
+        add(f"motor{n}", motor_model, "motors")
+    for n in range(n_signals):
+        add(f"signal{n}", signal_model, "signals")
+    for mode in modes:
+        for n in range(n_mode_devices):
+            add(f"{mode}_motor{n}", motor_model, "motors", [mode])
+            add(f"{mode}_signal{n}", signal_model, "signals", [mode])
+    return object_config, gui_config
+
+
+def _slope(values: list[float]) -> float:
+    """Least-squares slope of values against their index."""
+
+    n = len(values)
+    if n < 2:
+        return 0.0
+    mean_x = (n - 1) / 2.0
+    mean_y = sum(values) / n
+    num = sum((x - mean_x) * (y - mean_y) for x, y in enumerate(values))
+    den = sum((x - mean_x) ** 2 for x in range(n))
+    return num / den
+
+
+def _count_subscriptions(obj) -> int:
+    """Number of callbacks subscribed to an Ophyd object and its signals."""
+
+    objs = [obj]
+    if hasattr(obj, "walk_signals"):
+        objs.extend(walk.item for walk in obj.walk_signals(include_lazy=False))
+    return sum(
+        len(callbacks)
+        for item in objs
+        for callbacks in getattr(item, "_callbacks", {}).values()
+    )
+
+
+#: Recorded quantities and their default maximum growth per cycle
+DEFAULT_THRESHOLDS = {
+    "objects": 500.0,
+    "qtimers": 1.0,
+    "widgets": 0.5,
+    "rss_mb": 1.0,
+    "subscriptions": 0.5,
+}
+
+
+class LeakCheck:
+    """
+    Cycle mode switches and tab reloads and record the growth of the process.
+
+    Parameters
+    ----------
+    tabs : sequence of str, optional
+        Entry point names of the tabs to load. The tabs get a model without
+        a queue server and without Redis.
+    modes : sequence of str, optional
+        Modes of the simulated beamline. Each cycle switches to every mode
+        and back to ``"default"``.
+    rebuild_tabs : bool, optional
+        Also rebuild all reloadable tabs once per cycle, as a configuration
+        reload does.
+    settle_ms : int, optional
+        Time for which events are processed after each switch, so that timers,
+        deferred deletes and subscriptions run.
+    persistent_devices : bool, optional
+        Create each Ophyd object once and reuse it for every model of the
+        device, so that subscriptions that are not released keep the removed
+        models alive. Otherwise each model gets a new Ophyd object.
+    """
+
+    def __init__(
+        self,
+        tabs=("nbs-gui-motors", "nbs-gui-monitor", "nbs-gui-debug"),
+        modes=("a", "b"),
+        rebuild_tabs=True,
+        settle_ms=200,
+        persistent_devices=True,
+    ):
+        self.tabs = list(tabs)
+        self.modes = list(modes)
+        self.rebuild_tabs = rebuild_tabs
+        self.settle_ms = settle_ms
+        self.persistent_devices = persistent_devices
+        #: {device key: Ophyd object} of the persistent devices
+        self.ophyd_objects = {}
+        self._instantiate_ophyd = None
+        #: One dict of recorded quantities per cycle
+        self.samples = []
+        #: Object snapshots of the first and of the latest cycle
+        self.snapshots = []
+        self.app = None
+        self.beamline = None
+        self.viewer = None
+        self.model = None
+
+    def setup(self):
+        """Create the application, the simulated beamline and the tabs."""
+        os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+        from qtpy.QtWidgets import QApplication
+
+        from ..settings import SETTINGS
+
+        self.app = QApplication.instance() or QApplication([])
+        object_config, gui_config = simulated_device_config(modes=self.modes)
+        SETTINGS.object_config = object_config
+        SETTINGS.gui_config = {
+            "gui": {
+                "tabs": {"include": list(self.tabs)},
+                "stall_monitor": {"enabled": False},
+            }
+        }
+        if self.persistent_devices:
+            from .. import load
+
+            self._instantiate_ophyd = load.instantiateOphyd
+            load.instantiateOphyd = self._persistent_ophyd
+
+        from ..mainWidget import TabViewer
+        from ..models.beamline import GUIBeamlineModel
+
+        self.beamline = GUIBeamlineModel(gui_config)
+        self.model = SimpleNamespace(
+            beamline=self.beamline,
+            run_engine=None,
+            user_status=None,
+            queue_staging=None,
+            settings=SETTINGS,
+        )
+        self.viewer = TabViewer(self.model)
+        self.settle()
+
+    def _persistent_ophyd(self, key, info):
+        if key not in self.ophyd_objects:
+            self.ophyd_objects[key] = self._instantiate_ophyd(key, info)
+        return self.ophyd_objects[key]
+
+    def close(self):
+        """Restore the instantiation of Ophyd objects replaced by :meth:`setup`."""
+        if self._instantiate_ophyd is not None:
+            from .. import load
+
+            load.instantiateOphyd = self._instantiate_ophyd
+            self._instantiate_ophyd = None
+
+    def settle(self):
+        """Process events, including deferred deletes, for ``settle_ms``."""
+        from qtpy.QtCore import QCoreApplication, QEvent
+
+        end = time.monotonic() + self.settle_ms / 1000.0
+        while True:
+            self.app.processEvents()
+            QCoreApplication.sendPostedEvents(None, QEvent.DeferredDelete)
+            if time.monotonic() >= end:
+                break
+            time.sleep(0.005)
+
+    def cycle(self):
+        """Switch to every mode and back to default, then rebuild the tabs."""
+        for mode in self.modes + ["default"]:
+            changes = self.beamline.reload_for_mode(mode)
+            self.viewer.reload_tabs(self.model, changes)
+            self.settle()
+        if self.rebuild_tabs:
+            self.viewer.reload_tabs(self.model)
+            self.settle()
+
+    def sample(self, label):
+        """Record the object, QTimer, QWidget and subscription counts and the memory."""
+        from qtpy.QtCore import QTimer
+        from qtpy.QtWidgets import QWidget
+
+        from .debug_utils import iter_take_snapshot, run_to_completion
+
+        snapshot = run_to_completion(iter_take_snapshot(label))
+        qtimers = widgets = 0
+        for obj in gc.get_objects():
+            if isinstance(obj, QTimer):
+                qtimers += 1
+            elif isinstance(obj, QWidget):
+                widgets += 1
+        sample = {
+            "cycle": label,
+            "objects": snapshot.total,
+            "qtimers": qtimers,
+            "widgets": widgets,
+            "rss_mb": snapshot.rss_mb if snapshot.rss_mb is not None else 0.0,
+            "subscriptions": sum(
+                _count_subscriptions(obj) for obj in self.ophyd_objects.values()
+            ),
+        }
+        self.samples.append(sample)
+        # Keep the first and the latest snapshot only, so that the snapshots
+        # do not add to the growth
+        self.snapshots = self.snapshots[:1] + [snapshot]
+        return sample
+
+    def run(self, cycles=20, warmup=3, verbose=True):
+        """
+        Run the check.
+
+        Parameters
+        ----------
+        cycles : int, optional
+            Number of measured cycles.
+        warmup : int, optional
+            Number of cycles run before the measured cycles, so that caches
+            and lazily created objects are filled.
+        verbose : bool, optional
+            Print the samples of each cycle. The output of the GUI code is
+            always suppressed.
+
+        Returns
+        -------
+        dict
+            ``{quantity: growth per cycle}`` of the measured cycles.
+        """
+        log = io.StringIO()
+        with contextlib.redirect_stdout(log):
+            if self.beamline is None:
+                self.setup()
+            for _ in range(warmup):
+                self.cycle()
+        for n in range(cycles + 1):
+            if n > 0:
+                with contextlib.redirect_stdout(log):
+                    self.cycle()
+            sample = self.sample(str(n))
+            if verbose:
+                print(
+                    f"cycle {n:3d}: {sample['objects']:8d} objects "
+                    f"{sample['qtimers']:5d} QTimers {sample['widgets']:6d} QWidgets "
+                    f"{sample['rss_mb']:8.1f} MB {sample['subscriptions']:6d} subs"
+                )
+        return self.growth()
+
+    def growth(self):
+        """Growth per cycle of each recorded quantity."""
+        return {
+            key: _slope([sample[key] for sample in self.samples])
+            for key in DEFAULT_THRESHOLDS
+        }
+
+    def failures(self, thresholds=None):
+        """
+        Quantities that grew more than their threshold per cycle.
+
+        Parameters
+        ----------
+        thresholds : dict, optional
+            ``{quantity: maximum growth per cycle}``, see
+            :data:`DEFAULT_THRESHOLDS`.
+
+        Returns
+        -------
+        list of str
+            One message per quantity that grew too much.
+        """
+        limits = dict(DEFAULT_THRESHOLDS)
+        limits.update(thresholds or {})
+        return [
+            f"{key} grew by {value:.2f} per cycle (limit {limits[key]:g})"
+            for key, value in self.growth().items()
+            if value > limits[key]
+        ]
+
+    def report(self, thresholds=None):
+        """
+        Text report of the growth and of the types that grew the most.
+
+        Returns
+        -------
+        str
+            Multi-line text report.
+        """
+        from .debug_utils import diff_snapshots
+
+        lines = ["Growth per cycle:"]
+        for key, value in self.growth().items():
+            lines.append(f"  {key:>8}: {value:+.2f}")
+        if len(self.snapshots) >= 2:
+            lines.append(diff_snapshots(self.snapshots[0], self.snapshots[-1], 15))
+        failures = self.failures(thresholds)
+        if failures:
+            lines.append("FAILED:")
+            lines.extend(f"  {failure}" for failure in failures)
+        else:
+            lines.append("PASSED")
+        return "\n".join(lines)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--cycles", type=int, default=20, help="Measured cycles")
+    parser.add_argument("--warmup", type=int, default=3, help="Warm-up cycles")
+    parser.add_argument(
+        "--tabs",
+        nargs="+",
+        default=["nbs-gui-motors", "nbs-gui-monitor", "nbs-gui-debug"],
+        help="Entry point names of the tabs to load",
+    )
+    parser.add_argument(
+        "--no-rebuild", action="store_true", help="Do not rebuild the tabs each cycle"
+    )
+    parser.add_argument(
+        "--fresh-devices",
+        action="store_true",
+        help="Create a new Ophyd object for each model instead of reusing them",
+    )
+    for key, value in DEFAULT_THRESHOLDS.items():
+        parser.add_argument(
+            f"--max-{key.replace('_', '-')}",
+            type=float,
+            default=value,
+            dest=f"max_{key}",
+            help=f"Maximum growth of {key} per cycle (default {value:g})",
+        )
+    parser.add_argument("--json", default=None, help="Write the samples to a file")
+    args = parser.parse_args(argv)
+
+    check = LeakCheck(
+        tabs=args.tabs,
+        rebuild_tabs=not args.no_rebuild,
+        persistent_devices=not args.fresh_devices,
+    )
+    try:
+        check.run(cycles=args.cycles, warmup=args.warmup)
+    finally:
+        check.close()
+    thresholds = {key: getattr(args, f"max_{key}") for key in DEFAULT_THRESHOLDS}
+    print(check.report(thresholds))
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(
+                {"samples": check.samples, "growth": check.growth()}, f, indent=2
+            )
+    return 1 if check.failures(thresholds) else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
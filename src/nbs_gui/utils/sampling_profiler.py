@@ -0,0 +1,250 @@
+"""
+In-process sampling profiler.
+
+A helper thread samples the Python stacks of the GUI thread (or of all
+threads) with ``sys._current_frames()`` at a fixed interval, and counts
+identical stacks. The profile is saved as collapsed stacks, which flame graph
+tools read, and in the speedscope format (https://www.speedscope.app).
+
+Sampling needs the GIL, so time spent in C code that holds the GIL is
+attributed to the Python frame that called it. The sampling thread gets the
+GIL when the GUI thread releases it, e.g. in the Qt event loop, or after the
+interpreter's switch interval (5 ms by default), so Python code that runs for
+less than the switch interval between two returns to the event loop is
+under-represented.
+"""
+
+from __future__ import annotations
+
+from collections import Counter
+from datetime import datetime
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+
+
+def _frame_name(key) -> str:
+    filename, line, name = key
+    return f"{name} ({filename}:{line})"
+
+
+class SamplingProfiler:
+    """
+    Sample the Python stacks of running threads from a helper thread.
+
+    Parameters
+    ----------
+    interval_ms : float, optional
+        Time between two samples.
+    all_threads : bool, optional
+        Sample all threads instead of the thread that created the profiler.
+    max_depth : int, optional
+        Maximum number of frames of a sampled stack, innermost frames are kept.
+    """
+
+    def __init__(self, interval_ms=5.0, all_threads=False, max_depth=100):
+        self.interval = interval_ms / 1000.0
+        self.all_threads = all_threads
+        self.max_depth = max_depth
+        self._main_thread_id = threading.get_ident()
+        self._stop_event = threading.Event()
+        self._thread = None
+        self.reset()
+
+    def reset(self):
+        """Forget the samples of the last run."""
+        #: {(thread name, (frame key, ...)): number of samples}, outermost frame first
+        self.stacks = Counter()
+        self.n_samples = 0
+        self.start_time = None
+        self.stop_time = None
+        self.duration = None
+        self.started_at = None
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    @property
+    def elapsed(self):
+        """Time (s) since the start of the current or last run."""
+        if self.start_time is None:
+            return 0.0
+        end = self.stop_time if self.stop_time is not None else time.monotonic()
+        return end - self.start_time
+
+    def start(self, duration_s=None):
+        """
+        Start sampling.
+
+        Parameters
+        ----------
+        duration_s : float, optional
+            Stop after this time. None to sample until :meth:`stop`.
+        """
+        if self.running:
+            return
+        self.reset()
+        self.duration = duration_s
+        self._main_thread_id = threading.get_ident()
+        self._stop_event.clear()
+        self.start_time = time.monotonic()
+        self.started_at = datetime.now()
+        self._thread = threading.Thread(
+            target=self._run, name="nbs-gui-sampling-profiler", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self):
+        """Stop sampling and wait for the sampling thread."""
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+            self._thread = None
+
+    def _run(self):
+        own_id = threading.get_ident()
+        names = {}
+        max_depth = self.max_depth
+        while not self._stop_event.wait(self.interval):
+            if self.duration is not None and self.elapsed >= self.duration:
+                break
+            frames = sys._current_frames()
+            if self.all_threads:
+                items = [(i, f) for i, f in frames.items() if i != own_id]
+            else:
+                frame = frames.get(self._main_thread_id, None)
+                items = [(self._main_thread_id, frame)] if frame is not None else []
+            del frames
+            if len(names) != threading.active_count():
+                names = {t.ident: t.name for t in threading.enumerate()}
+            for ident, frame in items:
+                stack = []
+                while frame is not None and len(stack) < max_depth:
+                    code = frame.f_code
+                    stack.append((code.co_filename, code.co_firstlineno, code.co_name))
+                    frame = frame.f_back
+                stack.reverse()
+                self.stacks[(names.get(ident, str(ident)), tuple(stack))] += 1
+            del items
+            self.n_samples += 1
+        self.stop_time = time.monotonic()
+
+    def top_functions(self, limit: int = 25) -> list[tuple]:
+        """
+        Functions with the most samples.
+
+        Returns
+        -------
+        list of tuple
+            ``(function, self samples, total samples)`` sorted by total samples.
+            Self samples are samples in which the function was running, total
+            samples those in which it was on the stack.
+        """
+        own = Counter()
+        total = Counter()
+        for (_, stack), count in self.stacks.items():
+            if not stack:
+                continue
+            own[stack[-1]] += count
+            for key in set(stack):
+                total[key] += count
+        ranked = sorted(total.items(), key=lambda item: item[1], reverse=True)
+        return [(_frame_name(key), own[key], count) for key, count in ranked[:limit]]
+
+    def summary(self, limit: int = 25) -> str:
+        """
+        Text report of the functions with the most samples.
+
+        Returns
+        -------
+        str
+            Multi-line text report.
+        """
+        n_stacks = max(sum(self.stacks.values()), 1)
+        lines = [
+            f"Sampling Profile: {self.n_samples} samples in {self.elapsed:.1f} s "
+            f"every {self.interval * 1e3:.0f} ms, "
+            f"{'all threads' if self.all_threads else 'GUI thread'}",
+            f"  {'self %':>7} {'total %':>7}  function",
+        ]
+        for name, own, total in self.top_functions(limit):
+            own, total = 100.0 * own / n_stacks, 100.0 * total / n_stacks
+            lines.append(f"  {own:7.1f} {total:7.1f}  {name}")
+        return "\n".join(lines)
+
+    def write_collapsed(self, path: str) -> None:
+        """
+        Write the profile as collapsed stacks, one ``frame;frame;... count`` line
+        per distinct stack, outermost frame first, prefixed by the thread name.
+        """
+        with open(path, "w") as f:
+            for (thread, stack), count in self.stacks.most_common():
+                frames = ";".join([thread] + [_frame_name(key) for key in stack])
+                f.write(f"{frames} {count}\n")
+
+    def write_speedscope(self, path: str) -> None:
+        """Write the profile in the speedscope file format, one profile per thread."""
+        frame_index = {}
+        frames = []
+        profiles = {}
+        weight = self.interval * 1e3
+        for (thread, stack), count in self.stacks.items():
+            indices = []
+            for key in stack:
+                n = frame_index.get(key, None)
+                if n is None:
+                    n = frame_index[key] = len(frames)
+                    frames.append({"name": key[2], "file": key[0], "line": key[1]})
+                indices.append(n)
+            profile = profiles.setdefault(
+                thread,
+                {
+                    "type": "sampled",
+                    "name": thread,
+                    "unit": "milliseconds",
+                    "startValue": 0,
+                    "endValue": 0,
+                    "samples": [],
+                    "weights": [],
+                },
+            )
+            profile["samples"].append(indices)
+            profile["weights"].append(count * weight)
+            profile["endValue"] += count * weight
+        started_at = self.started_at or datetime.now()
+        data = {
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "shared": {"frames": frames},
+            "profiles": list(profiles.values()),
+            "name": f"nbs-gui {started_at:%Y-%m-%d %H:%M:%S}",
+            "exporter": "nbs-gui",
+        }
+        with open(path, "w") as f:
+            json.dump(data, f)
+
+    def save(self, directory: str | None = None) -> list[str]:
+        """
+        Write the collapsed stacks and speedscope files of the last run.
+
+        Parameters
+        ----------
+        directory : str, optional
+            Output directory. Default: the system temporary directory.
+
+        Returns
+        -------
+        list of str
+            Paths of the written files.
+        """
+        directory = directory or tempfile.gettempdir()
+        os.makedirs(directory, exist_ok=True)
+        started_at = self.started_at or datetime.now()
+        stem = os.path.join(directory, f"nbs_gui_profile_{started_at:%Y%m%d_%H%M%S}")
+        paths = [f"{stem}.collapsed.txt", f"{stem}.speedscope.json"]
+        self.write_collapsed(paths[0])
+        self.write_speedscope(paths[1])
+        return paths
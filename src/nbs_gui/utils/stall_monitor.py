@@ -0,0 +1,452 @@
+"""
+Event-loop latency monitor and stall detector.
+
+A heartbeat QTimer on the GUI thread measures how late the event loop runs it.
+A watchdog thread checks the time of the last heartbeat, and when the GUI
+thread has not returned to the event loop for longer than the stall threshold,
+it samples the Python stack of the GUI thread with ``sys._current_frames()``.
+When the heartbeat runs again, the stall is recorded with its duration and the
+sampled stack, aggregated by stall site, and written to a rotating log file.
+
+The stack can only be sampled while the GUI thread releases the GIL, which
+Python code does every few milliseconds. A stall in C code that holds the GIL
+is recorded with its duration, but without a stack.
+"""
+
+from __future__ import annotations
+
+from collections import deque
+from datetime import datetime
+import getpass
+import json
+import logging
+from logging.handlers import RotatingFileHandler
+import os
+import sys
+import tempfile
+import threading
+import time
+import traceback
+
+from qtpy.QtCore import QCoreApplication, QObject, QTimer
+
+#: Upper edges (ms) of the event loop lag histogram buckets
+LAG_BUCKETS_MS = (5, 16, 50, 100, 250, 1000)
+
+
+def _frame_text(frame) -> str:
+    return f"{frame.filename}:{frame.lineno} in {frame.name}"
+
+
+class Stall:
+    """
+    One stall of the GUI thread.
+
+    Attributes
+    ----------
+    time : float
+        Wall-clock time at which the stall started.
+    duration : float
+        Time (s) the event loop did not run.
+    stack : list of str
+        Sampled stack of the GUI thread, outermost frame first. Empty if the
+        stack could not be sampled.
+    site : str
+        Frame to which the stall is attributed.
+    """
+
+    __slots__ = ("time", "duration", "stack", "site")
+
+    def __init__(self, start_time, duration, stack, site):
+        self.time = start_time
+        self.duration = duration
+        self.stack = stack
+        self.site = site
+
+    def as_dict(self) -> dict:
+        return {
+            "time": datetime.fromtimestamp(self.time).isoformat(timespec="milliseconds"),
+            "duration_ms": round(self.duration * 1e3, 1),
+            "site": self.site,
+            "stack": self.stack,
+        }
+
+
+class _StallLogHandler(RotatingFileHandler):
+    """Rotating stall log that reports its first write error instead of each one."""
+
+    failed = False
+
+    def handleError(self, record):
+        if not self.failed:
+            self.failed = True
+            print(f"Could not write stall log {self.baseFilename}: {sys.exc_info()[1]}")
+
+
+def _default_log_name():
+    """Per-user name of the default stall log, so users do not share a file."""
+    try:
+        user = getpass.getuser()
+    except Exception:
+        user = str(os.getuid()) if hasattr(os, "getuid") else "user"
+    return f"nbs_gui_stalls_{user}.log"
+
+
+class StallMonitor(QObject):
+    """
+    Measure the event loop lag of the GUI thread and record stalls.
+
+    Parameters
+    ----------
+    interval_ms : int, optional
+        Interval of the heartbeat timer.
+    threshold_ms : int, optional
+        A heartbeat later than this is a stall.
+    log_file : str or None, optional
+        Rotating log file of the stalls, one JSON object per line. None to
+        not write stalls to a file.
+    max_bytes : int, optional
+        Size at which the log file is rotated.
+    backup_count : int, optional
+        Number of rotated log files kept.
+    max_stalls : int, optional
+        Number of recent stalls kept in memory.
+    app_packages : tuple of str, optional
+        Stalls are attributed to the innermost frame of these packages, or to
+        the innermost frame if the stack has none.
+    """
+
+    def __init__(
+        self,
+        interval_ms=50,
+        threshold_ms=250,
+        log_file=None,
+        max_bytes=1_000_000,
+        backup_count=3,
+        max_stalls=200,
+        app_packages=("nbs_gui", "nbs_bl"),
+        parent=None,
+    ):
+        super().__init__(parent)
+        self.interval = interval_ms / 1000.0
+        self.threshold = threshold_ms / 1000.0
+        self.log_file = log_file
+        self.app_packages = tuple(
+            f"{os.sep}{package}{os.sep}" for package in app_packages
+        )
+        #: Recent stalls, oldest first
+        self.stalls = deque(maxlen=max_stalls)
+        #: {site: [count, total duration, max duration, last stack]}
+        self.sites = {}
+        self.n_beats = 0
+        self.max_lag = 0.0
+        self.lag_histogram = [0] * (len(LAG_BUCKETS_MS) + 1)
+        self.start_time = None
+
+        self._last_beat = None
+        self._last_wall = None
+        # (beat time, stack) sampled by the watchdog during the current stall
+        self._sample = None
+        self._main_thread_id = threading.get_ident()
+        self._stop_event = threading.Event()
+        self._thread = None
+
+        self._logger = None
+        if log_file:
+            self._logger = self._make_logger(log_file, max_bytes, backup_count)
+            if self._logger is None:
+                self.log_file = None
+
+        self._timer = QTimer(self)
+        self._timer.setInterval(interval_ms)
+        self._timer.timeout.connect(self._beat)
+
+    @classmethod
+    def from_config(cls, config):
+        """
+        Create a monitor from the ``[gui.stall_monitor]`` settings.
+
+        Parameters
+        ----------
+        config : dict
+            The ``[gui.stall_monitor]`` table.
+
+        Returns
+        -------
+        StallMonitor or None
+            None if the monitor is not enabled.
+        """
+        if not config.get("enabled", True):
+            return None
+        log_file = config.get("log_file", None)
+        if log_file is None:
+            log_dir = config.get("log_dir", None) or tempfile.gettempdir()
+            log_file = os.path.join(log_dir, _default_log_name())
+        elif not log_file:
+            log_file = None
+        return cls(
+            interval_ms=int(config.get("interval_ms", 50)),
+            threshold_ms=int(config.get("threshold_ms", 250)),
+            log_file=log_file,
+            max_bytes=int(config.get("max_bytes", 1_000_000)),
+            backup_count=int(config.get("backup_count", 3)),
+            app_packages=tuple(config.get("app_packages", ("nbs_gui", "nbs_bl"))),
+        )
+
+    @staticmethod
+    def _make_logger(log_file, max_bytes, backup_count):
+        # The file is only created when the first stall is written, so check
+        # now that it can be
+        log_file = os.path.abspath(log_file)
+        if os.path.exists(log_file):
+            writable = os.path.isfile(log_file) and os.access(log_file, os.W_OK)
+        else:
+            log_dir = os.path.dirname(log_file)
+            writable = os.path.isdir(log_dir) and os.access(log_dir, os.W_OK)
+        if not writable:
+            print(f"Could not open stall log {log_file}: not writable")
+            return None
+        handler = _StallLogHandler(
+            log_file, maxBytes=max_bytes, backupCount=backup_count, delay=True
+        )
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        logger = logging.getLogger(f"nbs_gui.stalls.{id(handler)}")
+        logger.setLevel(logging.INFO)
+        logger.propagate = False
+        logger.addHandler(handler)
+        return logger
+
+    def start(self):
+        """Start the heartbeat and the watchdog thread."""
+        if self._timer.isActive():
+            return
+        self._main_thread_id = threading.get_ident()
+        self.start_time = time.monotonic()
+        self._last_beat = time.monotonic()
+        self._last_wall = time.time()
+        self._timer.start()
+        self._stop_event.clear()
+        self._thread = threading.Thread(
+            target=self._watch, name="nbs-gui-stall-watchdog", daemon=True
+        )
+        self._thread.start()
+        app = QCoreApplication.instance()
+        if app is not None:
+            app.aboutToQuit.connect(self.stop)
+        if self.log_file:
+            print(f"Stall monitor logging stalls to {self.log_file}")
+
+    def stop(self):
+        """Stop the heartbeat and the watchdog thread, and close the log file."""
+        self._timer.stop()
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+            self._thread = None
+        self._close_logger()
+
+    def _close_logger(self):
+        if self._logger is not None:
+            for handler in list(self._logger.handlers):
+                handler.close()
+                self._logger.removeHandler(handler)
+            self._logger = None
+
+    @property
+    def running(self):
+        return self._timer.isActive()
+
+    def _watch(self):
+        """Watchdog thread: sample the GUI thread stack during a stall."""
+        check_interval = max(self.threshold / 4.0, 0.005)
+        while not self._stop_event.wait(check_interval):
+            last_beat = self._last_beat
+            if last_beat is None or time.monotonic() - last_beat < self.threshold:
+                continue
+            sample = self._sample
+            if sample is not None and sample[0] == last_beat:
+                continue
+            frame = sys._current_frames().get(self._main_thread_id, None)
+            if frame is None:
+                continue
+            stack = traceback.StackSummary.extract(
+                traceback.walk_stack(frame), limit=60, lookup_lines=False
+            )
+            del frame
+            stack.reverse()
+            self._sample = (last_beat, [_frame_text(f) for f in stack])
+
+    def _beat(self):
+        """Heartbeat on the GUI thread: measure the lag and record stalls."""
+        now = time.monotonic()
+        last_beat = self._last_beat
+        self._last_beat = now
+        wall = time.time()
+        last_wall, self._last_wall = self._last_wall, wall
+        if last_beat is None:
+            return
+        lag = max(now - last_beat - self.interval, 0.0)
+        self.n_beats += 1
+        if lag > self.max_lag:
+            self.max_lag = lag
+        lag_ms = lag * 1e3
+        for n, edge in enumerate(LAG_BUCKETS_MS):
+            if lag_ms < edge:
+                self.lag_histogram[n] += 1
+                break
+        else:
+            self.lag_histogram[-1] += 1
+
+        if now - last_beat < self.threshold:
+            return
+        sample = self._sample
+        stack = sample[1] if sample is not None and sample[0] == last_beat else []
+        self._record(Stall(last_wall, now - last_beat, stack, self._site(stack)))
+
+    def _site(self, stack):
+        if not stack:
+            return "<no stack>"
+        for frame in reversed(stack):
+            if any(package in frame for package in self.app_packages):
+                return frame
+        return stack[-1]
+
+    def _record(self, stall):
+        self.stalls.append(stall)
+        site = self.sites.get(stall.site, None)
+        if site is None:
+            site = self.sites[stall.site] = [0, 0.0, 0.0, stall.stack]
+        site[0] += 1
+        site[1] += stall.duration
+        site[2] = max(site[2], stall.duration)
+        site[3] = stall.stack
+        if self._logger is not None:
+            try:
+                # GUIs of the same user share the default log
+                self._logger.info(json.dumps(dict(stall.as_dict(), pid=os.getpid())))
+            except Exception as e:
+                print(f"Could not log stall: {e}")
+            if any(getattr(h, "failed", False) for h in self._logger.handlers):
+                # Stop writing after the first error, e.g. a removed directory
+                self._close_logger()
+                self.log_file = None
+
+    def reset(self):
+        """Forget the recorded stalls and lag statistics."""
+        self.stalls.clear()
+        self.sites = {}
+        self.n_beats = 0
+        self.max_lag = 0.0
+        self.lag_histogram = [0] * (len(LAG_BUCKETS_MS) + 1)
+        self.start_time = time.monotonic()
+
+    def lag_report(self) -> str:
+        """
+        Event loop lag statistics.
+
+        Returns
+        -------
+        str
+            Multi-line text with the number of heartbeats, the maximum lag and
+            the lag histogram.
+        """
+        lines = [
+            "Event Loop Lag:",
+            f"  Heartbeat: {self.interval * 1e3:.0f} ms, "
+            f"stall threshold: {self.threshold * 1e3:.0f} ms",
+            f"  Heartbeats: {self.n_beats}, max lag: {self.max_lag * 1e3:.1f} ms, "
+            f"stalls: {sum(site[0] for site in self.sites.values())}",
+        ]
+        total = max(self.n_beats, 1)
+        low = 0
+        for edge, count in zip(LAG_BUCKETS_MS + (None,), self.lag_histogram):
+            label = f"{low}-{edge} ms" if edge is not None else f">{low} ms"
+            lines.append(f"    {label:>12}: {count:8d} ({100.0 * count / total:5.1f}%)")
+            low = edge
+        if self.log_file:
+            lines.append(f"  Log file: {self.log_file}")
+        return "\n".join(lines)
+
+    def top_sites_report(self, limit: int = 10, stack_depth: int = 8) -> str:
+        """
+        Stall sites sorted by total stall time.
+
+        Parameters
+        ----------
+        limit : int, optional
+            Maximum number of sites.
+        stack_depth : int, optional
+            Number of innermost frames of the last stack of each site.
+
+        Returns
+        -------
+        str
+            Multi-line text report.
+        """
+        if not self.sites:
+            return "Top Stall Sites:\n  No stalls recorded"
+        lines = ["Top Stall Sites (by total stall time):"]
+        ranked = sorted(self.sites.items(), key=lambda item: item[1][1], reverse=True)
+        for site, (count, total, longest, stack) in ranked[:limit]:
+            lines.append(
+                f"  {total * 1e3:9.0f} ms total, {count:4d} stalls, "
+                f"max {longest * 1e3:7.0f} ms  {site}"
+            )
+            for frame in stack[-stack_depth:]:
+                lines.append(f"      {frame}")
+        if len(ranked) > limit:
+            lines.append(f"  ... and {len(ranked) - limit} more sites")
+        return "\n".join(lines)
+
+    def recent_report(self, limit: int = 10) -> str:
+        """
+        Most recent stalls, newest first.
+
+        Returns
+        -------
+        str
+            Multi-line text report.
+        """
+        if not self.stalls:
+            return "Recent Stalls:\n  No stalls recorded"
+        lines = ["Recent Stalls:"]
+        for stall in list(self.stalls)[::-1][:limit]:
+            info = stall.as_dict()
+            lines.append(f"  {info['time']}  {info['duration_ms']:8.0f} ms  {stall.site}")
+        return "\n".join(lines)
+
+
+_monitor = None
+
+
+def start_stall_monitor(config):
+    """
+    Start the stall monitor of the application, if it is enabled.
+
+    Parameters
+    ----------
+    config : dict
+        The ``[gui.stall_monitor]`` table.
+
+    Returns
+    -------
+    StallMonitor or None
+        The running monitor.
+    """
+    global _monitor
+    if _monitor is not None:
+        _monitor.stop()
+        _monitor = None
+    try:
+        _monitor = StallMonitor.from_config(config)
+    except (TypeError, ValueError) as e:
+        print(f"Invalid stall monitor configuration: {e}")
+        _monitor = None
+    if _monitor is not None:
+        _monitor.start()
+    return _monitor
+
+
+def get_stall_monitor():
+    """The running stall monitor, None if it was not started."""
+    return _monitor
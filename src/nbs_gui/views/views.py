@@ -1,3 +1,6 @@
+import bisect
+
+from qtpy.QtCore import Qt
 from qtpy.QtWidgets import (
     QHBoxLayout,
     QVBoxLayout,
@@ -111,50 +114,91 @@ class AutoControlBox(QGroupBox):
         self.box.setContentsMargins(5, 5, 5, 5)
         self.box.setSpacing(5)
 
+        self._parent_model = parent_model
+        self._widget_orientation = widget_orientation
+        self._no_controls_label = None
+
         # Filter models that have controllers
         controllable_models = {}
 
         if isinstance(models, dict):
             for k, m in models.items():
                 # Check if model has a controller
-                if (
-                    hasattr(m, "default_controller")
-                    and m.default_controller is not None
-                ):
+                if self._is_controllable(m):
                     controllable_models[k] = m
                 else:
                     print(f"Skipping {k} - no controller available")
         elif isinstance(models, list):
             for m in models:
                 # Check if model has a controller
-                if (
-                    hasattr(m, "default_controller")
-                    and m.default_controller is not None
-                ):
+                if self._is_controllable(m):
                     controllable_models[m.label] = m
                 else:
                     print(f"Skipping {m.label} - no controller available")
 
         # Create widgets only for controllable models
         for k, m in controllable_models.items():
-            try:
-                widget = AutoControl(
-                    m, parent_model=parent_model, orientation=widget_orientation
-                )
-                self.widgets[k] = widget
-                self.box.addWidget(widget)
-                widget.setVisible(getattr(m, "visible", True))
-            except Exception as e:
-                print(f"Failed to create control widget for {k}: {e}")
+            self.add_model(k, m)
 
         # If no controllable models, add a message
-        if not controllable_models:
-            no_controls_label = QLabel("No controllable devices found")
-            no_controls_label.setAlignment(Qt.AlignCenter)
-            self.box.addWidget(no_controls_label)
+        if not self.widgets:
+            self._show_no_controls_label()
 
         self.setLayout(self.box)
 
+    @staticmethod
+    def _is_controllable(model):
+        return (
+            hasattr(model, "default_controller")
+            and model.default_controller is not None
+        )
+
+    def _show_no_controls_label(self):
+        self._no_controls_label = QLabel("No controllable devices found")
+        self._no_controls_label.setAlignment(Qt.AlignCenter)
+        self.box.addWidget(self._no_controls_label)
+
+    def add_model(self, key, model):
+        """
+        Add a control widget for a model, if the model has a controller.
+
+        Parameters
+        ----------
+        key : str
+            Name of the widget in the box.
+        model : object
+            Model to control.
+        """
+        if key in self.widgets or not self._is_controllable(model):
+            return
+        try:
+            widget = AutoControl(
+                model,
+                parent_model=self._parent_model,
+                orientation=self._widget_orientation,
+            )
+        except Exception as e:
+            print(f"Failed to create control widget for {key}: {e}")
+            return
+        if self._no_controls_label is not None:
+            self.box.removeWidget(self._no_controls_label)
+            self._no_controls_label.deleteLater()
+            self._no_controls_label = None
+        self.widgets[key] = widget
+        self.box.addWidget(widget)
+        widget.setVisible(getattr(model, "visible", True))
+
+    def remove_model(self, key):
+        """Remove the control widget of a model, if there is one."""
+        widget = self.widgets.pop(key, None)
+        if widget is None:
+            return
+        self.box.removeWidget(widget)
+        widget.setParent(None)
+        widget.deleteLater()
+        if not self.widgets:
+            self._show_no_controls_label()
+
     def contextMenuEvent(self, event):
         contextMenu = QMenu(self)
 
@@ -197,36 +241,54 @@ class AutoMonitorBox(QGroupBox):
             widget_orientation = "h"
         self.box.setContentsMargins(5, 5, 5, 5)
         self.box.setSpacing(5)
+        self._parent_model = parent_model
+        self._widget_orientation = widget_orientation
         if isinstance(models, dict):
             print(f"Adding {models.keys()} to AutoMonitorBox")
             for k, m in models.items():
                 if m is None:
                     print(f"Skipping {k} - no model available")
                     continue
-                print(f"Adding {m.label} to AutoMonitorBox")
-                widget = AutoMonitor(
-                    m, parent_model=parent_model, orientation=widget_orientation
-                )
-
-                self.widgets[k] = widget
-                self.box.addWidget(widget)
-                widget.setVisible(getattr(m, "visible", True))
+                self.add_model(k, m)
         elif isinstance(models, list):
             print(f"Adding {models} to AutoMonitorBox")
             for m in models:
                 if m is None:
                     print(f"Skipping None - no model available")
                     continue
-                print(f"Adding {m.label} to AutoMonitorBox")
-                widget = AutoMonitor(
-                    m, parent_model=parent_model, orientation=widget_orientation
-                )
-
-                self.widgets[m.label] = widget
-                self.box.addWidget(widget)
-                widget.setVisible(getattr(m, "visible", True))
+                self.add_model(m.label, m)
         self.setLayout(self.box)
 
+    def add_model(self, key, model):
+        """
+        Add a monitor widget for a model.
+
+        Parameters
+        ----------
+        key : str
+            Name of the widget in the box.
+        model : object
+            Model to monitor.
+        """
+        if key in self.widgets or model is None:
+            return
+        print(f"Adding {model.label} to AutoMonitorBox")
+        widget = AutoMonitor(
+            model, parent_model=self._parent_model, orientation=self._widget_orientation
+        )
+        self.widgets[key] = widget
+        self.box.addWidget(widget)
+        widget.setVisible(getattr(model, "visible", True))
+
+    def remove_model(self, key):
+        """Remove the monitor widget of a model, if there is one."""
+        widget = self.widgets.pop(key, None)
+        if widget is None:
+            return
+        self.box.removeWidget(widget)
+        widget.setParent(None)
+        widget.deleteLater()
+
     def contextMenuEvent(self, event):
         contextMenu = QMenu(self)
 
@@ -267,40 +329,72 @@ class AutoControlCombo(QWidget):
         """
         super().__init__(*args, **kwargs)
         print(f"Initializing AutoControlCombo {title}")
+        self._parent_model = parent_model
+        self._orientation = orientation
+        # Sorted keys of the models in the dropdown
+        self._keys = []
         controlBox = QVBoxLayout()
         selectBox = QHBoxLayout()
         label = QLabel(title)
-        dropdown = ScrollingComboBox(max_visible_items=10)
+        self.dropdown = ScrollingComboBox(max_visible_items=10)
 
-        widgetStack = QStackedWidget()
+        self.widgetStack = QStackedWidget()
         keys = sorted(modelDict.keys())
 
         for key in keys:
             print(f"Adding {key} to AutoControlCombo")
             model = modelDict.get(key, None)
             if model:
-                if model.default_controller is None:
-                    continue
-                dropdown.addItem(key)
-                print(f"Adding model {model.label} to widgetStack")
-                widgetStack.addWidget(
-                    AutoControl(
-                        model, parent_model=parent_model, orientation=orientation
-                    )
-                )
+                self.add_model(key, model)
             else:
                 print(f"Model with key {key} is not loaded!")
-        dropdown.currentIndexChanged.connect(widgetStack.setCurrentIndex)
+        self.dropdown.currentIndexChanged.connect(self.widgetStack.setCurrentIndex)
         selectBox.addWidget(label)
-        selectBox.addWidget(dropdown)
+        selectBox.addWidget(self.dropdown)
         controlBox.addLayout(selectBox)
-        controlBox.addWidget(widgetStack)
+        controlBox.addWidget(self.widgetStack)
         self.setLayout(controlBox)
 
         # Set size policy for widgetStack
-        widgetStack.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Minimum)
+        self.widgetStack.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Minimum)
         print(f"AutoControlCombo {title} initialized")
 
+    def add_model(self, key, model):
+        """
+        Add a model to the dropdown, keeping the keys sorted.
+
+        Parameters
+        ----------
+        key : str
+            Name of the model in the dropdown.
+        model : object
+            Model to control. Models without a controller are skipped.
+        """
+        if key in self._keys or model is None or model.default_controller is None:
+            return
+        print(f"Adding model {model.label} to widgetStack")
+        widget = AutoControl(
+            model, parent_model=self._parent_model, orientation=self._orientation
+        )
+        n = bisect.bisect_left(self._keys, key)
+        self._keys.insert(n, key)
+        self.widgetStack.insertWidget(n, widget)
+        self.dropdown.insertItem(n, key)
+        self.widgetStack.setCurrentIndex(self.dropdown.currentIndex())
+
+    def remove_model(self, key):
+        """Remove a model from the dropdown, if it is there."""
+        n = bisect.bisect_left(self._keys, key)
+        if n >= len(self._keys) or self._keys[n] != key:
+            return
+        del self._keys[n]
+        widget = self.widgetStack.widget(n)
+        self.widgetStack.removeWidget(widget)
+        widget.setParent(None)
+        widget.deleteLater()
+        self.dropdown.removeItem(n)
+        self.widgetStack.setCurrentIndex(self.dropdown.currentIndex())
+
 
 class DynamicControlWidget(QStackedWidget):
     """Widget that switches between monitor and control views based on availability.
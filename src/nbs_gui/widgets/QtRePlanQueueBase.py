@@ -11,11 +11,15 @@ from qtpy.QtWidgets import (
     QHeaderView,
     QTableView,
     QAbstractItemView,
+    QLineEdit,
 )
 from qtpy.QtCore import Signal, Slot, Qt, QMimeData, QTimer
 from bluesky_widgets.qt.run_engine_client import PushButtonMinimumWidth
+from bluesky_widgets.qt.threading import FunctionWorker
+from nbs_gui.models.planHistory import PlanHistoryIndex
 from nbs_gui.widgets.timeEstimators import TimeEstimator
 from nbs_gui.widgets.utils import ConfirmationButton
+from ..utils.hot_path import timed_slot
 
 class QueueTableWidget(QTableWidget):
     signal_drop_event = Signal(int, int)
@@ -216,10 +220,25 @@ class BaseQueueWidget(QWidget):
 
 
 class QtReActiveQueue(BaseQueueWidget):
+    #: Delay (ms) between a queue or selection change and the estimate update
+    estimate_debounce_ms = 250
+
     def __init__(self, model, parent=None):
         super().__init__(model, parent=parent)
 
         self.time_estimator = TimeEstimator(model)
+        # Per-item estimates {item_uid: (item_key, estimate)} of the items in the
+        #   table. The total of valid estimates is updated as items come and go.
+        self._queue_estimates = {}
+        self._total_estimate = 0.0
+        self._n_total_estimates = 0
+        self._selected_estimate_uids = []
+        self._estimate_worker = None
+        self._estimate_rerun = False
+        self._estimate_timer = QTimer(self)
+        self._estimate_timer.setSingleShot(True)
+        self._estimate_timer.setInterval(self.estimate_debounce_ms)
+        self._estimate_timer.timeout.connect(timed_slot(self._start_time_estimate))
 
         # Set True to block processing of table selection change events
         self._block_table_selection_processing = False
@@ -389,10 +408,12 @@ class QtReActiveQueue(BaseQueueWidget):
 
     def get_item_value_for_label(self, item, label):
         if label == "Est. Time":
+            # Only memoized estimates are shown, the rest are filled in by
+            #   '_update_estimate_column' once they are computed in the background.
             try:
-                return self.time_estimator.format_time_estimate(
-                    self.time_estimator.calculate_plan_time(item)
-                )
+                key = self.time_estimator.item_key(item)
+                _, estimate = self.time_estimator.get_cached_estimate(key)
+                return self.time_estimator.format_time_estimate(estimate)
             except Exception as e:
                 print(f"[QtRePlanQueue] Error estimating plan time: {e}")
                 return "--"
@@ -404,40 +425,127 @@ class QtReActiveQueue(BaseQueueWidget):
                 return ""
 
     def _update_total_time_estimate(self, plan_queue_items, selected_item_uids):
-        """Update the total time estimate display"""
-        try:
-            estimate = self.time_estimator.calculate_queue_time(plan_queue_items)
+        """Schedule an update of the total time estimate"""
+        self._estimate_timer.start()
 
-            if estimate is not None:
-                time_str = self.time_estimator.format_time_estimate(estimate)
-                self._total_time_label.setText(f"Total Est. Time: {time_str}")
-                self._total_time_label.setStyleSheet("QLabel { color: black; }")
-            else:
-                self._total_time_label.setText("Total Est. Time: --")
-                self._total_time_label.setStyleSheet("QLabel { color: gray; }")
+    def _update_selected_time_estimate(self, selected_item_uids):
+        """Schedule an update of the selected time estimate"""
+        self._selected_estimate_uids = list(selected_item_uids)
+        self._estimate_timer.start()
 
-        except Exception as e:
-            print(f"[QtRePlanQueue] Error updating total time estimate: {e}")
-            self._total_time_label.setText("Total Est. Time: --")
+    def _start_time_estimate(self):
+        """
+        Compute missing estimates in a worker thread, then update the labels.
+        """
+        if self._estimate_worker is not None:
+            # Items changed while the worker was running: start again when it is done
+            self._estimate_rerun = True
+            return
 
-    def _update_selected_time_estimate(self, selected_item_uids):
-        """Update the total time estimate display"""
-        plan_queue_items = [self.queue_model.queue_item_by_uid(u) for u in selected_item_uids]
         try:
-            estimate = self.time_estimator.calculate_queue_time(plan_queue_items)
+            jobs = self.time_estimator.prepare_estimate_jobs(self._plan_queue_items)
+        except Exception as e:
+            print(f"[QtRePlanQueue] Error preparing time estimates: {e}")
+            jobs = []
+        if not jobs:
+            self._apply_time_estimates()
+            return
+
+        worker = FunctionWorker(self.time_estimator.compute_estimates, jobs)
+        worker.returned.connect(self.time_estimator.store_estimates)
+        worker.finished.connect(self._on_estimate_worker_finished)
+        self._estimate_worker = worker
+        worker.start()
+
+    def _on_estimate_worker_finished(self):
+        worker, self._estimate_worker = self._estimate_worker, None
+        if worker is not None:
+            try:
+                worker.returned.disconnect()
+                worker.finished.disconnect()
+            except Exception:
+                pass
 
+        self._apply_time_estimates()
+        if self._estimate_rerun:
+            self._estimate_rerun = False
+            self._start_time_estimate()
+
+    def _apply_time_estimates(self):
+        """
+        Update per-item estimates and the running total from the memoized estimates,
+        then refresh the labels.
+        """
+        time_estimator = self.time_estimator
+        item_keys = {}
+        for item in self._plan_queue_items:
+            item_uid = item.get("item_uid", None)
+            if item_uid:
+                item_keys[item_uid] = time_estimator.item_key(item)
+
+        # Subtract the items that left the queue or were changed
+        for item_uid, (key, estimate) in list(self._queue_estimates.items()):
+            if item_keys.get(item_uid, None) != key:
+                del self._queue_estimates[item_uid]
+                if estimate is not None:
+                    self._total_estimate -= estimate
+                    self._n_total_estimates -= 1
+
+        # Add the items with available estimates
+        for item_uid, key in item_keys.items():
+            if item_uid in self._queue_estimates:
+                continue
+            found, estimate = time_estimator.get_cached_estimate(key)
+            if not found:
+                continue
+            self._queue_estimates[item_uid] = (key, estimate)
             if estimate is not None:
-                time_str = self.time_estimator.format_time_estimate(estimate)
-                self._selected_time_label.setText(f"Selected Est. Time: {time_str}")
-                self._selected_time_label.setStyleSheet("QLabel { color: black; }")
-            else:
-                self._selected_time_label.setText("Selected Est. Time: --")
-                self._selected_time_label.setStyleSheet("QLabel { color: gray; }")
+                self._total_estimate += estimate
+                self._n_total_estimates += 1
 
-        except Exception as e:
-            print(f"[QtRePlanQueue] Error updating selected time estimate: {e}")
-            self._selected_time_label.setText("Selected Est. Time: --")
+        if not self._n_total_estimates:
+            # Reset accumulated rounding errors
+            self._total_estimate = 0.0
+            total = None
+        else:
+            total = self._total_estimate
+        self._set_time_estimate_label(self._total_time_label, "Total Est. Time", total)
+
+        selected = [
+            self._queue_estimates.get(uid, (None, None))[1]
+            for uid in self._selected_estimate_uids
+        ]
+        selected = [_ for _ in selected if _ is not None]
+        self._set_time_estimate_label(
+            self._selected_time_label,
+            "Selected Est. Time",
+            sum(selected) if selected else None,
+        )
+        self._update_estimate_column()
+
+    def _set_time_estimate_label(self, label, prefix, estimate):
+        if estimate is not None:
+            time_str = self.time_estimator.format_time_estimate(estimate)
+            label.setText(f"{prefix}: {time_str}")
+            label.setStyleSheet("QLabel { color: black; }")
+        else:
+            label.setText(f"{prefix}: --")
+            label.setStyleSheet("QLabel { color: gray; }")
 
+    def _update_estimate_column(self):
+        """Fill in the 'Est. Time' cells of the estimates computed in the background"""
+        try:
+            col = self._table_column_labels.index("Est. Time")
+        except ValueError:
+            return
+        for row, item in enumerate(self._plan_queue_items):
+            entry = self._queue_estimates.get(item.get("item_uid", None), None)
+            if entry is None:
+                continue
+            text = self.time_estimator.format_time_estimate(entry[1])
+            table_item = self._table.item(row, col)
+            if table_item is not None and table_item.text() != text:
+                table_item.setText(text)
 
     @Slot(object, object)
     def slot_plan_queue_changed(self, plan_queue_items, selected_item_uids):
@@ -446,10 +554,10 @@ class QtReActiveQueue(BaseQueueWidget):
         #   even if additional plans are added to the queue.
         self._block_table_selection_processing = True
 
-        # Create local copy of the plan queue items for operations performed locally
-        #   within the widget without involving the model.
-
-        self._plan_queue_items = copy.deepcopy(plan_queue_items)
+        # Create local copy of the plan queue list for operations performed locally
+        #   within the widget without involving the model. Items are not modified
+        #   by the widget (editors copy the item they receive), so they are shared.
+        self._plan_queue_items = list(plan_queue_items)
 
         # Update the custom table widget with the plan queue items
         self._table.set_plan_queue_items(self._plan_queue_items)
@@ -756,23 +864,58 @@ class QtRePlanQueue(QtReActiveQueue):
 
 
 class QtRePlanHistory(BaseQueueWidget):
+    """
+    Plan history table that renders a bounded window of the history.
+
+    The newest page of history items is shown first. Older pages are loaded
+    when the table is scrolled to the top, and newer pages are loaded back when
+    it is scrolled to the bottom. The number of rendered rows never exceeds
+    ``history_max_rows``, so the table size is independent of history length.
+    A search box filters the history by plan name, user and exit status.
+    """
+
     signal_plan_history_changed = Signal(object, object)
 
+    history_page_size = 100
+    history_max_rows = 1000
+
     def __init__(self, model, parent=None):
         super().__init__(model, parent=parent)
 
         # Set True to block processing of table selection change events
         self._block_table_selection_processing = False
 
+        self._plan_history_items = []
+        self._history_index = PlanHistoryIndex()
+        self._history_filter = ""
+        self._matched_history_pos = range(0)
+        # Rendered window: 'self._window_stop' is None while the window is pinned
+        #   to the newest items, otherwise it is the (exclusive) index of the last
+        #   rendered item in the list of matched items.
+        self._window_len = self.history_page_size
+        self._window_stop = None
+        self._window_start = 0
+        self._window_pos = []
+        self._window_row = {}
+        self._history_paging_blocked = False
+        self._history_page_pending = False
+
         self._pb_copy_to_queue = PushButtonMinimumWidth("Copy to Queue")
         self._pb_copy_to_staging = PushButtonMinimumWidth("Copy to Staging")
         self._pb_deselect_all = PushButtonMinimumWidth("Deselect All")
         self._pb_clear_history = ConfirmationButton("Clear History")
 
+        self._le_search = QLineEdit()
+        self._le_search.setPlaceholderText("Search name, user, status")
+        self._le_search.setClearButtonEnabled(True)
+        self._lb_window = QLabel("")
+        self._lb_window.setStyleSheet("QLabel { color: gray; }")
+
         self._pb_copy_to_queue.clicked.connect(self._pb_copy_to_queue_clicked)
         self._pb_copy_to_staging.clicked.connect(self._pb_copy_to_staging_clicked)
         self._pb_deselect_all.clicked.connect(self._pb_deselect_all_clicked)
         self._pb_clear_history.clicked.connect(self._pb_clear_history_clicked)
+        self._le_search.textChanged.connect(self._le_search_text_changed)
 
         vbox = QVBoxLayout()
         hbox = QHBoxLayout()
@@ -784,6 +927,10 @@ class QtRePlanHistory(BaseQueueWidget):
         hbox.addWidget(self._pb_deselect_all)
         hbox.addWidget(self._pb_clear_history)
         vbox.addLayout(hbox)
+        search_hbox = QHBoxLayout()
+        search_hbox.addWidget(self._le_search)
+        search_hbox.addWidget(self._lb_window)
+        vbox.addLayout(search_hbox)
         vbox.addWidget(self._table)
         self.setLayout(vbox)
         self.run_engine.events.status_changed.connect(self.on_update_widgets)
@@ -821,6 +968,13 @@ class QtRePlanHistory(BaseQueueWidget):
         max = self._table.verticalScrollBar().maximum()
         self._table_scrolled_to_bottom = value == max
 
+        if self._history_paging_blocked or not max:
+            return
+        if value == 0 and self._window_start > 0:
+            self._schedule_history_page(self._load_older_history_page)
+        elif value == max and self._window_stop is not None:
+            self._schedule_history_page(self._load_newer_history_page)
+
     def on_vertical_scrollbar_range_changed(self, min, max):
         if self._table_scrolled_to_bottom:
             self._table.verticalScrollBar().setValue(max)
@@ -849,24 +1003,64 @@ class QtRePlanHistory(BaseQueueWidget):
 
     @Slot(object, object)
     def slot_plan_history_changed(self, plan_history_items, selected_item_pos):
+        # Keep a reference (not a copy) to the history list owned by the model.
+        self._plan_history_items = plan_history_items
+        self._history_index.update(plan_history_items)
+        self._matched_history_pos = self._history_index.search(self._history_filter)
+
+        # Update the number of table items
+        self._n_table_items = len(plan_history_items)
+
+        self._render_history_window()
+
+        # Call function directly
+        self.slot_change_selection(selected_item_pos)
+
+        self._update_button_states()
+
+    def _render_history_window(self):
+        """
+        Fill the table with the current window of matched history items.
+
+        Returns
+        -------
+        int
+            Change of the position of the first rendered item relative to the previous
+            render: positive if older rows were added at the top of the table.
+        """
+        self._history_paging_blocked = True
+        self._block_table_selection_processing = True
+
         # Check if the vertical scroll bar is scrolled to the bottom.
         scroll_value = self._table.verticalScrollBar().value()
         scroll_maximum = self._table.verticalScrollBar().maximum()
         self._table_scrolled_to_bottom = scroll_value == scroll_maximum
 
+        matched = self._matched_history_pos
+        n_matched = len(matched)
+        if self._window_stop is None or self._window_stop >= n_matched:
+            self._window_stop = None
+            stop = n_matched
+        else:
+            stop = self._window_stop
+        start = max(0, stop - self._window_len)
+        rows_added_top = self._window_start - start
+        self._window_start = start
+
+        self._window_pos = list(matched[start:stop])
+        self._window_row = {pos: row for row, pos in enumerate(self._window_pos)}
+        window_items = [self._plan_history_items[_] for _ in self._window_pos]
+
         self._table.clearContents()
-        self._table.setRowCount(len(plan_history_items))
+        self._table.setRowCount(len(window_items))
 
-        self._table.set_plan_queue_items(plan_history_items)
+        self._table.set_plan_queue_items(window_items)
 
-        if len(plan_history_items):
-            resize_mode = QHeaderView.ResizeToContents
-        else:
-            # Empty table, stretch the header
-            resize_mode = QHeaderView.Stretch
-        self._table.horizontalHeader().setSectionResizeMode(resize_mode)
+        # Columns are sized once after the table is filled: with 'ResizeToContents'
+        #   active, every inserted cell triggers a resize of the whole column.
+        self._table.horizontalHeader().setSectionResizeMode(QHeaderView.Interactive)
 
-        for nr, item in enumerate(plan_history_items):
+        for nr, item in enumerate(window_items):
             for nc, col_name in enumerate(self._table_column_labels):
                 try:
                     value = self.run_engine.get_item_value_for_label(
@@ -881,18 +1075,91 @@ class QtRePlanHistory(BaseQueueWidget):
                 )
                 self._table.setItem(nr, nc, table_item)
 
-        # Update the number of table items
-        self._n_table_items = len(plan_history_items)
+        if len(window_items):
+            resize_mode = QHeaderView.ResizeToContents
+        else:
+            # Empty table, stretch the header
+            resize_mode = QHeaderView.Stretch
+        self._table.horizontalHeader().setSectionResizeMode(resize_mode)
 
         # Advance scrollbar if the table is scrolled all the way down.
-        if self._table_scrolled_to_bottom:
+        if self._table_scrolled_to_bottom and self._window_stop is None:
             scroll_maximum_new = self._table.verticalScrollBar().maximum()
             self._table.verticalScrollBar().setValue(scroll_maximum_new)
 
-        # Call function directly
-        self.slot_change_selection(selected_item_pos)
+        if n_matched == len(self._plan_history_items):
+            self._lb_window.setText(
+                f"Showing {start + 1 if stop else 0}-{stop} of {n_matched}"
+            )
+        else:
+            self._lb_window.setText(
+                f"Showing {start + 1 if stop else 0}-{stop} of {n_matched} "
+                f"matches ({len(self._plan_history_items)} items)"
+            )
 
-        self._update_button_states()
+        self._block_table_selection_processing = False
+        self._history_paging_blocked = False
+        return rows_added_top
+
+    def _schedule_history_page(self, load_page):
+        # Loading is deferred so that the table is not rebuilt from inside
+        #   the scroll bar signal handler.
+        if not self._history_page_pending:
+            self._history_page_pending = True
+            QTimer.singleShot(0, load_page)
+
+    def _load_older_history_page(self):
+        """Add a page of older items at the top of the rendered window."""
+        self._history_page_pending = False
+        if self._window_start <= 0:
+            return
+
+        if self._window_len + self.history_page_size <= self.history_max_rows:
+            self._window_len += self.history_page_size
+        else:
+            # The window is at full size: slide it toward older items
+            stop = self._window_stop
+            if stop is None:
+                stop = len(self._matched_history_pos)
+            self._window_stop = stop - min(self.history_page_size, self._window_start)
+
+        rows_added_top = self._render_history_window()
+        self._restore_history_selection()
+        self._set_history_scroll_value(rows_added_top)
+
+    def _load_newer_history_page(self):
+        """Slide the rendered window toward newer items."""
+        self._history_page_pending = False
+        if self._window_stop is None:
+            return
+
+        scroll_value = self._table.verticalScrollBar().value()
+        self._window_stop += self.history_page_size
+        rows_added_top = self._render_history_window()
+        self._restore_history_selection()
+        self._set_history_scroll_value(scroll_value + rows_added_top)
+
+    def _set_history_scroll_value(self, value):
+        # Keep the same rows in view after the window moved. The scroll bar range is
+        #   updated first, otherwise the value is clamped to the old range.
+        self._history_paging_blocked = True
+        self._table.updateGeometries()
+        scroll_bar = self._table.verticalScrollBar()
+        scroll_bar.setValue(max(value, 0))
+        self._table_scrolled_to_bottom = scroll_bar.value() == scroll_bar.maximum()
+        self._history_paging_blocked = False
+
+    def _restore_history_selection(self):
+        self.slot_change_selection(self.run_engine.selected_history_item_pos)
+
+    def _le_search_text_changed(self, text):
+        self._history_filter = text
+        self._matched_history_pos = self._history_index.search(text)
+        self._window_len = self.history_page_size
+        self._window_stop = None
+        self._window_start = 0
+        self._render_history_window()
+        self._restore_history_selection()
 
     def on_item_selection_changed(self):
         """
@@ -904,7 +1171,8 @@ class QtRePlanHistory(BaseQueueWidget):
         sel_rows = self._table.selectionModel().selectedRows()
         try:
             if len(sel_rows) >= 1:
-                selected_item_pos = [_.row() for _ in sel_rows]
+                # Table rows are converted to positions in the full history list
+                selected_item_pos = sorted(self._window_pos[_.row()] for _ in sel_rows)
                 self.run_engine.selected_history_item_pos = selected_item_pos
                 self._selected_items_pos = selected_item_pos
             else:
@@ -928,14 +1196,15 @@ class QtRePlanHistory(BaseQueueWidget):
 
     @Slot(object)
     def slot_change_selection(self, selected_item_pos):
-        rows = selected_item_pos
+        # Only the selected items that are inside the rendered window can be highlighted
+        rows = [self._window_row[_] for _ in selected_item_pos if _ in self._window_row]
 
         # Keep horizontal scroll value while the selection is changed (more consistent behavior)
         scroll_value = self._table.horizontalScrollBar().value()
 
         if not rows:
             self._table.clearSelection()
-            self._selected_items_pos = []
+            self._selected_items_pos = list(selected_item_pos)
         else:
             self._block_table_selection_processing = True
             self._table.clearSelection()
@@ -956,7 +1225,7 @@ class QtRePlanHistory(BaseQueueWidget):
             item_visible = self._table.item(row_visible, 0)
             self._table.scrollToItem(item_visible, QAbstractItemView.EnsureVisible)
             self._block_table_selection_processing = False
-            self._selected_items_pos = rows
+            self._selected_items_pos = list(selected_item_pos)
 
         self._table.horizontalScrollBar().setValue(scroll_value)
 
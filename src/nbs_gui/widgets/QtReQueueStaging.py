@@ -7,6 +7,8 @@ from qtpy.QtWidgets import (
 )
 from bluesky_widgets.qt.run_engine_client import PushButtonMinimumWidth
 from .QtRePlanQueueBase import QtReActiveQueue
+from .utils import submit_plans
+from .planValidation import PlanValidationDialog
 
 
 class QtReQueueStaging(QtReActiveQueue):
@@ -43,6 +45,10 @@ class QtReQueueStaging(QtReActiveQueue):
             "Copy Selected to Queue"
         )
         self._pb_copy_all_to_queue = PushButtonMinimumWidth("Copy All to Queue")
+        self._pb_validate = PushButtonMinimumWidth("Validate")
+        self._pb_validate.setToolTip(
+            "Check staged plans against the plans allowed by the Queue Server"
+        )
 
         # Connect first row buttons
         self._pb_move_up.clicked.connect(self._pb_move_up_clicked)
@@ -63,6 +69,7 @@ class QtReQueueStaging(QtReActiveQueue):
             self._pb_copy_selected_to_queue_clicked
         )
         self._pb_copy_all_to_queue.clicked.connect(self._pb_copy_all_to_queue_clicked)
+        self._pb_validate.clicked.connect(self._pb_validate_clicked)
 
     def _create_layout(self):
         print("DEBUG: QtReQueueStaging - creating layout")
@@ -108,6 +115,8 @@ class QtReQueueStaging(QtReActiveQueue):
         hbox2.addStretch(1)
         hbox2.addWidget(self._pb_copy_selected_to_queue)
         hbox2.addWidget(self._pb_copy_all_to_queue)
+        hbox2.addStretch(1)
+        hbox2.addWidget(self._pb_validate)
 
         header_vbox.addLayout(hbox1)
         header_vbox.addLayout(hbox2)
@@ -145,28 +154,43 @@ class QtReQueueStaging(QtReActiveQueue):
         self._pb_move_all_to_queue.setEnabled(not mon and n_items)
         self._pb_copy_selected_to_queue.setEnabled(not mon and is_sel)
         self._pb_copy_all_to_queue.setEnabled(not mon and n_items)
+        self._pb_validate.setEnabled(bool(n_items))
+
+    def _submit_to_queue(self, plans, title):
+        """
+        Submit staged plans to the main queue in batches.
+
+        Returns
+        -------
+        int
+            The number of plans added to the queue. Plans are added in order, so
+            these are the first plans of the submitted list.
+        """
+        return submit_plans(self, self.run_engine, plans, title=title)
 
     def _pb_move_selected_to_queue_clicked(self):
         try:
+            selected_indices = self.queue_model.selected_plan_indices
             selected_plans = self.queue_model.selected_plans
             if selected_plans:
                 # Add to main queue
-                for plan in selected_plans:
-                    self.run_engine.queue_item_add(item=plan)
-                # Remove from staging
-                self.queue_model.queue_items_remove()
+                n_added = self._submit_to_queue(selected_plans, "Moving Plans to Queue")
+                # Remove the plans that were added from staging
+                self.queue_model.remove_plans(selected_indices[:n_added])
         except Exception as ex:
             print(f"Exception: {ex}")
 
     def _pb_move_all_to_queue_clicked(self):
         try:
-            all_plans = self.queue_model.staged_plans
+            all_plans = list(self.queue_model.staged_plans)
             if all_plans:
                 # Add all to main queue
-                for plan in all_plans:
-                    self.run_engine.queue_item_add(item=plan)
-                # Clear staging
-                self.queue_model.queue_clear()
+                n_added = self._submit_to_queue(all_plans, "Moving Plans to Queue")
+                # Clear staging, keeping the plans that were not added
+                if n_added == len(all_plans):
+                    self.queue_model.queue_clear()
+                else:
+                    self.queue_model.remove_plans(range(n_added))
         except Exception as ex:
             print(f"Exception: {ex}")
 
@@ -175,17 +199,35 @@ class QtReQueueStaging(QtReActiveQueue):
             selected_plans = self.queue_model.selected_plans
             if selected_plans:
                 # Add to main queue without removing from staging
-                for plan in selected_plans:
-                    self.run_engine.queue_item_add(item=plan)
+                self._submit_to_queue(selected_plans, "Copying Plans to Queue")
         except Exception as ex:
             print(f"Exception: {ex}")
 
     def _pb_copy_all_to_queue_clicked(self):
         try:
-            all_plans = self.queue_model.staged_plans
+            all_plans = list(self.queue_model.staged_plans)
             if all_plans:
                 # Add all to main queue without removing from staging
-                for plan in all_plans:
-                    self.run_engine.queue_item_add(item=plan)
+                self._submit_to_queue(all_plans, "Copying Plans to Queue")
         except Exception as ex:
             print(f"Exception: {ex}")
+
+    def _pb_validate_clicked(self):
+        try:
+            staged_plans = list(self.queue_model.staged_plans)
+            if staged_plans:
+                dialog = PlanValidationDialog(
+                    self.run_engine, staged_plans, self, title="Validate Staged Plans"
+                )
+                item_uids = [_.get("item_uid", None) for _ in staged_plans]
+                dialog.signal_item_activated.connect(
+                    lambda n: self._select_staged_item(item_uids[n])
+                )
+                dialog.exec_()
+        except Exception as ex:
+            print(f"Exception: {ex}")
+
+    def _select_staged_item(self, item_uid):
+        """Select a staged item, if it is still in staging"""
+        if item_uid and self.queue_model.queue_item_uid_to_pos(item_uid) >= 0:
+            self.queue_model.selected_queue_item_uids = [item_uid]
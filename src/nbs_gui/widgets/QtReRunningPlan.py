@@ -1,7 +1,7 @@
 import pprint
 
-from qtpy.QtCore import Signal, Slot
-from qtpy.QtGui import QPalette
+from qtpy.QtCore import Qt, Signal, Slot
+from qtpy.QtGui import QPalette, QTextCursor
 from qtpy.QtWidgets import (
     QHBoxLayout,
     QLabel,
@@ -40,6 +40,17 @@ class QtReRunningPlan(QWidget):
         self._pb_environment_update.setEnabled(False)
         self._pb_environment_update.clicked.connect(self._pb_environment_update_clicked)
 
+        # Pause state and plan status change independently of the plan description,
+        #   so they are shown outside of the text document.
+        self._lb_paused = QLabel("Plan Paused")
+        self._lb_paused.setAlignment(Qt.AlignCenter)
+        self._lb_paused.setStyleSheet(
+            "QLabel { color: red; font-size: 16px; font-weight: bold; }"
+        )
+        self._lb_paused.setVisible(False)
+        self._lb_plan_status = QLabel()
+        self._lb_plan_status.setVisible(False)
+
         vbox = QVBoxLayout()
         hbox = QHBoxLayout()
         hbox.addWidget(QLabel("RUNNING PLAN"))
@@ -47,6 +58,8 @@ class QtReRunningPlan(QWidget):
         hbox.addWidget(self._pb_environment_update)
         hbox.addWidget(self._pb_copy_to_queue)
         vbox.addLayout(hbox)
+        vbox.addWidget(self._lb_paused)
+        vbox.addWidget(self._lb_plan_status)
         vbox.addWidget(self._text_edit)
         self.setLayout(vbox)
 
@@ -56,6 +69,12 @@ class QtReRunningPlan(QWidget):
         self._running_item = None
         self._run_list = []
         self._is_paused = False
+        # UID of the item whose description is displayed and the displayed run rows,
+        #   [(run_uid, is_open, exit_status), ...]
+        self._displayed_item_uid = None
+        self._displayed_runs = []
+        # Formatted plan descriptions: {item_uid: html}
+        self._description_cache = {}
         self._update_copy_button_state()
 
         # Connect to run engine events
@@ -139,7 +158,7 @@ class QtReRunningPlan(QWidget):
 
         # Update display if paused state changed
         if was_paused != self._is_paused:
-            self._update_display()
+            self._update_state_labels()
 
         self._pb_environment_update.setEnabled(
             not monitor_mode
@@ -159,10 +178,40 @@ class QtReRunningPlan(QWidget):
         if plan_status and "status" in plan_status:
             self._current_plan_status = plan_status["status"]
             # Update the display to include plan status
-            self._update_display()
+            self._update_state_labels()
 
     def _update_display(self):
         """Update the display with current running item and plan status"""
+        self._update_state_labels()
+
+        running_item = self._running_item or {}
+        item_uid = running_item.get("item_uid", "")
+        if item_uid != self._displayed_item_uid:
+            self._text_edit.setHtml(self._format_description(running_item))
+            self._displayed_item_uid = item_uid
+            self._displayed_runs = []
+        self._update_run_rows()
+
+    def _update_state_labels(self):
+        """Show the pause state and the plan status of the running item"""
+        self._lb_paused.setVisible(self._is_paused)
+        show_status = self._current_plan_status != "idle" and bool(self._running_item)
+        if show_status:
+            self._lb_plan_status.setText(
+                f"<b>Plan Status:</b> {self._current_plan_status}"
+            )
+        self._lb_plan_status.setVisible(show_status)
+
+    def _format_description(self, running_item):
+        """
+        HTML description (name, arguments, parameters, metadata) of a running item.
+        Descriptions are cached by item UID, since a queue item does not change
+        while it is running.
+        """
+        item_uid = running_item.get("item_uid", "")
+        if item_uid in self._description_cache:
+            return self._description_cache[item_uid]
+
         s_running_item = ""
         indent = "&nbsp;&nbsp;&nbsp;&nbsp;"
 
@@ -180,47 +229,87 @@ class QtReRunningPlan(QWidget):
 
             return text_modified
 
-        # Add paused state at the top if paused
-        if self._is_paused:
-            s_running_item += "<table width='100%'><tr><td align='center'><span style='color: red; font-size: 16px; font-weight: bold;'>Plan Paused</span></td></tr></table>"
-
-        # Add plan status if not idle AND there's a running item
-        if self._current_plan_status != "idle" and self._running_item:
-            s_running_item += f"<b>Plan Status:</b> {self._current_plan_status}<br>"
-
-        if self._running_item:
-            s_running_item += (
-                f"<b>Plan Name:</b> {self._running_item.get('name', '')}<br>"
-            )
-            if ("args" in self._running_item) and self._running_item["args"]:
+        if running_item:
+            s_running_item += f"<b>Plan Name:</b> {running_item.get('name', '')}<br>"
+            if ("args" in running_item) and running_item["args"]:
                 s_running_item += (
-                    f"<b>Arguments:</b> {str(self._running_item['args'])[1:-1]}<br>"
+                    f"<b>Arguments:</b> {str(running_item['args'])[1:-1]}<br>"
                 )
-            if ("kwargs" in self._running_item) and self._running_item["kwargs"]:
+            if ("kwargs" in running_item) and running_item["kwargs"]:
                 s_running_item += "<b>Parameters:</b><br>"
-                for k, v in self._running_item["kwargs"].items():
+                for k, v in running_item["kwargs"].items():
                     s_running_item += indent + f"<b>{k}:</b> {v}<br>"
 
-            if ("meta" in self._running_item) and self._running_item["meta"]:
+            if ("meta" in running_item) and running_item["meta"]:
                 # This representation of metadata may not be the best, but it is still reasonable.
                 #   Note, that metadata may be a dictionary or a list of dictionaries.
-                s_meta = pprint.pformat(self._running_item["meta"])
+                s_meta = pprint.pformat(running_item["meta"])
                 s_meta = _to_html(s_meta)
                 s_running_item += f"<b>Metadata:</b><br>{s_meta}<br>"
 
-        s_run_list = "<b>Runs:</b><br>" if self._run_list else ""
-        for run_info in self._run_list:
-            run_uid = run_info["uid"]
-            run_is_open = run_info["is_open"]
-            run_exit_status = run_info["exit_status"]
-            s_run = indent + f"{run_uid}  "
-            if run_is_open:
-                s_run += "In progress ..."
-            else:
-                s_run += f"Exit status: {run_exit_status}"
-            s_run_list += s_run + "<br>"
-
-        self._text_edit.setHtml(s_running_item + s_run_list)
+        # The run list is appended as separate blocks, without an empty line before it
+        if s_running_item.endswith("<br>"):
+            s_running_item = s_running_item[: -len("<br>")]
+
+        # Only the description of the current item is needed again (e.g. after the
+        #   run list is replaced), so the cache holds a single entry.
+        self._description_cache = {item_uid: s_running_item}
+        return s_running_item
+
+    @staticmethod
+    def _format_run_row(run):
+        run_uid, run_is_open, run_exit_status = run
+        s_run = "&nbsp;&nbsp;&nbsp;&nbsp;" + f"{run_uid}&nbsp;&nbsp;"
+        if run_is_open:
+            s_run += "In progress ..."
+        else:
+            s_run += f"Exit status: {run_exit_status}"
+        return s_run
+
+    def _update_run_rows(self):
+        """
+        Update the list of runs at the end of the document. Each run is a separate
+        text block, so new runs are appended and runs that were closed are replaced
+        in place without reformatting the rest of the document.
+        """
+        runs = [
+            (_["uid"], _["is_open"], _["exit_status"]) for _ in (self._run_list or [])
+        ]
+        displayed = self._displayed_runs
+        if runs == displayed:
+            return
+
+        n_displayed = len(displayed)
+        if [_[0] for _ in runs[:n_displayed]] != [_[0] for _ in displayed]:
+            # Runs were removed or reordered: rebuild the description and run list
+            self._text_edit.setHtml(self._format_description(self._running_item or {}))
+            displayed, n_displayed = [], 0
+
+        document = self._text_edit.document()
+        cursor = QTextCursor(document)
+        cursor.beginEditBlock()
+
+        # Rows of the runs that changed state. The run rows are the last blocks.
+        first_row_block = document.blockCount() - n_displayed
+        for n, (run, run_displayed) in enumerate(zip(runs, displayed)):
+            if run != run_displayed:
+                block = document.findBlockByNumber(first_row_block + n)
+                cursor.setPosition(block.position())
+                cursor.movePosition(QTextCursor.EndOfBlock, QTextCursor.KeepAnchor)
+                cursor.insertHtml(self._format_run_row(run))
+
+        if len(runs) > n_displayed:
+            cursor.movePosition(QTextCursor.End)
+            if not n_displayed:
+                if not document.isEmpty():
+                    cursor.insertBlock()
+                cursor.insertHtml("<b>Runs:</b>")
+            for run in runs[n_displayed:]:
+                cursor.insertBlock()
+                cursor.insertHtml(self._format_run_row(run))
+
+        cursor.endEditBlock()
+        self._displayed_runs = runs
 
     def _update_copy_button_state(self):
         is_plan_running = self._is_item_running
@@ -0,0 +1,187 @@
+"""
+Live tables of the hot path counters and timers.
+"""
+
+from __future__ import annotations
+
+from qtpy.QtCore import Qt, QTimer
+from qtpy.QtGui import QStandardItem, QStandardItemModel
+from qtpy.QtWidgets import (
+    QCheckBox,
+    QFileDialog,
+    QHBoxLayout,
+    QHeaderView,
+    QLabel,
+    QPushButton,
+    QTabWidget,
+    QTableView,
+    QVBoxLayout,
+    QWidget,
+)
+
+from ..utils.hot_path import HOT_PATH, export_csv, export_json, model_rows
+
+MODEL_COLUMNS = [
+    ("name", "Model"),
+    ("class", "Class"),
+    ("received", "Received"),
+    ("stashed", "Stashed"),
+    ("drained", "Drained"),
+    ("emitted", "Emitted"),
+    ("limits", "Limits"),
+]
+
+TIMING_COLUMNS = [
+    ("category", "Category"),
+    ("name", "Name"),
+    ("calls", "Calls"),
+    ("calls_per_s", "Calls/s"),
+    ("total_ms", "Total (ms)"),
+    ("mean_ms", "Mean (ms)"),
+    ("max_ms", "Max (ms)"),
+]
+
+
+def _item(value) -> QStandardItem:
+    item = QStandardItem()
+    if isinstance(value, float):
+        # Numeric display data sorts numerically
+        item.setData(round(value, 3), Qt.DisplayRole)
+    else:
+        item.setData(value, Qt.DisplayRole)
+    item.setEditable(False)
+    return item
+
+
+class CounterTable(QTableView):
+    """
+    Sortable table of rows of dictionaries.
+
+    Parameters
+    ----------
+    columns : list of tuple
+        ``(row key, column header)`` of each column.
+    """
+
+    def __init__(self, columns, parent=None):
+        super().__init__(parent)
+        self.columns = columns
+        self._model = QStandardItemModel(0, len(columns), self)
+        self._model.setHorizontalHeaderLabels([header for _, header in columns])
+        self.setModel(self._model)
+        self.setSortingEnabled(True)
+        self.sortByColumn(2, Qt.DescendingOrder)
+        self.verticalHeader().setVisible(False)
+        self.horizontalHeader().setSectionResizeMode(QHeaderView.Interactive)
+        self.horizontalHeader().setStretchLastSection(True)
+        self.rows = []
+
+    def set_rows(self, rows: list[dict]) -> None:
+        """Replace the rows of the table, keeping the sort order."""
+        self.rows = rows
+        header = self.horizontalHeader()
+        column, order = header.sortIndicatorSection(), header.sortIndicatorOrder()
+        self.setSortingEnabled(False)
+        self._model.removeRows(0, self._model.rowCount())
+        for row in rows:
+            self._model.appendRow([_item(row.get(key, "")) for key, _ in self.columns])
+        self.setSortingEnabled(True)
+        self.sortByColumn(column, order)
+
+
+class HotPathView(QWidget):
+    """
+    Tables of the model update counters and of the hot path timings, with
+    live refresh and export to JSON or CSV.
+
+    Parameters
+    ----------
+    beamline : GUIBeamlineModel or None
+        Beamline whose models are listed.
+    refresh_ms : int, optional
+        Refresh interval of the live tables.
+    """
+
+    def __init__(self, beamline, refresh_ms=1000, parent=None):
+        super().__init__(parent)
+        self.beamline = beamline
+
+        self.model_table = CounterTable(MODEL_COLUMNS)
+        self.timing_table = CounterTable(TIMING_COLUMNS)
+        self.timing_table.sortByColumn(4, Qt.DescendingOrder)
+        self.tables = QTabWidget()
+        self.tables.addTab(self.timing_table, "Timings")
+        self.tables.addTab(self.model_table, "Models")
+
+        self._cb_live = QCheckBox("Live")
+        self._cb_live.setChecked(True)
+        btn_refresh = QPushButton("Refresh")
+        btn_refresh.clicked.connect(self.refresh)
+        btn_reset = QPushButton("Reset Timings")
+        btn_reset.clicked.connect(self._reset_timings)
+        btn_json = QPushButton("Export JSON")
+        btn_json.clicked.connect(self._export_json)
+        btn_csv = QPushButton("Export CSV")
+        btn_csv.clicked.connect(self._export_csv)
+        self._summary = QLabel("")
+
+        controls = QHBoxLayout()
+        controls.addWidget(self._cb_live)
+        controls.addWidget(btn_refresh)
+        controls.addWidget(btn_reset)
+        controls.addWidget(btn_json)
+        controls.addWidget(btn_csv)
+        controls.addStretch()
+        controls.addWidget(self._summary)
+
+        layout = QVBoxLayout()
+        layout.addLayout(controls)
+        layout.addWidget(self.tables)
+        self.setLayout(layout)
+
+        self._timer = QTimer(self)
+        self._timer.setInterval(refresh_ms)
+        self._timer.timeout.connect(self._live_refresh)
+        self._timer.start()
+
+    def _live_refresh(self) -> None:
+        if self._cb_live.isChecked() and self.isVisible():
+            self.refresh()
+
+    def refresh(self) -> None:
+        """Update both tables from the current counters."""
+        models = model_rows(self.beamline)
+        timings = HOT_PATH.timing_rows()
+        self.model_table.set_rows(models)
+        self.timing_table.set_rows(timings)
+        self._summary.setText(f"{len(models)} models, {len(timings)} hot paths")
+
+    def tables_as_dict(self) -> dict:
+        """Current counters as ``{"timings": rows, "models": rows}``."""
+        return {
+            "timings": HOT_PATH.timing_rows(),
+            "models": model_rows(self.beamline),
+        }
+
+    def _reset_timings(self) -> None:
+        HOT_PATH.reset()
+        self.refresh()
+
+    def _export(self, file_filter, writer) -> None:
+        path, _ = QFileDialog.getSaveFileName(self, "Export Counters", "", file_filter)
+        if not path:
+            return
+        try:
+            writer(path, self.tables_as_dict())
+        except Exception as e:
+            print(f"Error exporting counters to {path}: {e}")
+
+    def _export_json(self) -> None:
+        self._export("JSON files (*.json)", export_json)
+
+    def _export_csv(self) -> None:
+        self._export("CSV files (*.csv)", export_csv)
+
+    def teardown(self) -> None:
+        """Stop the live refresh."""
+        self._timer.stop()
@@ -9,11 +9,12 @@ from qtpy.QtWidgets import (
     QComboBox,
     QLabel,
     QPushButton,
-    QStackedWidget,
 )
+from functools import partial
 from nbs_gui.plans.base import PlanWidgetBase
 from nbs_gui.plans.durationMetaPlan import DurationMetaPlan
 from nbs_gui.plans.conditionMetaPlan import ConditionMetaPlan, UntilConditionMetaPlan
+from nbs_gui.widgets.utils import LazyWidgetStack
 
 
 class MetaPlanSubmissionWidget(QWidget):
@@ -21,22 +22,21 @@ class MetaPlanSubmissionWidget(QWidget):
     Widget for submitting meta-plans that run sequences of other plans.
 
     Provides a dropdown to select between different meta-plan types and
-    manages the individual meta-plan widgets.
+    manages the individual meta-plan widgets, which are created when they are
+    first selected.
     """
 
+    meta_plan_classes = [DurationMetaPlan, ConditionMetaPlan, UntilConditionMetaPlan]
+
     def __init__(self, model, parent=None):
         super().__init__(parent)
         print("[MetaPlanSubmission] Initializing widget")
         self.model = model
         self.run_engine_client = model.run_engine
         self.user_status = model.user_status
+        # Meta-plan widgets that have been created, keyed by display name
         self.action_dict = {}
-
-        # Create meta-plan widgets
-        self._create_meta_plan_widgets()
-
-        print(f"[MetaPlanSubmission] Loaded {len(self.action_dict)} meta-plan widgets")
-        self.action_widget = QStackedWidget(self)
+        self.action_widget = LazyWidgetStack(self)
 
         # Create and add the action selection combo box
         self.action_label = QLabel("Meta-Plan Type Selection", self)
@@ -50,10 +50,12 @@ class MetaPlanSubmissionWidget(QWidget):
         self.reset_button = QPushButton("Reset", self)
         self.reset_button.clicked.connect(self.reset_plan)
 
-        print("[MetaPlanSubmission] Adding widgets to stacked widget")
-        for k, widget in self.action_dict.items():
-            self.action_widget.addWidget(widget)
-            self.action_selection.addItem(k)
+        for plan_class in self.meta_plan_classes:
+            self.action_widget.add_lazy_widget(
+                partial(self._create_meta_plan_widget, plan_class)
+            )
+            self.action_selection.addItem(plan_class.display_name)
+        self.action_widget.widget_created.connect(self._on_meta_plan_widget_created)
 
         self.layout = QVBoxLayout(self)
         h = QHBoxLayout()
@@ -71,22 +73,13 @@ class MetaPlanSubmissionWidget(QWidget):
         self.action_widget.currentChanged.connect(self.update_plan_ready_connection)
         self.update_plan_ready_connection(self.action_widget.currentIndex())
 
-    def _create_meta_plan_widgets(self):
-        """Create the individual meta-plan widgets."""
-        # Duration-based meta-plan
-        print("[MetaPlanSubmission] Creating duration meta-plan widget")
-        duration_widget = DurationMetaPlan(self.model, self)
-        self.action_dict[duration_widget.display_name] = duration_widget
-
-        # Condition-based meta-plan (while condition)
-        print("[MetaPlanSubmission] Creating condition meta-plan widget")
-        condition_widget = ConditionMetaPlan(self.model, self)
-        self.action_dict[condition_widget.display_name] = condition_widget
+    def _create_meta_plan_widget(self, plan_class):
+        """Create the meta-plan widget of a meta-plan class."""
+        print(f"[MetaPlanSubmission] Creating {plan_class.display_name} widget")
+        return plan_class(self.model, self)
 
-        # Condition-based meta-plan (until condition)
-        print("[MetaPlanSubmission] Creating until condition meta-plan widget")
-        until_condition_widget = UntilConditionMetaPlan(self.model, self)
-        self.action_dict[until_condition_widget.display_name] = until_condition_widget
+    def _on_meta_plan_widget_created(self, index, widget):
+        self.action_dict[self.action_selection.itemText(index)] = widget
 
     def on_action_selection_changed(self, index):
         """Handler for action selection changes."""
@@ -109,6 +102,11 @@ class MetaPlanSubmissionWidget(QWidget):
 
         # Connect new widget
         self.current_widget = self.action_widget.widget(index)
+        if not self.action_widget.is_created(index):
+            # The meta-plan widget is created when it is shown
+            self.submit_button.setEnabled(False)
+            self.staging_button.setEnabled(False)
+            return
         if isinstance(self.current_widget, PlanWidgetBase):
             self.current_widget.plan_ready.connect(self.submit_button.setEnabled)
             self.current_widget.plan_ready.connect(self.staging_button.setEnabled)
@@ -22,7 +22,7 @@ from qtpy.QtWidgets import (
 from qtpy.QtCore import Qt, Signal, Slot
 from qtpy.QtGui import QBrush, QColor
 from .qt_custom import ScrollingComboBox
-from bluesky_queueserver import construct_parameters, format_text_descriptions
+from ..models.planValidation import get_item_parameter_info
 
 """
 Copied from bluesky-widgets and modified
@@ -50,6 +50,9 @@ class _QtRePlanEditorTable(QTableWidget):
         self._params = []
         self._params_indices = []
         self._params_descriptions = {}
+        # Parameter metadata of the displayed item and rows with invalid values
+        self._item_info = None
+        self._invalid_rows = set()
 
         self._item_meta = []
         self._item_result = []
@@ -123,36 +126,38 @@ class _QtRePlanEditorTable(QTableWidget):
 
     def _item_to_params(self, item):
         if item is None:
+            self._item_info = None
             return [], {}, [], []
 
         # Get plan parameters (probably should be a function call)
         item_name = item.get("name", None)
         item_type = item.get("item_type", None)
         if item_type in ("plan", "instruction"):
-            if item_type == "plan":
-                item_params = self.model.get_allowed_plan_parameters(name=item_name)
-            else:
-                item_params = self.model.get_allowed_instruction_parameters(
-                    name=item_name
-                )
+            # Parameters, descriptions and validators are compiled once per item name
+            #   and version of the allowed plans
+            item_info = get_item_parameter_info(self.model, item_type, item_name)
+            item_params = item_info.item_params
             item_editable = (item_name is not None) and (item_params is not None)
-            params_descriptions = format_text_descriptions(
-                item_parameters=item_params, use_html=True
-            )
+            params_descriptions = item_info.descriptions
         else:
             raise RuntimeError(f"Unknown item type '{item_type}'")
 
-        item_args, item_kwargs = self.model.get_bound_item_arguments(item)
+        item_args, item_kwargs = item_info.bind_arguments(
+            item.get("args", []), item.get("kwargs", {})
+        )
         if item_args:
             # Failed to bound the arguments. It is likely that the plan can not be submitted
             #   so consider it not editable. Display 'args' as a separate parameter named 'ARGS'.
             item_editable = False
             item_kwargs = dict(**{"ARGS": item_args}, **item_kwargs)
 
+        # Values are type-checked only if the parameters come from the item description
+        self._item_info = item_info if item_editable else None
+
         # print(f"plan_params={pprint.pformat(plan_params)}")
         if item_editable:
-            # Construct parameters (list of inspect.Parameter objects)
-            parameters = construct_parameters(item_params.get("parameters", {}))
+            # List of inspect.Parameter objects
+            parameters = item_info.parameters
         else:
             parameters = []
             for key, val in item_kwargs.items():
@@ -460,32 +465,53 @@ class _QtRePlanEditorTable(QTableWidget):
         if self._validation_disabled:
             return
 
-        data_valid = True
-        for n, p_index in enumerate(self._params_indices):
-            p = self._params[p_index]
-            if p["is_value_set"]:
-                table_item = self.item(n, 2)
-
-                if table_item:
-                    cell_valid = True
-                    cell_text = table_item.text()
-                    try:
-                        # Currently the simples verification is performed:
-                        #   - The cell is evaluated.
-                        #   - If the evaluation is successful, then the value is saved.
-                        # TODO: verify type of the loaded value whenever possible
-                        p["value"] = ast.literal_eval(cell_text)
-                    except Exception:
-                        cell_valid = False
-                        data_valid = False
-
-                    table_item.setForeground(
-                        self._text_color_valid
-                        if cell_valid
-                        else self._text_color_invalid
-                    )
-
-        self.signal_parameters_valid.emit(data_valid)
+        self._invalid_rows.clear()
+        for n in range(len(self._params_indices)):
+            self._validate_cell(n)
+
+        self.signal_parameters_valid.emit(not self._invalid_rows)
+
+    def _validate_cell(self, row):
+        """
+        Validate the value of the parameter displayed in a table row and update
+        the set of invalid rows. The value is evaluated and, if the parameters
+        of the item are known, checked against the parameter annotation.
+        """
+        self._invalid_rows.discard(row)
+        if row >= len(self._params_indices):
+            return
+        p = self._params[self._params_indices[row]]
+        table_item = self.item(row, 2)
+        if not p["is_value_set"] or not table_item:
+            return
+
+        description = self._params_descriptions.get("parameters", {}).get(
+            p["name"], None
+        ) or f"Description for parameter '{p['name']}' was not found ..."
+        msg = ""
+        try:
+            value = ast.literal_eval(table_item.text())
+        except Exception:
+            msg = "The value can not be evaluated"
+        else:
+            p["value"] = value
+            if self._item_info is not None:
+                msg = self._item_info.check_value(p["name"], value)
+
+        # Changing the style of the item must not be handled as a cell edit
+        signals_blocked = self.blockSignals(True)
+        try:
+            if msg:
+                self._invalid_rows.add(row)
+                table_item.setForeground(self._text_color_invalid)
+                table_item.setToolTip(
+                    f"<b>Invalid value:</b> {msg}<br><br>{description}"
+                )
+            else:
+                table_item.setForeground(self._text_color_valid)
+                table_item.setToolTip(description)
+        finally:
+            self.blockSignals(signals_blocked)
 
     def table_item_changed(self, table_item):
         try:
@@ -509,7 +535,10 @@ class _QtRePlanEditorTable(QTableWidget):
                     self._enable_signal_cell_modified = True
 
             if column in (1, 2):
-                self._validate_cell_values()
+                # Only the modified row needs to be validated again
+                if not self._validation_disabled:
+                    self._validate_cell(row)
+                    self.signal_parameters_valid.emit(not self._invalid_rows)
                 if self._enable_signal_cell_modified:
                     self.signal_cell_modified.emit()
         except ValueError:
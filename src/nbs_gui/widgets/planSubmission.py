@@ -5,62 +5,94 @@ from qtpy.QtWidgets import (
     QPushButton,
     QHBoxLayout,
     QLabel,
-    QStackedWidget,
     QSizePolicy,
     QFileDialog,
     QMessageBox,
 )
 from ..plans.planLoaders import PlanLoaderWidgetBase
 from ..plans.base import PlanWidgetBase
-from qtpy.QtCore import Signal, QObject
+from qtpy.QtCore import Signal, QObject, QTimer
+from bluesky_widgets.qt.threading import FunctionWorker
 from nbs_gui.widgets.timeEstimators import TimeEstimator
+from .planValidation import validate_plans
+from .utils import LazyWidgetStack
+from functools import partial
 from importlib.metadata import entry_points
+from ..utils.hot_path import timed_slot
+
+
+def load_widget_entry_points(group, include=(), exclude=()):
+    """
+    Load the widget classes of an entry point group without creating widgets.
+
+    Parameters
+    ----------
+    group : str
+        Entry point group, e.g. ``"nbs_gui.plans"``
+    include : list of str, optional
+        If not empty, only these entry points are loaded
+    exclude : list of str, optional
+        Entry points that are skipped. Ignored if *include* is not empty.
+
+    Returns
+    -------
+    list of tuple
+        ``(display_name, widget_class)`` pairs. The display name is the
+        ``display_name`` class attribute, or the entry point name if the class
+        does not define one.
+    """
+    widget_classes = []
+    for entry_point in entry_points(group=group):
+        if include:
+            if entry_point.name not in include:
+                continue
+        elif entry_point.name in exclude:
+            continue
+        try:
+            widget_class = entry_point.load()
+        except Exception as e:
+            print(f"Failed to load entry point {entry_point.name}: {e}")
+            continue
+        if not callable(widget_class):
+            continue
+        display_name = getattr(widget_class, "display_name", None)
+        if not isinstance(display_name, str):
+            display_name = entry_point.name
+        widget_classes.append((display_name, widget_class))
+    return widget_classes
 
 
 # Concepts of a plan submission model
 class PlanSubmissionBase(QWidget):
+    #: Delay (ms) between the last parameter change and the time estimate update
+    estimate_debounce_ms = 300
+
     def __init__(self, model, parent=None):
         super().__init__(parent)
         self.model = model
         self.run_engine_client = model.run_engine
         self.user_status = model.user_status
+        # Plan widgets that have been created, keyed by display name. Widgets are
+        # created when they are first selected.
         self.action_dict = {}
         self.time_estimator = TimeEstimator(model)
+        # Plans of the current widget for the estimate: [(item, count)]
+        self._estimate_items = []
+        self._estimate_worker = None
+        self._estimate_rerun = False
+        self._estimate_timer = QTimer(self)
+        self._estimate_timer.setSingleShot(True)
+        self._estimate_timer.setInterval(self.estimate_debounce_ms)
+        self._estimate_timer.timeout.connect(timed_slot(self._start_time_estimate))
         config = model.settings.gui_config
         plans_to_include = config.get("gui", {}).get("plans", {}).get("include", [])
         plans_to_exclude = config.get("gui", {}).get("plans", {}).get("exclude", [])
-        explicit_inclusion = len(plans_to_include) > 0
 
-        plans = entry_points(group="nbs_gui.plans")
         print("[PlanSubmission] Loading plan entry points")
-        for plan_entry_point in plans:
-            if explicit_inclusion:
-                if plan_entry_point.name in plans_to_include:
-                    print(
-                        f"[PlanSubmission] Loading included plan: {plan_entry_point.name}"
-                    )
-                    plan = plan_entry_point.load()
-                    if callable(plan):
-                        plan_widget = plan(model, self)
-                        display_name = getattr(
-                            plan_widget, "display_name", plan_entry_point.name
-                        )
-                        print(f"[PlanSubmission] Created widget for {display_name}")
-                        self.action_dict[display_name] = plan_widget
-            elif plan_entry_point.name not in plans_to_exclude:
-                print(
-                    f"[PlanSubmission] Loading non-excluded plan: {plan_entry_point.name}"
-                )
-                plan = plan_entry_point.load()
-                if callable(plan):
-                    plan_widget = plan(model, self)
-                    display_name = getattr(
-                        plan_widget, "display_name", plan_entry_point.name
-                    )
-                    print(f"[PlanSubmission] Created widget for {display_name}")
-                    self.action_dict[display_name] = plan_widget
-
-        print(f"[PlanSubmission] Loaded {len(self.action_dict)} plan widgets")
+        self.plan_classes = load_widget_entry_points(
+            "nbs_gui.plans", plans_to_include, plans_to_exclude
+        )
+        print(f"[PlanSubmission] Found {len(self.plan_classes)} plan widgets")
         self.setup_submission_buttons()
         self.setup_ui()
 
@@ -68,7 +100,7 @@ class PlanSubmissionBase(QWidget):
         pass
 
     def setup_ui(self):
-        self.action_widget = QStackedWidget(self)
+        self.action_widget = LazyWidgetStack(self)
         # Create and add the action selection combo box
         self.action_label = QLabel("Plan Type Selection", self)
         self.action_selection = QComboBox(self)
@@ -78,10 +110,12 @@ class PlanSubmissionBase(QWidget):
         self.time_estimate_label = QLabel("Time Estimate: --", self)
         self.time_estimate_label.setStyleSheet("QLabel { color: gray; }")
 
-        print("[PlanSubmission] Adding widgets to stacked widget")
-        for k, widget in self.action_dict.items():
-            self.action_widget.addWidget(widget)
-            self.action_selection.addItem(k)
+        for display_name, plan_class in self.plan_classes:
+            self.action_widget.add_lazy_widget(
+                partial(self._create_plan_widget, plan_class)
+            )
+            self.action_selection.addItem(display_name)
+        self.action_widget.widget_created.connect(self._on_plan_widget_created)
 
         self.layout = QVBoxLayout(self)
         h = QHBoxLayout()
@@ -100,46 +134,94 @@ class PlanSubmissionBase(QWidget):
         self.action_widget.currentChanged.connect(self.update_plan_ready_connection)
         self.update_plan_ready_connection(self.action_widget.currentIndex())
 
-    def _update_time_estimate(self):
-        """Update the time estimate display"""
-        try:
-            current_widget = self.action_widget.currentWidget()
-            if not isinstance(current_widget, PlanWidgetBase):
-                self.time_estimate_label.setText("Time Estimate: --")
-                return
-
-            # Only calculate time estimate if the plan is ready (submit button enabled)
-            if not self.submit_button.isEnabled():
-                self.time_estimate_label.setText("Time Estimate: --")
-                self.time_estimate_label.setStyleSheet("QLabel { color: gray; }")
-                return
-
-            # Get the plan items from the current widget
-            try:
-                plan_items = current_widget.create_plan_items()
-                if not plan_items:
-                    self.time_estimate_label.setText("Time Estimate: --")
-                    return
-
-                # Use the first plan item for estimation
-                # Calculate the estimate
-                estimate = self.time_estimator.calculate_plan_time(plan_items[0])
+    def _create_plan_widget(self, plan_class):
+        print(f"[PlanSubmission] Creating widget for {plan_class.__name__}")
+        return plan_class(self.model, self)
 
-                time_str = self.time_estimator.format_time_estimate(estimate)
-                self.time_estimate_label.setText(f"Time Estimate: {time_str}")
+    def _on_plan_widget_created(self, index, widget):
+        display_name = getattr(widget, "display_name", None)
+        if isinstance(display_name, str):
+            self.action_selection.setItemText(index, display_name)
+        self.action_dict[self.action_selection.itemText(index)] = widget
 
-                if estimate is not None:
-                    self.time_estimate_label.setStyleSheet("QLabel { color: black; }")
-                else:
-                    self.time_estimate_label.setStyleSheet("QLabel { color: gray; }")
+    def _update_time_estimate(self, *args):
+        """Schedule an update of the time estimate display"""
+        self._estimate_timer.start()
 
-            except Exception as e:
-                print(f"[PlanSubmission] Error getting plan info: {e}")
-                self.time_estimate_label.setText("Time Estimate: --")
+    def _start_time_estimate(self):
+        """
+        Compute the estimate of the current plans in a worker thread, then
+        update the display.
+        """
+        if self._estimate_worker is not None:
+            # Parameters changed while the worker was running: start again when it is done
+            self._estimate_rerun = True
+            return
+
+        self._estimate_items = []
+        current_widget = self.action_widget.currentWidget()
+        # Only calculate time estimate if the plan is ready (submit button enabled)
+        if (
+            not isinstance(current_widget, PlanWidgetBase)
+            or not self.submit_button.isEnabled()
+        ):
+            self._set_time_estimate(None)
+            return
 
+        try:
+            self._estimate_items = current_widget.estimate_plan_items()
+            jobs = self.time_estimator.prepare_estimate_jobs(
+                [item for item, _ in self._estimate_items]
+            )
         except Exception as e:
-            print(f"[PlanSubmission] Error updating time estimate: {e}")
-            self.time_estimate_label.setText("Time Estimate: --")
+            print(f"[PlanSubmission] Error getting plan info: {e}")
+            self._estimate_items = []
+            jobs = []
+        if not jobs:
+            self._apply_time_estimate()
+            return
+
+        worker = FunctionWorker(self.time_estimator.compute_estimates, jobs)
+        worker.returned.connect(self.time_estimator.store_estimates)
+        worker.finished.connect(self._on_estimate_worker_finished)
+        self._estimate_worker = worker
+        worker.start()
+
+    def _on_estimate_worker_finished(self):
+        worker, self._estimate_worker = self._estimate_worker, None
+        if worker is not None:
+            try:
+                worker.returned.disconnect()
+                worker.finished.disconnect()
+            except Exception:
+                pass
+
+        if self._estimate_rerun:
+            self._estimate_rerun = False
+            self._start_time_estimate()
+        else:
+            self._apply_time_estimate()
+
+    def _apply_time_estimate(self):
+        """Show the total estimate of the plans from the memoized estimates"""
+        total, n_plans = None, 0
+        for item, count in self._estimate_items:
+            n_plans += count
+            key = self.time_estimator.item_key(item)
+            _, estimate = self.time_estimator.get_cached_estimate(key)
+            if estimate is not None:
+                total = (total or 0) + estimate * count
+        self._set_time_estimate(total, n_plans)
+
+    def _set_time_estimate(self, estimate, n_plans=0):
+        time_str = self.time_estimator.format_time_estimate(estimate)
+        if estimate is not None and n_plans > 1:
+            time_str = f"{time_str} ({n_plans} plans)"
+        self.time_estimate_label.setText(f"Time Estimate: {time_str}")
+        if estimate is not None:
+            self.time_estimate_label.setStyleSheet("QLabel { color: black; }")
+        else:
+            self.time_estimate_label.setStyleSheet("QLabel { color: gray; }")
 
     def on_action_selection_changed(self, index):
         """Handler for action selection changes"""
@@ -165,6 +247,12 @@ class PlanSubmissionBase(QWidget):
 
         # Connect new widget
         self.current_widget = self.action_widget.widget(index)
+        if not self.action_widget.is_created(index):
+            # The plan widget is created when it is shown
+            for button in self.submission_buttons:
+                button.setEnabled(False)
+            self._update_time_estimate()
+            return
         if isinstance(self.current_widget, PlanWidgetBase):
             for button in self.submission_buttons:
                 self.current_widget.plan_ready.connect(button.setEnabled)
@@ -217,34 +305,12 @@ class PlanLoadWidget(QWidget):
         plans_to_exclude = (
             config.get("gui", {}).get("plan_loaders", {}).get("exclude", [])
         )
-        explicit_inclusion = len(plans_to_include) > 0
-
-        plans = entry_points(group="nbs_gui.plan_loaders")
         # Need to load only desired plans from config file!
-        for plan_entry_point in plans:
-            if explicit_inclusion:
-                if plan_entry_point.name in plans_to_include:
-                    print(f"Initializing {plan_entry_point.name} Loader")
-                    plan = plan_entry_point.load()  # Load the modifier function
-                    if callable(plan):
-                        # Call the modifier function with model and self (as parent) to get the QWidget
-                        plan_widget = plan(model, self)
-                        print("Created plan loader")
-                        self.action_dict[
-                            getattr(plan_widget, "display_name", plan_entry_point.name)
-                        ] = plan_widget
-                        print("Added plan loader to dict")
-            elif plan_entry_point.name not in plans_to_exclude:
-                print(f"Initializing {plan_entry_point.name}")
-                plan = plan_entry_point.load()  # Load the modifier function
-                if callable(plan):
-                    # Call the modifier function with model and self (as parent) to get the QWidget
-                    plan_widget = plan(model, self)
-                    self.action_dict[
-                        getattr(plan_widget, "display_name", plan_entry_point.name)
-                    ] = plan_widget
+        self.loader_classes = load_widget_entry_points(
+            "nbs_gui.plan_loaders", plans_to_include, plans_to_exclude
+        )
         print("Initialized Loader Dict")
-        self.action_widget = QStackedWidget(self)
+        self.action_widget = LazyWidgetStack(self)
 
         # Create and add the action selection combo box
         self.action_label = QLabel("Load Type", self)
@@ -254,9 +320,13 @@ class PlanLoadWidget(QWidget):
         self.reset_button = QPushButton("Reset", self)
         self.reset_button.clicked.connect(self.reset_plan)
 
-        for k, widget in self.action_dict.items():
-            self.action_widget.addWidget(widget)
-            self.action_selection.addItem(k)
+        # Loaders are created when they are first selected
+        for display_name, loader_class in self.loader_classes:
+            self.action_widget.add_lazy_widget(
+                partial(self._create_loader_widget, loader_class)
+            )
+            self.action_selection.addItem(display_name)
+        self.action_widget.widget_created.connect(self._on_loader_widget_created)
 
         self.layout = QVBoxLayout(self)
         h = QHBoxLayout()
@@ -273,7 +343,15 @@ class PlanLoadWidget(QWidget):
         # Create and add the submit button
         self.submit_button = QPushButton("Submit Plan Queue", self)
         self.submit_button.clicked.connect(self.submit_plan)
-        self.layout.addWidget(self.submit_button)
+        self.validate_button = QPushButton("Validate Plans", self)
+        self.validate_button.setToolTip(
+            "Check the plans against the plans allowed by the Queue Server"
+        )
+        self.validate_button.clicked.connect(self.validate_plan)
+        h = QHBoxLayout()
+        h.addWidget(self.submit_button)
+        h.addWidget(self.validate_button)
+        self.layout.addLayout(h)
         print("Submit Button Added")
         self.action_selection.currentIndexChanged.connect(
             self.action_widget.setCurrentIndex
@@ -291,25 +369,51 @@ class PlanLoadWidget(QWidget):
         if hasattr(self, "current_widget") and isinstance(
             self.current_widget, PlanLoaderWidgetBase
         ):
-            try:
-                self.current_widget.plan_ready.disconnect(self.submit_button.setEnabled)
-            except TypeError:
-                # The signal was not connected
-                pass
+            for button in (self.submit_button, self.validate_button):
+                try:
+                    self.current_widget.plan_ready.disconnect(button.setEnabled)
+                except (TypeError, RuntimeError):
+                    # The signal was not connected
+                    pass
 
         # Connect the plan_ready signal of the new widget
         self.current_widget = self.action_widget.widget(index)
+        if not self.action_widget.is_created(index):
+            # The loader is created when it is shown
+            self.submit_button.setEnabled(False)
+            self.validate_button.setEnabled(False)
+            return
         if isinstance(self.current_widget, PlanLoaderWidgetBase):
             self.current_widget.plan_ready.connect(self.submit_button.setEnabled)
+            self.current_widget.plan_ready.connect(self.validate_button.setEnabled)
         print("Checking if PlanLoadWidget is ready")
 
         self.current_widget.check_plan_ready()
 
+    def _create_loader_widget(self, loader_class):
+        print(f"Initializing {loader_class.__name__} Loader")
+        return loader_class(self.model, self)
+
+    def _on_loader_widget_created(self, index, widget):
+        display_name = getattr(widget, "display_name", None)
+        if isinstance(display_name, str):
+            self.action_selection.setItemText(index, display_name)
+        self.action_dict[self.action_selection.itemText(index)] = widget
+
     def submit_plan(self):
         # Get the selected action, noun, and modifier
         selected_widget = self.action_widget.currentWidget()
         selected_widget.submit_all_plans()
 
+    def validate_plan(self):
+        """Check all plans of the loaded file against the allowed plans"""
+        selected_widget = self.action_widget.currentWidget()
+        plan_items = selected_widget.create_plan_items()
+        if plan_items:
+            validate_plans(
+                self, self.model.run_engine, plan_items, title="Validate Loaded Plans"
+            )
+
     def reset_plan(self):
         # Get the selected action, noun, and modifier
         selected_widget = self.action_widget.currentWidget()
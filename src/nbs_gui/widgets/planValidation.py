@@ -0,0 +1,181 @@
+from bluesky_widgets.qt.threading import GeneratorWorker
+from qtpy.QtCore import Qt, Signal
+from qtpy.QtWidgets import (
+    QAbstractItemView,
+    QDialog,
+    QHBoxLayout,
+    QHeaderView,
+    QLabel,
+    QProgressBar,
+    QPushButton,
+    QTableWidget,
+    QTableWidgetItem,
+    QVBoxLayout,
+)
+
+from ..models.planValidation import get_plan_validators
+
+
+class PlanValidationDialog(QDialog):
+    """
+    Validate queue items against the allowed plans in a worker thread.
+
+    Progress is shown with a progress bar and invalid items are listed in a table
+    as they are found.
+
+    Parameters
+    ----------
+    run_engine_client : RunEngineClient
+        Client whose allowed plans and devices are used.
+    items : list
+        Queue items (dict or BItem) to validate.
+    parent : QWidget, optional
+        Parent widget.
+    title : str, optional
+        Window title.
+    """
+
+    #: Emitted with the index of an invalid item when its row is double-clicked
+    signal_item_activated = Signal(int)
+
+    def __init__(self, run_engine_client, items, parent=None, title="Validate Plans"):
+        super().__init__(parent)
+        self.setWindowTitle(title)
+        self.resize(700, 400)
+
+        self._items = list(items)
+        self._validators = get_plan_validators(run_engine_client)
+        self._worker = None
+        self.errors = []
+
+        self._label = QLabel(f"Validating {len(self._items)} plans ...")
+        self._progress = QProgressBar()
+        self._progress.setRange(0, len(self._items))
+        self._progress.setValue(0)
+
+        self._table = QTableWidget(0, 3)
+        self._table.setHorizontalHeaderLabels(["Row", "Plan", "Error"])
+        self._table.verticalHeader().setVisible(False)
+        self._table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self._table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self._table.setWordWrap(False)
+        header = self._table.horizontalHeader()
+        header.setSectionResizeMode(0, QHeaderView.ResizeToContents)
+        header.setSectionResizeMode(1, QHeaderView.ResizeToContents)
+        header.setSectionResizeMode(2, QHeaderView.Stretch)
+        self._table.cellDoubleClicked.connect(self._table_cell_double_clicked)
+
+        self._pb_cancel = QPushButton("Cancel")
+        self._pb_cancel.clicked.connect(self._pb_cancel_clicked)
+        self._pb_close = QPushButton("Close")
+        self._pb_close.clicked.connect(self.accept)
+        self._pb_close.setEnabled(False)
+
+        hbox = QHBoxLayout()
+        hbox.addStretch(1)
+        hbox.addWidget(self._pb_cancel)
+        hbox.addWidget(self._pb_close)
+
+        vbox = QVBoxLayout()
+        vbox.addWidget(self._label)
+        vbox.addWidget(self._progress)
+        vbox.addWidget(self._table)
+        vbox.addLayout(hbox)
+        self.setLayout(vbox)
+
+    def start(self):
+        """Start validation in a worker thread."""
+        worker = GeneratorWorker(self._validators.iter_validate, self._items)
+        worker.yielded.connect(self._on_chunk_validated)
+        worker.aborted.connect(self._on_aborted)
+        worker.errored.connect(self._on_errored)
+        worker.finished.connect(self._on_finished)
+        self._worker = worker
+        worker.start()
+
+    def exec_(self):
+        self.start()
+        return super().exec_()
+
+    def _on_chunk_validated(self, result):
+        n_validated, errors = result
+        self._progress.setValue(n_validated)
+        if errors:
+            self.errors.extend(errors)
+            table = self._table
+            row = table.rowCount()
+            table.setRowCount(row + len(errors))
+            for n, plan_name, msg in errors:
+                # Rows are numbered from 1, as in the plan tables
+                table.setItem(row, 0, QTableWidgetItem(str(n + 1)))
+                table.setItem(row, 1, QTableWidgetItem(str(plan_name)))
+                error_item = QTableWidgetItem(msg.splitlines()[0] if msg else "")
+                error_item.setToolTip(msg)
+                table.setItem(row, 2, error_item)
+                row += 1
+        self._label.setText(
+            f"Validated {n_validated} of {len(self._items)} plans, "
+            f"{len(self.errors)} invalid"
+        )
+
+    def _on_aborted(self):
+        self._label.setText(
+            f"Validation cancelled after {self._progress.value()} of "
+            f"{len(self._items)} plans, {len(self.errors)} invalid"
+        )
+
+    def _on_errored(self, ex):
+        self._label.setText(f"Validation failed: {ex}")
+
+    def _on_finished(self):
+        worker, self._worker = self._worker, None
+        if worker is not None:
+            try:
+                worker.yielded.disconnect()
+                worker.aborted.disconnect()
+                worker.errored.disconnect()
+                worker.finished.disconnect()
+            except Exception:
+                pass
+        if self._progress.value() == len(self._items) and not self.errors:
+            self._label.setText(f"All {len(self._items)} plans are valid")
+        self._pb_cancel.setEnabled(False)
+        self._pb_close.setEnabled(True)
+
+    def _pb_cancel_clicked(self):
+        if self._worker is not None:
+            self._worker.quit()
+
+    def _table_cell_double_clicked(self, row, column):
+        if 0 <= row < len(self.errors):
+            self.signal_item_activated.emit(self.errors[row][0])
+
+    def reject(self):
+        # Closing the dialog stops the validation
+        self._pb_cancel_clicked()
+        super().reject()
+
+
+def validate_plans(parent, run_engine_client, items, *, title="Validate Plans"):
+    """
+    Validate plan items with a progress and error report dialog.
+
+    Parameters
+    ----------
+    parent : QWidget
+        The parent widget of the dialog
+    run_engine_client : RunEngineClient
+        Client whose allowed plans and devices are used
+    items : list
+        The plan items to be validated
+    title : str, optional
+        Title of the dialog
+
+    Returns
+    -------
+    list of tuple
+        ``(index, plan_name, message)`` for each invalid item found
+    """
+    dialog = PlanValidationDialog(run_engine_client, items, parent, title=title)
+    dialog.exec_()
+    return dialog.errors
@@ -1,4 +1,5 @@
-from qtpy.QtCore import Qt, QThread, Signal
+from bluesky_widgets.qt.threading import FunctionWorker
+from qtpy.QtCore import Qt, QTimer
 from qtpy.QtGui import (
     QFont,
     QFontMetrics,
@@ -18,6 +19,12 @@ from qtpy.QtWidgets import (
 )
 from qtpy.QtGui import QIntValidator
 
+from ..models.consoleStream import (  # noqa: F401
+    ConsoleMonitorThread,
+    dropped_lines_message,
+    get_console_stream,
+)
+
 
 class PushButtonMinimumWidth(QPushButton):
     """Push button minimum width necessary to fit the text."""
@@ -32,62 +39,27 @@ class PushButtonMinimumWidth(QPushButton):
         self.setFixedWidth(text_width)
 
 
-class ConsoleMonitorThread(QThread):
-    """Thread that polls the RE Manager console output stream.
-
-    Runs a loop calling ``next_msg`` with a short timeout.  When a message
-    arrives it is forwarded to the main thread via *message_received*.  The
-    loop checks ``_running`` each iteration so it can be stopped
-    deterministically with :meth:`stop`.
-
-    Parameters
-    ----------
-    re_client : RunEngineClient
-        The run engine client model whose console monitor to poll.
-    parent : QObject, optional
-        Parent Qt object.
-    """
-
-    message_received = Signal(object, object)
-
-    def __init__(self, re_client, parent=None):
-        super().__init__(parent)
-        self._re_client = re_client
-        self._running = False
-
-    def run(self):
-        self._running = True
-        client = self._re_client._client
-        client.console_monitor.enable()
-        while self._running:
-            try:
-                payload = client.console_monitor.next_msg(timeout=0.2)
-                time_val = payload.get("time", None)
-                msg = payload.get("msg", None)
-                if msg is not None:
-                    self.message_received.emit(time_val, msg)
-            except client.RequestTimeoutError:
-                pass
-            except Exception as ex:
-                if self._running:
-                    print(f"Console monitor error: {ex}")
-        try:
-            client.console_monitor.disable_wait()
-        except Exception:
-            pass
-
-    def stop(self):
-        """Stop the monitoring loop and wait for the thread to finish."""
-        self._running = False
-        self.wait(2000)
-
-
 class QtReConsoleMonitor(QWidget):
+    #: Maximum number of search matches, older matches are omitted
+    max_search_results = 10000
+
     def __init__(self, model, parent=None, start_monitoring=True):
         super().__init__(parent)
         self.setAttribute(Qt.WA_DeleteOnClose)
         self._max_lines = 1000
-        self._monitor_thread = None
+        self._console_stream = None
+
+        # Browsing the session history: the display shows the lines
+        #   [_window_start, _window_stop) of the console log store instead of live output
+        self._browsing = False
+        self._window_start = 0
+        self._window_stop = 0
+        self._window_paging_blocked = False
+        self._window_page_pending = False
+        self._search_matches = []
+        self._search_index = -1
+        self._search_omitted = False
+        self._search_worker = None
 
         self._text_edit = QPlainTextEdit()
         self._text_edit.setReadOnly(True)
@@ -103,6 +75,9 @@ class QtReConsoleMonitor(QWidget):
         self._text_edit.verticalScrollBar().sliderReleased.connect(
             self._slider_released
         )
+        self._text_edit.verticalScrollBar().valueChanged.connect(
+            self._scroll_value_changed
+        )
         self._is_slider_pressed = False
 
         self._pb_clear = PushButtonMinimumWidth("Clear")
@@ -117,7 +92,9 @@ class QtReConsoleMonitor(QWidget):
         self._le_max_lines_min = 10
         self._le_max_lines_max = 10000
         self._le_max_lines.setValidator(
-            QIntValidator(self._le_max_lines_min, self._le_max_lines_max)
+            QIntValidator(
+                self._le_max_lines_min, self._le_max_lines_max, self._le_max_lines
+            )
         )
 
         self._autoscroll_enabled = True
@@ -125,6 +102,21 @@ class QtReConsoleMonitor(QWidget):
         self._cb_autoscroll.setChecked(True)
         self._cb_autoscroll.stateChanged.connect(self._cb_autoscroll_state_changed)
 
+        self._le_search = QLineEdit()
+        self._le_search.setPlaceholderText("Search session history")
+        self._le_search.returnPressed.connect(self._start_search)
+        self._cb_regex = QCheckBox("Regex")
+        self._pb_search_prev = PushButtonMinimumWidth("Prev")
+        self._pb_search_prev.clicked.connect(self._pb_search_prev_clicked)
+        self._pb_search_next = PushButtonMinimumWidth("Next")
+        self._pb_search_next.clicked.connect(self._pb_search_next_clicked)
+        self._lb_search = QLabel("")
+        self._lb_window = QLabel("")
+        self._pb_live = PushButtonMinimumWidth("Live")
+        self._pb_live.setToolTip("Return to the live console output")
+        self._pb_live.clicked.connect(self._pb_live_clicked)
+        self._update_search_buttons()
+
         vbox = QVBoxLayout()
         hbox = QHBoxLayout()
         hbox.addWidget(self._cb_autoscroll)
@@ -133,6 +125,23 @@ class QtReConsoleMonitor(QWidget):
         hbox.addWidget(self._le_max_lines)
         hbox.addWidget(self._pb_clear)
         vbox.addLayout(hbox)
+
+        self._search_widget = QWidget()
+        hbox = QHBoxLayout()
+        hbox.setContentsMargins(0, 0, 0, 0)
+        hbox.addWidget(self._le_search)
+        hbox.addWidget(self._cb_regex)
+        hbox.addWidget(self._pb_search_prev)
+        hbox.addWidget(self._pb_search_next)
+        hbox.addWidget(self._lb_search)
+        hbox.addStretch()
+        hbox.addWidget(self._lb_window)
+        hbox.addWidget(self._pb_live)
+        self._search_widget.setLayout(hbox)
+        # Shown only if the session history is recorded
+        self._search_widget.setVisible(False)
+        vbox.addWidget(self._search_widget)
+
         vbox.addWidget(self._text_edit)
         self.setLayout(vbox)
 
@@ -141,10 +150,11 @@ class QtReConsoleMonitor(QWidget):
             self._start_monitoring()
 
     def _start_monitoring(self):
-        """Start the console monitoring thread."""
-        self._monitor_thread = ConsoleMonitorThread(self.model, parent=self)
-        self._monitor_thread.message_received.connect(self._process_message)
-        self._monitor_thread.start()
+        """Subscribe to the shared console stream and replay recent output."""
+        self._console_stream = get_console_stream(self.model)
+        history = self._console_stream.subscribe(self._process_batch)
+        self._append_lines(history)
+        self._search_widget.setVisible(self._log_store() is not None)
         app = QApplication.instance()
         if app:
             app.aboutToQuit.connect(self.teardown)
@@ -159,18 +169,42 @@ class QtReConsoleMonitor(QWidget):
         msg : str or None
             Console output text.
         """
-        if msg is None:
+        if msg is not None:
+            self._append_lines([msg])
+
+    def _process_batch(self, lines, n_dropped):
+        """Append a batch of console output messages.
+
+        Parameters
+        ----------
+        lines : list of str
+            Console output messages.
+        n_dropped : int
+            Number of messages dropped before this batch because the
+            display could not keep up.
+        """
+        if self._browsing:
+            # New output is in the console log store, and shown on return to live
             return
-        msg = msg.rstrip()
-        if not msg:
+        if n_dropped:
+            lines = [dropped_lines_message(n_dropped)] + lines
+        self._append_lines(lines)
+
+    def _append_lines(self, lines):
+        """Insert messages with a single edit and scroll once."""
+        lines = [_.rstrip() for _ in lines]
+        lines = [_ for _ in lines if _]
+        if not lines:
             return
+        # Lines beyond the block limit would be removed right after insertion
+        text = "\n".join(lines[-self._max_lines :])
 
         cursor = QTextCursor(self._text_edit.document())
         cursor.movePosition(QTextCursor.End)
         if self._text_edit.document().isEmpty():
-            cursor.insertText(msg)
+            cursor.insertText(text)
         else:
-            cursor.insertText("\n" + msg)
+            cursor.insertText("\n" + text)
         if self._autoscroll_enabled and not self._is_slider_pressed:
             self._text_edit.setTextCursor(cursor)
             self._text_edit.ensureCursorVisible()
@@ -182,8 +216,183 @@ class QtReConsoleMonitor(QWidget):
         self._is_slider_pressed = False
 
     def _pb_clear_clicked(self):
+        self._set_browsing(False)
         self._text_edit.clear()
 
+    def _log_store(self):
+        if self._console_stream is None:
+            return None
+        return self._console_stream.log_store
+
+    def _set_browsing(self, browsing):
+        self._browsing = browsing
+        self._pb_live.setEnabled(browsing)
+        if not browsing:
+            self._lb_window.setText("")
+
+    def _update_search_buttons(self):
+        n_matches = len(self._search_matches)
+        self._pb_search_prev.setEnabled(self._search_index > 0)
+        self._pb_search_next.setEnabled(0 <= self._search_index < n_matches - 1)
+        self._pb_live.setEnabled(self._browsing)
+
+    def _start_search(self):
+        """Search the session history in a worker thread."""
+        store = self._log_store()
+        text = self._le_search.text()
+        if store is None or self._search_worker is not None:
+            return
+        self._search_matches, self._search_index = [], -1
+        self._update_search_buttons()
+        if not text:
+            self._lb_search.setText("")
+            return
+
+        self._lb_search.setText("Searching ...")
+        worker = FunctionWorker(
+            store.search,
+            text,
+            regex=self._cb_regex.isChecked(),
+            # One more than shown, to tell whether older matches were omitted
+            max_results=self.max_search_results + 1,
+        )
+        worker.returned.connect(self._search_returned)
+        worker.errored.connect(self._search_errored)
+        worker.finished.connect(self._search_finished)
+        self._search_worker = worker
+        worker.start()
+
+    def _search_returned(self, matches):
+        self._search_omitted = len(matches) > self.max_search_results
+        if self._search_omitted:
+            matches = matches[1:]
+        self._search_matches = matches
+        if not matches:
+            self._lb_search.setText("No matches")
+            self._update_search_buttons()
+            return
+        # Start from the most recent match
+        self._search_index = len(matches) - 1
+        self._show_search_match()
+
+    def _search_errored(self, ex):
+        self._lb_search.setText("Invalid pattern")
+        self._lb_search.setToolTip(str(ex))
+
+    def _search_finished(self):
+        worker, self._search_worker = self._search_worker, None
+        if worker is not None:
+            try:
+                worker.returned.disconnect()
+                worker.errored.disconnect()
+                worker.finished.disconnect()
+            except Exception:
+                pass
+
+    def _show_search_match(self):
+        n_matches = len(self._search_matches)
+        if self._search_omitted:
+            self._lb_search.setText(f"{self._search_index + 1} of {n_matches}+")
+            self._lb_search.setToolTip(
+                f"Only the {n_matches} most recent matches are shown, "
+                "older matches are omitted"
+            )
+        else:
+            self._lb_search.setText(f"{self._search_index + 1} of {n_matches}")
+            self._lb_search.setToolTip("")
+        self._update_search_buttons()
+        line = self._search_matches[self._search_index]
+        self._show_history_window(line - self._max_lines // 2, highlight_line=line)
+
+    def _pb_search_prev_clicked(self):
+        if self._search_index > 0:
+            self._search_index -= 1
+            self._show_search_match()
+
+    def _pb_search_next_clicked(self):
+        if self._search_index < len(self._search_matches) - 1:
+            self._search_index += 1
+            self._show_search_match()
+
+    def _pb_live_clicked(self):
+        """Leave the session history and show the recent output again."""
+        self._set_browsing(False)
+        self._text_edit.clear()
+        if self._console_stream is not None:
+            self._append_lines(self._console_stream.history())
+
+    def _show_history_window(self, start, *, highlight_line=None, top_line=None):
+        """
+        Display a window of ``_max_lines`` lines of the session history.
+
+        Parameters
+        ----------
+        start : int
+            First line of the window, clipped to the stored lines.
+        highlight_line : int, optional
+            Line to select and center in the view.
+        top_line : int, optional
+            Line to scroll to the top of the view.
+        """
+        store = self._log_store()
+        if store is None:
+            return
+        n_lines = len(store)
+        start = max(min(start, n_lines - self._max_lines), 0)
+        records = store.read_lines(start, start + self._max_lines)
+
+        self._set_browsing(True)
+        self._window_start, self._window_stop = start, start + len(records)
+        self._lb_window.setText(
+            f"Lines {self._window_start + 1}-{self._window_stop} of {n_lines}"
+        )
+
+        self._window_paging_blocked = True
+        try:
+            self._text_edit.setPlainText("\n".join(text for _, text in records))
+            if highlight_line is not None:
+                block = self._text_edit.document().findBlockByNumber(
+                    highlight_line - start
+                )
+                cursor = QTextCursor(block)
+                cursor.movePosition(QTextCursor.EndOfBlock, QTextCursor.KeepAnchor)
+                self._text_edit.setTextCursor(cursor)
+                self._text_edit.centerCursor()
+            elif top_line is not None:
+                # The scroll position of a plain text edit is the first visible line
+                self._text_edit.verticalScrollBar().setValue(top_line - start)
+        finally:
+            self._window_paging_blocked = False
+
+    def _scroll_value_changed(self, value):
+        """Move the history window when its first or last line is reached."""
+        if not self._browsing or self._window_paging_blocked:
+            return
+        scroll_bar = self._text_edit.verticalScrollBar()
+        at_top = (value == scroll_bar.minimum()) and (self._window_start > 0)
+        at_bottom = (value == scroll_bar.maximum()) and (
+            self._window_stop < len(self._log_store() or ())
+        )
+        if (at_top or at_bottom) and not self._window_page_pending:
+            # Do not replace the text while the scroll bar is processing the event
+            self._window_page_pending = True
+            QTimer.singleShot(0, self._page_history_window)
+
+    def _page_history_window(self):
+        self._window_page_pending = False
+        if not self._browsing:
+            return
+        scroll_bar = self._text_edit.verticalScrollBar()
+        top_line = self._window_start + scroll_bar.value()
+        step = max(self._max_lines // 2, 1)
+        if scroll_bar.value() == scroll_bar.minimum():
+            start = self._window_start - step
+        elif scroll_bar.value() == scroll_bar.maximum():
+            start = self._window_start + step
+        else:
+            return
+        self._show_history_window(start, top_line=top_line)
+
     def _le_max_lines_editing_finished(self):
         v = int(self._le_max_lines.text())
         v = max(min(v, self._le_max_lines_max), self._le_max_lines_min)
@@ -195,7 +404,7 @@ class QtReConsoleMonitor(QWidget):
         self._autoscroll_enabled = state == Qt.Checked
 
     def teardown(self):
-        """Stop monitoring and clean up the thread."""
-        if self._monitor_thread is not None:
-            self._monitor_thread.stop()
-            self._monitor_thread = None
+        """Unsubscribe from the console stream."""
+        if self._console_stream is not None:
+            self._console_stream.unsubscribe(self._process_batch)
+            self._console_stream = None
@@ -1,4 +1,6 @@
+from collections import OrderedDict
 from importlib.metadata import entry_points
+import orjson
 
 
 def load_time_estimators():
@@ -42,11 +44,28 @@ def load_time_estimators():
     return time_estimators
 
 
+def _content_hash(value):
+    """Hash of a JSON-serializable value, or None if it can not be serialized."""
+    try:
+        return hash(
+            orjson.dumps(
+                value, option=orjson.OPT_SORT_KEYS | orjson.OPT_SERIALIZE_NUMPY
+            )
+        )
+    except TypeError:
+        return None
+
+
 class TimeEstimator:
+    #: Maximum number of memoized per-item estimates
+    max_cached_estimates = 10000
+
     def __init__(self, model):
         self.model = model
         self.plan_time_dict = {}
         self.time_estimators = load_time_estimators()
+        # Memoized estimates: {item_key: estimate}, oldest first
+        self._estimate_cache = OrderedDict()
         self._subscribe_to_time_estimation()
 
     def _subscribe_to_time_estimation(self):
@@ -73,19 +92,30 @@ class TimeEstimator:
 
             # Get the estimation parameters for this plan
             estimation_params = self.plan_time_dict.get(plan_name)
-            if not estimation_params:
-                return None
-
-            # Get the estimator function name
-            estimator_name = estimation_params.get("estimator", "generic_estimate")
-            if estimator_name not in self.time_estimators:
-                return None
-
-            # Calculate the estimate
-            estimator_func = self.time_estimators[estimator_name]
-            estimate = estimator_func(plan_name, plan_args, estimation_params)
-
-            return estimate
+        except Exception as e:
+            print(f"[QtRePlanQueue] Error calculating time estimate: {e}")
+            return None
+        return self._run_estimator(plan_name, plan_args, estimation_params)
+
+    def _run_estimator(self, plan_name, plan_args, params):
+        """
+        Run the estimator function named in the estimation parameters of a plan.
+        Safe to call from a worker thread.
+
+        Returns
+        -------
+        float or None
+            The estimate, None if there are no parameters, the estimator is
+            unknown, or it failed
+        """
+        if not params:
+            return None
+        estimator_name = params.get("estimator", "generic_estimate")
+        estimator_func = self.time_estimators.get(estimator_name, None)
+        if estimator_func is None:
+            return None
+        try:
+            return estimator_func(plan_name, plan_args, params)
         except Exception as e:
             print(f"[QtRePlanQueue] Error calculating time estimate: {e}")
             return None
@@ -103,6 +133,18 @@ class TimeEstimator:
             return f"{estimate/3600:.1f}h"
 
     def calculate_plan_time(self, plan_item):
+        key = self.item_key(plan_item)
+        found, estimate = self.get_cached_estimate(key)
+        if found:
+            return estimate
+
+        plan_name, plan_args = self._plan_name_and_args(plan_item)
+        estimate = self._calculate_time_estimate(plan_name, plan_args)
+        if key is not None:
+            self.store_estimates({key: estimate})
+        return estimate
+
+    def _plan_name_and_args(self, plan_item):
         if hasattr(plan_item, "to_dict"):
             plan_item = plan_item.to_dict()
         plan_name = plan_item.get("name")
@@ -110,9 +152,77 @@ class TimeEstimator:
         plan_args.update(plan_item.get("kwargs", {}))
         if "args" in plan_item:
             plan_args["args"] = plan_item["args"]
-
-        estimate = self._calculate_time_estimate(plan_name, plan_args)
-        return estimate
+        return plan_name, plan_args
+
+    def item_key(self, plan_item):
+        """
+        Returns the memoization key of a plan item, or None if it can not be hashed.
+
+        The key covers the plan name, the plan arguments and the estimation parameters
+        of the plan, so that estimates are recomputed if any of them change.
+        """
+        plan_name, plan_args = self._plan_name_and_args(plan_item)
+        estimation_params = (self.plan_time_dict or {}).get(plan_name)
+        args_hash = _content_hash(plan_args)
+        params_hash = _content_hash(estimation_params)
+        if args_hash is None or params_hash is None:
+            return None
+        return (plan_name, args_hash, params_hash)
+
+    def get_cached_estimate(self, key):
+        """
+        Returns ``(True, estimate)`` if the estimate for the key is memoized,
+        ``(False, None)`` otherwise. The estimate itself may be None.
+        """
+        if key is not None and key in self._estimate_cache:
+            return True, self._estimate_cache[key]
+        return False, None
+
+    def store_estimates(self, estimates):
+        """Memoize a dictionary of ``{item_key: estimate}``."""
+        cache = self._estimate_cache
+        cache.update(estimates)
+        while len(cache) > self.max_cached_estimates:
+            cache.popitem(last=False)
+
+    def prepare_estimate_jobs(self, plan_items):
+        """
+        Collect plan items that have no memoized estimate.
+
+        Estimation parameters are looked up here, so the returned jobs can be run
+        by ``compute_estimates`` in a worker thread without touching the Redis dict.
+
+        Returns
+        -------
+        list of tuple
+            ``(item_key, plan_name, plan_args, estimation_params)`` for each item
+            with a key that is not in the cache, without duplicates
+        """
+        jobs, keys = [], set()
+        plan_time_dict = self.plan_time_dict or {}
+        for plan_item in plan_items:
+            key = self.item_key(plan_item)
+            if key is None or key in keys or key in self._estimate_cache:
+                continue
+            keys.add(key)
+            plan_name, plan_args = self._plan_name_and_args(plan_item)
+            jobs.append((key, plan_name, plan_args, plan_time_dict.get(plan_name)))
+        return jobs
+
+    def compute_estimates(self, jobs):
+        """
+        Run estimator functions for jobs from ``prepare_estimate_jobs``.
+        Safe to call from a worker thread.
+
+        Returns
+        -------
+        dict
+            ``{item_key: estimate}``, where the estimate is None if it is not available
+        """
+        return {
+            key: self._run_estimator(plan_name, plan_args, estimation_params)
+            for key, plan_name, plan_args, estimation_params in jobs
+        }
 
     def calculate_queue_time(self, plan_queue_items):
         total_estimate = 0
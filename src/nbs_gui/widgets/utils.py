@@ -1,8 +1,12 @@
-from qtpy.QtWidgets import QFrame, QMessageBox, QPushButton
-from qtpy.QtWidgets import QWidget, QSizePolicy
-from qtpy.QtCore import Qt, QSize
+from qtpy.QtWidgets import QFrame, QMessageBox, QPushButton, QProgressDialog
+from qtpy.QtWidgets import QWidget, QSizePolicy, QStackedWidget
+from qtpy.QtCore import Qt, QSize, Signal
 from qtpy.QtGui import QPainter, QColor
 
+from ..settings import SETTINGS
+
+DEFAULT_SUBMIT_CHUNK_SIZE = 100
+
 
 def submit_plan(parent, item):
     """
@@ -33,6 +37,190 @@ def submit_plan(parent, item):
         return False
 
 
+def _queue_config():
+    return SETTINGS.gui_config.get("gui", {}).get("queue", {})
+
+
+def get_submit_chunk_size():
+    """
+    Get the number of items sent per ``queue_item_add_batch`` request.
+
+    Returns
+    -------
+    int
+        Value of ``submit_chunk_size`` from the ``[gui.queue]`` section of
+        ``gui_config.toml``, or ``DEFAULT_SUBMIT_CHUNK_SIZE``
+    """
+    chunk_size = _queue_config().get("submit_chunk_size", DEFAULT_SUBMIT_CHUNK_SIZE)
+    return max(int(chunk_size), 1)
+
+
+def _request_error_messages(ex, offset=0):
+    """Extract per-item error messages from a failed batch request, if available."""
+    response = getattr(ex.__cause__, "response", None) or {}
+    messages = []
+    for n, result in enumerate(response.get("results", [])):
+        if not result.get("success", True):
+            messages.append(f"Item {offset + n + 1}: {result.get('msg', '')}")
+    return messages
+
+
+def queue_items_add_chunked(
+    run_engine_client,
+    items,
+    *,
+    chunk_size=None,
+    rollback=False,
+    progress_callback=None,
+):
+    """
+    Add items to the queue using ``queue_item_add_batch`` in chunks.
+
+    Each chunk is a single request, and the Queue Server adds either all items of
+    a chunk or none of them. Each chunk is inserted after the previous one, so the
+    order of the items is preserved.
+
+    Parameters
+    ----------
+    run_engine_client : RunEngineClient
+        Client used to submit the items
+    items : list
+        Items (dict or BPlan) to add to the queue
+    chunk_size : int, optional
+        Number of items per request. Defaults to ``get_submit_chunk_size()``
+    rollback : bool, optional
+        If True, the items from the chunks that were already added are removed
+        from the queue when a chunk fails, so that the submission is all-or-nothing
+    progress_callback : callable, optional
+        Called as ``progress_callback(n_submitted, n_total)`` after each chunk.
+        Returning ``False`` cancels the remaining chunks.
+
+    Returns
+    -------
+    dict
+        ``n_added`` - number of items in the queue after the submission,
+        ``n_total`` - number of items requested, ``cancelled`` - whether the
+        submission was cancelled, ``rolled_back`` - whether added items were removed,
+        ``error`` - error message or None, ``item_errors`` - list of per-item error
+        messages for the failed chunk
+    """
+    chunk_size = chunk_size or get_submit_chunk_size()
+    items = list(items)
+    report = {
+        "n_added": 0,
+        "n_total": len(items),
+        "cancelled": False,
+        "rolled_back": False,
+        "error": None,
+        "item_errors": [],
+    }
+    added_uids = []
+    for start in range(0, len(items), chunk_size):
+        chunk = items[start : start + chunk_size]
+        try:
+            run_engine_client.queue_item_add_batch(items=chunk)
+        except Exception as ex:
+            report["error"] = (
+                f"Items {start + 1}-{start + len(chunk)} were rejected: {ex}"
+            )
+            report["item_errors"] = _request_error_messages(ex, offset=start)
+            break
+        # Newly added items are selected by the client
+        added_uids.extend(run_engine_client.selected_queue_item_uids)
+        report["n_added"] += len(chunk)
+
+        if progress_callback is not None:
+            if progress_callback(report["n_added"], len(items)) is False:
+                report["cancelled"] = report["n_added"] < len(items)
+                break
+
+    if rollback and added_uids and (report["error"] or report["cancelled"]):
+        try:
+            run_engine_client._client.item_remove_batch(
+                uids=added_uids, ignore_missing=True
+            )
+            report["n_added"] = 0
+            report["rolled_back"] = True
+        except Exception as ex:
+            report["error"] = f"{report['error']}\nRollback failed: {ex}"
+        finally:
+            run_engine_client.load_re_manager_status(unbuffered=True)
+
+    return report
+
+
+def submit_plans(
+    parent, run_engine_client, items, *, rollback=None, title="Submitting Plans"
+):
+    """
+    Submit plan items to the queue in chunks, with a progress dialog.
+
+    Parameters
+    ----------
+    parent : QWidget
+        The parent widget for the progress and error dialogs
+    run_engine_client : RunEngineClient
+        Client used to submit the items
+    items : list of BPlan
+        The plan items to be submitted
+    rollback : bool, optional
+        Remove already submitted items if a chunk fails or the user cancels.
+        Defaults to ``submit_rollback`` from the ``[gui.queue]`` config section
+    title : str, optional
+        Title of the progress dialog
+
+    Returns
+    -------
+    int
+        The number of items that were added to the queue
+    """
+    items = list(items)
+    if not items:
+        return 0
+
+    if rollback is None:
+        rollback = bool(_queue_config().get("submit_rollback", False))
+
+    progress = None
+    chunk_size = get_submit_chunk_size()
+    if len(items) > chunk_size:
+        progress = QProgressDialog(title, "Cancel", 0, len(items), parent)
+        progress.setWindowModality(Qt.WindowModal)
+        progress.setMinimumDuration(0)
+        progress.setValue(0)
+
+    def _progress(n_submitted, n_total):
+        if progress is None:
+            return True
+        progress.setValue(n_submitted)
+        progress.setLabelText(f"{title}: {n_submitted} of {n_total}")
+        return not progress.wasCanceled()
+
+    report = queue_items_add_chunked(
+        run_engine_client,
+        items,
+        chunk_size=chunk_size,
+        rollback=rollback,
+        progress_callback=_progress,
+    )
+    if progress is not None:
+        progress.close()
+
+    if report["error"]:
+        if report["rolled_back"]:
+            summary = "No plans were added, the submitted plans were removed."
+        else:
+            summary = f"{report['n_added']} of {report['n_total']} plans were added."
+        details = "\n".join(report["item_errors"][:20])
+        QMessageBox.critical(
+            parent,
+            "Plan Submission Error",
+            f"Failed to submit plans: {report['error']}\n\n{summary}\n{details}",
+            QMessageBox.Ok,
+        )
+    return report["n_added"]
+
+
 def execute_plan(parent, run_engine_client, item):
     """
     Execute a plan item immediately in the run engine client.
@@ -73,6 +261,94 @@ class HLine(QFrame):
         self.setFrameShadow(QFrame.Sunken)
 
 
+class LazyWidgetStack(QStackedWidget):
+    """
+    QStackedWidget whose pages are created the first time they are shown.
+
+    Pages are added as factories. An empty placeholder holds the place of each
+    page until the page is selected, or is current when the stack is first
+    shown. It is then replaced by the widget returned by the factory.
+
+    Parameters
+    ----------
+    parent : QWidget, optional
+        Parent widget
+    """
+
+    #: Emitted with the index and the widget when a page is created
+    widget_created = Signal(int, object)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        # Placeholder widget: factory
+        self._factories = {}
+
+    def add_lazy_widget(self, factory):
+        """
+        Add a page that is created on first use.
+
+        Parameters
+        ----------
+        factory : callable
+            Called without arguments to create the page widget.
+
+        Returns
+        -------
+        int
+            Index of the page
+        """
+        placeholder = QWidget(self)
+        self._factories[placeholder] = factory
+        return self.addWidget(placeholder)
+
+    def is_created(self, index):
+        """True if the page at *index* has been created."""
+        widget = self.widget(index)
+        return widget is not None and widget not in self._factories
+
+    def created_widgets(self):
+        """List of the pages that have been created."""
+        return [
+            self.widget(n) for n in range(self.count()) if self.is_created(n)
+        ]
+
+    def ensure_widget(self, index):
+        """
+        Create the page at *index* if it is still a placeholder.
+
+        Returns
+        -------
+        QWidget or None
+            The page widget, None if the index is out of range or the page
+            could not be created.
+        """
+        placeholder = self.widget(index)
+        if placeholder is None or placeholder not in self._factories:
+            return placeholder
+        try:
+            widget = self._factories[placeholder]()
+        except Exception as ex:
+            print(f"[LazyWidgetStack] Failed to create page {index}: {ex}")
+            return None
+        del self._factories[placeholder]
+        is_current = self.currentIndex() == index
+        self.insertWidget(index, widget)
+        if is_current:
+            super().setCurrentIndex(index)
+        self.removeWidget(placeholder)
+        placeholder.deleteLater()
+        self.widget_created.emit(index, widget)
+        return widget
+
+    def setCurrentIndex(self, index):
+        self.ensure_widget(index)
+        super().setCurrentIndex(index)
+
+    def showEvent(self, event):
+        self.ensure_widget(self.currentIndex())
+        super().showEvent(event)
+
+
 class ConfirmationButton(QPushButton):
     """
     A QPushButton that shows a confirmation dialog before emitting clicked.
@@ -4,6 +4,7 @@ from .settings import SETTINGS
 from .widgets.header import Header
 from .mainWidget import TabViewer
 from .confEdit import ConfigEditor
+from .utils.stall_monitor import start_stall_monitor
 from qtpy.QtWidgets import QVBoxLayout, QWidget, QAction
 
 from importlib.metadata import entry_points
@@ -20,6 +21,9 @@ class MainWindow(Window):
         super().__init__(TabViewer(model), show=show)
         self.model = model
         self._mode_model = None
+        self.stall_monitor = start_stall_monitor(
+            SETTINGS.gui_config.get("gui", {}).get("stall_monitor", {})
+        )
 
         # Initialize main widget container
         self.main_widget = QWidget()
@@ -150,8 +154,9 @@ class MainWindow(Window):
         mode : str
             Target mode.
         """
-        self.model.reload_beamline_for_mode_inplace(mode)
+        beamline = self.model.reload_beamline_for_mode_inplace(mode)
+        changes = getattr(beamline, "device_changes", None)
         if hasattr(self.qt_widget, "reload_tabs"):
-            self.qt_widget.reload_tabs(self.model)
+            self.qt_widget.reload_tabs(self.model, changes)
         self._attach_mode_listener()
         self._update_action_env_destroy_state()